@@ -211,6 +211,78 @@ class EvacuationManagerAgent(BaseAgent):
                 "timestamp": datetime.now()
             }
 
+    def handle_route_requests(
+        self,
+        requests: List[Dict[str, Any]],
+        max_workers: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Handle a batch of route requests against the current graph state.
+
+        Uses RoutingAgent.calculate_routes() so requests sharing a
+        destination are answered by one search; falls back to one
+        handle_route_request() per request otherwise.
+
+        Args:
+            requests: Dicts with "start", "end" and optional "preferences"
+            max_workers: Threads used by the routing searches
+
+        Returns:
+            Route dicts (as handle_route_request()) in request order
+        """
+        if not self.routing_agent or not hasattr(self.routing_agent, "calculate_routes"):
+            return [
+                self.handle_route_request(r.get("start"), r.get("end"), r.get("preferences"))
+                for r in requests
+            ]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        valid_indices = []
+        for index, request in enumerate(requests):
+            if self._validate_coordinates(request.get("start")) and self._validate_coordinates(request.get("end")):
+                valid_indices.append(index)
+            else:
+                results[index] = {
+                    "route_id": str(uuid.uuid4()),
+                    "status": "error",
+                    "message": "Invalid coordinates provided",
+                    "timestamp": datetime.now()
+                }
+
+        try:
+            routes = self.routing_agent.calculate_routes(
+                [requests[i] for i in valid_indices],
+                max_workers=max_workers
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate routes: {e}")
+            routes = [{"status": "error", "message": str(e)} for _ in valid_indices]
+
+        for index, route_result in zip(valid_indices, routes):
+            if route_result.get("status") == "error":
+                results[index] = {
+                    "route_id": str(uuid.uuid4()),
+                    "status": "error",
+                    "message": route_result.get("message", "Route calculation failed"),
+                    "timestamp": datetime.now()
+                }
+                continue
+
+            route = self._format_route(route_result)
+            request = requests[index]
+            self.route_history.append({
+                "route_id": route["route_id"],
+                "start": request.get("start"),
+                "end": request.get("end"),
+                "preferences": request.get("preferences"),
+                "route": route,
+                "timestamp": route["timestamp"]
+            })
+            results[index] = route
+
+        logger.info(f"{self.agent_id} handled {len(requests)} route requests in one batch")
+        return results
+
     def collect_user_feedback(
         self,
         route_id: str,
@@ -422,8 +494,10 @@ class EvacuationManagerAgent(BaseAgent):
         # Direct method call to RoutingAgent's calculate_route
         # In a fully distributed system, this could use ACL messages via message queue
         route_result = self.routing_agent.calculate_route(start, end, preferences)
+        return self._format_route(route_result)
 
-        # Format response to match expected structure
+    def _format_route(self, route_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a RoutingAgent result as a route response."""
         return {
             "route_id": str(uuid.uuid4()),
             "path": route_result.get("path", []),
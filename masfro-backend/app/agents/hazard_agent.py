@@ -20,11 +20,14 @@ Date: November 2025
 """
 
 from .base_agent import BaseAgent
-from typing import Dict, Any, List, Tuple, Optional, TYPE_CHECKING
+from typing import Dict, Any, List, Tuple, Optional, Callable, TYPE_CHECKING
 import logging
-from datetime import datetime
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from threading import Lock, Thread
 from app.core.timezone_utils import get_philippine_time
 import math
+import numpy as np
 
 if TYPE_CHECKING:
     from ..environment.graph_manager import DynamicGraphEnvironment
@@ -51,8 +54,10 @@ except ImportError:
 # Haversine distance for spatial queries
 try:
     from app.algorithms.risk_aware_astar import haversine_distance
+    from app.algorithms.time_dependent_astar import EdgeDepthSeries
 except ImportError:
     haversine_distance = None
+    EdgeDepthSeries = None
 
 # ACL Protocol imports for MAS communication
 try:
@@ -150,6 +155,18 @@ class HazardAgent(BaseAgent):
         # Flood prediction configuration (default: rr01, time_step 1)
         self.return_period = "rr01"  # Default return period
         self.time_step = 1  # Default time step (1 hour = first time step)
+        self.prefetch_steps = 2  # Upcoming time steps loaded in the background (0 = off)
+        self.interpolation = "linear"  # Depths at fractional time steps: "linear" or "monotone"
+        self._depth_series: Dict[str, "EdgeDepthSeries"] = {}  # Per-edge forecasts by return period
+
+        # Static water depth (m) at which roads close, per vehicle class
+        self.passability_depths = {
+            vehicle: limits["static_depth"]
+            for vehicle, limits in (RiskCalculator.PASSABILITY_THRESHOLDS if RiskCalculator else {}).items()
+        } or {"car": 0.3}
+        self._inundation_index: Dict[Tuple[str, float], np.ndarray] = {}  # (rp, depth) -> uint8 steps
+        self._forecast_lock = Lock()
+        self._forecast_builds: Dict[str, Thread] = {}  # Background series/index builds by return period
 
         # Risk decay configuration - Realistic flood recession modeling
         self.enable_risk_decay = True  # Enable time-based risk decay
@@ -192,6 +209,13 @@ class HazardAgent(BaseAgent):
             logger.error(f"Failed to initialize RiskCalculator: {e}")
             self.risk_calculator = None
 
+        # Clock used for data ages and decay; None means wall-clock time.
+        # The SimulationManager injects its virtual clock for headless runs.
+        self.time_source: Optional[Callable[[], datetime]] = None
+
+        # Optional TickProfiler timing the update_risk steps (see set_profiler)
+        self.profiler = None
+
         # Risk trend tracking
         self.previous_average_risk = 0.0
         self.last_update_time = None
@@ -202,6 +226,12 @@ class HazardAgent(BaseAgent):
         self.spatial_index_grid_size = 0.01  # Grid cell size in degrees (~1.1km)
         self._build_spatial_index()
 
+        # Only read the raster pixels covering the road network, and gather
+        # edge depths in one vectorized pass
+        self._edge_sample_count = 0
+        self._edge_depth_array: Optional[np.ndarray] = None  # Last gather, in graph edge order
+        self._attach_graph_to_geotiff()
+
         logger.info(
             f"{self.agent_id} initialized with risk weights: {self.risk_weights}, "
             f"return_period: {self.return_period}, time_step: {self.time_step}, "
@@ -220,8 +250,52 @@ class HazardAgent(BaseAgent):
         """
         self.flood_data_cache.clear()
         self.scout_data_cache.clear()
+        self._depth_series.clear()
+        self._inundation_index.clear()
         logger.info(f"{self.agent_id} caches cleared")
 
+    def set_time_source(self, time_source: Optional[Callable[[], datetime]]) -> None:
+        """
+        Set the clock used for data ages, TTLs and risk decay.
+
+        Args:
+            time_source: Callable returning the current datetime, or None
+                to use wall-clock time
+        """
+        self.time_source = time_source
+
+    def set_profiler(self, profiler) -> None:
+        """
+        Set the profiler that times the update_risk steps.
+
+        Args:
+            profiler: TickProfiler (steps are recorded as "hazard.<step>"),
+                or None to disable timing
+        """
+        self.profiler = profiler
+
+    def _timed(self, step: str):
+        """Context manager timing a step when a profiler is set."""
+        profiler = self.profiler
+        if profiler is None:
+            return nullcontext()
+        return profiler.measure(f"hazard.{step}")
+
+    def _now(self) -> datetime:
+        """Current time from the injected time source (naive) or the wall clock."""
+        if self.time_source is not None:
+            return self.time_source()
+        return datetime.now()
+
+    def _now_utc(self) -> datetime:
+        """Current time as an aware UTC datetime (naive sources are taken as UTC)."""
+        if self.time_source is None:
+            return datetime.now(timezone.utc)
+        current_time = self.time_source()
+        if current_time.tzinfo is None:
+            current_time = current_time.replace(tzinfo=timezone.utc)
+        return current_time
+
     def calculate_data_age_minutes(self, timestamp: Any) -> float:
         """
         Calculate age of data in minutes from its timestamp.
@@ -244,7 +318,7 @@ class HazardAgent(BaseAgent):
             return 0.0
 
         # Make both datetimes timezone-aware for comparison
-        current_time = datetime.now(timezone.utc)
+        current_time = self._now_utc()
 
         # If timestamp is naive, assume it's UTC
         if timestamp.tzinfo is None:
@@ -330,8 +404,7 @@ class HazardAgent(BaseAgent):
         Returns:
             Dict with counts of expired items
         """
-        from datetime import datetime
-        current_time = datetime.now()
+        current_time = self._now()
         expired_counts = {"scouts": 0, "flood_locations": 0}
 
         # Clean expired scout reports
@@ -374,8 +447,8 @@ class HazardAgent(BaseAgent):
         Returns:
             True if any scout reported "clear" within radius in last 15 minutes
         """
-        from datetime import datetime, timedelta
-        current_time = datetime.now()
+        from datetime import timedelta
+        current_time = self._now()
         validation_window = timedelta(minutes=15)
 
         for report in self.scout_data_cache:
@@ -663,7 +736,8 @@ class HazardAgent(BaseAgent):
 
         # Clean expired data first (time-based decay)
         if self.enable_risk_decay:
-            expired_counts = self.clean_expired_data()
+            with self._timed("clean_expired_data"):
+                expired_counts = self.clean_expired_data()
             if expired_counts["scouts"] > 0 or expired_counts["flood_locations"] > 0:
                 logger.debug(
                     f"Expired data removed: {expired_counts['scouts']} scouts, "
@@ -690,7 +764,7 @@ class HazardAgent(BaseAgent):
 
         # Ensure GeoTIFF is set to current time step (already done by SimulationManager)
         # This is a safety check
-        if self.time_step != time_step:
+        if int(self.time_step) != time_step:
             logger.warning(
                 f"HazardAgent time_step mismatch: expected {time_step}, "
                 f"got {self.time_step}. Correcting..."
@@ -727,12 +801,15 @@ class HazardAgent(BaseAgent):
 
         # Process data and update graph
         # Pass flag to exclude coordinate-based reports from global processing
-        fused_data = self.fuse_data(exclude_coordinate_reports=True)
-        risk_scores = self.calculate_risk_scores(fused_data)
-        self.update_environment(risk_scores)
+        with self._timed("fuse_data"):
+            fused_data = self.fuse_data(exclude_coordinate_reports=True)
+        with self._timed("calculate_risk_scores"):
+            risk_scores = self.calculate_risk_scores(fused_data)
+        with self._timed("update_environment"):
+            self.update_environment(risk_scores)
 
         # Calculate risk trend metrics
-        current_time = get_philippine_time()
+        current_time = self._now()
         average_risk = sum(risk_scores.values()) / len(risk_scores) if risk_scores else 0.0
 
         # Determine trend
@@ -1072,6 +1149,7 @@ class HazardAgent(BaseAgent):
         if not 1 <= ts <= 18:
             logger.warning(f"Invalid time_step: {ts}. Using default: 1")
             ts = 1
+        ts = int(ts)  # Point queries use the hourly map at or before a fractional time
 
         try:
             # Get node coordinates
@@ -1109,9 +1187,14 @@ class HazardAgent(BaseAgent):
         """
         Query flood depths for all edges in the graph.
 
+        Fractional time steps (e.g. 4.5) are interpolated between the
+        neighbouring hourly maps using self.interpolation when the
+        vectorized edge samples are available; otherwise the hourly map at
+        or before that time is used.
+
         Args:
             return_period: Return period (rr01-rr04), uses default if None
-            time_step: Time step (1-18), uses default if None
+            time_step: Time step (1-18, may be fractional), uses default if None
 
         Returns:
             Dict mapping edge tuples to flood depths in meters
@@ -1127,6 +1210,7 @@ class HazardAgent(BaseAgent):
             return {}
 
         edge_depths = {}
+        self._edge_depth_array = None
         rp = return_period or self.return_period
         ts = time_step if time_step is not None else self.time_step
 
@@ -1137,6 +1221,25 @@ class HazardAgent(BaseAgent):
 
         logger.info(f"Querying flood depths for all edges (rp={rp}, ts={ts})")
 
+        # Vectorized path: one gather over the registered edge samples
+        if self._edge_sample_count:
+            if ts != int(ts):
+                depths = self.geotiff_service.get_edge_depths_at(rp, ts, self.interpolation)
+            else:
+                depths = self.geotiff_service.get_edge_depths(rp, int(ts))
+            keys = self.geotiff_service.edge_sample_keys
+            if isinstance(depths, np.ndarray) and keys is not None and len(keys) == len(depths):
+                flooded = np.flatnonzero(depths > 0.01)  # Threshold: 1cm (NaN compares False)
+                edge_depths = {keys[i]: float(depths[i]) for i in flooded}
+                if len(depths) == self.environment.graph.number_of_edges():
+                    # Samples were registered in graph edge order
+                    self._edge_depth_array = np.where(depths > 0.01, depths, 0.0)
+                logger.info(
+                    f"Flood depth query complete: {len(edge_depths)}/{len(keys)} edges flooded "
+                    f"(>{0.01}m)"
+                )
+                return edge_depths
+
         edge_count = 0
         flooded_count = 0
 
@@ -1156,6 +1259,217 @@ class HazardAgent(BaseAgent):
 
         return edge_depths
 
+    def get_edge_depth_series(
+        self,
+        return_period: Optional[str] = None,
+        build: bool = True
+    ) -> Optional["EdgeDepthSeries"]:
+        """
+        Per-edge flood depth over all time steps, for time-dependent routing.
+
+        Built once per return period from the vectorized edge gathers
+        (all time steps of the return period are read).
+
+        Args:
+            return_period: Return period (rr01-rr04), uses default if None
+            build: Build the series now if it is not cached; when False a
+                background build is started instead and None is returned
+
+        Returns:
+            EdgeDepthSeries keyed by (u, v, key), or None if GeoTIFF data or
+            edge samples are unavailable (or not built yet)
+        """
+        if not self.geotiff_enabled or not self.geotiff_service or not self._edge_sample_count:
+            return None
+
+        rp = return_period or self.return_period
+        series = self._depth_series.get(rp)
+        if series is not None:
+            return series
+        if not build:
+            self.prepare_forecast_async(rp)
+            return None
+
+        try:
+            depths = self.geotiff_service.get_edge_depth_series(rp)
+            keys = self.geotiff_service.edge_sample_keys
+            if depths is None or keys is None:
+                return None
+            series = EdgeDepthSeries(keys, depths, first_step=self.geotiff_service.time_steps[0])
+        except Exception as e:
+            logger.warning(f"{self.agent_id} could not build edge depth series for {rp}: {e}")
+            return None
+
+        self._depth_series[rp] = series
+        logger.info(
+            f"{self.agent_id} built edge depth series for {rp}: "
+            f"{series.depths.shape[0]} time steps x {series.depths.shape[1]} edges"
+        )
+        return series
+
+    def get_inundation_index(
+        self,
+        return_period: Optional[str] = None,
+        vehicle_type: str = "car",
+        build: bool = True
+    ) -> Optional[np.ndarray]:
+        """
+        Time step at which each road first becomes impassable for a vehicle.
+
+        Computed once per return period and depth limit from the edge
+        depth series, so "when does this road close?" is an array lookup.
+
+        Args:
+            return_period: Return period (rr01-rr04), uses default if None
+            vehicle_type: Key of passability_depths ("car", "suv", "truck")
+            build: Build a missing depth series now; when False, None is
+                returned until the background build has finished
+
+        Returns:
+            uint8 array aligned with the depth series index (see
+            get_edge_depth_series), NEVER_INUNDATED (255) for roads that stay
+            passable; None if no forecast is available
+
+        Raises:
+            ValueError: If the vehicle type is unknown
+        """
+        if vehicle_type not in self.passability_depths:
+            raise ValueError(
+                f"Invalid vehicle type: {vehicle_type}. "
+                f"Valid options: {list(self.passability_depths)}"
+            )
+
+        series = self.get_edge_depth_series(return_period, build=build)
+        if series is None:
+            return None
+
+        key = (return_period or self.return_period, self.passability_depths[vehicle_type])
+        index = self._inundation_index.get(key)
+        if index is None:
+            index = series.first_inundation(key[1])
+            self._inundation_index[key] = index
+        return index
+
+    def prepare_forecast(self, return_period: Optional[str] = None) -> bool:
+        """
+        Build the edge depth series and every vehicle's inundation index.
+
+        Reads all time steps of the return period, so it is meant to run
+        in the background (see prepare_forecast_async).
+
+        Args:
+            return_period: Return period (rr01-rr04), uses default if None
+
+        Returns:
+            True if the forecast is available
+        """
+        rp = return_period or self.return_period
+        if self.get_edge_depth_series(rp) is None:
+            return False
+        for vehicle_type in list(self.passability_depths):
+            self.get_inundation_index(rp, vehicle_type)
+        return True
+
+    def prepare_forecast_async(self, return_period: Optional[str] = None) -> Optional[Thread]:
+        """
+        Start building the forecast for a return period on a background thread.
+
+        Does nothing if it is already built or being built.
+
+        Args:
+            return_period: Return period (rr01-rr04), uses default if None
+
+        Returns:
+            The build thread, or None if no build was needed
+        """
+        if not self.geotiff_enabled or not self.geotiff_service or not self._edge_sample_count:
+            return None
+
+        rp = return_period or self.return_period
+        with self._forecast_lock:
+            if rp in self._depth_series:
+                return None
+            running = self._forecast_builds.get(rp)
+            if running is not None and running.is_alive():
+                return None
+            thread = Thread(
+                target=self.prepare_forecast, args=(rp,),
+                name=f"forecast-{rp}", daemon=True
+            )
+            self._forecast_builds[rp] = thread
+            thread.start()
+        return thread
+
+    def depth_to_risk(self, depth: float) -> float:
+        """
+        Risk score contributed by a flood depth.
+
+        Uses RiskCalculator's hydrological risk for static water, or a
+        simple depth mapping if it is unavailable, weighted by
+        risk_weights["flood_depth"].
+
+        Args:
+            depth: Flood depth in meters
+
+        Returns:
+            Weighted depth risk (0-1)
+        """
+        if self.risk_calculator:
+            risk = self.risk_calculator.calculate_hydrological_risk(
+                flood_depth=depth,
+                flow_velocity=0.0  # Could be enhanced with velocity maps
+            )
+        # Fallback to simple hardcoded logic if RiskCalculator unavailable
+        # Risk mapping: depth -> risk_score
+        #   0.0-0.3m: low risk (0.0-0.3)
+        #   0.3-0.6m: moderate risk (0.3-0.6)
+        #   0.6-1.0m: high risk (0.6-0.8)
+        #   >1.0m: critical risk (0.8-1.0)
+        elif depth <= 0.3:
+            risk = depth  # Linear: 0.3m = 0.3 risk
+        elif depth <= 0.6:
+            risk = 0.3 + (depth - 0.3) * 1.0  # 0.3-0.6m -> 0.3-0.6 risk
+        elif depth <= 1.0:
+            risk = 0.6 + (depth - 0.6) * 0.5  # 0.6-1.0m -> 0.6-0.8 risk
+        else:
+            risk = min(0.8 + (depth - 1.0) * 0.2, 1.0)  # >1.0m -> 0.8-1.0 risk
+
+        # Apply flood_depth weight
+        return risk * self.risk_weights["flood_depth"]
+
+    def _attach_graph_to_geotiff(self) -> None:
+        """
+        Share the road graph's geometry with the GeoTIFFService.
+
+        Restricts raster reads to the graph's bounding box and registers
+        edge endpoints so flood depths for all edges come from one
+        vectorized gather (prefetched ahead of time step changes).
+        """
+        if not self.geotiff_service or not self.environment or not self.environment.graph:
+            return
+
+        try:
+            graph = self.environment.graph
+            lons, lats = [], []
+            for _, data in graph.nodes(data=True):
+                if 'x' in data and 'y' in data:
+                    lons.append(float(data['x']))
+                    lats.append(float(data['y']))
+            if not lons:
+                return
+            self.geotiff_service.set_clip_bounds((min(lons), min(lats), max(lons), max(lats)))
+
+            edge_keys, u_coords, v_coords = [], [], []
+            for u, v, key in graph.edges(keys=True):
+                u_data, v_data = graph.nodes[u], graph.nodes[v]
+                edge_keys.append((u, v, key))
+                u_coords.append((float(u_data['x']), float(u_data['y'])))
+                v_coords.append((float(v_data['x']), float(v_data['y'])))
+            self.geotiff_service.set_edge_samples(edge_keys, u_coords, v_coords)
+            self._edge_sample_count = len(edge_keys)
+        except Exception as e:
+            logger.debug(f"{self.agent_id} could not attach graph to GeoTIFFService: {e}")
+
     def _build_spatial_index(self) -> None:
         """
         Build grid-based spatial index for fast edge lookups.
@@ -1371,7 +1685,7 @@ class HazardAgent(BaseAgent):
         return nearby_edges
 
     def set_flood_scenario(
-        self, return_period: str = "rr01", time_step: int = 1
+        self, return_period: str = "rr01", time_step: float = 1
     ) -> None:
         """
         Dynamically configure the flood scenario for GeoTIFF queries.
@@ -1385,7 +1699,8 @@ class HazardAgent(BaseAgent):
                 - rr02: 5-year return period
                 - rr03: 10-year return period
                 - rr04: 25-year return period
-            time_step: Time step in hours (1-18)
+            time_step: Time step in hours (1-18); fractional values
+                (e.g. 6.25) interpolate edge depths between hourly maps
 
         Raises:
             ValueError: If return_period or time_step is invalid
@@ -1405,6 +1720,15 @@ class HazardAgent(BaseAgent):
         self.return_period = return_period
         self.time_step = time_step
 
+        # Road closure forecasts for routes are built off the request path
+        self.prepare_forecast_async(return_period)
+
+        if self.geotiff_enabled and self.geotiff_service and self.prefetch_steps > 0:
+            try:
+                self.geotiff_service.prefetch(return_period, int(time_step), self.prefetch_steps)
+            except Exception as e:
+                logger.debug(f"{self.agent_id} flood map prefetch not scheduled: {e}")
+
         logger.info(
             f"{self.agent_id} flood scenario updated: "
             f"return_period={return_period}, time_step={time_step}"
@@ -1428,6 +1752,7 @@ class HazardAgent(BaseAgent):
             try:
                 self.geotiff_service = get_geotiff_service()
                 logger.info(f"{self.agent_id} GeoTIFFService initialized")
+                self._attach_graph_to_geotiff()
             except Exception as e:
                 logger.error(f"Failed to initialize GeoTIFFService: {e}")
                 return
@@ -1517,43 +1842,22 @@ class HazardAgent(BaseAgent):
                     risk_scores[(u, v, key)] = existing_risk
 
         # Query GeoTIFF flood depths for all edges
-        edge_flood_depths = self.get_edge_flood_depths()
+        with self._timed("get_edge_flood_depths"):
+            edge_flood_depths = self.get_edge_flood_depths()
+
+        # Per-vehicle passability bitsets follow these depths (see VehiclePassabilityIndex);
+        # the aligned gather is handed over as is, the dict only without samples
+        if hasattr(self.environment, 'set_flood_depths'):
+            aligned = self._edge_depth_array
+            self.environment.set_flood_depths(
+                aligned if aligned is not None else edge_flood_depths,
+                self.passability_depths
+            )
 
         # Convert flood depths to risk scores using RiskCalculator
+        # (static water: velocity=0.0 unless we have velocity data)
         for edge_tuple, depth in edge_flood_depths.items():
-            u, v, key = edge_tuple
-
-            if self.risk_calculator:
-                # Get edge attributes for sophisticated risk calculation
-                edge_data = self.environment.graph[u][v][key]
-                road_type = edge_data.get('highway', 'primary')
-
-                # Use RiskCalculator for hydrological risk
-                # Assume static water (velocity=0.0) unless we have velocity data
-                risk_from_depth = self.risk_calculator.calculate_hydrological_risk(
-                    flood_depth=depth,
-                    flow_velocity=0.0  # Could be enhanced with velocity maps
-                )
-
-                # Apply flood_depth weight
-                risk_scores[edge_tuple] = risk_from_depth * self.risk_weights["flood_depth"]
-            else:
-                # Fallback to simple hardcoded logic if RiskCalculator unavailable
-                # Risk mapping: depth -> risk_score
-                #   0.0-0.3m: low risk (0.0-0.3)
-                #   0.3-0.6m: moderate risk (0.3-0.6)
-                #   0.6-1.0m: high risk (0.6-0.8)
-                #   >1.0m: critical risk (0.8-1.0)
-                if depth <= 0.3:
-                    risk_from_depth = depth  # Linear: 0.3m = 0.3 risk
-                elif depth <= 0.6:
-                    risk_from_depth = 0.3 + (depth - 0.3) * 1.0  # 0.3-0.6m -> 0.3-0.6 risk
-                elif depth <= 1.0:
-                    risk_from_depth = 0.6 + (depth - 0.6) * 0.5  # 0.6-1.0m -> 0.6-0.8 risk
-                else:
-                    risk_from_depth = min(0.8 + (depth - 1.0) * 0.2, 1.0)  # >1.0m -> 0.8-1.0 risk
-
-                risk_scores[edge_tuple] = risk_from_depth * self.risk_weights["flood_depth"]
+            risk_scores[edge_tuple] = self.depth_to_risk(depth)
 
         # Add risk from fused data (river levels, weather, crowdsourced)
         # Apply environmental risk spatially (only to edges near reported location)
@@ -1636,14 +1940,13 @@ class HazardAgent(BaseAgent):
         Args:
             risk_scores: Dict mapping edge tuples to risk scores
         """
-        from datetime import datetime
         logger.debug(f"{self.agent_id} updating environment with risk scores")
 
         if not self.environment or not hasattr(self.environment, 'update_edge_risk'):
             logger.warning("Environment not configured for risk updates")
             return
 
-        current_time = datetime.now()
+        current_time = self._now()
 
         for (u, v, key), risk in risk_scores.items():
             try:
@@ -2001,7 +2304,7 @@ class HazardAgent(BaseAgent):
         Args:
             max_age_seconds: Maximum age of data to keep (default: 1 hour)
         """
-        current_time = get_philippine_time()
+        current_time = self._now()
 
         # Clear old flood data
         locations_to_remove = []
@@ -24,12 +24,20 @@ Date: November 2025
 """
 
 from .base_agent import BaseAgent
-from typing import Dict, Any, List, Tuple, Optional, TYPE_CHECKING
+from typing import Dict, Any, Callable, List, Tuple, Optional, TYPE_CHECKING
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 import logging
+import time
 import pandas as pd
 import os
 from pathlib import Path
 
+# Inundation index value for roads that never close (see EdgeDepthSeries.first_inundation)
+NEVER_INUNDATED = 255
+
 if TYPE_CHECKING:
     from ..environment.graph_manager import DynamicGraphEnvironment
 
@@ -66,7 +74,12 @@ class RoutingAgent(BaseAgent):
         agent_id: str,
         environment: "DynamicGraphEnvironment",
         risk_penalty: float = 2000.0,  # BALANCED MODE: 2000 virtual meters per risk unit
-        distance_weight: float = 1.0   # Always 1.0 to preserve A* heuristic consistency
+        distance_weight: float = 1.0,  # Always 1.0 to preserve A* heuristic consistency
+        use_contraction: bool = False,
+        fast_mode_queue_threshold: int = 10,
+        fast_mode_latency_ms: float = 1000.0,
+        fast_mode_epsilon: float = 1.1,
+        fast_mode_budget_ms: float = 5.0
     ) -> None:
         """
         Initialize the RoutingAgent.
@@ -84,12 +97,37 @@ class RoutingAgent(BaseAgent):
                 - Balanced mode: 2000.0 (moderate penalty, balance safety/speed)
                 - Fastest mode: 0.0 (no penalty, ignore risk completely)
             distance_weight: Weight for distance (always 1.0 for A* consistency)
+            use_contraction: Search the degree-2 contracted routing graph
+                (same results, far fewer nodes expanded)
+            fast_mode_queue_threshold: Route requests in flight/queued at which
+                bounded-suboptimal fast mode kicks in
+            fast_mode_latency_ms: Tick or route latency at which fast mode kicks in
+            fast_mode_epsilon: Cost bound of fast mode routes (1.1 = within 10%)
+            fast_mode_budget_ms: Search time budget per fast mode query
         """
         super().__init__(agent_id, environment)
 
         # Pathfinding configuration using Virtual Meters approach
         self.risk_penalty = risk_penalty
         self.distance_weight = distance_weight
+        self.use_contraction = use_contraction
+
+        # Load-based switch to bounded-suboptimal search (see report_load)
+        self.fast_mode_queue_threshold = fast_mode_queue_threshold
+        self.fast_mode_latency_ms = fast_mode_latency_ms
+        self.fast_mode_epsilon = fast_mode_epsilon
+        self.fast_mode_budget_ms = fast_mode_budget_ms
+        self._load_lock = Lock()
+        self._in_flight = 0
+        self._queue_depth = 0
+        self._tick_latency_ms = 0.0
+        self._route_latencies_ms = deque(maxlen=20)
+        self.fast_mode_routes = 0
+
+        # Flood forecast source for time-dependent routes (see set_hazard_agent)
+        self.hazard_agent = None
+        self.passable_depth = 0.3  # meters; static water limit for cars (RiskCalculator)
+        self.forecast_speed_kmh = 30.0
 
         # Load evacuation centers
         self.evacuation_centers = self._load_evacuation_centers()
@@ -100,6 +138,16 @@ class RoutingAgent(BaseAgent):
             f"evacuation_centers={len(self.evacuation_centers)}"
         )
 
+    def set_hazard_agent(self, hazard_agent) -> None:
+        """
+        Set reference to HazardAgent (flood forecast for time-dependent routes).
+
+        Args:
+            hazard_agent: HazardAgent instance
+        """
+        self.hazard_agent = hazard_agent
+        logger.info(f"{self.agent_id} linked to {hazard_agent.agent_id}")
+
     def step(self):
         """
         Perform one step of agent's operation.
@@ -113,15 +161,31 @@ class RoutingAgent(BaseAgent):
         self,
         start: Tuple[float, float],
         end: Tuple[float, float],
-        preferences: Optional[Dict[str, Any]] = None
+        preferences: Optional[Dict[str, Any]] = None,
+        departure_time: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Calculate optimal route from start to end coordinates.
 
+        With a departure_time the route is time-dependent: each road's
+        flood depth is taken from the HazardAgent's forecast (GeoTIFF time
+        steps) at the time the traveller is predicted to reach it, and
+        roads flooded to passable_depth by then are avoided.
+
         Args:
             start: Starting coordinates (latitude, longitude)
             end: Ending coordinates (latitude, longitude)
             preferences: Optional routing preferences
+                - avoid_floods: Safest mode
+                - fastest: Fastest mode
+                - full_geometry: Return road-following geometry instead of
+                  node-to-node coordinates
+                - return_period: Forecast scenario for time-dependent routes
+                  (default: the HazardAgent's current return period)
+                - vehicle_type: "car", "suv" or "truck"; roads flooded beyond
+                  the vehicle's depth limit are avoided
+            departure_time: Optional departure in flood time steps (hours,
+                1-18, may be fractional) for a time-dependent route
 
         Returns:
             Dict containing route information:
@@ -133,7 +197,9 @@ class RoutingAgent(BaseAgent):
                     "risk_level": Average risk score (0-1),
                     "max_risk": Maximum risk score on route,
                     "num_segments": Number of road segments,
-                    "warnings": List of warning messages
+                    "warnings": List of warning messages,
+                    "departure_time", "arrival_time": Time steps
+                        (time-dependent routes only)
                 }
 
             Status values:
@@ -142,12 +208,12 @@ class RoutingAgent(BaseAgent):
                 - "no_safe_route": No safe route found (safest/balanced mode)
 
         Raises:
-            ValueError: If coordinates are invalid or graph not loaded
+            ValueError: If coordinates are invalid, the vehicle type is
+                unknown or graph not loaded
         """
         from ..algorithms.risk_aware_astar import (
             risk_aware_astar,
-            calculate_path_metrics,
-            get_path_coordinates
+            bounded_risk_aware_astar
         )
 
         logger.info(f"{self.agent_id} calculating route: {start} -> {end}")
@@ -163,6 +229,323 @@ class RoutingAgent(BaseAgent):
         if not start_node or not end_node:
             raise ValueError("Could not map coordinates to road network")
 
+        risk_penalty, distance_weight = self._mode_weights(preferences)
+        passable = self._vehicle_test(preferences)
+
+        # Endpoints in different passable components cannot be joined:
+        # answer immediately instead of exhausting the search space
+        component_index = self.environment.get_component_index()
+        if component_index is not None and not component_index.same_component(start_node, end_node):
+            logger.info(f"{self.agent_id} no passable route: endpoints in different components")
+            return self._no_route_result(preferences)
+
+        if departure_time is not None:
+            series = self.hazard_agent.get_edge_depth_series(
+                (preferences or {}).get("return_period")
+            ) if self.hazard_agent else None
+            if series is not None:
+                return self._time_dependent_route(
+                    start_node, end_node, series, departure_time,
+                    risk_penalty, distance_weight, preferences
+                )
+            logger.warning(f"{self.agent_id} flood forecast unavailable, routing on current conditions")
+
+        # Search the contracted graph when enabled; endpoints inside a
+        # degree-2 chain are split out so they are addressable
+        routing_graph = self.environment.graph
+        contracted = self.environment.get_contracted_graph() if self.use_contraction else None
+        if contracted is not None:
+            contracted.ensure_node(start_node)
+            contracted.ensure_node(end_node)
+            routing_graph = contracted.graph
+
+        # Searches hold the contracted graph's structure stable against
+        # concurrent endpoint splits
+        with contracted.searching() if contracted is not None else nullcontext():
+            with self._load_lock:
+                self._in_flight += 1
+            search_started = time.perf_counter()
+            suboptimality_bound = None
+            try:
+                path_nodes = None
+                if self.is_under_load():
+                    # Surge: accept a route within fast_mode_epsilon of optimal
+                    fast_result = bounded_risk_aware_astar(
+                        routing_graph,
+                        start_node,
+                        end_node,
+                        risk_weight=risk_penalty,
+                        distance_weight=distance_weight,
+                        epsilon=self.fast_mode_epsilon,
+                        time_budget_ms=self.fast_mode_budget_ms,
+                        anytime=True,
+                        passable=passable
+                    )
+                    if fast_result["complete"]:
+                        path_nodes = fast_result["path"]
+                        suboptimality_bound = fast_result["bound"]
+                        self.fast_mode_routes += 1
+                        if path_nodes is None:
+                            return self._no_route_result(preferences)
+                    else:
+                        logger.info(f"{self.agent_id} fast mode budget exhausted, running exact search")
+
+                if path_nodes is None:
+                    # Calculate route using risk-aware A*
+                    # Note: risk_penalty is passed as risk_weight to maintain API compatibility
+                    path_nodes = risk_aware_astar(
+                        routing_graph,
+                        start_node,
+                        end_node,
+                        risk_weight=risk_penalty,  # Virtual meters per risk unit
+                        distance_weight=distance_weight,  # Always 1.0
+                        passable=passable
+                    )
+            finally:
+                elapsed_ms = (time.perf_counter() - search_started) * 1000.0
+                with self._load_lock:
+                    self._in_flight -= 1
+                    self._route_latencies_ms.append(elapsed_ms)
+
+            if contracted is not None:
+                path_nodes = contracted.expand_path(
+                    path_nodes,
+                    risk_weight=risk_penalty,
+                    distance_weight=distance_weight,
+                    passable=passable
+                )
+
+        result = self._build_route_result(path_nodes, preferences, suboptimality_bound)
+        if departure_time is not None and result["status"] == "success":
+            result["warnings"].append(
+                "Flood forecast unavailable: route reflects current conditions only."
+            )
+        return result
+
+    def _time_dependent_route(
+        self,
+        start_node: Any,
+        end_node: Any,
+        series: Any,
+        departure_time: float,
+        risk_penalty: float,
+        distance_weight: float,
+        preferences: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Route against the flood forecast (see time_dependent_astar).
+
+        Searches the original graph, whose edge keys the depth series uses.
+
+        Args:
+            start_node: Start node ID
+            end_node: End node ID
+            series: EdgeDepthSeries from the HazardAgent
+            departure_time: Departure in time steps
+            risk_penalty: Virtual meters per risk unit
+            distance_weight: Weight for distance
+            preferences: Routing preferences
+
+        Returns:
+            Route dict as returned by calculate_route()
+
+        Raises:
+            ValueError: If departure_time is outside the forecast
+        """
+        from ..algorithms.time_dependent_astar import time_dependent_astar
+
+        if not series.first_step <= departure_time <= series.last_step:
+            raise ValueError(
+                f"departure_time must be between {series.first_step} and "
+                f"{series.last_step}, got {departure_time}"
+            )
+
+        with self._load_lock:
+            self._in_flight += 1
+        search_started = time.perf_counter()
+        try:
+            search = time_dependent_astar(
+                self.environment.graph,
+                start_node,
+                end_node,
+                series,
+                departure_time,
+                risk_weight=risk_penalty,
+                distance_weight=distance_weight,
+                passable_depth=self._vehicle_depth_limit(preferences),
+                speed_kmh=self.forecast_speed_kmh,
+                depth_risk=self.hazard_agent.depth_to_risk
+            )
+        finally:
+            elapsed_ms = (time.perf_counter() - search_started) * 1000.0
+            with self._load_lock:
+                self._in_flight -= 1
+                self._route_latencies_ms.append(elapsed_ms)
+
+        result = self._build_route_result(search["path"], preferences, departure_time=departure_time)
+        result["departure_time"] = departure_time
+        result["arrival_time"] = search["arrival_time"]
+        return result
+
+    def calculate_routes(
+        self,
+        requests: List[Dict[str, Any]],
+        max_workers: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate many routes against the current graph state in one batch.
+
+        Requests that map to the same destination node and routing mode are
+        answered by one reverse search from the destination; groups run on
+        a thread pool when max_workers > 1. The searches run inside the
+        environment's frozen_risks(), so risk updates from any thread wait
+        and every search reads the same risk epoch.
+
+        Args:
+            requests: Dicts with "start", "end" and optional "preferences"
+                and "departure_time" (time-dependent, routed individually)
+            max_workers: Threads used for the searches
+
+        Returns:
+            Route dicts in request order (as calculate_route()); requests
+            that fail get {"status": "error", "message": ...}
+
+        Example:
+            >>> results = agent.calculate_routes([
+            ...     {"start": (14.65, 121.10), "end": (14.66, 121.11)},
+            ...     {"start": (14.64, 121.09), "end": (14.66, 121.11)},
+            ... ], max_workers=4)
+        """
+        from ..algorithms.risk_aware_astar import risk_aware_astar, reverse_risk_search
+
+        if not self.environment or not self.environment.graph:
+            raise ValueError("Graph environment not loaded")
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        groups: Dict[Tuple[Any, float, float], List[Tuple[int, Any]]] = {}
+        component_index = self.environment.get_component_index()
+        contracted = self.environment.get_contracted_graph() if self.use_contraction else None
+
+        # Map every distinct coordinate in one spatial query
+        coords = list(dict.fromkeys(
+            tuple(request[field]) for request in requests for field in ("start", "end")
+        ))
+        nearest = dict(zip(coords, self._find_nearest_nodes(coords)))
+
+        for index, request in enumerate(requests):
+            preferences = request.get("preferences")
+            if request.get("departure_time") is not None:
+                # Time-dependent routes depend on the arrival time at every
+                # node, so they cannot share a reverse search
+                try:
+                    results[index] = self.calculate_route(
+                        request["start"], request["end"], preferences, request["departure_time"]
+                    )
+                except Exception as e:
+                    results[index] = {"status": "error", "message": str(e)}
+                continue
+
+            start_node = nearest[tuple(request["start"])]
+            end_node = nearest[tuple(request["end"])]
+            if start_node is None or end_node is None:
+                results[index] = {"status": "error", "message": "Could not map coordinates to road network"}
+                continue
+            if component_index is not None and not component_index.same_component(start_node, end_node):
+                results[index] = self._no_route_result(preferences)
+                continue
+
+            if contracted is not None:
+                # Splitting chains mutates the contracted graph: do it before
+                # the searches fan out
+                contracted.ensure_node(start_node)
+                contracted.ensure_node(end_node)
+
+            risk_penalty, distance_weight = self._mode_weights(preferences)
+            vehicle_type = (preferences or {}).get("vehicle_type")
+            try:
+                self._vehicle_test(preferences)
+            except ValueError as e:
+                results[index] = {"status": "error", "message": str(e)}
+                continue
+            groups.setdefault(
+                (end_node, risk_penalty, distance_weight, vehicle_type), []
+            ).append((index, start_node))
+
+        routing_graph = contracted.graph if contracted is not None else self.environment.graph
+
+        def solve(group_key: Tuple[Any, float, float, Optional[str]], members: List[Tuple[int, Any]]):
+            end_node, risk_penalty, distance_weight, vehicle_type = group_key
+            passable = self._vehicle_test({"vehicle_type": vehicle_type})
+            with contracted.searching() if contracted is not None else nullcontext():
+                starts = list(dict.fromkeys(start_node for _, start_node in members))
+                if len(starts) == 1:
+                    paths = {starts[0]: risk_aware_astar(
+                        routing_graph,
+                        starts[0],
+                        end_node,
+                        risk_weight=risk_penalty,
+                        distance_weight=distance_weight,
+                        passable=passable
+                    )}
+                else:
+                    paths = reverse_risk_search(
+                        routing_graph,
+                        end_node,
+                        starts,
+                        risk_weight=risk_penalty,
+                        distance_weight=distance_weight,
+                        passable=passable
+                    )
+
+                for index, start_node in members:
+                    preferences = requests[index].get("preferences")
+                    try:
+                        path_nodes = paths[start_node]
+                        if contracted is not None:
+                            path_nodes = contracted.expand_path(
+                                path_nodes,
+                                risk_weight=risk_penalty,
+                                distance_weight=distance_weight,
+                                passable=passable
+                            )
+                        results[index] = self._build_route_result(path_nodes, preferences)
+                    except Exception as e:
+                        results[index] = {"status": "error", "message": str(e)}
+
+        batch_started = time.perf_counter()
+        # Risk updates from other threads (e.g. the flood data scheduler)
+        # wait until every search of the batch has finished
+        with self.environment.frozen_risks():
+            if max_workers > 1 and len(groups) > 1:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(groups))) as pool:
+                    futures = [pool.submit(solve, key, members) for key, members in groups.items()]
+                    for future in futures:
+                        future.result()
+            else:
+                for key, members in groups.items():
+                    solve(key, members)
+
+        elapsed_ms = (time.perf_counter() - batch_started) * 1000.0
+        if requests:
+            with self._load_lock:
+                self._route_latencies_ms.append(elapsed_ms / len(requests))
+
+        logger.info(
+            f"{self.agent_id} batch routed {len(requests)} requests in "
+            f"{len(groups)} searches ({elapsed_ms:.1f} ms)"
+        )
+        return results
+
+    def _mode_weights(self, preferences: Optional[Dict[str, Any]]) -> Tuple[float, float]:
+        """
+        Resolve the routing mode preferences into search weights.
+
+        Args:
+            preferences: Optional routing preferences
+
+        Returns:
+            Tuple of (risk_penalty, distance_weight)
+        """
         # Apply preferences using Virtual Meters approach
         # Risk penalties convert risk (0-1) into "Virtual Meters" to match distance units
         # This prevents the A* heuristic (pure distance) from dominating risk scores
@@ -195,50 +578,93 @@ class RoutingAgent(BaseAgent):
                 f"distance_weight={distance_weight}"
             )
 
-        # Calculate route using risk-aware A*
-        # Note: risk_penalty is passed as risk_weight to maintain API compatibility
-        path_nodes = risk_aware_astar(
-            self.environment.graph,
-            start_node,
-            end_node,
-            risk_weight=risk_penalty,  # Virtual meters per risk unit
-            distance_weight=distance_weight  # Always 1.0
-        )
+        return risk_penalty, distance_weight
 
-        if not path_nodes:
-            # Determine appropriate warning and status based on mode
-            if preferences and preferences.get("fastest"):
-                status = "impassable"
-                warning_msg = (
-                    "IMPASSABLE: No route found. All paths contain critically flooded "
-                    "or impassable roads (risk >= 90%). Consider waiting for conditions "
-                    "to improve or using evacuation assistance."
-                )
-            else:
-                status = "no_safe_route"
-                warning_msg = (
-                    "No safe route found. Try 'Fastest' mode to see if any path exists, "
-                    "or consider evacuation to a nearby shelter."
-                )
+    def _vehicle_test(
+        self,
+        preferences: Optional[Dict[str, Any]]
+    ) -> Optional[Callable[[Tuple], bool]]:
+        """
+        Resolve the vehicle_type preference into an edge passability test.
+
+        Args:
+            preferences: Optional routing preferences
+
+        Returns:
+            Bit test from the environment's VehiclePassabilityIndex, or None
+            if no vehicle type is given or no flood depths are known yet
+
+        Raises:
+            ValueError: If the vehicle type is unknown
+        """
+        vehicle_type = (preferences or {}).get("vehicle_type")
+        if vehicle_type is None:
+            return None
+        index = self.environment.get_passability_index()
+        return index.edge_test(vehicle_type) if index is not None else None
+
+    def _vehicle_depth_limit(self, preferences: Optional[Dict[str, Any]]) -> float:
+        """
+        Depth (meters) at which forecast-flooded roads block a time-dependent route.
+
+        Args:
+            preferences: Optional routing preferences
+
+        Returns:
+            The vehicle's depth limit, or passable_depth if no vehicle type is given
+
+        Raises:
+            ValueError: If the vehicle type is unknown
+        """
+        vehicle_type = (preferences or {}).get("vehicle_type")
+        if vehicle_type is None:
+            return self.passable_depth
+        limits = self.environment.get_passability_index().depth_limits
+        if vehicle_type not in limits:
+            raise ValueError(f"Invalid vehicle type: {vehicle_type}. Valid options: {list(limits)}")
+        return limits[vehicle_type]
+
+    def _build_route_result(
+        self,
+        path_nodes: Optional[List[Any]],
+        preferences: Optional[Dict[str, Any]] = None,
+        suboptimality_bound: Optional[float] = None,
+        departure_time: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the route result for a node path on the original graph.
+
+        When the HazardAgent has a flood forecast, the result also carries
+        "usable_until": the time step at which the first road on the route
+        becomes impassable for the vehicle (None if none does).
+
+        Args:
+            path_nodes: Node path (None/empty if no route was found)
+            preferences: Routing preferences
+            suboptimality_bound: Cost bound of a fast mode route, if any
+            departure_time: Departure time step of a time-dependent route
+
+        Returns:
+            Route dict as returned by calculate_route()
+        """
+        from ..algorithms.risk_aware_astar import calculate_path_metrics
 
-            return {
-                "status": status,
-                "path": [],
-                "distance": 0,
-                "estimated_time": 0,
-                "risk_level": 1.0,
-                "max_risk": 1.0,
-                "warnings": [warning_msg]
-            }
+        if not path_nodes:
+            return self._no_route_result(preferences)
 
         # Convert to coordinates
-        path_coords = get_path_coordinates(self.environment.graph, path_nodes)
+        path_coords = self._path_to_coordinates(path_nodes, preferences)
 
         # Calculate metrics
         metrics = calculate_path_metrics(self.environment.graph, path_nodes)
 
+        # Forecast road closures along the route (time step or None)
+        closes_at = self._route_closure(path_nodes, preferences)
+        if closes_at is not None and departure_time is None:
+            departure_time = self.hazard_agent.time_step
+
         # Generate warnings (pass preferences to customize warnings by mode)
-        warnings = self._generate_warnings(metrics, preferences)
+        warnings = self._generate_warnings(metrics, preferences, closes_at, departure_time)
 
         logger.info(
             f"{self.agent_id} route calculated: "
@@ -246,7 +672,7 @@ class RoutingAgent(BaseAgent):
             f"risk={metrics['average_risk']:.2f}"
         )
 
-        return {
+        result = {
             "status": "success",
             "path": path_coords,
             "distance": metrics["total_distance"],
@@ -256,6 +682,171 @@ class RoutingAgent(BaseAgent):
             "num_segments": metrics["num_segments"],
             "warnings": warnings
         }
+        if suboptimality_bound is not None:
+            result["suboptimality_bound"] = suboptimality_bound
+        if closes_at is not None:
+            result["usable_until"] = None if closes_at == NEVER_INUNDATED else closes_at
+        return result
+
+    def _route_closure(
+        self,
+        path_nodes: List[Any],
+        preferences: Optional[Dict[str, Any]] = None
+    ) -> Optional[int]:
+        """
+        First forecast time step at which a road on the route closes.
+
+        Looks up the HazardAgent's inundation index per segment; of
+        parallel roads between two nodes the one closing last counts.
+        The index is never built here: until the HazardAgent's background
+        build (started with the flood scenario) is done, None is returned.
+
+        Args:
+            path_nodes: Node path on the original graph
+            preferences: Routing preferences (return_period, vehicle_type)
+
+        Returns:
+            Time step, NEVER_INUNDATED if the route stays passable through
+            the forecast, or None if no forecast is available
+        """
+        if not self.hazard_agent:
+            return None
+
+        preferences = preferences or {}
+        return_period = preferences.get("return_period")
+        try:
+            index = self.hazard_agent.get_inundation_index(
+                return_period, preferences.get("vehicle_type", "car"), build=False
+            )
+        except ValueError as e:
+            logger.warning(f"{self.agent_id} no closure forecast: {e}")
+            return None
+        if index is None:
+            return None
+
+        columns = self.hazard_agent.get_edge_depth_series(return_period, build=False).index
+        graph = self.environment.graph
+        closes_at = NEVER_INUNDATED
+        for u, v in zip(path_nodes[:-1], path_nodes[1:]):
+            segment = [
+                int(index[columns[(u, v, key)]])
+                for key in graph[u][v] if (u, v, key) in columns
+            ]
+            if segment:
+                closes_at = min(closes_at, max(segment))
+        return closes_at
+
+    def report_load(
+        self,
+        queue_depth: Optional[int] = None,
+        tick_latency_ms: Optional[float] = None
+    ) -> None:
+        """
+        Report system load used to decide on fast (bounded) routing.
+
+        Called by the SimulationManager with the number of queued route
+        requests and the duration of the last tick.
+
+        Args:
+            queue_depth: Route requests waiting to be processed
+            tick_latency_ms: Duration of the last simulation tick
+        """
+        with self._load_lock:
+            if queue_depth is not None:
+                self._queue_depth = queue_depth
+            if tick_latency_ms is not None:
+                self._tick_latency_ms = tick_latency_ms
+
+    def is_under_load(self) -> bool:
+        """
+        Check whether routing should switch to bounded-suboptimal fast mode.
+
+        Returns:
+            True if queued/in-flight requests, tick latency or recent
+            route latency exceed the configured thresholds
+        """
+        with self._load_lock:
+            depth = self._queue_depth + max(self._in_flight - 1, 0)
+            recent = (
+                sum(self._route_latencies_ms) / len(self._route_latencies_ms)
+                if self._route_latencies_ms else 0.0
+            )
+            return (
+                depth >= self.fast_mode_queue_threshold
+                or self._tick_latency_ms >= self.fast_mode_latency_ms
+                or recent >= self.fast_mode_latency_ms
+            )
+
+    def _no_route_result(
+        self,
+        preferences: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the route result returned when no route exists.
+
+        Args:
+            preferences: Routing preferences (selects status and warning)
+
+        Returns:
+            Route dict with "impassable" (fastest mode) or "no_safe_route" status
+        """
+        # Determine appropriate warning and status based on mode
+        if preferences and preferences.get("fastest"):
+            status = "impassable"
+            warning_msg = (
+                "IMPASSABLE: No route found. All paths contain critically flooded "
+                "or impassable roads (risk >= 90%). Consider waiting for conditions "
+                "to improve or using evacuation assistance."
+            )
+        else:
+            status = "no_safe_route"
+            warning_msg = (
+                "No safe route found. Try 'Fastest' mode to see if any path exists, "
+                "or consider evacuation to a nearby shelter."
+            )
+
+        return {
+            "status": status,
+            "path": [],
+            "distance": 0,
+            "estimated_time": 0,
+            "risk_level": 1.0,
+            "max_risk": 1.0,
+            "warnings": [warning_msg]
+        }
+
+    def _path_to_coordinates(
+        self,
+        path_nodes: List[Any],
+        preferences: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[float, float]]:
+        """
+        Convert a node path to (lat, lon) coordinates.
+
+        With the ``full_geometry`` preference the path follows the road
+        geometry from the environment's packed geometry store; otherwise
+        one coordinate per node is returned.
+
+        Args:
+            path_nodes: List of node IDs
+            preferences: Optional routing preferences
+
+        Returns:
+            List of (latitude, longitude) tuples
+        """
+        from ..algorithms.risk_aware_astar import get_path_coordinates
+
+        if preferences and preferences.get("full_geometry"):
+            store = self.environment.get_geometry_store()
+            if store is not None:
+                try:
+                    return store.path_coordinates(
+                        path_nodes, passable=self._vehicle_test(preferences)
+                    )
+                except KeyError as e:
+                    logger.warning(f"Falling back to node coordinates: {e}")
+
+        return get_path_coordinates(self.environment.graph, path_nodes)
 
     def find_nearest_evacuation_center(
         self,
@@ -452,10 +1043,50 @@ class RoutingAgent(BaseAgent):
 
             return nearest_node
 
+    def _find_nearest_nodes(
+        self,
+        coords: List[Tuple[float, float]],
+        max_distance: float = 500.0
+    ) -> List[Optional[Any]]:
+        """
+        Find the nearest graph node for many coordinates in one query.
+
+        Args:
+            coords: Target coordinates (latitude, longitude)
+            max_distance: Maximum search distance in meters
+
+        Returns:
+            Nearest node ID (or None if too far) per coordinate
+        """
+        if not coords or not self.environment or not self.environment.graph:
+            return [None] * len(coords)
+
+        try:
+            import osmnx as ox
+            from ..algorithms.risk_aware_astar import haversine_distance
+
+            nodes = ox.distance.nearest_nodes(
+                self.environment.graph,
+                X=[lon for _, lon in coords],
+                Y=[lat for lat, _ in coords]
+            )
+        except Exception as e:
+            logger.warning(f"Batched nearest_nodes failed ({e}), looking up one by one")
+            return [self._find_nearest_node(c, max_distance) for c in coords]
+
+        graph_nodes = self.environment.graph.nodes
+        result = []
+        for (lat, lon), node in zip(coords, nodes):
+            distance = haversine_distance((lat, lon), (graph_nodes[node]['y'], graph_nodes[node]['x']))
+            result.append(node if distance <= max_distance else None)
+        return result
+
     def _generate_warnings(
         self,
         metrics: Dict[str, float],
-        preferences: Optional[Dict[str, Any]] = None
+        preferences: Optional[Dict[str, Any]] = None,
+        closes_at: Optional[int] = None,
+        current_time: Optional[float] = None
     ) -> List[str]:
         """
         Generate warning messages based on route metrics.
@@ -463,6 +1094,8 @@ class RoutingAgent(BaseAgent):
         Args:
             metrics: Path metrics dictionary
             preferences: Optional routing preferences (to customize warnings by mode)
+            closes_at: Forecast time step at which the route closes (see _route_closure)
+            current_time: Time step the route is travelled from
 
         Returns:
             List of warning messages
@@ -504,6 +1137,20 @@ class RoutingAgent(BaseAgent):
                 "This is a long route. Consider fuel and time requirements."
             )
 
+        # Forecast closures: how long the route stays usable
+        if closes_at is not None and closes_at != NEVER_INUNDATED:
+            vehicle = (preferences or {}).get("vehicle_type", "car")
+            if current_time is not None and closes_at <= current_time:
+                warnings.append(
+                    f"WARNING: Roads on this route are forecast to be too deep for a {vehicle} "
+                    f"since time step {closes_at}."
+                )
+            else:
+                warnings.append(
+                    f"Route usable until time step {closes_at}: a road on it is forecast "
+                    f"to become too deep for a {vehicle} then."
+                )
+
         return warnings
 
     def _load_evacuation_centers(self) -> pd.DataFrame:
@@ -581,5 +1228,7 @@ class RoutingAgent(BaseAgent):
             "risk_penalty": self.risk_penalty,  # Virtual meters per risk unit
             "distance_weight": self.distance_weight,
             "evacuation_centers": len(self.evacuation_centers),
-            "graph_loaded": bool(self.environment and self.environment.graph)
+            "graph_loaded": bool(self.environment and self.environment.graph),
+            "fast_mode_active": self.is_under_load(),
+            "fast_mode_routes": self.fast_mode_routes
         }
@@ -0,0 +1,450 @@
+# filename: app/algorithms/graph_contraction.py
+
+"""
+Degree-2 Chain Contraction for MAS-FRO Routing
+
+OSM-derived road graphs are dominated by "shape" nodes: intermediate points
+with exactly one way in and one way out that only exist to bend the road.
+This module collapses every chain of such nodes into a single super-edge so
+search algorithms expand far fewer nodes, while keeping enough bookkeeping
+to expand paths back to the original graph.
+
+Each super-edge stores:
+- length: summed length of the underlying edges
+- risk_score: maximum risk along the chain (drives impassability)
+- risk_weighted_length: sum(length * risk_score) along the chain
+- edges: list of underlying (u, v, key) edges in travel order
+
+Risk-aware A* cost over a chain is then exactly
+    distance_weight * length + risk_weight * risk_weighted_length
+which equals the sum of the per-edge costs, so search results are unchanged.
+
+Only chains whose hops are single edges are contracted. Parallel edges keep
+their original "lowest risk edge" semantics and are left as plain edges.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+from contextlib import contextmanager
+from threading import Condition, Lock
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import logging
+
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+EdgeKey = Tuple[Any, Any, Any]
+
+
+def _is_contractible(graph: nx.MultiDiGraph, node: Any) -> bool:
+    """
+    Check whether a node is an interior shape node of a road chain.
+
+    A node qualifies when it is a pass-through for exactly one one-way road
+    (one edge in from a, one edge out to b) or exactly one two-way road
+    (single edges a<->node<->b), with a != b and no self-loops.
+    """
+    preds = graph.pred[node]
+    succs = graph.succ[node]
+    if node in succs:
+        return False
+
+    # Every hop must be a single edge
+    if any(len(keys) != 1 for keys in preds.values()):
+        return False
+    if any(len(keys) != 1 for keys in succs.values()):
+        return False
+
+    in_nodes = set(preds)
+    out_nodes = set(succs)
+
+    # One-way pass-through: a -> node -> b
+    if len(in_nodes) == 1 and len(out_nodes) == 1:
+        return in_nodes != out_nodes
+
+    # Two-way pass-through: a <-> node <-> b
+    if len(in_nodes) == 2 and in_nodes == out_nodes:
+        return True
+
+    return False
+
+
+def best_parallel_edge(
+    parallel: Dict[Any, Dict[str, Any]],
+    risk_weight: float,
+    distance_weight: float,
+    max_risk_threshold: float,
+    passable: Optional[Callable[[EdgeKey], bool]] = None
+) -> Tuple[float, Dict[str, Any]]:
+    """
+    Pick the contracted edge a risk-aware search uses between two nodes.
+
+    Plain (single underlying edge) entries follow the original A* rule:
+    take the lowest-risk edge, shortest on ties. Chain entries are costed
+    from their aggregates. The cheaper of the two choices wins.
+
+    Args:
+        parallel: Dict of key -> edge data for all edges between two nodes
+        risk_weight: Virtual meters per risk unit
+        distance_weight: Weight for distance
+        max_risk_threshold: Risk at which an edge is impassable
+        passable: Optional vehicle test on underlying edges; entries with a
+            failing edge are skipped
+
+    Returns:
+        Tuple of (cost, chosen edge data); cost is inf if impassable
+    """
+    best_cost = float("inf")
+    best_data = None
+
+    plain_data = None
+    plain_length = 1.0
+    plain_risk = 1.0
+    for data in parallel.values():
+        if passable is not None and not all(passable(edge) for edge in data["edges"]):
+            continue
+        if data.get("chain"):
+            if data["risk_score"] >= max_risk_threshold:
+                cost = float("inf")
+            else:
+                cost = (
+                    data["length"] * distance_weight
+                    + data["risk_weighted_length"] * risk_weight
+                )
+            if best_data is None or cost < best_cost:
+                best_cost, best_data = cost, data
+        else:
+            length = data.get("length", 1.0)
+            risk = data.get("risk_score", 0.0)
+            if plain_data is None or risk < plain_risk or (risk == plain_risk and length < plain_length):
+                plain_data, plain_length, plain_risk = data, length, risk
+
+    if plain_data is not None:
+        if plain_risk >= max_risk_threshold:
+            plain_cost = float("inf")
+        else:
+            plain_cost = plain_length * distance_weight + plain_length * plain_risk * risk_weight
+        if best_data is None or plain_cost <= best_cost:
+            best_cost, best_data = plain_cost, plain_data
+
+    return best_cost, best_data
+
+
+class _ReadWriteLock:
+    """
+    Many concurrent readers or one writer; waiting writers block new readers.
+
+    Not reentrant: a thread holding the read side must not ask for the write
+    side.
+    """
+
+    def __init__(self):
+        self._cond = Condition(Lock())
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+class ContractedGraph:
+    """
+    Routing graph with degree-2 chains collapsed into super-edges.
+
+    The original graph stays the source of truth for risk scores; the
+    contracted graph mirrors it through update_edge_risk() (single edge,
+    recomputes only the affected super-edge) and sync() (full refresh).
+
+    ensure_node() changes the graph structure, so searches over the shared
+    contracted graph (and path expansion) run inside searching(); splits
+    wait for in-flight searches and block new ones until they finish.
+
+    Attributes:
+        original: The original road network graph
+        graph: Contracted MultiDiGraph (junction nodes only)
+        contracted_nodes: Set of original nodes hidden inside super-edges
+
+    Example:
+        >>> contracted = ContractedGraph(env.graph)
+        >>> contracted.ensure_node(start_node)
+        >>> contracted.ensure_node(end_node)
+        >>> with contracted.searching():
+        ...     path = risk_aware_astar(contracted.graph, start_node, end_node)
+        ...     full_path = contracted.expand_path(path)
+    """
+
+    def __init__(self, original: nx.MultiDiGraph):
+        """
+        Build the contracted graph.
+
+        Args:
+            original: NetworkX MultiDiGraph with 'length'/'risk_score' edges
+        """
+        self.original = original
+        self._lock = Lock()
+        self._structure_lock = _ReadWriteLock()
+
+        # underlying (u, v, key) -> super-edge (a, b, key) in self.graph
+        self._edge_to_super: Dict[EdgeKey, EdgeKey] = {}
+
+        self.contracted_nodes: Set[Any] = {
+            node for node in original.nodes if _is_contractible(original, node)
+        }
+        self.graph = self._build()
+
+        logger.info(
+            f"ContractedGraph built: {original.number_of_nodes()} -> "
+            f"{self.graph.number_of_nodes()} nodes, {original.number_of_edges()} -> "
+            f"{self.graph.number_of_edges()} edges"
+        )
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def _walk_chain(self, u: Any, key: Any, v: Any) -> Tuple[List[EdgeKey], Any]:
+        """Follow a chain starting with edge (u, v, key) until a junction."""
+        edges = [(u, v, key)]
+        prev, node = u, v
+        while node in self.contracted_nodes:
+            succs = [s for s in self.original.succ[node] if s != prev]
+            if not succs:
+                break
+            nxt = succs[0]
+            nxt_key = next(iter(self.original.succ[node][nxt]))
+            edges.append((node, nxt, nxt_key))
+            prev, node = node, nxt
+        return edges, node
+
+    def _build(self) -> nx.MultiDiGraph:
+        """Create the contracted graph from the original."""
+        contracted = nx.MultiDiGraph()
+        contracted.graph.update(self.original.graph)
+        contracted.graph["contracted"] = True
+
+        for node, data in self.original.nodes(data=True):
+            if node not in self.contracted_nodes:
+                contracted.add_node(node, **{k: data[k] for k in ("x", "y") if k in data})
+
+        for u, v, key in self.original.edges(keys=True):
+            if u in self.contracted_nodes:
+                continue
+            edges, end = self._walk_chain(u, key, v)
+            self._add_super_edge(contracted, u, end, edges)
+
+        # Nodes in isolated loops made only of shape nodes are never reached
+        # from a junction; keep them as ordinary nodes and rebuild.
+        covered = {e[0] for edges in self._chains(contracted) for e in edges[1:]}
+        orphans = self.contracted_nodes - covered
+        if orphans:
+            self.contracted_nodes -= orphans
+            self._edge_to_super.clear()
+            return self._build()
+
+        return contracted
+
+    @staticmethod
+    def _chains(contracted: nx.MultiDiGraph):
+        """Yield the underlying edge lists of all super-edges."""
+        for _, _, data in contracted.edges(data=True):
+            yield data["edges"]
+
+    def _add_super_edge(
+        self,
+        contracted: nx.MultiDiGraph,
+        a: Any,
+        b: Any,
+        edges: List[EdgeKey]
+    ) -> EdgeKey:
+        """Add a super-edge for the given underlying edges and index it."""
+        key = contracted.add_edge(a, b, edges=edges, chain=len(edges) > 1)
+        self._refresh(contracted[a][b][key])
+        for edge in edges:
+            self._edge_to_super[edge] = (a, b, key)
+        return (a, b, key)
+
+    def _refresh(self, data: Dict[str, Any]) -> None:
+        """Recompute a super-edge's aggregates from the original graph."""
+        length = 0.0
+        max_risk = 0.0
+        risk_weighted = 0.0
+        for u, v, key in data["edges"]:
+            edge = self.original[u][v][key]
+            edge_length = edge.get("length", 1.0)
+            edge_risk = edge.get("risk_score", 0.0)
+            length += edge_length
+            risk_weighted += edge_length * edge_risk
+            if edge_risk > max_risk:
+                max_risk = edge_risk
+        data["length"] = length
+        data["risk_score"] = max_risk
+        data["risk_weighted_length"] = risk_weighted
+        data["weight"] = length + risk_weighted
+
+    # ------------------------------------------------------------------
+    # Risk synchronisation
+    # ------------------------------------------------------------------
+
+    def update_edge_risk(self, u: Any, v: Any, key: Any) -> None:
+        """
+        Propagate a risk change on an original edge to its super-edge.
+
+        Args:
+            u: Source node ID (original graph)
+            v: Target node ID (original graph)
+            key: Edge key (original graph)
+        """
+        with self._lock:
+            super_edge = self._edge_to_super.get((u, v, key))
+            if super_edge is None:
+                return
+            a, b, k = super_edge
+            self._refresh(self.graph[a][b][k])
+
+    def sync(self) -> None:
+        """Recompute every super-edge from the original graph."""
+        with self._lock:
+            for _, _, data in self.graph.edges(data=True):
+                self._refresh(data)
+
+    # ------------------------------------------------------------------
+    # Routing helpers
+    # ------------------------------------------------------------------
+
+    def searching(self):
+        """
+        Hold the contracted graph's structure stable for a search.
+
+        Returns:
+            Context manager; any number of searches may hold it at once,
+            while ensure_node() waits for all of them
+        """
+        return self._structure_lock.read()
+
+    def ensure_node(self, node: Any) -> None:
+        """
+        Make an original node addressable in the contracted graph.
+
+        Route endpoints that fall inside a chain split every super-edge
+        passing through them. The split is permanent; each split adds at
+        most one node and two edges per direction. Splitting waits until
+        no search holds searching(), so call it before entering a search.
+
+        Args:
+            node: Original node ID
+
+        Raises:
+            KeyError: If the node is not in the original graph
+        """
+        if node not in self.original:
+            raise KeyError(f"Node {node} not in graph")
+
+        if node not in self.contracted_nodes:
+            return
+
+        with self._structure_lock.write(), self._lock:
+            if node not in self.contracted_nodes:
+                return
+
+            data = self.original.nodes[node]
+            self.graph.add_node(node, **{k: data[k] for k in ("x", "y") if k in data})
+
+            through = {
+                self._edge_to_super[(node, succ, key)]
+                for succ, keys in self.original.succ[node].items()
+                for key in keys
+            }
+            for a, b, k in through:
+                edges = self.graph[a][b][k]["edges"]
+                split = next(i for i, edge in enumerate(edges) if edge[0] == node)
+                self.graph.remove_edge(a, b, k)
+                self._add_super_edge(self.graph, a, node, edges[:split])
+                self._add_super_edge(self.graph, node, b, edges[split:])
+
+            self.contracted_nodes.discard(node)
+
+    def expand_path(
+        self,
+        path: Optional[List[Any]],
+        risk_weight: float = 0.5,
+        distance_weight: float = 0.5,
+        max_risk_threshold: float = 0.9,
+        passable: Optional[Callable[[EdgeKey], bool]] = None
+    ) -> Optional[List[Any]]:
+        """
+        Expand a contracted path back to original node IDs.
+
+        Where several contracted edges connect the same nodes the one with
+        the lowest cost under the given weights is used, matching the
+        choice made during search.
+
+        Args:
+            path: Node path in the contracted graph (or None)
+            risk_weight: Risk weight used for the search
+            distance_weight: Distance weight used for the search
+            max_risk_threshold: Impassability threshold used for the search
+            passable: Vehicle passability test used for the search
+
+        Returns:
+            Node path in the original graph, or None if path is None
+        """
+        if path is None:
+            return None
+        if len(path) < 2:
+            return list(path)
+
+        expanded = [path[0]]
+        for a, b in zip(path[:-1], path[1:]):
+            _, best = best_parallel_edge(
+                self.graph[a][b], risk_weight, distance_weight, max_risk_threshold, passable
+            )
+            expanded.extend(edge[1] for edge in best["edges"])
+        return expanded
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get size reduction statistics.
+
+        Returns:
+            Dict with original/contracted node and edge counts
+        """
+        original_nodes = self.original.number_of_nodes()
+        return {
+            "original_nodes": original_nodes,
+            "original_edges": self.original.number_of_edges(),
+            "contracted_nodes": self.graph.number_of_nodes(),
+            "contracted_edges": self.graph.number_of_edges(),
+            "hidden_nodes": len(self.contracted_nodes),
+            "node_reduction": (
+                1.0 - self.graph.number_of_nodes() / original_nodes if original_nodes else 0.0
+            ),
+        }
@@ -25,6 +25,9 @@ Date: November 2025
 
 import networkx as nx
 import math
+import time
+from heapq import heappush, heappop
+from itertools import count
 from typing import Tuple, List, Optional, Callable, Any, Dict
 import logging
 
@@ -112,13 +115,103 @@ def create_heuristic(graph: nx.MultiDiGraph, target_node: Any) -> Callable:
     return heuristic
 
 
+def create_weight_function(
+    graph: nx.MultiDiGraph,
+    risk_weight: float,
+    distance_weight: float,
+    max_risk_threshold: float,
+    passable: Optional[Callable[[Tuple], bool]] = None
+) -> Tuple[Callable, List[int]]:
+    """
+    Create the risk-aware edge weight function used by A* searches.
+
+    Args:
+        graph: NetworkX MultiDiGraph (original or contracted)
+        risk_weight: Weight for risk component
+        distance_weight: Weight for distance component
+        max_risk_threshold: Risk at which an edge is impassable
+        passable: Optional vehicle test on original (u, v, key) edges
+            (see VehiclePassabilityIndex.edge_test); failing edges are skipped
+
+    Returns:
+        Tuple of (weight function, single-item list counting blocked edges)
+    """
+    blocked_edges_count = [0]  # Use list to allow modification in nested function
+
+    # Contracted graphs (see graph_contraction) carry chain super-edges
+    is_contracted = graph.graph.get('contracted', False)
+    if is_contracted:
+        from .graph_contraction import best_parallel_edge
+
+    # Define weight function that combines distance and risk
+    def weight_function(u, v, edge_data):
+        """
+        Calculate edge weight considering both distance and risk.
+
+        For MultiDiGraph, we need to find the best (lowest risk) edge among parallel edges.
+
+        Args:
+            u: Source node
+            v: Target node
+            edge_data: Dict of edge attributes (may not have risk_score for MultiDiGraph!)
+
+        Returns:
+            Combined weight (distance + risk cost) or inf if impassable
+        """
+        if is_contracted:
+            total_cost, _ = best_parallel_edge(
+                graph[u][v], risk_weight, distance_weight, max_risk_threshold, passable
+            )
+            if total_cost == float('inf'):
+                blocked_edges_count[0] += 1
+            return total_cost
+
+        # For MultiDiGraph, access edge data directly from graph
+        # Find the edge with lowest risk among all parallel edges between u and v
+        best_length = 1.0
+        best_risk = 1.0
+
+        if v in graph[u]:
+            # Get all parallel edges between u and v
+            for key, data in graph[u][v].items():
+                if passable is not None and not passable((u, v, key)):
+                    continue
+                edge_length = data.get('length', 1.0)
+                edge_risk = data.get('risk_score', 0.0)
+
+                # Choose edge with lowest risk (or shortest if risks are equal)
+                if edge_risk < best_risk or (edge_risk == best_risk and edge_length < best_length):
+                    best_length = edge_length
+                    best_risk = edge_risk
+
+        length = best_length
+        risk_score = best_risk
+
+        # Check if road is impassable
+        if risk_score >= max_risk_threshold:
+            blocked_edges_count[0] += 1
+            if blocked_edges_count[0] <= 10:  # Log first 10 blocked edges
+                print(f"  [A*] BLOCKING edge ({u}, {v}): risk={risk_score:.3f} >= {max_risk_threshold}")
+            return float('inf')
+
+        # Calculate combined cost: distance + risk penalty
+        distance_cost = length * distance_weight
+        risk_cost = length * risk_score * risk_weight
+        total_cost = distance_cost + risk_cost
+
+        return total_cost
+
+    return weight_function, blocked_edges_count
+
+
 def risk_aware_astar(
     graph: nx.MultiDiGraph,
     start: Any,
     end: Any,
     risk_weight: float = 0.5,
     distance_weight: float = 0.5,
-    max_risk_threshold: float = 0.9  # Only block critical/extreme risk roads (90%+)
+    max_risk_threshold: float = 0.9,  # Only block critical/extreme risk roads (90%+)
+    passable: Optional[Callable[[Tuple], bool]] = None
 ) -> Optional[List[Any]]:
     """
     Find the safest path using risk-aware A* algorithm.
@@ -130,7 +223,10 @@ def risk_aware_astar(
     The total cost of an edge is calculated as:
         cost = (distance * distance_weight) + (risk_score * distance * risk_weight)
 
-    Roads exceeding max_risk_threshold are considered impassable (infinite cost).
+    Roads exceeding max_risk_threshold are considered impassable (infinite
+    cost) and are never traversed, so a destination reachable only over
+    impassable roads has no path. bounded_risk_aware_astar() and
+    reverse_risk_search() follow the same rule.
 
     Args:
         graph: NetworkX MultiDiGraph with road network
@@ -142,6 +238,8 @@ def risk_aware_astar(
         distance_weight: Weight for distance component (default: 0.5)
         max_risk_threshold: Maximum acceptable risk (default: 0.9)
             Edges with risk >= 90% are considered impassable (critical flood danger)
+        passable: Optional vehicle passability test on original (u, v, key)
+            edges (see VehiclePassabilityIndex.edge_test)
 
     Returns:
         List of node IDs representing the path, or None if no path exists
@@ -176,55 +274,15 @@ def risk_aware_astar(
     heuristic = create_heuristic(graph, end)
 
     # Track weight function calls for debugging
-    blocked_edges_count = [0]  # Use list to allow modification in nested function
-
-    # Define weight function that combines distance and risk
-    def weight_function(u, v, edge_data):
-        """
-        Calculate edge weight considering both distance and risk.
-
-        For MultiDiGraph, we need to find the best (lowest risk) edge among parallel edges.
-
-        Args:
-            u: Source node
-            v: Target node
-            edge_data: Dict of edge attributes (may not have risk_score for MultiDiGraph!)
-
-        Returns:
-            Combined weight (distance + risk cost) or inf if impassable
-        """
-        # For MultiDiGraph, access edge data directly from graph
-        # Find the edge with lowest risk among all parallel edges between u and v
-        best_length = 1.0
-        best_risk = 1.0
-
-        if v in graph[u]:
-            # Get all parallel edges between u and v
-            for key, data in graph[u][v].items():
-                edge_length = data.get('length', 1.0)
-                edge_risk = data.get('risk_score', 0.0)
-
-                # Choose edge with lowest risk (or shortest if risks are equal)
-                if edge_risk < best_risk or (edge_risk == best_risk and edge_length < best_length):
-                    best_length = edge_length
-                    best_risk = edge_risk
-
-        length = best_length
-        risk_score = best_risk
-
-        # Check if road is impassable
-        if risk_score >= max_risk_threshold:
-            blocked_edges_count[0] += 1
-            if blocked_edges_count[0] <= 10:  # Log first 10 blocked edges
-                print(f"  [A*] BLOCKING edge ({u}, {v}): risk={risk_score:.3f} >= {max_risk_threshold}")
-            return float('inf')
+    weight_function, blocked_edges_count = create_weight_function(
+        graph, risk_weight, distance_weight, max_risk_threshold, passable
+    )
 
-        # Calculate combined cost: distance + risk penalty
-        distance_cost = length * distance_weight
-        risk_cost = length * risk_score * risk_weight
-        total_cost = distance_cost + risk_cost
-
-        return total_cost
+    def astar_weight(u, v, edge_data):
+        # NetworkX hides edges whose weight is None; an inf weight would
+        # still be relaxed and yield an inf-cost path over blocked roads
+        cost = weight_function(u, v, edge_data)
+        return None if cost == float('inf') else cost
 
     try:
         # Run A* with custom weight and heuristic
@@ -233,7 +291,7 @@ def risk_aware_astar(
             start,
             end,
             heuristic=heuristic,
-            weight=weight_function
+            weight=astar_weight
         )
 
         logger.info(
@@ -253,6 +311,287 @@ def risk_aware_astar(
         raise
 
 
+def _weighted_astar_search(
+    graph: nx.MultiDiGraph,
+    start: Any,
+    end: Any,
+    weight_function: Callable,
+    heuristic: Callable,
+    epsilon: float,
+    deadline: Optional[float],
+    max_expansions: Optional[int],
+    cost_bound: float = float('inf')
+) -> Tuple[Optional[List[Any]], float, int, bool]:
+    """
+    Heap-based weighted A* core (f = g + epsilon * h).
+
+    Impassable (infinite cost) edges are never relaxed, as in
+    risk_aware_astar(), so fast and exact modes agree on reachability.
+    Nodes whose admissible estimate g + h cannot beat cost_bound are
+    pruned, which lets anytime refinements reuse the incumbent solution;
+    heuristic must therefore never overestimate.
+
+    Returns:
+        Tuple of (path or None, path cost, expansions, budget_exhausted)
+    """
+    tie = count()
+    g_score = {start: 0.0}
+    parent = {start: None}
+    closed = set()
+    open_heap = [(epsilon * heuristic(start, end), next(tie), start)]
+    expansions = 0
+
+    while open_heap:
+        _, _, node = heappop(open_heap)
+        if node in closed:
+            continue
+
+        if node == end:
+            path = [node]
+            while parent[path[-1]] is not None:
+                path.append(parent[path[-1]])
+            path.reverse()
+            return path, g_score[node], expansions, False
+
+        closed.add(node)
+        expansions += 1
+        if max_expansions is not None and expansions >= max_expansions:
+            return None, float('inf'), expansions, True
+        if deadline is not None and (expansions & 63) == 0 and time.perf_counter() >= deadline:
+            return None, float('inf'), expansions, True
+
+        g_node = g_score[node]
+        for neighbor in graph.succ[node]:
+            if neighbor in closed:
+                continue
+            cost = weight_function(node, neighbor, None)
+            if cost == float('inf'):
+                continue
+            tentative = g_node + cost
+            if tentative >= g_score.get(neighbor, float('inf')):
+                continue
+            h = heuristic(neighbor, end)
+            if tentative + h >= cost_bound:
+                continue
+            g_score[neighbor] = tentative
+            parent[neighbor] = node
+            heappush(open_heap, (tentative + epsilon * h, next(tie), neighbor))
+
+    return None, float('inf'), expansions, False
+
+
+def bounded_risk_aware_astar(
+    graph: nx.MultiDiGraph,
+    start: Any,
+    end: Any,
+    risk_weight: float = 0.5,
+    distance_weight: float = 0.5,
+    max_risk_threshold: float = 0.9,
+    epsilon: float = 1.1,
+    time_budget_ms: Optional[float] = None,
+    max_expansions: Optional[int] = None,
+    anytime: bool = False,
+    passable: Optional[Callable[[Tuple], bool]] = None
+) -> Dict[str, Any]:
+    """
+    Bounded-suboptimal risk-aware A* with an optional search budget.
+
+    Runs weighted A* (f = g + epsilon * h). Every edge costs at least
+    distance_weight * length, so h is the Haversine distance scaled by
+    distance_weight; with this admissible heuristic the returned path
+    costs at most epsilon times the optimum.
+    In anytime mode a fast search with a larger epsilon runs first and
+    is refined with decreasing epsilon (down to 1.0) while budget remains,
+    pruning with the incumbent cost; the reported bound is that of the last
+    completed search.
+
+    Costs use the same edge rule as risk_aware_astar().
+
+    Args:
+        graph: NetworkX MultiDiGraph with road network (original or contracted)
+        start: Start node ID
+        end: End node ID
+        risk_weight: Weight for risk component
+        distance_weight: Weight for distance component
+        max_risk_threshold: Risk at which an edge is impassable
+        epsilon: Suboptimality factor (>= 1.0) for the final search
+        time_budget_ms: Optional wall-clock budget for the whole query
+        max_expansions: Optional node expansion budget per search
+        anytime: Start from 2 * epsilon and refine toward 1.0
+        passable: Optional vehicle passability test (see risk_aware_astar())
+
+    Returns:
+        Dict containing:
+            {
+                "path": List of node IDs or None,
+                "cost": Path cost (inf if no path),
+                "bound": Guaranteed suboptimality factor of "path",
+                "expansions": Total nodes expanded,
+                "complete": False if the budget ran out before any path was found
+            }
+
+    Example:
+        >>> result = bounded_risk_aware_astar(graph, a, b, epsilon=1.1, time_budget_ms=5)
+        >>> if result["path"]:
+        ...     print(f"Route within {result['bound']:.2f}x of optimal")
+    """
+    if start not in graph:
+        raise ValueError(f"Start node {start} not in graph")
+    if end not in graph:
+        raise ValueError(f"End node {end} not in graph")
+    if epsilon < 1.0:
+        raise ValueError(f"epsilon must be >= 1.0, got {epsilon}")
+    if distance_weight < 0.0:
+        raise ValueError(f"distance_weight must be >= 0.0, got {distance_weight}")
+
+    distance_heuristic = create_heuristic(graph, end)
+
+    def heuristic(node, target):
+        """Haversine distance in the cost units of distance_weight."""
+        return distance_weight * distance_heuristic(node, target)
+
+    weight_function, _ = create_weight_function(
+        graph, risk_weight, distance_weight, max_risk_threshold, passable
+    )
+    deadline = (
+        time.perf_counter() + time_budget_ms / 1000.0 if time_budget_ms is not None else None
+    )
+
+    if anytime:
+        schedule = [2.0 * epsilon, epsilon]
+        if epsilon > 1.0:
+            schedule.append(1.0)
+    else:
+        schedule = [epsilon]
+
+    best_path = None
+    best_cost = float('inf')
+    bound = float('inf')
+    total_expansions = 0
+    exhausted = False
+
+    for current_epsilon in schedule:
+        path, cost, expansions, exhausted = _weighted_astar_search(
+            graph, start, end, weight_function, heuristic,
+            current_epsilon, deadline, max_expansions, cost_bound=best_cost
+        )
+        total_expansions += expansions
+        if exhausted:
+            break
+        if path is not None:
+            best_path, best_cost = path, cost
+        # A completed search either found a path within current_epsilon or
+        # proved none cheaper than the incumbent exists
+        bound = current_epsilon
+
+    logger.info(
+        f"Bounded A* {start} -> {end}: "
+        f"{'found' if best_path else 'no path'}, bound={bound}, "
+        f"expansions={total_expansions}, budget_exhausted={exhausted}"
+    )
+
+    return {
+        "path": best_path,
+        "cost": best_cost,
+        "bound": bound if best_path else None,
+        "expansions": total_expansions,
+        "complete": not (exhausted and best_path is None)
+    }
+
+
+def reverse_risk_search(
+    graph: nx.MultiDiGraph,
+    end: Any,
+    starts: List[Any],
+    risk_weight: float = 0.5,
+    distance_weight: float = 0.5,
+    max_risk_threshold: float = 0.9,
+    passable: Optional[Callable[[Tuple], bool]] = None
+) -> Dict[Any, Optional[List[Any]]]:
+    """
+    Risk-aware shortest paths from many starts to one destination.
+
+    Runs a single Dijkstra search backwards from the destination over
+    incoming edges, stopping once every start node is settled, so requests
+    that share a destination (e.g. an evacuation center) cost one search
+    instead of one A* each. Costs and the impassable-edge rule (never
+    traversed) are those of risk_aware_astar(), so a start gets the same
+    answer whether it is routed alone or as part of a group.
+
+    Args:
+        graph: NetworkX MultiDiGraph with road network (original or contracted)
+        end: Destination node ID
+        starts: Start node IDs
+        risk_weight: Weight for risk component
+        distance_weight: Weight for distance component
+        max_risk_threshold: Risk at which an edge is impassable
+        passable: Optional vehicle passability test (see risk_aware_astar())
+
+    Returns:
+        Dict mapping each start node to its path (start ... end), or None
+        if the destination cannot be reached from it
+
+    Raises:
+        ValueError: If the destination is not in the graph
+
+    Example:
+        >>> paths = reverse_risk_search(graph, shelter_node, [a, b, c], risk_weight=2000.0,
+        ...                             distance_weight=1.0)
+        >>> paths[a]
+    """
+    if end not in graph:
+        raise ValueError(f"End node {end} not in graph")
+
+    weight_function, blocked_edges_count = create_weight_function(
+        graph, risk_weight, distance_weight, max_risk_threshold, passable
+    )
+    inf = float('inf')
+    pred = graph.pred
+
+    pending = {node for node in starts if node in graph}
+    distances = {end: 0.0}
+    next_hop: Dict[Any, Any] = {}
+    settled = set()
+    push_order = count()
+    heap = [(0.0, next(push_order), end)]
+
+    while heap and pending:
+        cost, _, node = heappop(heap)
+        if node in settled:
+            continue
+        settled.add(node)
+        pending.discard(node)
+
+        for neighbor, edges in pred[node].items():
+            if neighbor in settled:
+                continue
+            edge_cost = weight_function(neighbor, node, edges)
+            if edge_cost == inf:
+                continue
+            new_cost = cost + edge_cost
+            if new_cost < distances.get(neighbor, inf):
+                distances[neighbor] = new_cost
+                next_hop[neighbor] = node
+                heappush(heap, (new_cost, next(push_order), neighbor))
+
+    paths: Dict[Any, Optional[List[Any]]] = {}
+    for start in starts:
+        if start not in settled:
+            paths[start] = None
+            continue
+        path = [start]
+        while path[-1] != end:
+            path.append(next_hop[path[-1]])
+        paths[start] = path
+
+    logger.info(
+        f"Reverse search to {end}: {sum(p is not None for p in paths.values())}/{len(paths)} "
+        f"starts reached, {len(settled)} nodes settled, "
+        f"blocked {blocked_edges_count[0]} edges"
+    )
+    return paths
+
+
 def calculate_path_metrics(
     graph: nx.MultiDiGraph,
     path: List[Any]
@@ -0,0 +1,306 @@
+# filename: app/algorithms/time_dependent_astar.py
+
+"""
+Time-Dependent Flood-Aware A* for MAS-FRO
+
+Plans routes against the flood forecast instead of the current flood
+state: the depth on each road is evaluated at the time the traveller is
+predicted to be on it, using the per-edge depth series of the GeoTIFF
+time steps (linear between hourly maps).
+
+Travel time on an edge is fixed by its length and the planning speed, so
+leaving later never means arriving earlier, and no waiting at nodes is
+modelled. Cost is not monotone in arrival time, though: the cheapest way
+to a node can arrive after the roads beyond it have flooded. The search
+therefore keeps every label that is Pareto-optimal on (cost, arrival)
+per node, treating earlier arrival as better (rising water). Edges whose
+predicted depth during the traversal reaches the passability depth are
+blocked; otherwise the cost follows risk_aware_astar() with the edge risk
+raised to the forecast depth risk where that is higher.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import math
+from heapq import heappush, heappop
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import logging
+
+import networkx as nx
+import numpy as np
+
+from .risk_aware_astar import create_heuristic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPEED_KMH = 30.0  # Same planning speed as calculate_path_metrics
+DEFAULT_PASSABLE_DEPTH = 0.3  # Static water limit for cars (RiskCalculator)
+NEVER_INUNDATED = 255  # first_inundation() value for edges that stay passable
+
+
+class EdgeDepthSeries:
+    """
+    Flood depth over time for every road edge.
+
+    Depths between time steps are linear, so each lookup is one
+    multiply-add on precomputed per-step slopes.
+
+    Attributes:
+        depths: (time_steps, edges) float32 depths in meters (no data = 0)
+        first_step: Time step of row 0
+        last_step: Time step of the last row
+        step_hours: Hours per time step
+
+    Example:
+        >>> series = EdgeDepthSeries(keys, depths)  # depths: (18, E)
+        >>> series.depth_at(series.index[(u, v, 0)], 2.5)
+    """
+
+    def __init__(
+        self,
+        edge_keys: Sequence[Tuple],
+        depths: np.ndarray,
+        first_step: int = 1,
+        step_hours: float = 1.0
+    ) -> None:
+        """
+        Initialize the series.
+
+        Args:
+            edge_keys: Edge identifiers (u, v, key), aligned with the depth columns
+            depths: (time_steps, edges) depths in meters (NaN = no data)
+            first_step: Time step of the first row
+            step_hours: Hours per time step
+
+        Raises:
+            ValueError: If the shapes do not match
+        """
+        depths = np.nan_to_num(np.asarray(depths, dtype=np.float32), nan=0.0)
+        if depths.ndim != 2 or depths.shape[1] != len(edge_keys):
+            raise ValueError(
+                f"depths must be (time_steps, {len(edge_keys)}), got {depths.shape}"
+            )
+        self.depths = depths
+        self.slopes = np.diff(depths, axis=0)
+        self.index: Dict[Tuple, int] = {key: i for i, key in enumerate(edge_keys)}
+        self.first_step = first_step
+        self.last_step = first_step + depths.shape[0] - 1
+        self.step_hours = step_hours
+
+    def depth_at(self, edge: int, time: float) -> float:
+        """
+        Depth of one edge at a (fractional) time step, clamped to the series.
+
+        Args:
+            edge: Edge column index (see index)
+            time: Time step, e.g. 2.5
+
+        Returns:
+            Depth in meters
+        """
+        offset = time - self.first_step
+        if offset <= 0:
+            return float(self.depths[0, edge])
+        row = int(offset)
+        if row >= len(self.slopes):
+            return float(self.depths[-1, edge])
+        return float(self.depths[row, edge] + (offset - row) * self.slopes[row, edge])
+
+    def max_depth(self, edge: int, start: float, end: float) -> float:
+        """
+        Deepest water on an edge between two times.
+
+        Depth is piecewise linear, so the maximum is at an end or at a
+        time step in between.
+
+        Args:
+            edge: Edge column index
+            start: Time step entering the edge
+            end: Time step leaving the edge
+
+        Returns:
+            Maximum depth in meters
+        """
+        deepest = max(self.depth_at(edge, start), self.depth_at(edge, end))
+        for step in range(max(math.ceil(start), self.first_step), min(math.floor(end), self.last_step) + 1):
+            deepest = max(deepest, float(self.depths[step - self.first_step, edge]))
+        return deepest
+
+    def first_inundation(self, depth: float) -> np.ndarray:
+        """
+        First time step at which each edge's depth reaches a limit.
+
+        Args:
+            depth: Depth limit in meters (e.g. a vehicle's static water limit)
+
+        Returns:
+            uint8 time step per edge (aligned with index), NEVER_INUNDATED
+            where the depth stays below the limit over the whole series
+
+        Raises:
+            ValueError: If the time steps do not fit in uint8
+        """
+        if self.last_step >= NEVER_INUNDATED:
+            raise ValueError(f"Time steps must be below {NEVER_INUNDATED}, series ends at {self.last_step}")
+        flooded = self.depths >= depth
+        steps = flooded.argmax(axis=0).astype(np.uint8) + np.uint8(self.first_step)
+        steps[~flooded.any(axis=0)] = NEVER_INUNDATED
+        return steps
+
+
+def time_dependent_astar(
+    graph: nx.MultiDiGraph,
+    start: Any,
+    end: Any,
+    series: EdgeDepthSeries,
+    departure_time: float,
+    risk_weight: float = 0.5,
+    distance_weight: float = 0.5,
+    max_risk_threshold: float = 0.9,
+    passable_depth: float = DEFAULT_PASSABLE_DEPTH,
+    speed_kmh: float = DEFAULT_SPEED_KMH,
+    depth_risk: Optional[Callable[[float], float]] = None
+) -> Dict[str, Any]:
+    """
+    Risk-aware A* where edge depth is taken at the predicted arrival time.
+
+    Each label carries the arrival time at its node, and a node keeps all
+    labels not dominated by one that is both cheaper (or equal) and
+    earlier (or equal), so a costlier but earlier label survives when
+    the cheapest one arrives too late for the next road. Crossing an edge
+    takes length / speed_kmh; the edge is blocked if the forecast depth at
+    any point of the crossing reaches passable_depth. Its risk is the larger
+    of the current risk_score and depth_risk(depth), and the cost is
+    distance * distance_weight + distance * risk * risk_weight as in
+    risk_aware_astar(). The Haversine heuristic, scaled by distance_weight,
+    stays admissible.
+
+    Args:
+        graph: NetworkX MultiDiGraph with road network (original, not contracted)
+        start: Start node ID
+        end: End node ID
+        series: Per-edge depth series keyed by (u, v, key)
+        departure_time: Departure in time steps (e.g. 2.0 = hour 2 of the event)
+        risk_weight: Weight for risk component
+        distance_weight: Weight for distance component
+        max_risk_threshold: Risk at which an edge is impassable
+        passable_depth: Depth (meters) at which an edge is impassable
+        speed_kmh: Planning speed for arrival times
+        depth_risk: Optional depth (m) -> risk (0-1) mapping for forecast depths
+
+    Returns:
+        Dict containing:
+            {
+                "path": List of node IDs or None,
+                "cost": Path cost (inf if no path),
+                "arrival_time": Arrival time step at the destination (None if no path),
+                "expansions": Labels expanded
+            }
+
+    Raises:
+        ValueError: If start or end is not in the graph
+
+    Example:
+        >>> result = time_dependent_astar(graph, a, b, series, departure_time=2.0,
+        ...                               risk_weight=2000.0, distance_weight=1.0)
+        >>> result["arrival_time"]
+    """
+    if start not in graph:
+        raise ValueError(f"Start node {start} not in graph")
+    if end not in graph:
+        raise ValueError(f"End node {end} not in graph")
+
+    heuristic = create_heuristic(graph, end)
+    steps_per_meter = 1.0 / (speed_kmh * 1000.0 * series.step_hours)
+    index = series.index
+    inf = float('inf')
+    blocked = 0
+
+    # labels[i] = (node, cost, arrival, parent label); a node's frontier
+    # holds its live, mutually non-dominated label ids
+    labels = [(start, 0.0, departure_time, None)]
+    frontier: Dict[Any, List[int]] = {start: [0]}
+    dead = set()
+    tie = count()
+    open_heap = [(distance_weight * heuristic(start, end), next(tie), 0)]
+    expansions = 0
+
+    while open_heap:
+        _, _, label = heappop(open_heap)
+        if label in dead:
+            continue
+        node, g_node, t_node, _ = labels[label]
+
+        if node == end:
+            path = []
+            while label is not None:
+                path.append(labels[label][0])
+                label = labels[label][3]
+            path.reverse()
+            logger.info(
+                f"Time-dependent A* {start} -> {end}: path with {len(path)} nodes, "
+                f"arrival={t_node:.2f}, expansions={expansions}, blocked={blocked}"
+            )
+            return {
+                "path": path,
+                "cost": g_node,
+                "arrival_time": t_node,
+                "expansions": expansions
+            }
+
+        expansions += 1
+
+        for neighbor, edges in graph.succ[node].items():
+            # Best parallel edge given the water level while crossing it
+            best_cost, best_arrival = inf, inf
+            for key, data in edges.items():
+                length = data.get('length', 1.0)
+                t_leave = t_node + length * steps_per_meter
+                risk = data.get('risk_score', 0.0)
+
+                column = index.get((node, neighbor, key))
+                if column is not None:
+                    depth = series.max_depth(column, t_node, t_leave)
+                    if depth >= passable_depth:
+                        continue
+                    if depth_risk is not None and depth > 0.0:
+                        risk = max(risk, depth_risk(depth))
+                if risk >= max_risk_threshold:
+                    continue
+
+                cost = length * distance_weight + length * risk * risk_weight
+                if cost < best_cost:
+                    best_cost, best_arrival = cost, t_leave
+
+            if best_cost == inf:
+                blocked += 1
+                continue
+
+            tentative = g_node + best_cost
+            existing = frontier.setdefault(neighbor, [])
+            if any(
+                labels[other][1] <= tentative and labels[other][2] <= best_arrival
+                for other in existing
+            ):
+                continue
+            survivors = []
+            for other in existing:
+                if tentative <= labels[other][1] and best_arrival <= labels[other][2]:
+                    dead.add(other)
+                else:
+                    survivors.append(other)
+            labels.append((neighbor, tentative, best_arrival, label))
+            survivors.append(len(labels) - 1)
+            frontier[neighbor] = survivors
+            heappush(open_heap, (
+                tentative + distance_weight * heuristic(neighbor, end), next(tie), len(labels) - 1
+            ))
+
+    logger.warning(
+        f"Time-dependent A* {start} -> {end}: no passable path "
+        f"(expansions={expansions}, blocked={blocked})"
+    )
+    return {"path": None, "cost": inf, "arrival_time": None, "expansions": expansions}
+
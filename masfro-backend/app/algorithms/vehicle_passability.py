@@ -0,0 +1,160 @@
+# filename: app/algorithms/vehicle_passability.py
+
+"""
+Vehicle Passability Bitsets for MAS-FRO
+
+Cars, SUVs and trucks tolerate different flood depths
+(RiskCalculator.PASSABILITY_THRESHOLDS). Rather than re-deriving those
+limits for every edge a search relaxes, this index compares the current
+per-edge flood depths against each vehicle's static water limit in one
+vectorized pass per risk epoch and packs the result into one bitset per
+vehicle class. Searches then test a single bit per edge.
+
+Flow velocity is not modelled by the flood maps, so the static water
+limits apply. Like the passable-component index, the bitsets are rebuilt
+lazily on the first query after the environment's risk epoch changes.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple
+import logging
+
+import numpy as np
+
+from ..environment.risk_calculator import RiskCalculator
+
+logger = logging.getLogger(__name__)
+
+# Static water limit (meters) per vehicle class
+DEFAULT_DEPTH_LIMITS = {
+    vehicle: limits["static_depth"]
+    for vehicle, limits in RiskCalculator.PASSABILITY_THRESHOLDS.items()
+}
+
+
+def passability_bits(depths: np.ndarray, depth_limit: float) -> np.ndarray:
+    """
+    Pack per-edge passability into a bitset.
+
+    Args:
+        depths: (E,) flood depth per edge in meters
+        depth_limit: Depth at which an edge becomes impassable
+
+    Returns:
+        uint8 array of ceil(E / 8) bytes; bit i (little-endian within each
+        byte) is set when edge i is passable
+    """
+    return np.packbits(depths < depth_limit, bitorder="little")
+
+
+class VehiclePassabilityIndex:
+    """
+    Lazily maintained per-vehicle passability bitsets for a DynamicGraphEnvironment.
+
+    Bit positions follow graph.edges(keys=True) order, the order of the
+    environment's flood depth array (see set_flood_depths).
+
+    Attributes:
+        environment: DynamicGraphEnvironment providing depths and risk_epoch
+
+    Example:
+        >>> index = VehiclePassabilityIndex(env)
+        >>> passable = index.edge_test("car")
+        >>> if passable is not None and not passable((u, v, key)):
+        ...     print("Too deep for a car")
+    """
+
+    def __init__(self, environment):
+        """
+        Initialize the index.
+
+        Args:
+            environment: DynamicGraphEnvironment instance
+        """
+        self.environment = environment
+
+        self._positions: Dict[Tuple, int] = {}
+        self._positions_graph = None
+        self._bits: Dict[str, np.ndarray] = {}
+        self._state: Optional[Tuple] = None
+        self._lock = Lock()
+
+    @property
+    def depth_limits(self) -> Dict[str, float]:
+        """Depth limit per vehicle class in effect for the current depths."""
+        return self.environment.flood_depth_limits or DEFAULT_DEPTH_LIMITS
+
+    def _ensure_current(self) -> None:
+        """Rebuild the bitsets if the risk epoch or the depth limits changed."""
+        limits = self.depth_limits
+        state = (self.environment.risk_epoch, tuple(sorted(limits.items())))
+        if self._state == state:
+            return
+
+        with self._lock:
+            if self._state == state:
+                return
+            graph = self.environment.graph
+            if self._positions_graph is not graph:
+                self._positions = {edge: i for i, edge in enumerate(graph.edges(keys=True))}
+                self._positions_graph = graph
+
+            depths = self.environment.get_flood_depth_array()
+            self._bits = {} if depths is None else {
+                vehicle: passability_bits(depths, limit) for vehicle, limit in limits.items()
+            }
+            self._state = state
+
+        logger.debug(
+            f"Vehicle passability bitsets rebuilt at epoch {state[0]} for {list(self._bits)}"
+        )
+
+    def get_bits(self, vehicle_type: str) -> Optional[np.ndarray]:
+        """
+        Get a vehicle's packed passability bitset.
+
+        Args:
+            vehicle_type: Vehicle class ("car", "suv", "truck")
+
+        Returns:
+            Bitset as described in passability_bits(), or None if no flood
+            depths have been set
+
+        Raises:
+            ValueError: If the vehicle type is unknown
+        """
+        if vehicle_type not in self.depth_limits:
+            raise ValueError(
+                f"Invalid vehicle type: {vehicle_type}. Valid options: {list(self.depth_limits)}"
+            )
+        self._ensure_current()
+        return self._bits.get(vehicle_type)
+
+    def edge_test(self, vehicle_type: str) -> Optional[Callable[[Tuple], bool]]:
+        """
+        Get a per-edge passability test for searches.
+
+        Args:
+            vehicle_type: Vehicle class ("car", "suv", "truck")
+
+        Returns:
+            Callable taking an original-graph (u, v, key) and returning
+            whether the vehicle can use it (edges unknown to the index are
+            passable), or None if no flood depths have been set
+
+        Raises:
+            ValueError: If the vehicle type is unknown
+        """
+        bits = self.get_bits(vehicle_type)
+        if bits is None:
+            return None
+        positions = self._positions
+
+        def passable(edge: Tuple) -> bool:
+            i = positions.get(edge)
+            return i is None or bool(bits[i >> 3] >> (i & 7) & 1)
+
+        return passable
@@ -170,7 +170,7 @@ async def get_graph_edges_geojson(
                     "risk_score": float(risk_score),
                     "risk_category": _get_risk_category(risk_score),
                     "length": data.get("length", 0.0),
-                    "highway": data.get("highway", "unknown"),
+                    "highway": env.get_edge_highway(data, "unknown"),
                 },
             }
 
@@ -261,6 +261,45 @@ async def get_graph_statistics() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Failed to calculate statistics: {str(e)}")
 
 
+@router.get("/stranded-areas")
+async def get_stranded_areas(
+    min_nodes: int = Query(
+        5, ge=1, description="Ignore components with fewer nodes than this"
+    ),
+) -> Dict[str, Any]:
+    """
+    Get areas cut off from the main road network by impassable roads.
+
+    Uses the passable-component index (edges with risk < 0.9). Every
+    component other than the largest one is reported as stranded.
+
+    Args:
+        min_nodes: Minimum component size to report
+
+    Returns:
+        Dictionary with component count and stranded area summaries
+    """
+    try:
+        env = get_graph_environment()
+        index = env.get_component_index()
+        if index is None:
+            raise HTTPException(status_code=503, detail="Graph not loaded")
+
+        areas = index.get_stranded_areas(min_nodes=min_nodes)
+        return {
+            "risk_epoch": env.risk_epoch,
+            "total_components": index.num_components,
+            "stranded_areas": areas,
+            "stranded_nodes": sum(area["node_count"] for area in areas),
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error computing stranded areas: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to compute stranded areas: {str(e)}")
+
+
 def _get_risk_category(risk_score: float) -> str:
     """
     Categorize risk score into low/medium/high.
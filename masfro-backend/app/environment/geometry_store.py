@@ -0,0 +1,196 @@
+# filename: app/environment/geometry_store.py
+
+"""
+Packed Edge Geometry Store for MAS-FRO
+
+This module packs the road-following geometry of every graph edge into a
+single float32 coordinate buffer with per-edge offsets. Route geometry is
+assembled by slicing that buffer instead of walking shapely objects edge by
+edge, which keeps full-detail route polylines cheap to build.
+
+Coordinates are stored as (latitude, longitude) pairs to match the route
+path format used by the API.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+import networkx as nx
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EdgeGeometryStore:
+    """
+    Float32 coordinate buffer holding the geometry of every edge.
+
+    Edge i owns rows ``offsets[i]:offsets[i + 1]`` of ``coords``. Geometry is
+    taken from the edge ``geometry`` attribute when present (shapely
+    LineString, x=lon / y=lat) and otherwise from the endpoint node
+    coordinates.
+
+    Attributes:
+        coords: (N, 2) float32 array of (lat, lon) pairs
+        offsets: (E + 1,) int64 array of row offsets per edge
+        edge_index: Dict mapping (u, v, key) to edge position
+
+    Example:
+        >>> store = EdgeGeometryStore(graph)
+        >>> coords = store.path_geometry([node_a, node_b, node_c])
+        >>> coords.shape
+        (12, 2)
+    """
+
+    def __init__(self, graph: nx.MultiDiGraph):
+        """
+        Build the store from a graph.
+
+        Args:
+            graph: NetworkX MultiDiGraph with node 'x'/'y' attributes
+        """
+        self.graph = graph
+        self.edge_index: Dict[Tuple[Any, Any, Any], int] = {}
+
+        chunks: List[np.ndarray] = []
+        offsets = [0]
+        for i, (u, v, key, data) in enumerate(graph.edges(keys=True, data=True)):
+            self.edge_index[(u, v, key)] = i
+            chunk = self._edge_coords(graph, u, v, data)
+            chunks.append(chunk)
+            offsets.append(offsets[-1] + len(chunk))
+
+        if chunks:
+            self.coords = np.concatenate(chunks).astype(np.float32, copy=False)
+        else:
+            self.coords = np.empty((0, 2), dtype=np.float32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+        logger.info(
+            f"EdgeGeometryStore built: {len(self.edge_index)} edges, "
+            f"{len(self.coords)} points ({self.coords.nbytes / 1e6:.1f} MB)"
+        )
+
+    @staticmethod
+    def _edge_coords(graph: nx.MultiDiGraph, u: Any, v: Any, data: Dict[str, Any]) -> np.ndarray:
+        """Return the (lat, lon) points of one edge."""
+        geometry = data.get("geometry")
+        if geometry is not None and hasattr(geometry, "coords"):
+            xy = np.asarray(geometry.coords, dtype=np.float64)
+            if len(xy) >= 2:
+                return xy[:, ::-1].astype(np.float32)
+
+        u_data = graph.nodes[u]
+        v_data = graph.nodes[v]
+        return np.array(
+            [[u_data["y"], u_data["x"]], [v_data["y"], v_data["x"]]],
+            dtype=np.float32
+        )
+
+    def edge_geometry(self, u: Any, v: Any, key: Any = 0) -> np.ndarray:
+        """
+        Get the geometry of a single edge.
+
+        Args:
+            u: Source node ID
+            v: Target node ID
+            key: Edge key
+
+        Returns:
+            (n, 2) float32 view of (lat, lon) points
+
+        Raises:
+            KeyError: If the edge is not in the store
+        """
+        i = self.edge_index[(u, v, key)]
+        return self.coords[self.offsets[i]:self.offsets[i + 1]]
+
+    def _select_key(
+        self,
+        u: Any,
+        v: Any,
+        passable: Optional[Callable[[Tuple], bool]] = None
+    ) -> Optional[Any]:
+        """
+        Pick the parallel edge a route uses.
+
+        Same rule as the risk-aware A* weight function (and the plain-edge
+        case of best_parallel_edge): lowest risk_score, shortest on ties,
+        among edges that pass the vehicle test.
+        """
+        edges = self.graph.get_edge_data(u, v)
+        if not edges:
+            return None
+        candidates = [
+            k for k in edges if passable is None or passable((u, v, k))
+        ] or list(edges)
+        return min(
+            candidates,
+            key=lambda k: (edges[k].get("risk_score", 0.0), edges[k].get("length", 1.0))
+        )
+
+    def path_geometry(
+        self,
+        path: List[Any],
+        keys: Optional[List[Any]] = None,
+        passable: Optional[Callable[[Tuple], bool]] = None
+    ) -> np.ndarray:
+        """
+        Stitch the road-following geometry of a node path.
+
+        Consecutive edge slices share their junction point, so the first
+        point of every slice after the first is dropped.
+
+        Args:
+            path: List of node IDs
+            keys: Optional edge keys per hop (defaults to the edge the
+                risk-aware search picks, see _select_key)
+            passable: Vehicle passability test used for the search
+
+        Returns:
+            (n, 2) float32 array of (lat, lon) points
+        """
+        if len(path) < 2:
+            if path and path[0] in self.graph:
+                node = self.graph.nodes[path[0]]
+                return np.array([[node["y"], node["x"]]], dtype=np.float32)
+            return np.empty((0, 2), dtype=np.float32)
+
+        slices = []
+        for hop, (u, v) in enumerate(zip(path[:-1], path[1:])):
+            key = keys[hop] if keys is not None else self._select_key(u, v, passable)
+            i = self.edge_index.get((u, v, key))
+            if i is None:
+                raise KeyError(f"Edge ({u}, {v}, {key}) not in geometry store")
+            start = self.offsets[i] if hop == 0 else self.offsets[i] + 1
+            slices.append(self.coords[start:self.offsets[i + 1]])
+
+        return np.concatenate(slices)
+
+    def path_coordinates(
+        self,
+        path: List[Any],
+        passable: Optional[Callable[[Tuple], bool]] = None
+    ) -> List[Tuple[float, float]]:
+        """
+        Stitch path geometry as a list of (lat, lon) tuples.
+
+        Args:
+            path: List of node IDs
+            passable: Vehicle passability test used for the search
+
+        Returns:
+            List of (latitude, longitude) tuples
+        """
+        return [
+            tuple(point)
+            for point in self.path_geometry(path, passable=passable).astype(float).tolist()
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the coordinate and offset buffers."""
+        return self.coords.nbytes + self.offsets.nbytes
@@ -1,13 +1,65 @@
 # filename: app/environment/graph_manager.py
 import osmnx as ox
 import networkx as nx
+import numpy as np
 import os # Import the os module to check for file existence
+import pickle
+import sys
+from contextlib import contextmanager
 from pathlib import Path
 from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple, Union
 import logging
 
+from app.algorithms.graph_contraction import _ReadWriteLock
+
 logger = logging.getLogger(__name__)
 
+# Edge attributes read by the routing and hazard code. Everything else is
+# moved to the side table when the graph is loaded in lean mode.
+LEAN_EDGE_ATTRIBUTES = ("length", "risk_score", "weight", "geometry", "highway_code")
+LEAN_NODE_ATTRIBUTES = ("x", "y")
+
+# Environment variable that enables lean mode when no explicit flag is given
+LEAN_MODE_ENV_VAR = "MASFRO_LEAN_GRAPH"
+
+
+def _estimate_attribute_bytes(graph: nx.MultiDiGraph) -> int:
+    """
+    Estimate the memory held by node and edge attribute dicts.
+
+    Counts each attribute dict plus its values once (shared objects such as
+    interned strings and small ints are only counted the first time).
+    Shapely geometries are counted by their WKB size.
+
+    Args:
+        graph: Graph to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    seen = set()
+    total = 0
+
+    def _size(obj) -> int:
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        if hasattr(obj, "wkb"):
+            return sys.getsizeof(obj) + len(obj.wkb)
+        size = sys.getsizeof(obj)
+        if isinstance(obj, (list, tuple)):
+            size += sum(_size(item) for item in obj)
+        return size
+
+    for _, data in graph.nodes(data=True):
+        total += _size(data)
+        total += sum(_size(value) for value in data.values())
+    for _, _, _, data in graph.edges(keys=True, data=True):
+        total += _size(data)
+        total += sum(_size(value) for value in data.values())
+    return total
+
 
 class DynamicGraphEnvironment:
     """
@@ -16,8 +68,46 @@ class DynamicGraphEnvironment:
 
     Thread-safe implementation using a lock to prevent race conditions
     during graph updates.
+
+    In lean mode only the attributes read by routing and hazard code are kept
+    on the graph (see LEAN_EDGE_ATTRIBUTES). The ``highway`` string is interned
+    into a small-int ``highway_code`` and the remaining OSM attributes are
+    written to a side table that is loaded on demand by get_edge_attributes().
+
+    Args:
+        lean: Enable lean mode. Defaults to the MASFRO_LEAN_GRAPH env variable.
+        graph: Optional pre-built graph (skips loading from file, used by tests
+            and tools that build graphs in memory)
     """
-    def __init__(self):
+    def __init__(self, lean: Optional[bool] = None, graph: Optional[nx.MultiDiGraph] = None):
+        if lean is None:
+            lean = os.getenv(LEAN_MODE_ENV_VAR, "").lower() in ("1", "true", "yes")
+        self.lean = lean
+
+        # Interned highway categories: code -> value, value -> code
+        self.highway_table: List[Any] = []
+        self._highway_codes: Dict[Any, int] = {}
+
+        # Side table of stripped attributes (lean mode only, loaded lazily)
+        self._side_table: Optional[Dict[str, Dict]] = None
+        self._side_table_path: Optional[Path] = None
+        self.memory_report: Dict[str, Any] = {}
+
+        # Packed edge geometry, built on first use (see get_geometry_store)
+        self._geometry_store = None
+
+        # Degree-2 contracted routing graph, built on first use
+        self._contracted = None
+
+        # Incremented on every risk change; derived indexes rebuild lazily
+        self.risk_epoch = 0
+        self._component_index = None
+
+        # Current flood depth per edge and vehicle depth limits (see set_flood_depths)
+        self._flood_depths: Optional[np.ndarray] = None
+        self.flood_depth_limits: Optional[Dict[str, float]] = None
+        self._passability_index = None
+
         base = Path(__file__).resolve().parent   # .../app/environment
         # If data folder is at mesfro-backend/data use parent.parent
         candidate = (base.parent.parent / "data" / "marikina_graph.graphml").resolve()
@@ -31,8 +121,15 @@ class DynamicGraphEnvironment:
         # Thread safety
         self._lock = Lock()
         self._is_updating = False
+        # Risk writers take the write side; frozen_risks() the read side
+        self._risk_lock = _ReadWriteLock()
 
-        self._load_graph_from_file()
+        self._loaded_from_file = graph is None
+        if graph is not None:
+            self.graph = graph
+            self._preprocess_graph()
+        else:
+            self._load_graph_from_file()
 
     def _load_graph_from_file(self):
         """
@@ -51,13 +148,7 @@ class DynamicGraphEnvironment:
 
             # --- Pre-processing Steps ---
             print("Pre-processing graph (adding/resetting risk and weight attributes)...")
-            for u, v, key in self.graph.edges(keys=True):
-                # Access edge data directly to ensure modifications persist
-                edge_data = self.graph[u][v][key]
-                edge_data['risk_score'] = 0.0  # Start with safe roads (0.0), flood data will increase risk
-                if 'length' not in edge_data:
-                    edge_data['length'] = 1.0 # Should exist, but good to be safe
-                edge_data['weight'] = edge_data['length'] * (1.0 + edge_data['risk_score'])  # Base distance + risk penalty
+            self._preprocess_graph()
 
             # Verify preprocessing worked
             sample_count = 0
@@ -77,6 +168,208 @@ class DynamicGraphEnvironment:
             print(f"\n❌ An error occurred while loading or processing the graph file: {e}")
             self.graph = None
 
+    def _preprocess_graph(self):
+        """
+        Reset risk/weight attributes on every edge and, in lean mode,
+        strip the graph down to the attributes the simulation needs.
+        """
+        for u, v, key in self.graph.edges(keys=True):
+            # Access edge data directly to ensure modifications persist
+            edge_data = self.graph[u][v][key]
+            edge_data['risk_score'] = 0.0  # Start with safe roads (0.0), flood data will increase risk
+            if 'length' not in edge_data:
+                edge_data['length'] = 1.0 # Should exist, but good to be safe
+            edge_data['weight'] = edge_data['length'] * (1.0 + edge_data['risk_score'])  # Base distance + risk penalty
+
+        if self.lean:
+            self._strip_to_lean()
+
+    def _intern_highway(self, value: Any) -> int:
+        """
+        Return the small-int code for a highway value, adding it if new.
+
+        Args:
+            value: OSM highway tag (string, or list for merged ways)
+
+        Returns:
+            Index into highway_table
+        """
+        if isinstance(value, list):
+            value = tuple(value)
+        code = self._highway_codes.get(value)
+        if code is None:
+            code = len(self.highway_table)
+            self.highway_table.append(value)
+            self._highway_codes[value] = code
+        return code
+
+    def _strip_to_lean(self):
+        """
+        Keep only LEAN_EDGE_ATTRIBUTES / LEAN_NODE_ATTRIBUTES on the graph.
+
+        Attribute dicts are rebuilt in place (clear + update) so the
+        dict storage actually shrinks; NetworkX keeps references to these
+        exact dict objects so they cannot be replaced.
+        """
+        before = _estimate_attribute_bytes(self.graph)
+        side_edges: Dict[Tuple, Dict] = {}
+        side_nodes: Dict[Any, Dict] = {}
+
+        for u, v, key, data in self.graph.edges(keys=True, data=True):
+            if 'highway' in data:
+                data['highway_code'] = self._intern_highway(data['highway'])
+            kept = {k: data[k] for k in LEAN_EDGE_ATTRIBUTES if k in data}
+            extra = {k: val for k, val in data.items() if k not in kept}
+            if extra:
+                side_edges[(u, v, key)] = extra
+            data.clear()
+            data.update(kept)
+
+        for node, data in self.graph.nodes(data=True):
+            kept = {k: data[k] for k in LEAN_NODE_ATTRIBUTES if k in data}
+            extra = {k: val for k, val in data.items() if k not in kept}
+            if extra:
+                side_nodes[node] = extra
+            data.clear()
+            data.update(kept)
+
+        self._write_side_table({"edges": side_edges, "nodes": side_nodes})
+        after = _estimate_attribute_bytes(self.graph)
+
+        self.memory_report = {
+            "lean": True,
+            "attribute_bytes_before": before,
+            "attribute_bytes_after": after,
+            "saved_bytes": before - after,
+            "nodes": self.graph.number_of_nodes(),
+            "edges": self.graph.number_of_edges(),
+            "highway_categories": len(self.highway_table),
+            "side_table": str(self._side_table_path) if self._side_table_path else None,
+        }
+        logger.info(
+            f"Lean graph: attribute memory {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB "
+            f"({len(self.highway_table)} highway categories interned)"
+        )
+
+    def _write_side_table(self, side_table: Dict[str, Dict]):
+        """
+        Persist stripped attributes next to the graph file.
+
+        Graphs passed in memory keep their side table in memory. If the
+        graph directory is not writable the stripped attributes are dropped.
+        """
+        if not self._loaded_from_file:
+            self._side_table = side_table
+            return
+        path = Path(self.filepath).with_suffix(".attrs.pkl")
+        try:
+            with open(path, "wb") as f:
+                pickle.dump(side_table, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._side_table_path = path
+        except OSError as e:
+            logger.warning(f"Could not write graph side table to {path}: {e}")
+            self._side_table_path = None
+
+    def _load_side_table(self) -> Dict[str, Dict]:
+        """Load the side table from disk on first use."""
+        if self._side_table is None:
+            self._side_table = {"edges": {}, "nodes": {}}
+            if self._side_table_path is not None and self._side_table_path.exists():
+                with open(self._side_table_path, "rb") as f:
+                    self._side_table = pickle.load(f)
+        return self._side_table
+
+    def get_edge_attributes(self, u, v, key) -> Dict[str, Any]:
+        """
+        Get the full attribute set of an edge, including stripped attributes.
+
+        In normal mode this is a copy of the edge dict. In lean mode the
+        side table is loaded on first call and merged with the kept attributes.
+
+        Args:
+            u: Source node ID
+            v: Target node ID
+            key: Edge key (for multigraphs)
+
+        Returns:
+            Dict of edge attributes (empty if the edge does not exist)
+        """
+        if self.graph is None or not self.graph.has_edge(u, v, key):
+            return {}
+        attributes = dict(self.graph[u][v][key])
+        if self.lean:
+            attributes.update(self._load_side_table()["edges"].get((u, v, key), {}))
+            if 'highway_code' in attributes:
+                attributes['highway'] = self.decode_highway(attributes.pop('highway_code'))
+        return attributes
+
+    def get_node_attributes(self, node) -> Dict[str, Any]:
+        """
+        Get the full attribute set of a node, including stripped attributes.
+
+        Args:
+            node: Node ID
+
+        Returns:
+            Dict of node attributes (empty if the node does not exist)
+        """
+        if self.graph is None or node not in self.graph:
+            return {}
+        attributes = dict(self.graph.nodes[node])
+        if self.lean:
+            attributes.update(self._load_side_table()["nodes"].get(node, {}))
+        return attributes
+
+    def decode_highway(self, code: int) -> Any:
+        """
+        Map an interned highway code back to its OSM value.
+
+        Args:
+            code: Value of an edge's ``highway_code`` attribute
+
+        Returns:
+            Highway tag (string, or list for merged ways)
+        """
+        value = self.highway_table[code]
+        return list(value) if isinstance(value, tuple) else value
+
+    def get_edge_highway(self, edge_data: Dict[str, Any], default: Any = None) -> Any:
+        """
+        Read the highway tag from an edge dict in either load mode.
+
+        Args:
+            edge_data: Edge attribute dict from the graph
+            default: Value returned when the edge has no highway tag
+
+        Returns:
+            Highway tag or default
+        """
+        if 'highway' in edge_data:
+            return edge_data['highway']
+        code = edge_data.get('highway_code')
+        if code is None:
+            return default
+        return self.decode_highway(code)
+
+    def get_memory_report(self) -> Dict[str, Any]:
+        """
+        Get attribute memory usage of the loaded graph.
+
+        Returns:
+            Dict with before/after byte estimates in lean mode, or the
+            current estimate in normal mode
+        """
+        if self.memory_report:
+            return self.memory_report
+        if self.graph is None:
+            return {"lean": self.lean, "attribute_bytes": 0}
+        return {
+            "lean": False,
+            "attribute_bytes": _estimate_attribute_bytes(self.graph),
+            "nodes": self.graph.number_of_nodes(),
+            "edges": self.graph.number_of_edges(),
+        }
+
     def update_edge_risk(self, u, v, key, risk_factor: float):
         """
         Update the risk score for a specific edge (thread-safe).
@@ -90,13 +383,16 @@ class DynamicGraphEnvironment:
         if self.graph is None:
             return
 
-        with self._lock:
+        with self._risk_lock.write(), self._lock:
             self._is_updating = True
             try:
                 edge_data = self.graph.edges[u, v, key]
                 edge_data['risk_score'] = risk_factor
                 # Base distance + risk penalty
                 edge_data['weight'] = edge_data['length'] * (1.0 + risk_factor)
+                if self._contracted is not None:
+                    self._contracted.update_edge_risk(u, v, key)
+                self.risk_epoch += 1
             except KeyError:
                 logger.warning(f"Edge ({u}, {v}, {key}) not found in graph")
             finally:
@@ -119,7 +415,7 @@ class DynamicGraphEnvironment:
         if self.graph is None:
             return
 
-        with self._lock:
+        with self._risk_lock.write(), self._lock:
             self._is_updating = True
             try:
                 updated_count = 0
@@ -128,14 +424,209 @@ class DynamicGraphEnvironment:
                         edge_data = self.graph.edges[u, v, key]
                         edge_data['risk_score'] = risk_factor
                         edge_data['weight'] = edge_data['length'] * (1.0 + risk_factor)
+                        if self._contracted is not None:
+                            self._contracted.update_edge_risk(u, v, key)
                         updated_count += 1
                     except KeyError:
                         logger.warning(f"Edge ({u}, {v}, {key}) not found in graph")
 
+                if updated_count:
+                    self.risk_epoch += 1
                 logger.info(f"Batch updated {updated_count}/{len(risk_updates)} edges")
             finally:
                 self._is_updating = False
 
+    def reset_edge_risks(self):
+        """
+        Reset every edge to risk 0.0 (thread-safe).
+
+        Used by simulation resets so derived structures (such as the
+        contracted routing graph) stay in sync with the edge data.
+        """
+        if self.graph is None:
+            return
+
+        with self._risk_lock.write(), self._lock:
+            self._is_updating = True
+            try:
+                for _, _, edge_data in self.graph.edges(data=True):
+                    edge_data['risk_score'] = 0.0
+                    edge_data['weight'] = edge_data.get('length', 1.0)
+                if self._contracted is not None:
+                    self._contracted.sync()
+                self._flood_depths = None
+                self.risk_epoch += 1
+            finally:
+                self._is_updating = False
+
+    @contextmanager
+    def frozen_risks(self):
+        """
+        Keep every edge's risk score and flood depth unchanged for a block.
+
+        Risk writers (update_edge_risk, batch_update_edge_risks,
+        reset_edge_risks, set_risk_array, set_flood_depths) wait until the
+        block exits, whichever thread they run on, so searches inside it
+        all read one risk epoch. Not reentrant.
+
+        Yields:
+            The risk epoch being read
+        """
+        with self._risk_lock.read():
+            yield self.risk_epoch
+
+    def get_risk_array(self) -> np.ndarray:
+        """
+        Snapshot every edge's risk score as a float32 array.
+
+        Values follow graph.edges(keys=True) order, which is stable for a
+        loaded graph, so the array can be restored with set_risk_array().
+
+        Returns:
+            (E,) float32 array of risk scores (empty if no graph)
+        """
+        if self.graph is None:
+            return np.empty(0, dtype=np.float32)
+        with self._lock:
+            return np.fromiter(
+                (data.get('risk_score', 0.0) for _, _, data in self.graph.edges(data=True)),
+                dtype=np.float32,
+                count=self.graph.number_of_edges()
+            )
+
+    def set_risk_array(self, risks: np.ndarray) -> None:
+        """
+        Restore every edge's risk score from get_risk_array() output.
+
+        Args:
+            risks: (E,) array in graph.edges(keys=True) order
+
+        Raises:
+            ValueError: If the array does not match the graph's edge count
+        """
+        if self.graph is None:
+            return
+        if len(risks) != self.graph.number_of_edges():
+            raise ValueError(
+                f"Risk array has {len(risks)} values for {self.graph.number_of_edges()} edges"
+            )
+
+        with self._risk_lock.write(), self._lock:
+            self._is_updating = True
+            try:
+                for (_, _, edge_data), risk in zip(self.graph.edges(data=True), risks.tolist()):
+                    edge_data['risk_score'] = risk
+                    edge_data['weight'] = edge_data.get('length', 1.0) * (1.0 + risk)
+                if self._contracted is not None:
+                    self._contracted.sync()
+                self.risk_epoch += 1
+            finally:
+                self._is_updating = False
+
+    def set_flood_depths(
+        self,
+        depths: Union[np.ndarray, Dict[Tuple, float]],
+        depth_limits: Optional[Dict[str, float]] = None
+    ) -> None:
+        """
+        Set the current flood depth of every edge (thread-safe).
+
+        An array in graph.edges(keys=True) order (such as the
+        GeoTIFFService edge gathers) is stored as is; a dict is spread
+        over the edges, which is a Python loop over the whole graph.
+        Starts a new risk epoch, so the vehicle passability bitsets are
+        rebuilt on next use.
+
+        Args:
+            depths: (E,) array in graph.edges(keys=True) order (NaN = dry),
+                or dict mapping (u, v, key) tuples to depths in meters
+                (missing edges are dry)
+            depth_limits: Optional depth limit per vehicle class (default:
+                RiskCalculator static water limits)
+
+        Raises:
+            ValueError: If an array does not match the graph's edge count
+        """
+        if self.graph is None:
+            return
+
+        if isinstance(depths, np.ndarray):
+            if len(depths) != self.graph.number_of_edges():
+                raise ValueError(
+                    f"Depth array has {len(depths)} values for {self.graph.number_of_edges()} edges"
+                )
+            array = np.nan_to_num(depths.astype(np.float32, copy=True), nan=0.0)
+        else:
+            array = None
+
+        with self._risk_lock.write(), self._lock:
+            if array is None:
+                array = np.zeros(self.graph.number_of_edges(), dtype=np.float32)
+                if depths:
+                    for i, edge in enumerate(self.graph.edges(keys=True)):
+                        depth = depths.get(edge)
+                        if depth is not None:
+                            array[i] = depth
+            self._flood_depths = array
+            if depth_limits is not None:
+                self.flood_depth_limits = dict(depth_limits)
+            self.risk_epoch += 1
+
+    def get_flood_depth_array(self) -> Optional[np.ndarray]:
+        """
+        Get the depths from set_flood_depths() in graph.edges(keys=True) order.
+
+        Returns:
+            (E,) float32 array, or None if no depths have been set
+        """
+        return self._flood_depths
+
+    def get_passability_index(self):
+        """
+        Get the per-vehicle passability bitsets, rebuilt lazily per risk epoch.
+
+        Returns:
+            VehiclePassabilityIndex instance, or None if no graph is loaded
+        """
+        if self.graph is None:
+            return None
+        if self._passability_index is None:
+            from app.algorithms.vehicle_passability import VehiclePassabilityIndex
+            self._passability_index = VehiclePassabilityIndex(self)
+        return self._passability_index
+
+    def get_contracted_graph(self):
+        """
+        Get the degree-2 contracted routing graph, building it on first use.
+
+        Once built it is kept in sync by update_edge_risk(),
+        batch_update_edge_risks() and reset_edge_risks().
+
+        Returns:
+            ContractedGraph instance, or None if no graph is loaded
+        """
+        if self.graph is None:
+            return None
+        if self._contracted is None or self._contracted.original is not self.graph:
+            from app.algorithms.graph_contraction import ContractedGraph
+            with self._lock:
+                self._contracted = ContractedGraph(self.graph)
+        return self._contracted
+
+    def get_component_index(self):
+        """
+        Get the passable-component index for O(1) no-route checks.
+
+        Returns:
+            PassableComponentIndex instance, or None if no graph is loaded
+        """
+        if self.graph is None:
+            return None
+        if self._component_index is None:
+            from app.algorithms.passable_components import PassableComponentIndex
+            self._component_index = PassableComponentIndex(self)
+        return self._component_index
+
     def is_updating(self) -> bool:
         """
         Check if graph is currently being updated.
@@ -145,6 +636,24 @@ class DynamicGraphEnvironment:
         """
         return self._is_updating
 
+    def get_geometry_store(self):
+        """
+        Get the packed edge geometry store, building it on first use.
+
+        Geometry does not change with risk updates, so the store is built
+        once per loaded graph.
+
+        Returns:
+            EdgeGeometryStore instance, or None if no graph is loaded
+        """
+        if self.graph is None:
+            return None
+        if self._geometry_store is None or self._geometry_store.graph is not self.graph:
+            from .geometry_store import EdgeGeometryStore
+            with self._lock:
+                self._geometry_store = EdgeGeometryStore(self.graph)
+        return self._geometry_store
+
     def get_graph(self) -> nx.MultiDiGraph:
         """
         Get the graph instance.
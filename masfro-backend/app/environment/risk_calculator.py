@@ -54,6 +54,13 @@ class RiskCalculator:
         >>> print(f"Risk score: {risk:.2f}")
     """
 
+    # Vehicle flood limits (meters, m/s) used by calculate_passability_threshold
+    PASSABILITY_THRESHOLDS = {
+        "car": {"static_depth": 0.3, "flowing_depth": 0.4, "max_velocity": 0.5},
+        "suv": {"static_depth": 0.5, "flowing_depth": 0.6, "max_velocity": 0.5},
+        "truck": {"static_depth": 0.6, "flowing_depth": 0.7, "max_velocity": 0.6}
+    }
+
     def __init__(self):
         """Initialize the RiskCalculator with default parameters."""
         # Physical constants
@@ -232,12 +239,7 @@ class RiskCalculator:
                     "reason": str
                 }
         """
-        thresholds = {
-            "car": {"static_depth": 0.3, "flowing_depth": 0.4, "max_velocity": 0.5},
-            "suv": {"static_depth": 0.5, "flowing_depth": 0.6, "max_velocity": 0.5},
-            "truck": {"static_depth": 0.6, "flowing_depth": 0.7, "max_velocity": 0.6}
-        }
-
+        thresholds = self.PASSABILITY_THRESHOLDS
         thresh = thresholds.get(vehicle_type.lower(), thresholds["car"])
 
         # Check passability
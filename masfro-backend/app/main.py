@@ -11,8 +11,9 @@ Author: MAS-FRO Development Team
 Date: November 2025
 """
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Query
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Query, Header, Request
+from fastapi.responses import Response
+from pydantic import BaseModel, ValidationError
 from typing import List, Tuple, Optional, Dict, Any, Set
 from fastapi import BackgroundTasks
 from fastapi.staticfiles import StaticFiles
@@ -20,6 +21,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 import logging
 import asyncio
+import math
 import json
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -45,6 +47,7 @@ from app.services.flood_data_scheduler import FloodDataScheduler, set_scheduler,
 
 # Simulation Manager imports
 from app.services.simulation_manager import get_simulation_manager, SimulationManager
+from app.services.tick_recorder import tick_log_path
 
 # Database imports
 from app.database import get_db, FloodDataRepository, check_connection, init_db
@@ -55,6 +58,9 @@ from app.core.logging_config import setup_logging, get_logger
 # API Routes
 from app.api import graph_router, set_graph_environment, evacuation_router
 
+# Compact route encoding
+from app.utils.polyline import encode_polyline, SUPPORTED_ENCODINGS
+
 # Initialize structured logging (will be called again in startup event for safety)
 setup_logging()
 logger = get_logger(__name__)
@@ -347,6 +353,8 @@ class RouteRequest(BaseModel):
     start_location: Tuple[float, float]  # (latitude, longitude)
     end_location: Tuple[float, float]
     preferences: Optional[Dict[str, Any]] = None
+    encoding: Optional[str] = None  # "polyline" | "polyline6" -> path returned in encoded_path
+    departure_time: Optional[float] = None  # Flood time step (1-18) -> time-dependent route
 
 class RouteResponse(BaseModel):
     """Response model for route results."""
@@ -358,6 +366,40 @@ class RouteResponse(BaseModel):
     risk_level: Optional[float] = None
     warnings: List[str] = []
     message: Optional[str] = None
+    encoding: Optional[str] = None
+    encoded_path: Optional[str] = None
+    arrival_time: Optional[float] = None  # Flood time step at arrival (time-dependent routes)
+
+
+def encode_route_path(
+    path: List[Tuple[float, float]],
+    encoding: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Build the path fields of a route payload in the requested encoding.
+
+    Args:
+        path: List of (latitude, longitude) tuples
+        encoding: None for a plain coordinate list, or a key of SUPPORTED_ENCODINGS
+
+    Returns:
+        Dict with "path", "encoding" and "encoded_path" keys
+
+    Raises:
+        ValueError: If the encoding is not supported
+    """
+    if encoding is None:
+        return {"path": path, "encoding": None, "encoded_path": None}
+    if encoding not in SUPPORTED_ENCODINGS:
+        raise ValueError(
+            f"Unsupported encoding '{encoding}'. "
+            f"Supported: {', '.join(sorted(SUPPORTED_ENCODINGS))}"
+        )
+    return {
+        "path": [],
+        "encoding": encoding,
+        "encoded_path": encode_polyline(path, precision=SUPPORTED_ENCODINGS[encoding])
+    }
 
 class FeedbackRequest(BaseModel):
     """Request model for user feedback."""
@@ -367,6 +409,14 @@ class FeedbackRequest(BaseModel):
     severity: Optional[float] = None
     description: Optional[str] = None
 
+class DepthBatchRequest(BaseModel):
+    """Request model for batch flood depth queries (JSON body)."""
+    lons: List[float] = []
+    lats: List[float] = []
+    points: Optional[List[Tuple[float, float]]] = None  # (longitude, latitude), instead of lons/lats
+    return_period: str = "rr01"
+    time_steps: List[int] = [1]
+
 # --- 2. FastAPI Application Setup ---
 
 app = FastAPI(
@@ -423,7 +473,7 @@ flood_agent = FloodAgent(
     hazard_agent_id="hazard_agent_001"  # Target agent for messages
 )
 
-routing_agent = RoutingAgent("routing_agent_001", environment)
+routing_agent = RoutingAgent("routing_agent_001", environment, use_contraction=True)
 evacuation_manager = EvacuationManagerAgent("evac_manager_001", environment)
 
 # ScoutAgent in simulation mode with MAS communication
@@ -443,6 +493,7 @@ scout_agent = ScoutAgent(
 # EvacuationManager still uses direct references (to be refactored later)
 evacuation_manager.set_hazard_agent(hazard_agent)
 evacuation_manager.set_routing_agent(routing_agent)
+routing_agent.set_hazard_agent(hazard_agent)  # Flood forecast for time-dependent routes
 
 # Initialize FloodAgent scheduler (5-minute intervals) with WebSocket broadcasting
 # NOTE: FloodAgent now sends data to HazardAgent via MessageQueue (MAS architecture)
@@ -549,6 +600,13 @@ async def startup_event():
         logger.error(f"Failed to load initial flood data: {e}")
         logger.warning("Continuing with zero risk scores - all roads passable")
 
+    # Polygonize flood maps in the background for /api/geotiff/flood-extent
+    try:
+        from app.services.geotiff_service import get_geotiff_service
+        get_geotiff_service().start_geojson_precompute()
+    except Exception as e:
+        logger.warning(f"Flood extent precompute not started: {e}")
+
     # Start scheduler
     logger.info("Starting background scheduler...")
     scheduler = get_scheduler()
@@ -570,6 +628,11 @@ async def shutdown_event():
     if scheduler:
         await scheduler.stop()
         logger.info("Scheduler stopped gracefully")
+    try:
+        from app.services.geotiff_service import get_geotiff_service
+        get_geotiff_service().stop_geojson_precompute()
+    except Exception:
+        pass
     logger.info("MAS-FRO backend shutdown complete")
 
 
@@ -606,10 +669,18 @@ async def get_route(request: RouteRequest):
     Calculate optimal flood-safe route between two points.
 
     Uses RoutingAgent with risk-aware A* algorithm to find the safest path
-    considering current flood conditions.
+    considering current flood conditions. With departure_time (flood time
+    step, 1-18) the route follows the flood forecast instead, avoiding
+    roads that will be flooded by the time they are reached.
     """
     logger.info(f"Route request: {request.start_location} -> {request.end_location}")
 
+    if request.encoding is not None and request.encoding not in SUPPORTED_ENCODINGS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported encoding '{request.encoding}'"
+        )
+
     try:
         # Check if graph is loaded
         if not environment.graph:
@@ -618,11 +689,14 @@ async def get_route(request: RouteRequest):
                 detail="Road network not loaded. Please contact administrator."
             )
 
-        # Use RoutingAgent to calculate route
-        route_result = routing_agent.calculate_route(
+        # Use RoutingAgent to calculate route (in a worker thread: the search
+        # may wait for tick routing to release the contracted graph)
+        route_result = await asyncio.to_thread(
+            routing_agent.calculate_route,
             start=request.start_location,
             end=request.end_location,
-            preferences=request.preferences
+            preferences=request.preferences,
+            departure_time=request.departure_time
         )
 
         if not route_result.get("path"):
@@ -638,11 +712,12 @@ async def get_route(request: RouteRequest):
         return RouteResponse(
             route_id=route_id,
             status="success",
-            path=route_result["path"],
             distance=route_result.get("distance"),
             estimated_time=route_result.get("estimated_time"),
             risk_level=route_result.get("risk_level"),
-            warnings=route_result.get("warnings", [])
+            warnings=route_result.get("warnings", []),
+            arrival_time=route_result.get("arrival_time"),
+            **encode_route_path(route_result["path"], request.encoding)
         )
 
     except HTTPException:
@@ -933,6 +1008,11 @@ async def start_simulation(
     mode: str = Query(
         "light",
         description="Simulation mode: light, medium, or heavy"
+    ),
+    tick_period_s: Optional[float] = Query(
+        None,
+        gt=0,
+        description="Target seconds between ticks (default: keep current, 1.0)"
     )
 ):
     """
@@ -943,17 +1023,21 @@ async def start_simulation(
             - light: < 0.5m depth, low risk areas
             - medium: 0.5m - 1.0m depth, moderate risk
             - heavy: > 1.0m depth, high risk zones
+        tick_period_s: Optional tick period for the adaptive scheduler
 
     Returns:
         Simulation start result with state information
 
     Example:
         POST /api/simulation/start?mode=medium
+        POST /api/simulation/start?mode=heavy&tick_period_s=2
     """
     logger.info(f"Simulation start request received - Mode: {mode}")
 
     try:
         sim_manager = get_simulation_manager()
+        if tick_period_s is not None:
+            sim_manager.configure_scheduler(tick_period_s=tick_period_s)
         result = await sim_manager.start(mode=mode)
 
         # Broadcast simulation state change via WebSocket
@@ -1062,8 +1146,7 @@ async def reset_simulation():
         if environment.graph:
             logger.info("Resetting graph risk scores to baseline")
             # Reset all edge risk scores to 0.0
-            for u, v, key in environment.graph.edges(keys=True):
-                environment.graph[u][v][key]["risk_score"] = 0.0
+            environment.reset_edge_risks()
             logger.info(f"Reset {environment.graph.number_of_edges()} edges to baseline risk")
 
         # Broadcast simulation state change via WebSocket
@@ -1125,6 +1208,191 @@ async def get_simulation_status():
         )
 
 
+@app.get("/api/simulation/profile", tags=["Simulation"])
+async def get_simulation_profile(
+    reset: bool = Query(False, description="Clear the collected samples after reading")
+):
+    """
+    Get rolling tick latency percentiles per phase.
+
+    Covers the whole tick, each phase (collection, fusion, routing,
+    evacuation, advancement) and the HazardAgent steps inside fusion
+    (hazard.clean_expired_data, hazard.fuse_data, ...), each as
+    p50/p95/max over the most recent samples.
+
+    Args:
+        reset: Clear the samples after reading
+
+    Returns:
+        Profile dict of name -> {count, last, p50, p95, max} in ms
+
+    Example:
+        GET /api/simulation/profile
+    """
+    sim_manager = get_simulation_manager()
+    profile = sim_manager.get_profile()
+    if reset:
+        sim_manager.profiler.reset()
+    return {
+        "status": "success",
+        "window": sim_manager.profiler.window,
+        "profile": profile,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.post("/api/simulation/checkpoint", tags=["Simulation"])
+async def create_simulation_checkpoint(
+    name: Optional[str] = Query(
+        None,
+        description="Checkpoint name (default: tick_<tick_count>)"
+    )
+):
+    """
+    Capture the current simulation state as a checkpoint.
+
+    Checkpoints hold edge risk scores, HazardAgent caches, the scenario
+    position, evacuation occupancy and the simulation clock.
+
+    Args:
+        name: Optional checkpoint name
+
+    Returns:
+        Checkpoint info (name, size, tick, clock, capture time)
+
+    Example:
+        POST /api/simulation/checkpoint?name=before_peak
+    """
+    try:
+        sim_manager = get_simulation_manager()
+        info = await sim_manager.create_checkpoint(name)
+        return {"status": "success", "checkpoint": info}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error creating checkpoint: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error creating checkpoint: {str(e)}"
+        )
+
+
+@app.get("/api/simulation/checkpoints", tags=["Simulation"])
+async def list_simulation_checkpoints():
+    """
+    List stored simulation checkpoints.
+
+    Returns:
+        Checkpoint info dicts, oldest first
+
+    Example:
+        GET /api/simulation/checkpoints
+    """
+    sim_manager = get_simulation_manager()
+    return {
+        "status": "success",
+        "checkpoints": sim_manager.checkpoint_store.list()
+    }
+
+
+@app.post("/api/simulation/restore", tags=["Simulation"])
+async def restore_simulation_checkpoint(
+    name: str = Query(..., description="Checkpoint name to restore")
+):
+    """
+    Restore a checkpoint and leave the simulation paused at that state.
+
+    Resume with POST /api/simulation/start using the same mode.
+
+    Args:
+        name: Checkpoint name
+
+    Returns:
+        Restored tick, clock and restore duration
+
+    Example:
+        POST /api/simulation/restore?name=before_peak
+    """
+    try:
+        sim_manager = get_simulation_manager()
+        result = await sim_manager.restore_checkpoint(name=name)
+
+        await ws_manager.broadcast({
+            "type": "simulation_state",
+            "event": "restored",
+            "data": result,
+            "timestamp": datetime.now().isoformat()
+        })
+        return result
+
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error restoring checkpoint: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error restoring checkpoint: {str(e)}"
+        )
+
+
+@app.post("/api/simulation/recording/start", tags=["Simulation"])
+async def start_tick_recording(
+    name: str = Query(..., description="Tick log name (written to outputs/tick_logs/<name>.mftl)")
+):
+    """
+    Start recording every tick's inputs and outputs to a tick log.
+
+    Replay the log against another build with TickReplayer
+    (scripts/analysis/replay_tick_log.py) to compare per-phase latency
+    and output drift.
+
+    Args:
+        name: Tick log name
+
+    Returns:
+        Log path and the tick the recording starts at
+
+    Example:
+        POST /api/simulation/recording/start?name=flood_day_2025_11_18
+    """
+    try:
+        sim_manager = get_simulation_manager()
+        path = tick_log_path(sim_manager.tick_log_directory, name)
+        info = await sim_manager.start_recording(path)
+        return {"status": "success", "recording": info}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error starting tick recording: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error starting tick recording: {str(e)}"
+        )
+
+
+@app.post("/api/simulation/recording/stop", tags=["Simulation"])
+async def stop_tick_recording():
+    """
+    Stop the active tick recording.
+
+    Returns:
+        Log path, records and bytes written
+
+    Example:
+        POST /api/simulation/recording/stop
+    """
+    try:
+        sim_manager = get_simulation_manager()
+        return {"status": "success", "recording": sim_manager.stop_recording()}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.websocket("/ws/route-updates")
 async def websocket_route_updates(websocket: WebSocket):
     """
@@ -1169,6 +1437,7 @@ async def websocket_route_updates(websocket: WebSocket):
 
         # Keep connection alive and listen for messages
         while True:
+            data = {}
             try:
                 # Receive message from client
                 data = await websocket.receive_json()
@@ -1195,6 +1464,40 @@ async def websocket_route_updates(websocket: WebSocket):
                         websocket
                     )
 
+                elif data.get("type") == "request_route":
+                    # Route over the socket, optionally with a compact path encoding
+                    start = data.get("start_location")
+                    end = data.get("end_location")
+                    if not start or not end:
+                        raise ValueError("start_location and end_location are required")
+                    if not environment.graph:
+                        raise ValueError("Road network not loaded")
+
+                    route_result = await asyncio.to_thread(
+                        routing_agent.calculate_route,
+                        start=tuple(start),
+                        end=tuple(end),
+                        preferences=data.get("preferences")
+                    )
+                    path_fields = encode_route_path(
+                        route_result.get("path", []),
+                        data.get("encoding")
+                    )
+                    await ws_manager.send_personal_message(
+                        {
+                            "type": "route_result",
+                            "request_id": data.get("request_id"),
+                            "status": route_result.get("status"),
+                            "distance": route_result.get("distance"),
+                            "estimated_time": route_result.get("estimated_time"),
+                            "risk_level": route_result.get("risk_level"),
+                            "warnings": route_result.get("warnings", []),
+                            **path_fields,
+                            "timestamp": datetime.now().isoformat()
+                        },
+                        websocket
+                    )
+
             except WebSocketDisconnect:
                 break
             except Exception as e:
@@ -1202,6 +1505,7 @@ async def websocket_route_updates(websocket: WebSocket):
                 await ws_manager.send_personal_message(
                     {
                         "type": "error",
+                        "request_id": data.get("request_id") if isinstance(data, dict) else None,
                         "message": str(e),
                         "timestamp": datetime.now().isoformat()
                     },
@@ -1950,6 +2254,34 @@ async def get_available_flood_maps():
         )
 
 
+@app.get("/api/geotiff/cache-stats")
+async def get_geotiff_cache_stats():
+    """
+    Get GeoTIFF raster cache metrics.
+
+    Returns entries, bytes used against the budget, hits, misses and evictions,
+    plus flood tile cache usage.
+    """
+    try:
+        from app.services.geotiff_service import get_geotiff_service
+        from app.services.flood_tiles import get_flood_tile_renderer
+
+        service = get_geotiff_service()
+
+        return {
+            "status": "success",
+            "cache": service.get_cache_stats(),
+            "tiles": get_flood_tile_renderer().stats()
+        }
+
+    except Exception as e:
+        logger.error(f"Error getting GeoTIFF cache stats: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving cache stats: {str(e)}"
+        )
+
+
 @app.get("/api/geotiff/flood-map")
 async def get_flood_map(
     return_period: str = Query(
@@ -1993,6 +2325,123 @@ async def get_flood_map(
         )
 
 
+@app.get("/api/geotiff/flood-extent")
+async def get_flood_extent(
+    return_period: str = Query(
+        "rr01",
+        description="Return period (rr01, rr02, rr03, rr04)"
+    ),
+    time_step: int = Query(
+        1,
+        ge=1,
+        le=18,
+        description="Time step (1-18 hours)"
+    ),
+    threshold: float = Query(
+        0.01,
+        ge=0.0,
+        description="Minimum flood depth to include (meters)"
+    ),
+    zoom: float = Query(
+        14,
+        ge=0,
+        le=22,
+        description="Display zoom level; sets the simplification tolerance"
+    ),
+    tolerance: Optional[float] = Query(
+        None,
+        ge=0.0,
+        description="Simplification tolerance in degrees (overrides zoom)"
+    )
+):
+    """
+    Get flood extent polygons as GeoJSON, one MultiPolygon per depth band.
+
+    Bands: threshold-0.5m, 0.5-1m, 1-2m, >=2m. Geometry is simplified to
+    about one screen pixel at the requested zoom and cached server-side.
+
+    Example: /api/geotiff/flood-extent?return_period=rr04&time_step=18&zoom=13
+    """
+    try:
+        from app.services.geotiff_service import get_geotiff_service
+
+        service = get_geotiff_service()
+        return await asyncio.to_thread(
+            service.get_flood_map_as_geojson,
+            return_period, time_step, threshold, tolerance, zoom
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error building flood extent: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error building flood extent: {str(e)}"
+        )
+
+
+@app.get("/api/geotiff/road-closures")
+async def get_road_closures(
+    return_period: str = Query(
+        "rr01",
+        description="Return period (rr01, rr02, rr03, rr04)"
+    ),
+    vehicle_type: str = Query(
+        "car",
+        description="Vehicle class (car, suv, truck)"
+    )
+):
+    """
+    Get the forecast time step at which each road becomes impassable.
+
+    A road closes at the first time step whose flood depth reaches the
+    vehicle's static water limit. Only roads that close within the
+    forecast are listed.
+
+    Example: /api/geotiff/road-closures?return_period=rr03&vehicle_type=truck
+    """
+    if not hazard_agent:
+        raise HTTPException(status_code=503, detail="HazardAgent not initialized")
+
+    try:
+        from app.algorithms.time_dependent_astar import NEVER_INUNDATED
+
+        index = await asyncio.to_thread(
+            hazard_agent.get_inundation_index, return_period, vehicle_type
+        )
+        if index is None:
+            raise HTTPException(status_code=404, detail="No flood forecast available for road closures")
+
+        keys = list(hazard_agent.get_edge_depth_series(return_period).index)
+        closures = [
+            {"u": keys[i][0], "v": keys[i][1], "key": keys[i][2], "time_step": int(index[i])}
+            for i in (index != NEVER_INUNDATED).nonzero()[0]
+        ]
+
+        return {
+            "status": "success",
+            "return_period": return_period,
+            "vehicle_type": vehicle_type,
+            "depth_threshold": hazard_agent.passability_depths[vehicle_type],
+            "count": len(closures),
+            "closures": closures
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error building road closures: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error building road closures: {str(e)}"
+        )
+
+
 @app.get("/api/geotiff/flood-depth")
 async def get_flood_depth_at_point(
     lon: float = Query(..., description="Longitude (WGS84)"),
@@ -2054,6 +2503,131 @@ async def get_flood_depth_at_point(
         )
 
 
+@app.post("/api/geotiff/flood-depth/batch")
+async def get_flood_depths_batch(
+    request: Request,
+    return_period: str = Query(
+        "rr01",
+        description="Return period for binary bodies (rr01, rr02, rr03, rr04)"
+    ),
+    time_steps: List[int] = Query(
+        [1],
+        description="Time steps for binary bodies (repeat for several)"
+    )
+):
+    """
+    Get flood depths for many coordinates in one request.
+
+    JSON body (DepthBatchRequest): {"lons": [...], "lats": [...],
+    "return_period": "rr02", "time_steps": [1, 2, 3]} or "points" as
+    [[lon, lat], ...]. Depths come back as one list per time step, null
+    where there is no data.
+
+    Binary body (Content-Type: application/octet-stream): interleaved
+    little-endian float64 lon, lat pairs, with return_period/time_steps as
+    query parameters. The response is little-endian float32 depths,
+    row-major (time step, point), NaN where there is no data; shape in
+    the X-Time-Steps and X-Points headers.
+    """
+    try:
+        from app.services.geotiff_service import get_geotiff_service, pack_depths, unpack_points
+
+        service = get_geotiff_service()
+        binary = request.headers.get("content-type", "").startswith("application/octet-stream")
+
+        if binary:
+            lons, lats = unpack_points(await request.body())
+        else:
+            try:
+                query = DepthBatchRequest(**await request.json())
+            except (ValidationError, json.JSONDecodeError, TypeError) as e:
+                raise ValueError(f"Invalid batch request: {e}")
+            if query.points is not None:
+                lons = [p[0] for p in query.points]
+                lats = [p[1] for p in query.points]
+            else:
+                lons, lats = query.lons, query.lats
+            return_period, time_steps = query.return_period, query.time_steps
+
+        depths = await asyncio.to_thread(
+            service.get_flood_depths_at_points, lons, lats, return_period, time_steps
+        )
+
+        if binary:
+            return Response(
+                content=pack_depths(depths),
+                media_type="application/octet-stream",
+                headers={"X-Time-Steps": str(depths.shape[0]), "X-Points": str(depths.shape[1])}
+            )
+
+        return {
+            "status": "success",
+            "return_period": return_period,
+            "time_steps": time_steps,
+            "count": depths.shape[1],
+            "depths": [
+                [None if math.isnan(d) else round(d, 4) for d in row.tolist()]
+                for row in depths
+            ]
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error querying batch flood depths: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error querying batch flood depths: {str(e)}"
+        )
+
+
+@app.get("/api/geotiff/tiles/{return_period}/{time_step}/{z}/{x}/{y}.png")
+async def get_flood_tile(
+    return_period: str,
+    time_step: int,
+    z: int,
+    x: int,
+    y: int,
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get a colour-mapped flood depth tile (XYZ, 256px PNG).
+
+    Tiles are rendered from the cached rasters with the same manual
+    georeferencing as the TIFF overlay and cached in memory and on disk.
+    Responses carry an ETag; a matching If-None-Match returns 304.
+
+    Example: /api/geotiff/tiles/rr02/6/15/27446/15010.png
+    """
+    try:
+        from app.services.flood_tiles import get_flood_tile_renderer
+
+        renderer = get_flood_tile_renderer()
+        headers = {"Cache-Control": "public, max-age=3600"}
+
+        etag = renderer.tile_etag(return_period, time_step, z, x, y)
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers={**headers, "ETag": etag})
+
+        png, etag = await asyncio.to_thread(
+            renderer.get_tile, return_period, time_step, z, x, y
+        )
+        return Response(content=png, media_type="image/png", headers={**headers, "ETag": etag})
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error rendering flood tile: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error rendering flood tile: {str(e)}"
+        )
+
+
 @app.get("/data/timed_floodmaps/{return_period}/{filename}")
 async def serve_geotiff_file(return_period: str, filename: str):
     """
@@ -2146,7 +2720,7 @@ async def get_simulation_events_debug():
         )
 
     # Get next 10 events without removing them
-    upcoming_events = simulation_manager._event_queue[:10] if simulation_manager._event_queue else []
+    upcoming_events = [event.to_dict() for event in simulation_manager._event_queue.upcoming(10)]
 
     return {
         "status": "success",
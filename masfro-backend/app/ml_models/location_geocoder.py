@@ -333,6 +333,47 @@ class LocationGeocoder:
 
         return enhanced_result
 
+    def geocode_nlp_results(self, nlp_results: List[Dict]) -> List[Dict]:
+        """
+        Enhance many NLP results with coordinates.
+
+        Each distinct location name is resolved once per batch, and the
+        case-insensitive index is built once instead of being scanned per
+        report.
+
+        Args:
+            nlp_results: Results from NLPProcessor.extract_flood_info_batch()
+
+        Returns:
+            Enhanced results (same order) with coordinates added
+        """
+        lower_index = {name.lower(): coords for name, coords in self.location_coordinates.items()}
+        resolved: Dict[str, Optional[Tuple[float, float]]] = {}
+
+        enhanced_results = []
+        for nlp_result in nlp_results:
+            enhanced_result = nlp_result.copy()
+            location = nlp_result.get("location")
+
+            coords = None
+            if location:
+                if location not in resolved:
+                    coords = self.location_coordinates.get(location) or lower_index.get(location.lower())
+                    if coords is None:
+                        coords = self.get_coordinates(location, fuzzy=True, threshold=0.6)
+                    resolved[location] = coords
+                coords = resolved[location]
+
+            if coords:
+                enhanced_result["coordinates"] = {"lat": coords[0], "lon": coords[1]}
+                enhanced_result["has_coordinates"] = True
+            else:
+                enhanced_result["coordinates"] = None
+                enhanced_result["has_coordinates"] = False
+            enhanced_results.append(enhanced_result)
+
+        return enhanced_results
+
     def get_nearby_locations(
         self,
         lat: float,
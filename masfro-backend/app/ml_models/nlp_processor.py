@@ -210,6 +210,59 @@ class NLPProcessor:
         # 3. Severity classification (ML or fallback)
         severity_label, severity_score = self._classify_severity(text)
 
+        return self._assemble_result(
+            text,
+            (is_flood_related, flood_confidence),
+            (location, location_confidence),
+            (severity_label, severity_score)
+        )
+
+    def extract_flood_info_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract flood information from many texts with batched model calls.
+
+        Produces the same results as calling extract_flood_info() per text,
+        but runs each sklearn classifier once over the whole batch and
+        streams all texts through spaCy with nlp.pipe().
+
+        Args:
+            texts: Social media post texts
+
+        Returns:
+            List of extracted information dicts, in input order
+
+        Example:
+            >>> infos = processor.extract_flood_info_batch([
+            ...     "Baha sa Nangka! Tuhod level!",
+            ...     "Clear na sa Tumana, madaan na."
+            ... ])
+            >>> [info['severity'] for info in infos]
+            [0.65, 0.0]
+        """
+        if not texts:
+            return []
+
+        floods = self._classify_flood_batch(texts)
+        locations = self._extract_location_batch(texts)
+        severities = self._classify_severity_batch(texts)
+
+        return [
+            self._assemble_result(text, flood, location, severity)
+            for text, flood, location, severity in zip(texts, floods, locations, severities)
+        ]
+
+    def _assemble_result(
+        self,
+        text: str,
+        flood: tuple,
+        location: tuple,
+        severity: tuple
+    ) -> Dict[str, Any]:
+        """Combine per-model outputs into an extract_flood_info() result."""
+        is_flood_related, flood_confidence = flood
+        location, location_confidence = location
+        severity_label, severity_score = severity
+
         # 4. Map severity to 0-1 scale
         # If model outputs unknown label, default to 0.0
         severity = self.severity_mapping.get(severity_label, 0.0)
@@ -253,6 +306,58 @@ class NLPProcessor:
             }
         }
 
+    @staticmethod
+    def _predict_batch(classifier, texts: List[str], default_confidence: float) -> List[tuple]:
+        """Run one predict (and predict_proba) call over all texts."""
+        predictions = classifier.predict(texts)
+        if hasattr(classifier, 'predict_proba'):
+            confidences = classifier.predict_proba(texts).max(axis=1).tolist()
+        else:
+            confidences = [default_confidence] * len(texts)
+        return list(zip(predictions, confidences))
+
+    def _classify_flood_batch(self, texts: List[str]) -> List[tuple]:
+        """Batched _classify_flood()."""
+        if self.flood_classifier is None:
+            return [self._classify_flood_fallback(text) for text in texts]
+
+        try:
+            return [
+                (prediction == "flood", float(confidence))
+                for prediction, confidence in self._predict_batch(self.flood_classifier, texts, 0.5)
+            ]
+        except Exception as e:
+            logger.error(f"Error in batched flood classification: {e}")
+            return [self._classify_flood(text) for text in texts]
+
+    def _classify_severity_batch(self, texts: List[str]) -> List[tuple]:
+        """Batched _classify_severity()."""
+        if self.severity_classifier is None:
+            return [self._classify_severity_fallback(text) for text in texts]
+
+        try:
+            return [
+                (prediction, float(confidence))
+                for prediction, confidence in self._predict_batch(self.severity_classifier, texts, 0.8)
+            ]
+        except Exception as e:
+            logger.error(f"Error in batched severity classification: {e}")
+            return [self._classify_severity(text) for text in texts]
+
+    def _extract_location_batch(self, texts: List[str]) -> List[tuple]:
+        """Batched _extract_location() using spaCy's nlp.pipe()."""
+        if self.location_model is None:
+            return [self._extract_location_fallback(text) for text in texts]
+
+        try:
+            return [
+                self._location_from_doc(doc)
+                for doc in self.location_model.pipe(texts, batch_size=64)
+            ]
+        except Exception as e:
+            logger.error(f"Error in batched location extraction: {e}")
+            return [self._extract_location(text) for text in texts]
+
     def _classify_flood(self, text: str) -> tuple[bool, float]:
         """
         Classify if text is flood-related using ML model.
@@ -321,63 +426,72 @@ class NLPProcessor:
 
         try:
             # Use spaCy NER model
-            doc = self.location_model(text)
-
-            # Extract location entities
-            locations = [ent.text for ent in doc.ents if ent.label_ == "LOC"]
-
-            if locations:
-                # Clean and filter locations
-                cleaned_locations = []
-                for loc in locations:
-                    # Split on punctuation and take first part (in case entity spans multiple phrases)
-                    import re
-                    parts = re.split(r'[.!?;]+', loc)
-                    cleaned = parts[0].strip() if parts else loc
-
-                    # Remove trailing and leading punctuation from cleaned part
-                    cleaned = cleaned.strip('.,!?;:')
-
-                    # Remove common suffixes/prefixes that aren't part of location
-                    stop_words = ['area', 'near', 'at', 'sa', 'ng', 'pa', 'na', 'ko', 'ka']
-                    words = cleaned.split()
-
-                    # Remove stop words from the end
-                    while words and words[-1].lower() in stop_words:
-                        words.pop()
-
-                    # Remove stop words from the beginning
-                    while words and words[0].lower() in stop_words:
-                        words.pop(0)
-
-                    cleaned = ' '.join(words) if words else cleaned
-
-                    # Filter out common false positives
-                    false_positives = [
-                        'urgent', 'update', 'alert', 'warning', 'help',
-                        'all', 'now', 'today', 'yesterday', 'ulan', 'rain',
-                        'baha', 'flood', 'tubig', 'water', 'bantayan',
-                        'madaan', 'lahat'
-                    ]
-
-                    if cleaned.lower() not in false_positives and len(cleaned) > 2:
-                        cleaned_locations.append(cleaned)
-
-                if cleaned_locations:
-                    # Return first valid location with high confidence
-                    location = cleaned_locations[0]
-                    confidence = 0.85  # Default high confidence for NER
-
-                    logger.debug(f"Location extracted: {location} (confidence: {confidence:.2f})")
-                    return location, confidence
-
-            logger.debug("No valid location entities found")
-            return None, 0.0
+            return self._location_from_doc(self.location_model(text))
 
         except Exception as e:
             logger.error(f"Error in location extraction: {e}")
             return self._extract_location_fallback(text)
 
+    def _location_from_doc(self, doc) -> tuple[Optional[str], float]:
+        """
+        Pick the first valid location entity from a spaCy Doc.
+
+        Args:
+            doc: spaCy Doc produced by the location model
+
+        Returns:
+            (location: str or None, confidence: float)
+        """
+        # Extract location entities
+        locations = [ent.text for ent in doc.ents if ent.label_ == "LOC"]
+
+        if locations:
+            # Clean and filter locations
+            cleaned_locations = []
+            for loc in locations:
+                # Split on punctuation and take first part (in case entity spans multiple phrases)
+                parts = re.split(r'[.!?;]+', loc)
+                cleaned = parts[0].strip() if parts else loc
+
+                # Remove trailing and leading punctuation from cleaned part
+                cleaned = cleaned.strip('.,!?;:')
+
+                # Remove common suffixes/prefixes that aren't part of location
+                stop_words = ['area', 'near', 'at', 'sa', 'ng', 'pa', 'na', 'ko', 'ka']
+                words = cleaned.split()
+
+                # Remove stop words from the end
+                while words and words[-1].lower() in stop_words:
+                    words.pop()
+
+                # Remove stop words from the beginning
+                while words and words[0].lower() in stop_words:
+                    words.pop(0)
+
+                cleaned = ' '.join(words) if words else cleaned
+
+                # Filter out common false positives
+                false_positives = [
+                    'urgent', 'update', 'alert', 'warning', 'help',
+                    'all', 'now', 'today', 'yesterday', 'ulan', 'rain',
+                    'baha', 'flood', 'tubig', 'water', 'bantayan',
+                    'madaan', 'lahat'
+                ]
+
+                if cleaned.lower() not in false_positives and len(cleaned) > 2:
+                    cleaned_locations.append(cleaned)
+
+            if cleaned_locations:
+                # Return first valid location with high confidence
+                location = cleaned_locations[0]
+                confidence = 0.85  # Default high confidence for NER
+
+                logger.debug(f"Location extracted: {location} (confidence: {confidence:.2f})")
+                return location, confidence
+
+        logger.debug("No valid location entities found")
+        return None, 0.0
+
     def _extract_location_fallback(self, text: str) -> tuple[Optional[str], float]:
         """Fallback rule-based location extraction."""
 
@@ -481,6 +595,11 @@ class NLPProcessor:
         Returns:
             List of extracted information dicts
         """
+        try:
+            return self.extract_flood_info_batch(texts)
+        except Exception as e:
+            logger.error(f"Batched processing failed, processing texts one by one: {e}")
+
         results = []
         for text in texts:
             try:
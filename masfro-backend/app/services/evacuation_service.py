@@ -40,6 +40,8 @@ class EvacuationCenterService:
         """
         self.centers: pd.DataFrame = pd.DataFrame()
         self.occupancy: Dict[str, int] = {}
+        # Static per-center attributes keyed by name (avoids DataFrame scans per lookup)
+        self._center_rows: Dict[str, Dict[str, Any]] = {}
         self.last_update: datetime = datetime.now()
 
         # Load centers from CSV
@@ -78,13 +80,18 @@ class EvacuationCenterService:
             self.centers = pd.read_csv(csv_path)
             logger.info(f"Loaded {len(self.centers)} evacuation centers from {csv_path}")
 
+            self._center_rows = {
+                record['name']: record for record in self.centers.to_dict('records')
+            }
+
             # Initialize occupancy to 0 for all centers
-            self.occupancy = {row['name']: 0 for _, row in self.centers.iterrows()}
+            self.occupancy = {name: 0 for name in self._center_rows}
 
         except Exception as e:
             logger.error(f"Failed to load evacuation centers: {e}")
             self.centers = pd.DataFrame()
             self.occupancy = {}
+            self._center_rows = {}
 
     def get_all_centers(self) -> List[Dict[str, Any]]:
         """
@@ -96,38 +103,9 @@ class EvacuationCenterService:
         if self.centers.empty:
             return []
 
-        centers_list = []
-        for _, row in self.centers.iterrows():
-            center_name = row['name']
-            capacity = int(row['capacity'])
-            current_occupancy = self.occupancy.get(center_name, 0)
-
-            # Calculate availability status
-            occupancy_ratio = current_occupancy / capacity if capacity > 0 else 0
-            if occupancy_ratio >= 0.95:
-                status = 'full'
-            elif occupancy_ratio >= 0.70:
-                status = 'limited'
-            else:
-                status = 'available'
-
-            centers_list.append({
-                'name': center_name,
-                'coordinates': {
-                    'lat': float(row['latitude']),
-                    'lon': float(row['longitude'])
-                },
-                'location': row.get('address', ''),
-                'barangay': row.get('barangay', ''),
-                'capacity': capacity,
-                'current_occupancy': current_occupancy,
-                'available_slots': max(0, capacity - current_occupancy),
-                'occupancy_percentage': round(occupancy_ratio * 100, 1),
-                'status': status,
-                'type': row.get('type', 'unknown'),
-                'contact': row.get('contact', ''),
-                'facilities': row.get('facilities', '').split(', ') if pd.notna(row.get('facilities')) else []
-            })
+        centers_list = [
+            self._build_center(name, row) for name, row in self._center_rows.items()
+        ]
 
         # Sort by availability (available first, then limited, then full)
         status_order = {'available': 0, 'limited': 1, 'full': 2}
@@ -155,11 +133,51 @@ class EvacuationCenterService:
         Returns:
             Center dictionary or None if not found
         """
-        all_centers = self.get_all_centers()
-        for center in all_centers:
-            if center['name'] == name:
-                return center
-        return None
+        row = self._center_rows.get(name)
+        if row is None:
+            return None
+        return self._build_center(name, row)
+
+    def _build_center(self, center_name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the status dict of one center from its CSV row and occupancy.
+
+        Args:
+            center_name: Name of the evacuation center
+            row: CSV record of the center
+
+        Returns:
+            Center dictionary with capacity status
+        """
+        capacity = int(row['capacity'])
+        current_occupancy = self.occupancy.get(center_name, 0)
+
+        # Calculate availability status
+        occupancy_ratio = current_occupancy / capacity if capacity > 0 else 0
+        if occupancy_ratio >= 0.95:
+            status = 'full'
+        elif occupancy_ratio >= 0.70:
+            status = 'limited'
+        else:
+            status = 'available'
+
+        return {
+            'name': center_name,
+            'coordinates': {
+                'lat': float(row['latitude']),
+                'lon': float(row['longitude'])
+            },
+            'location': row.get('address', ''),
+            'barangay': row.get('barangay', ''),
+            'capacity': capacity,
+            'current_occupancy': current_occupancy,
+            'available_slots': max(0, capacity - current_occupancy),
+            'occupancy_percentage': round(occupancy_ratio * 100, 1),
+            'status': status,
+            'type': row.get('type', 'unknown'),
+            'contact': row.get('contact', ''),
+            'facilities': row.get('facilities', '').split(', ') if pd.notna(row.get('facilities')) else []
+        }
 
     def update_occupancy(self, center_name: str, occupancy: int) -> bool:
         """
@@ -177,11 +195,11 @@ class EvacuationCenterService:
             return False
 
         # Get capacity to validate
-        center_row = self.centers[self.centers['name'] == center_name]
-        if center_row.empty:
+        center_row = self._center_rows.get(center_name)
+        if center_row is None:
             return False
 
-        capacity = int(center_row.iloc[0]['capacity'])
+        capacity = int(center_row['capacity'])
 
         # Clamp occupancy to valid range
         occupancy = max(0, min(occupancy, capacity))
@@ -0,0 +1,274 @@
+# filename: app/services/flood_map_store.py
+
+"""
+Memory-Mapped Flood Map Store for MAS-FRO
+
+One-time conversion of the rrXX-N.tif flood maps into raw .npy arrays with
+a JSON sidecar (shape, bounds, transform, statistics). GeoTIFFService opens
+converted maps with np.load(mmap_mode='r'), so queries read straight from
+the OS page cache without rasterio/GDAL, several worker processes share a
+single physical copy, and switching scenarios costs a header read.
+
+Layout:
+    <store_dir>/rr01/rr01-1.npy
+    <store_dir>/rr01/rr01-1.json
+
+A sidecar records the source file's size and mtime; a map whose GeoTIFF
+changed since conversion is treated as missing until reconverted.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+STORE_DTYPES = ("float32", "float16")
+
+
+def depth_statistics(data: np.ndarray) -> Dict[str, Any]:
+    """
+    Flood statistics for a depth array (NaN = nodata, >1cm = flooded).
+
+    Args:
+        data: Depth array in metres
+
+    Returns:
+        Dict with total/valid/flooded pixel counts and min/max/mean depth
+    """
+    return blockwise_depth_statistics([data])
+
+
+def blockwise_depth_statistics(blocks: Iterable[np.ndarray]) -> Dict[str, Any]:
+    """
+    Flood statistics accumulated over the blocks of a larger raster.
+
+    Lets whole-band statistics be computed from strips without holding
+    the full band in memory; the result equals depth_statistics() on the
+    concatenated data.
+
+    Args:
+        blocks: Depth arrays in metres (NaN = nodata)
+
+    Returns:
+        Dict with total/valid/flooded pixel counts and min/max/mean depth
+    """
+    total = valid = flooded = 0
+    depth_sum = 0.0
+    min_depth = float("inf")
+    max_depth = 0.0
+
+    for data in blocks:
+        valid_data = data[~np.isnan(data)]
+        flooded_pixels = valid_data[valid_data > 0.01]  # >1cm threshold
+        total += int(data.size)
+        valid += int(valid_data.size)
+        if flooded_pixels.size:
+            flooded += int(flooded_pixels.size)
+            depth_sum += float(np.sum(flooded_pixels, dtype=np.float64))
+            min_depth = min(min_depth, float(np.min(flooded_pixels)))
+            max_depth = max(max_depth, float(np.max(flooded_pixels)))
+
+    return {
+        "total_pixels": total,
+        "valid_pixels": valid,
+        "flooded_pixels": flooded,
+        "min_depth": min_depth if flooded else 0.0,
+        "max_depth": max_depth if flooded else 0.0,
+        "mean_depth": depth_sum / flooded if flooded else 0.0,
+    }
+
+
+def store_paths(store_dir: Path, return_period: str, time_step: int) -> Tuple[Path, Path]:
+    """
+    Array and sidecar paths for one map.
+
+    Returns:
+        Tuple of (npy_path, json_path)
+    """
+    base = Path(store_dir) / return_period / f"{return_period}-{time_step}"
+    return base.with_suffix(".npy"), base.with_suffix(".json")
+
+
+def _source_signature(tif_path: Path) -> Dict[str, int]:
+    stat = os.stat(tif_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def convert_flood_map(
+    tif_path: Path,
+    npy_path: Path,
+    json_path: Path,
+    return_period: str,
+    time_step: int,
+    dtype: str = "float32"
+) -> Dict[str, Any]:
+    """
+    Convert one GeoTIFF into an .npy array and JSON sidecar.
+
+    Both files are written to temporary names and renamed into place, so
+    readers never see a half-written map.
+
+    Args:
+        tif_path: Source GeoTIFF
+        npy_path: Destination array
+        json_path: Destination sidecar
+        return_period: Return period of the map
+        time_step: Time step of the map
+        dtype: Stored dtype ("float32" or "float16")
+
+    Returns:
+        The sidecar dict
+    """
+    import rasterio
+
+    if dtype not in STORE_DTYPES:
+        raise ValueError(f"Invalid store dtype: {dtype}. Valid options: {STORE_DTYPES}")
+
+    with rasterio.open(tif_path) as src:
+        data = src.read(1, out_dtype="float32")
+        sidecar = {
+            "version": STORE_VERSION,
+            "shape": list(src.shape),
+            "dtype": dtype,
+            "bounds": {
+                "left": src.bounds.left,
+                "bottom": src.bounds.bottom,
+                "right": src.bounds.right,
+                "top": src.bounds.top
+            },
+            "crs": str(src.crs),
+            "transform": list(src.transform)[:6],
+            "nodata": src.nodata,
+            "return_period": return_period,
+            "time_step": time_step,
+            "statistics": depth_statistics(data),
+            "source": _source_signature(tif_path)
+        }
+
+    npy_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_npy = npy_path.with_name(npy_path.stem + ".tmp.npy")
+    tmp_json = json_path.with_name(json_path.name + ".tmp")
+    np.save(tmp_npy, np.ascontiguousarray(data.astype(dtype, copy=False)))
+    with open(tmp_json, "w", encoding="utf-8") as f:
+        json.dump(sidecar, f, indent=2)
+    os.replace(tmp_npy, npy_path)
+    os.replace(tmp_json, json_path)
+
+    return sidecar
+
+
+def convert_flood_maps(
+    data_dir: Path,
+    store_dir: Path,
+    return_periods: Iterable[str],
+    time_steps: Iterable[int],
+    dtype: str = "float32",
+    force: bool = False
+) -> Dict[str, int]:
+    """
+    Convert every available flood map that is missing or stale in the store.
+
+    Args:
+        data_dir: Directory containing rrXX/rrXX-N.tif
+        store_dir: Destination directory
+        return_periods: Return periods to convert
+        time_steps: Time steps to convert
+        dtype: Stored dtype ("float32" or "float16")
+        force: Reconvert maps that are already current
+
+    Returns:
+        Dict with converted, skipped and missing counts
+    """
+    counts = {"converted": 0, "skipped": 0, "missing": 0}
+    time_steps = list(time_steps)
+
+    for rp in return_periods:
+        for ts in time_steps:
+            tif_path = Path(data_dir) / rp / f"{rp}-{ts}.tif"
+            if not tif_path.exists():
+                counts["missing"] += 1
+                continue
+
+            npy_path, json_path = store_paths(store_dir, rp, ts)
+            if not force and read_sidecar(json_path, tif_path) is not None and npy_path.exists():
+                counts["skipped"] += 1
+                continue
+
+            convert_flood_map(tif_path, npy_path, json_path, rp, ts, dtype)
+            counts["converted"] += 1
+
+    logger.info(
+        f"Flood map store {store_dir}: {counts['converted']} converted, "
+        f"{counts['skipped']} up to date, {counts['missing']} missing"
+    )
+    return counts
+
+
+def read_sidecar(json_path: Path, tif_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """
+    Read a sidecar, rejecting unknown versions and stale conversions.
+
+    Args:
+        json_path: Sidecar path
+        tif_path: Source GeoTIFF to check freshness against (optional)
+
+    Returns:
+        Sidecar dict, or None if missing, unreadable or stale
+    """
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if sidecar.get("version") != STORE_VERSION:
+        return None
+
+    if tif_path is not None and Path(tif_path).exists():
+        if sidecar.get("source") != _source_signature(tif_path):
+            logger.debug(f"Stale flood map store entry: {json_path}")
+            return None
+
+    return sidecar
+
+
+def open_mapped(
+    npy_path: Path,
+    json_path: Path,
+    tif_path: Optional[Path] = None
+) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+    """
+    Memory-map a converted flood map.
+
+    Args:
+        npy_path: Array path
+        json_path: Sidecar path
+        tif_path: Source GeoTIFF to check freshness against (optional)
+
+    Returns:
+        Tuple of (read-only memmap, sidecar), or None if not available
+    """
+    sidecar = read_sidecar(json_path, tif_path)
+    if sidecar is None or not npy_path.exists():
+        return None
+
+    try:
+        data = np.load(npy_path, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not map {npy_path}: {e}")
+        return None
+
+    if list(data.shape) != sidecar["shape"]:
+        logger.warning(f"Shape mismatch between {npy_path} and its sidecar")
+        return None
+
+    return data, sidecar
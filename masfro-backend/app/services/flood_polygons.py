@@ -0,0 +1,129 @@
+# filename: app/services/flood_polygons.py
+
+"""
+Flood Extent Polygons for MAS-FRO
+
+Turns a flood depth raster into depth-band polygons for vector display:
+the raster is classified into bands, polygonized (rasterio.features),
+and each band is simplified with a topology-preserving tolerance derived
+from the display zoom level.
+
+Band edges follow the depth breakpoints used for initial edge risk
+(0.5m, 1.0m, 2.0m) above the caller's minimum depth threshold.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from rasterio import features
+from rasterio.transform import Affine
+import shapely
+from shapely.geometry import MultiPolygon, mapping, shape
+
+logger = logging.getLogger(__name__)
+
+DEPTH_BANDS = (0.5, 1.0, 2.0)  # upper band edges above the threshold (metres)
+DEFAULT_ZOOM = 14
+COORDINATE_PRECISION = 1e-6  # degrees (~0.1m); keeps the GeoJSON compact
+
+
+def tolerance_for_zoom(zoom: float) -> float:
+    """
+    Simplification tolerance (degrees) of about one screen pixel at a zoom level.
+
+    Args:
+        zoom: Web map zoom level
+
+    Returns:
+        Tolerance in degrees
+    """
+    return 360.0 / (256.0 * 2 ** zoom)
+
+
+def band_edges(threshold: float, bands: Sequence[float] = DEPTH_BANDS) -> List[float]:
+    """
+    Lower edges of the depth bands, starting at threshold.
+
+    Args:
+        threshold: Minimum depth to include (metres)
+        bands: Candidate band edges
+
+    Returns:
+        Sorted list of lower band edges
+    """
+    return [threshold] + sorted(b for b in bands if b > threshold)
+
+
+def polygonize_depths(
+    data: np.ndarray,
+    bounds: Dict[str, float],
+    threshold: float = 0.01,
+    tolerance: float = 0.0,
+    bands: Sequence[float] = DEPTH_BANDS
+) -> List[Dict[str, Any]]:
+    """
+    Polygonize a depth raster into one MultiPolygon feature per depth band.
+
+    Args:
+        data: Depth array (NaN = nodata), row 0 at max_lat
+        bounds: Geographic bounds with min_lon, max_lon, min_lat, max_lat
+        threshold: Minimum depth to include (metres)
+        tolerance: Simplification tolerance in degrees (0 = none)
+        bands: Band edges above threshold (metres)
+
+    Returns:
+        List of GeoJSON Feature dicts (empty bands omitted)
+    """
+    height, width = data.shape
+    edges = band_edges(threshold, bands)
+
+    # 0 = dry/nodata, k = depth in [edges[k-1], edges[k])
+    classes = np.zeros(data.shape, dtype=np.uint8)
+    valid = ~np.isnan(data)
+    classes[valid] = np.digitize(data[valid], edges).astype(np.uint8)
+
+    transform = Affine(
+        (bounds['max_lon'] - bounds['min_lon']) / width, 0.0, bounds['min_lon'],
+        0.0, -(bounds['max_lat'] - bounds['min_lat']) / height, bounds['max_lat']
+    )
+
+    parts: Dict[int, List] = {}
+    for geometry, value in features.shapes(classes, mask=classes > 0, transform=transform):
+        parts.setdefault(int(value), []).append(shape(geometry))
+
+    min_area = tolerance * tolerance
+    result = []
+    for band in sorted(parts):
+        geometry = MultiPolygon(parts[band])
+        if tolerance > 0:
+            geometry = geometry.simplify(tolerance, preserve_topology=True)
+            polygons = getattr(geometry, "geoms", [geometry])
+            polygons = [p for p in polygons if p.area >= min_area]
+            if not polygons:
+                continue
+            geometry = MultiPolygon(polygons)
+        geometry = shapely.set_precision(geometry, COORDINATE_PRECISION)
+        if geometry.is_empty:
+            continue
+        if geometry.geom_type == "Polygon":
+            geometry = MultiPolygon([geometry])
+
+        lower = edges[band - 1]
+        upper: Optional[float] = edges[band] if band < len(edges) else None
+        result.append({
+            "type": "Feature",
+            "geometry": mapping(geometry),
+            "properties": {
+                "band": band,
+                "min_depth": lower,
+                "max_depth": upper,
+                "label": f"{lower:g}-{upper:g}m" if upper is not None else f">={lower:g}m",
+                "polygons": len(geometry.geoms)
+            }
+        })
+
+    return result
@@ -0,0 +1,191 @@
+# filename: app/services/flood_prefetch.py
+
+"""
+Flood Map Prefetcher for MAS-FRO
+
+Loads upcoming GeoTIFF time steps on a background thread while the
+simulation is still on the current one, so a tick that crosses into the
+next hour finds its raster decoded and its edge depths gathered instead
+of stalling on I/O.
+
+Scheduling is per return period: when the active return period changes
+(a simulation mode switch), pending work for the old one is cancelled and
+any results it produced are discarded.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PrefetchKey = Tuple[str, int]
+
+
+class FloodPrefetcher:
+    """
+    Background loader for (return_period, time_step) flood map work.
+
+    Attributes:
+        counters: scheduled, completed, cancelled, hits, waits and errors
+
+    Example:
+        >>> prefetcher = FloodPrefetcher(lambda rp, ts: load(rp, ts))
+        >>> prefetcher.schedule("rr02", [4, 5])
+        >>> result = prefetcher.take(("rr02", 4))  # None if never scheduled
+    """
+
+    def __init__(self, load: Callable[[str, int], Any], max_workers: int = 1):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            load: Function (return_period, time_step) -> result to keep
+            max_workers: Background threads
+        """
+        self._load = load
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+        self._pending: Dict[PrefetchKey, Future] = {}
+        self._results: Dict[PrefetchKey, Any] = {}
+        self._return_period: Optional[str] = None
+        self._generation = 0
+        self.counters = {
+            "scheduled": 0,
+            "completed": 0,
+            "cancelled": 0,
+            "hits": 0,
+            "waits": 0,
+            "errors": 0
+        }
+
+    @property
+    def return_period(self) -> Optional[str]:
+        """Return period currently being prefetched."""
+        return self._return_period
+
+    def schedule(self, return_period: str, time_steps: Iterable[int]) -> int:
+        """
+        Queue time steps for background loading.
+
+        A different return period than the last call cancels all pending
+        work first. Results not among time_steps are dropped.
+
+        Args:
+            return_period: Active return period
+            time_steps: Upcoming time steps to load
+
+        Returns:
+            Number of newly queued time steps
+        """
+        if return_period != self._return_period:
+            self.cancel()
+            self._return_period = return_period
+
+        wanted = {(return_period, ts) for ts in time_steps}
+        queued = 0
+
+        with self._lock:
+            for key in [k for k in self._results if k not in wanted]:
+                del self._results[key]
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="flood-prefetch"
+                )
+
+            for key in sorted(wanted, key=lambda k: k[1]):
+                if key in self._pending or key in self._results:
+                    continue
+                self._pending[key] = self._executor.submit(self._run, self._generation, key)
+                self.counters["scheduled"] += 1
+                queued += 1
+
+        return queued
+
+    def _run(self, generation: int, key: PrefetchKey) -> None:
+        try:
+            if generation != self._generation:
+                return
+            result = self._load(*key)
+            with self._lock:
+                if generation == self._generation:
+                    self._results[key] = result
+                    self.counters["completed"] += 1
+        except Exception as e:
+            logger.warning(f"Prefetch of {key[0]}-{key[1]} failed: {e}")
+            with self._lock:
+                self.counters["errors"] += 1
+        finally:
+            with self._lock:
+                if generation == self._generation:
+                    self._pending.pop(key, None)
+
+    def take(self, key: PrefetchKey) -> Optional[Any]:
+        """
+        Claim a prefetched result, waiting if it is still loading.
+
+        Args:
+            key: (return_period, time_step)
+
+        Returns:
+            The load result, or None if it was never scheduled or failed
+        """
+        with self._lock:
+            if key in self._results:
+                self.counters["hits"] += 1
+                return self._results.pop(key)
+            future = self._pending.get(key)
+
+        if future is None:
+            return None
+
+        try:
+            future.result()
+        except Exception:
+            return None
+
+        with self._lock:
+            if key in self._results:
+                self.counters["hits"] += 1
+                self.counters["waits"] += 1
+                return self._results.pop(key)
+        return None
+
+    def cancel(self) -> None:
+        """Cancel pending work and discard results."""
+        with self._lock:
+            self._generation += 1
+            for future in self._pending.values():
+                future.cancel()
+                self.counters["cancelled"] += 1
+            self._pending.clear()
+            self._results.clear()
+
+    def shutdown(self) -> None:
+        """Cancel everything and stop the background thread."""
+        self.cancel()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Prefetch counters and state.
+
+        Returns:
+            Dict with counters, return_period, pending and ready time steps
+        """
+        with self._lock:
+            return {
+                **self.counters,
+                "return_period": self._return_period,
+                "pending": sorted(ts for _, ts in self._pending),
+                "ready": sorted(ts for _, ts in self._results)
+            }
@@ -0,0 +1,467 @@
+# filename: app/services/flood_tiles.py
+
+"""
+Flood Depth Tile Renderer for MAS-FRO
+
+Renders colour-mapped XYZ (Web Mercator, 256px) PNG tiles from the cached
+flood depth rasters, so the frontend only downloads the viewport at the
+current zoom instead of whole GeoTIFFs per time step.
+
+- Georeferencing uses GeoTIFFService's manual bounds (same as the
+  frontend canvas overlay and point queries).
+- Each map gets an overview pyramid (2x2 NaN-aware means); a tile samples
+  the level whose pixel size is closest to, but not coarser than, the
+  tile's.
+- Colours follow the frontend flood gradient (cyan -> blue -> dark blue),
+  normalized to the map's flooded depth range; depths <= 1cm are transparent.
+- Rendered tiles are kept in a byte-bounded in-memory LRU and a
+  byte-bounded on-disk cache; ETags derive from the source GeoTIFF, so
+  unchanged tiles revalidate without rendering.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import hashlib
+import io
+import logging
+import math
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256
+MAX_ZOOM = 22
+FLOOD_THRESHOLD = 0.01  # metres; shallower pixels are transparent
+RENDER_VERSION = 1  # bump when colours or sampling change (invalidates ETags)
+
+
+def tile_bounds(z: int, x: int, y: int) -> Dict[str, float]:
+    """
+    Geographic bounds of an XYZ tile.
+
+    Args:
+        z: Zoom level
+        x: Tile column
+        y: Tile row (0 at the north)
+
+    Returns:
+        Dict with west, east, south, north in degrees
+    """
+    n = 2 ** z
+
+    def lat(row: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return {
+        "west": x / n * 360.0 - 180.0,
+        "east": (x + 1) / n * 360.0 - 180.0,
+        "north": lat(y),
+        "south": lat(y + 1)
+    }
+
+
+def depth_colormap() -> np.ndarray:
+    """
+    256-entry RGBA lookup table for normalized depth (0 = shallow, 1 = deep).
+
+    Matches the gradient of the frontend GeoTIFF canvas overlay.
+
+    Returns:
+        (256, 4) uint8 array
+    """
+    lut = np.zeros((256, 4), dtype=np.uint8)
+    for i in range(256):
+        n = i / 255.0
+        if n < 0.3:
+            t = n / 0.3
+            rgba = (64 + t * (30 - 64), 224 + t * (144 - 224), 208 + t * (255 - 208),
+                    min(255, 180 + n * 200))
+        elif n < 0.7:
+            t = (n - 0.3) / 0.4
+            rgba = (30 * (1 - t), 144 + t * (100 - 144), 255, 220 + n * 35)
+        else:
+            t = (n - 0.7) / 0.3
+            rgba = (0, 100 * (1 - t), 255 - t * (255 - 139), 255)
+        lut[i] = [int(c + 1e-6) for c in rgba]  # floor, as the frontend does
+    return lut
+
+
+def build_overviews(data: np.ndarray, min_size: int = 32) -> List[np.ndarray]:
+    """
+    Overview pyramid by repeated 2x2 NaN-aware averaging.
+
+    Level k pixel (r, c) covers level-0 pixels (r*2^k .. , c*2^k ..).
+
+    Args:
+        data: Full-resolution depths (NaN = nodata)
+        min_size: Stop once a level's shorter side is below this
+
+    Returns:
+        List of float32 arrays, level 0 first
+    """
+    levels = [data.astype(np.float32, copy=False)]
+    while min(levels[-1].shape) >= 2 * min_size:
+        level = levels[-1]
+        height, width = level.shape
+        padded = np.full((height + height % 2, width + width % 2), np.nan, dtype=np.float32)
+        padded[:height, :width] = level
+        blocks = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2)
+        valid = (~np.isnan(blocks)).sum(axis=(1, 3))
+        total = np.nan_to_num(blocks).sum(axis=(1, 3))
+        levels.append(np.where(valid > 0, total / np.maximum(valid, 1), np.nan).astype(np.float32))
+    return levels
+
+
+class _ByteLRU:
+    """Thread-safe LRU of bytes values bounded by total size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Any, Tuple[bytes, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def get(self, key: Any) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key: Any, item: Tuple[bytes, str]) -> None:
+        size = len(item[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            while self._items and self._bytes + size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted[0])
+            self._items[key] = item
+            self._bytes += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+class FloodTileRenderer:
+    """
+    XYZ PNG tile renderer over GeoTIFFService flood maps.
+
+    Attributes:
+        service: GeoTIFFService providing depths and georeferencing
+        cache_dir: On-disk tile cache directory (None disables it)
+        counters: memory_hits, disk_hits, rendered, empty
+
+    Example:
+        >>> renderer = FloodTileRenderer(get_geotiff_service())
+        >>> png, etag = renderer.get_tile("rr02", 6, 15, 27446, 15010)
+    """
+
+    def __init__(
+        self,
+        service,
+        cache_dir: Optional[str] = "cache/flood_tiles",
+        memory_bytes: int = 32 * 1024 * 1024,
+        disk_bytes: int = 256 * 1024 * 1024,
+        pyramid_maps: int = 8
+    ):
+        """
+        Initialize the renderer.
+
+        Args:
+            service: GeoTIFFService instance
+            cache_dir: Directory for cached PNGs (None = memory only)
+            memory_bytes: In-memory tile cache budget
+            disk_bytes: On-disk tile cache budget
+            pyramid_maps: Number of map overview pyramids kept in memory
+        """
+        self.service = service
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.disk_bytes = disk_bytes
+        self.pyramid_maps = pyramid_maps
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "rendered": 0, "empty": 0}
+
+        self._lut = depth_colormap()
+        self._memory = _ByteLRU(memory_bytes)
+        self._pyramids: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pyramid_lock = Lock()
+        self._disk_index: Optional["OrderedDict[Path, int]"] = None
+        self._disk_used = 0
+        self._disk_lock = Lock()
+        self._empty_png: Optional[bytes] = None
+
+    # ------------------------------------------------------------------
+    # Caching helpers
+    # ------------------------------------------------------------------
+
+    def _map_version(self, return_period: str, time_step: int) -> str:
+        signature = self.service.get_map_signature(return_period, time_step)
+        return hashlib.sha1(f"{signature}:{RENDER_VERSION}".encode("utf-8")).hexdigest()[:16]
+
+    def tile_etag(self, return_period: str, time_step: int, z: int, x: int, y: int) -> str:
+        """
+        ETag for a tile, computed without rendering it.
+
+        Returns:
+            Quoted ETag string
+        """
+        version = self._map_version(return_period, time_step)
+        digest = hashlib.sha1(f"{version}/{z}/{x}/{y}".encode("utf-8")).hexdigest()[:20]
+        return f'"{digest}"'
+
+    def _disk_path(self, version: str, z: int, x: int, y: int) -> Path:
+        return self.cache_dir / version / str(z) / str(x) / f"{y}.png"
+
+    def _load_disk_index(self) -> None:
+        """Scan existing cached tiles (oldest first) on first use."""
+        entries = []
+        if self.cache_dir.exists():
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith(".png"):
+                        path = Path(root) / name
+                        stat = path.stat()
+                        entries.append((stat.st_mtime_ns, path, stat.st_size))
+        entries.sort()
+        self._disk_index = OrderedDict((path, size) for _, path, size in entries)
+        self._disk_used = sum(size for _, _, size in entries)
+
+    def _disk_get(self, path: Path) -> Optional[bytes]:
+        with self._disk_lock:
+            if self._disk_index is None:
+                self._load_disk_index()
+            if path not in self._disk_index:
+                return None
+            try:
+                return path.read_bytes()
+            except OSError:
+                self._disk_used -= self._disk_index.pop(path)
+                return None
+
+    def _disk_put(self, path: Path, png: bytes) -> None:
+        with self._disk_lock:
+            if self._disk_index is None:
+                self._load_disk_index()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(png)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"Could not write tile cache {path}: {e}")
+                return
+            self._disk_used -= self._disk_index.pop(path, 0)
+            self._disk_index[path] = len(png)
+            self._disk_used += len(png)
+            while self._disk_used > self.disk_bytes and len(self._disk_index) > 1:
+                old_path, size = self._disk_index.popitem(last=False)
+                self._disk_used -= size
+                try:
+                    old_path.unlink()
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _pyramid(self, return_period: str, time_step: int, version: str) -> Dict[str, Any]:
+        """Overview pyramid and colour range for one map (LRU of pyramid_maps)."""
+        with self._pyramid_lock:
+            pyramid = self._pyramids.get(version)
+            if pyramid is not None:
+                self._pyramids.move_to_end(version)
+                return pyramid
+
+        data = self.service.get_full_depths(return_period, time_step)
+        flooded = data[data > FLOOD_THRESHOLD]
+        height, width = data.shape
+        bounds = self.service._calculate_manual_bounds(width, height)
+        pyramid = {
+            "levels": build_overviews(data),
+            "shape": (height, width),
+            "bounds": bounds,
+            "min_depth": float(flooded.min()) if flooded.size else 0.0,
+            "max_depth": float(flooded.max()) if flooded.size else 0.0
+        }
+
+        with self._pyramid_lock:
+            self._pyramids[version] = pyramid
+            while len(self._pyramids) > self.pyramid_maps:
+                self._pyramids.popitem(last=False)
+        return pyramid
+
+    def _encode(self, rgba: np.ndarray) -> bytes:
+        if Image is None:
+            raise RuntimeError("Pillow is required to render flood tiles")
+        buffer = io.BytesIO()
+        Image.fromarray(rgba, mode="RGBA").save(buffer, format="PNG", optimize=False)
+        return buffer.getvalue()
+
+    def _empty_tile(self) -> bytes:
+        if self._empty_png is None:
+            self._empty_png = self._encode(np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8))
+        return self._empty_png
+
+    def render_tile(self, return_period: str, time_step: int, z: int, x: int, y: int) -> bytes:
+        """
+        Render one tile (no caching).
+
+        Args:
+            return_period: Return period (rr01, rr02, rr03, rr04)
+            time_step: Time step (1-18)
+            z: Zoom level
+            x: Tile column
+            y: Tile row
+
+        Returns:
+            PNG bytes
+        """
+        version = self._map_version(return_period, time_step)
+        tile = tile_bounds(z, x, y)
+        pyramid = self._pyramid(return_period, time_step, version)
+        bounds = pyramid["bounds"]
+
+        if (tile["east"] <= bounds["min_lon"] or tile["west"] >= bounds["max_lon"] or
+                tile["north"] <= bounds["min_lat"] or tile["south"] >= bounds["max_lat"]):
+            self.counters["empty"] += 1
+            return self._empty_tile()
+
+        height, width = pyramid["shape"]
+        levels = pyramid["levels"]
+
+        # Coarsest overview whose pixels are still no larger than the tile's
+        tile_px = (tile["east"] - tile["west"]) / TILE_SIZE
+        raster_px = bounds["coverage_width"] / width
+        level = 0 if tile_px <= raster_px else int(math.floor(math.log2(tile_px / raster_px)))
+        level = max(0, min(level, len(levels) - 1))
+        data = levels[level]
+
+        # Pixel-centre coordinates (lat via Web Mercator)
+        n = 2 ** z
+        offsets = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+        lons = (x + offsets) / n * 360.0 - 180.0
+        lats = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + offsets) / n))))
+
+        # Same mapping as GeoTIFFService._lonlat_to_pixel, then down to the level
+        norm_x = (lons - bounds["min_lon"]) / (bounds["max_lon"] - bounds["min_lon"])
+        norm_y = (lats - bounds["min_lat"]) / (bounds["max_lat"] - bounds["min_lat"])
+        cols = np.clip((norm_x * width).astype(np.int64), 0, width - 1) >> level
+        rows = np.clip(((1.0 - norm_y) * height).astype(np.int64), 0, height - 1) >> level
+        col_inside = (lons >= bounds["min_lon"]) & (lons <= bounds["max_lon"])
+        row_inside = (lats >= bounds["min_lat"]) & (lats <= bounds["max_lat"])
+
+        depths = data[rows[:, None], cols[None, :]]
+        visible = (row_inside[:, None] & col_inside[None, :]) & (depths > FLOOD_THRESHOLD)
+
+        rgba = np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8)
+        if visible.any():
+            span = pyramid["max_depth"] - pyramid["min_depth"]
+            if span > 0:
+                normalized = (depths[visible] - pyramid["min_depth"]) / span
+            else:
+                normalized = np.zeros(int(visible.sum()), dtype=np.float32)
+            rgba[visible] = self._lut[np.clip((normalized * 255).astype(np.int64), 0, 255)]
+
+        self.counters["rendered"] += 1
+        return self._encode(rgba)
+
+    def get_tile(
+        self,
+        return_period: str,
+        time_step: int,
+        z: int,
+        x: int,
+        y: int
+    ) -> Tuple[bytes, str]:
+        """
+        Cached tile lookup, rendering on a miss.
+
+        Args:
+            return_period: Return period (rr01, rr02, rr03, rr04)
+            time_step: Time step (1-18)
+            z: Zoom level (0-22)
+            x: Tile column
+            y: Tile row
+
+        Returns:
+            Tuple of (png_bytes, etag)
+
+        Raises:
+            ValueError: If the tile coordinates or map are invalid
+            FileNotFoundError: If the GeoTIFF file is missing
+        """
+        if not 0 <= z <= MAX_ZOOM or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+            raise ValueError(f"Invalid tile coordinates: {z}/{x}/{y}")
+
+        version = self._map_version(return_period, time_step)
+        key = (version, z, x, y)
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            self.counters["memory_hits"] += 1
+            return cached
+
+        etag = self.tile_etag(return_period, time_step, z, x, y)
+        path = self._disk_path(version, z, x, y) if self.cache_dir else None
+        png = self._disk_get(path) if path else None
+        if png is not None:
+            self.counters["disk_hits"] += 1
+        else:
+            png = self.render_tile(return_period, time_step, z, x, y)
+            if path:
+                self._disk_put(path, png)
+
+        self._memory.put(key, (png, etag))
+        return png, etag
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Tile cache metrics.
+
+        Returns:
+            Dict with counters, memory cache and disk cache usage
+        """
+        with self._disk_lock:
+            disk = {
+                "entries": len(self._disk_index) if self._disk_index is not None else 0,
+                "bytes": self._disk_used,
+                "max_bytes": self.disk_bytes
+            }
+        with self._pyramid_lock:
+            pyramids = len(self._pyramids)
+        return {**self.counters, "memory": self._memory.stats(), "disk": disk, "pyramids": pyramids}
+
+
+# Global renderer instance
+_tile_renderer: Optional[FloodTileRenderer] = None
+
+
+def get_flood_tile_renderer() -> FloodTileRenderer:
+    """Get or create the global flood tile renderer."""
+    global _tile_renderer
+    if _tile_renderer is None:
+        from app.services.geotiff_service import get_geotiff_service
+        _tile_renderer = FloodTileRenderer(get_geotiff_service())
+    return _tile_renderer
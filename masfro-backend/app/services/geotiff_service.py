@@ -20,8 +20,10 @@ Date: November 2025
 
 import os
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Tuple, Optional, List
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Tuple, Optional, List, Sequence, Union
 import numpy as np
 
 # Configure GDAL environment variables BEFORE importing rasterio
@@ -32,7 +34,30 @@ os.environ['CPL_LOG'] = '/dev/null'  # Suppress GDAL C-level log messages
 
 import rasterio
 from rasterio.transform import rowcol
-from functools import lru_cache
+from rasterio.windows import Window
+
+from app.services.raster_cache import (
+    DEFAULT_CACHE_BYTES,
+    STORAGE_DTYPES,
+    CachedRaster,
+    RasterCache,
+    decode_depths,
+    encode_depths,
+)
+from app.services.flood_prefetch import FloodPrefetcher
+from app.services.flood_interpolation import (
+    INTERPOLATION_METHODS,
+    evaluate_interval,
+    interval_coefficients,
+)
+from app.services.flood_polygons import DEFAULT_ZOOM, polygonize_depths, tolerance_for_zoom
+from app.services.flood_map_store import (
+    blockwise_depth_statistics,
+    convert_flood_maps,
+    depth_statistics,
+    open_mapped,
+    store_paths,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +68,13 @@ class GeoTIFFService:
 
     Features:
     - Lazy loading of GeoTIFF files
-    - Caching for performance
+    - Byte-budgeted LRU raster cache with float16/uint16 storage
+    - Windowed reads clipped to a region of interest (e.g. the road graph)
+    - Zero-copy memory-mapped .npy store (see convert_to_store)
+    - Vectorized edge depth gather with background prefetch of upcoming time steps
+    - Sub-hourly (linear or monotone) interpolation of edge depths
+    - Batch point depth queries across time steps
+    - Depth-band flood extent polygons (GeoJSON), cached and precomputable
     - Query flood depth at coordinates with manual coordinate mapping
     - Get flood map bounds and metadata
 
@@ -59,20 +90,66 @@ class GeoTIFFService:
     MANUAL_CENTER_LON = 121.10305
     MANUAL_BASE_COVERAGE = 0.06  # Base coverage in degrees (~6.6km) - MUST MATCH FRONTEND!
 
-    def __init__(self, data_dir: str = "app/data/timed_floodmaps"):
+    MAX_BATCH_POINTS = 50000  # Per get_flood_depths_at_points call
+    WINDOW_FALLBACK_LIMIT = 16  # Out-of-window points read one by one below this
+
+    def __init__(
+        self,
+        data_dir: str = "app/data/timed_floodmaps",
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        storage: str = "float16",
+        clip_bounds: Optional[Tuple[float, float, float, float]] = None,
+        store_dir: Optional[str] = None
+    ):
         """
         Initialize GeoTIFF service.
 
         Args:
             data_dir: Directory containing GeoTIFF files
+            cache_bytes: Byte budget for cached rasters
+            storage: Cached depth dtype ("float16" or "uint16" millimetres)
+            clip_bounds: Optional (min_lon, min_lat, max_lon, max_lat) read window
+            store_dir: Memory-mapped .npy store (default: flood_map_store next to data_dir)
         """
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"Invalid storage dtype: {storage}. Valid options: {STORAGE_DTYPES}")
+
         self.data_dir = Path(data_dir)
+        self.store_dir = Path(store_dir) if store_dir else self.data_dir.parent / "flood_map_store"
+        self.use_store = True
         self.return_periods = ["rr01", "rr02", "rr03", "rr04"]
         self.time_steps = list(range(1, 19))  # 1-18
+        self.storage = storage
+        self.clip_bounds: Optional[Tuple[float, float, float, float]] = clip_bounds
+        self.window_fallback_reads = 0
 
-        # Cache for loaded GeoTIFF data
-        self._cache: Dict[str, np.ndarray] = {}
+        # Cache for loaded GeoTIFF data (metadata is small and kept for every map)
+        self._raster_cache = RasterCache(cache_bytes)
         self._metadata_cache: Dict[str, Dict] = {}
+        self._mapped_maps: Dict[str, np.ndarray] = {}  # full memmaps for out-of-window reads
+
+        # Edge endpoint samples (see set_edge_samples) and their gathered depths
+        self._edge_samples: Optional[Dict[str, Any]] = None
+        self._edge_depths: "OrderedDict[Tuple[str, int], np.ndarray]" = OrderedDict()
+        self._edge_depths_lock = Lock()
+        self.edge_depth_cache_size = 40
+        self.edge_depth_sync_loads = 0
+
+        # Per-interval interpolation coefficients (see get_edge_depths_at)
+        self._edge_coeffs: "OrderedDict[Tuple[str, int, str], np.ndarray]" = OrderedDict()
+        self.edge_coeff_cache_size = 8
+
+        # Background loading of upcoming time steps
+        self.prefetcher = FloodPrefetcher(self._prefetch_load)
+
+        # Flood extent polygons per (return_period, time_step, threshold, tolerance)
+        self._geojson_cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._geojson_lock = Lock()
+        self.geojson_cache_size = 96
+        self.geojson_hits = 0
+        self.geojson_misses = 0
+        self._geojson_thread: Optional[Thread] = None
+        self._geojson_stop = Event()
 
         # Verify data directory exists
         if not self.data_dir.exists():
@@ -105,27 +182,80 @@ class GeoTIFFService:
         """Generate cache key for return period and time step."""
         return f"{return_period}_{time_step}"
 
-    @lru_cache(maxsize=32)
-    def load_flood_map(
+    def set_clip_bounds(
         self,
-        return_period: str = "rr01",
-        time_step: int = 1
-    ) -> Tuple[np.ndarray, Dict]:
+        bounds: Optional[Tuple[float, float, float, float]],
+        margin: float = 0.005
+    ) -> None:
         """
-        Load flood map data from GeoTIFF file.
+        Restrict raster reads to a geographic bounding box.
+
+        Only the pixels covering the box (plus margin) are read and cached;
+        point queries outside it fall back to single-pixel reads. Changing
+        the bounds drops cached rasters since their windows no longer match.
 
         Args:
-            return_period: Return period (rr01, rr02, rr03, rr04)
-            time_step: Time step (1-18)
+            bounds: (min_lon, min_lat, max_lon, max_lat), or None to read full rasters
+            margin: Padding in degrees added on every side
+
+        Example:
+            >>> service.set_clip_bounds((121.08, 14.61, 121.12, 14.68))
+        """
+        if bounds is not None:
+            min_lon, min_lat, max_lon, max_lat = bounds
+            if min_lon > max_lon or min_lat > max_lat:
+                raise ValueError(f"Invalid clip bounds: {bounds}")
+            bounds = (min_lon - margin, min_lat - margin, max_lon + margin, max_lat + margin)
+
+        if bounds == self.clip_bounds:
+            return
+
+        self.clip_bounds = bounds
+        self._raster_cache.clear()
+        self._metadata_cache.clear()
+        self._mapped_maps.clear()
+        logger.info(f"GeoTIFF reads clipped to {bounds}" if bounds else "GeoTIFF clipping disabled")
+
+    def _clip_window(self, width: int, height: int) -> Window:
+        """
+        Pixel window covering the clip bounds (full raster if unset).
+
+        Args:
+            width: TIFF width in pixels
+            height: TIFF height in pixels
 
         Returns:
-            Tuple of (flood_depth_array, metadata_dict)
+            rasterio Window clamped to the raster (may be empty)
+        """
+        if self.clip_bounds is None:
+            return Window(0, 0, width, height)
+
+        min_lon, min_lat, max_lon, max_lat = self.clip_bounds
+        bounds = self._calculate_manual_bounds(width, height)
+        lon_span = bounds['max_lon'] - bounds['min_lon']
+        lat_span = bounds['max_lat'] - bounds['min_lat']
+
+        col_start = int(np.floor((min_lon - bounds['min_lon']) / lon_span * width))
+        col_stop = int(np.ceil((max_lon - bounds['min_lon']) / lon_span * width)) + 1
+        row_start = int(np.floor((1.0 - (max_lat - bounds['min_lat']) / lat_span) * height))
+        row_stop = int(np.ceil((1.0 - (min_lat - bounds['min_lat']) / lat_span) * height)) + 1
+
+        col_start, col_stop = max(0, col_start), min(width, col_stop)
+        row_start, row_stop = max(0, row_start), min(height, row_stop)
+
+        return Window(
+            col_start, row_start,
+            max(0, col_stop - col_start), max(0, row_stop - row_start)
+        )
+
+    def _validate_map(self, return_period: str, time_step: int) -> Path:
+        """
+        Validate a return period/time step and resolve its file.
 
         Raises:
             ValueError: If invalid return period or time step
             FileNotFoundError: If GeoTIFF file not found
         """
-        # Validate inputs
         if return_period not in self.return_periods:
             raise ValueError(
                 f"Invalid return period: {return_period}. "
@@ -143,51 +273,307 @@ class GeoTIFFService:
         if not file_path.exists():
             raise FileNotFoundError(f"GeoTIFF file not found: {file_path}")
 
+        return file_path
+
+    def get_raster(self, return_period: str = "rr01", time_step: int = 1) -> CachedRaster:
+        """
+        Get the cached (downcast, clipped) raster for a flood map.
+
+        Args:
+            return_period: Return period (rr01, rr02, rr03, rr04)
+            time_step: Time step (1-18)
+
+        Returns:
+            CachedRaster for the map
+
+        Raises:
+            ValueError: If invalid return period or time step
+            FileNotFoundError: If GeoTIFF file not found
+        """
+        key = self._get_cache_key(return_period, time_step)
+        raster = self._raster_cache.get(key)
+        if raster is not None:
+            return raster
+
+        file_path = self._validate_map(return_period, time_step)
+
+        raster = self._open_from_store(return_period, time_step, file_path) if self.use_store else None
+        if raster is not None:
+            self._raster_cache.put(key, raster)
+            return raster
+
         try:
             with rasterio.open(file_path) as src:
-                # Read flood depth data
-                data = src.read(1)
-
-                # Get metadata
-                metadata = {
-                    "bounds": {
-                        "left": src.bounds.left,
-                        "bottom": src.bounds.bottom,
-                        "right": src.bounds.right,
-                        "top": src.bounds.top
-                    },
-                    "shape": src.shape,
-                    "crs": str(src.crs),
-                    "transform": list(src.transform)[:6],  # Affine transform
-                    "nodata": src.nodata,
-                    "return_period": return_period,
-                    "time_step": time_step
-                }
-
-                # Calculate statistics
-                valid_data = data[~np.isnan(data)]
-                flooded_pixels = data[(~np.isnan(data)) & (data > 0.01)]  # >1cm threshold
-
-                metadata["statistics"] = {
-                    "total_pixels": int(data.size),
-                    "valid_pixels": int(valid_data.size),
-                    "flooded_pixels": int(flooded_pixels.size),
-                    "min_depth": float(np.min(flooded_pixels)) if flooded_pixels.size > 0 else 0.0,
-                    "max_depth": float(np.max(flooded_pixels)) if flooded_pixels.size > 0 else 0.0,
-                    "mean_depth": float(np.mean(flooded_pixels)) if flooded_pixels.size > 0 else 0.0,
-                }
-
-                logger.debug(
-                    f"Loaded {return_period}-{time_step}: "
-                    f"{metadata['statistics']['flooded_pixels']} flooded pixels"
-                )
-
-                return data, metadata
+                height, width = src.shape
+                window = self._clip_window(width, height)
+
+                if window.width and window.height:
+                    data = src.read(1, window=window, out_dtype="float32")
+                else:
+                    data = np.empty((0, 0), dtype=np.float32)
+
+                if key not in self._metadata_cache:
+                    self._metadata_cache[key] = self._build_metadata(
+                        src, data, window, return_period, time_step
+                    )
 
         except Exception as e:
             logger.error(f"Error loading GeoTIFF {file_path}: {e}")
             raise
 
+        encoded, scale = encode_depths(data, self.storage)
+        raster = CachedRaster(
+            encoded, scale, int(window.row_off), int(window.col_off), (height, width)
+        )
+        self._raster_cache.put(key, raster)
+
+        logger.debug(
+            f"Loaded {return_period}-{time_step}: window {data.shape} of "
+            f"{(height, width)}, {raster.nbytes} bytes as {self.storage}"
+        )
+
+        return raster
+
+    def _build_metadata(
+        self,
+        src,
+        data: np.ndarray,
+        window: Window,
+        return_period: str,
+        time_step: int
+    ) -> Dict:
+        """Metadata, full-raster and window depth statistics for a freshly read window."""
+        metadata = {
+            "bounds": {
+                "left": src.bounds.left,
+                "bottom": src.bounds.bottom,
+                "right": src.bounds.right,
+                "top": src.bounds.top
+            },
+            "shape": src.shape,
+            "window": {
+                "row_off": int(window.row_off),
+                "col_off": int(window.col_off),
+                "height": int(window.height),
+                "width": int(window.width)
+            },
+            "crs": str(src.crs),
+            "transform": list(src.transform)[:6],  # Affine transform
+            "nodata": src.nodata,
+            "return_period": return_period,
+            "time_step": time_step
+        }
+
+        # Statistics describe the whole map, whatever the clip window (the
+        # .npy store's sidecar does the same); the window gets its own key
+        window_statistics = depth_statistics(data)
+        if data.shape == src.shape:
+            metadata["statistics"] = window_statistics
+        else:
+            metadata["statistics"] = blockwise_depth_statistics(self._read_strips(src))
+        metadata["window_statistics"] = window_statistics
+
+        return metadata
+
+    @staticmethod
+    def _read_strips(src, target_pixels: int = 1 << 20):
+        """Yield the band as float32 row strips of about target_pixels."""
+        height, width = src.shape
+        block_rows = src.block_shapes[0][0] if src.block_shapes else 1
+        rows = max(block_rows, (target_pixels // max(width, 1)) // block_rows * block_rows)
+        for row_off in range(0, height, rows):
+            yield src.read(
+                1, window=Window(0, row_off, width, min(rows, height - row_off)),
+                out_dtype="float32"
+            )
+
+    def _open_from_store(
+        self,
+        return_period: str,
+        time_step: int,
+        file_path: Path
+    ) -> Optional[CachedRaster]:
+        """
+        Map a converted flood map from the .npy store, if present and current.
+
+        The clip window is a view of the memmap, so nothing is copied; the
+        sidecar supplies metadata and full-raster statistics.
+        """
+        npy_path, json_path = store_paths(self.store_dir, return_period, time_step)
+        mapped = open_mapped(npy_path, json_path, file_path)
+        if mapped is None:
+            return None
+
+        data, sidecar = mapped
+        self._mapped_maps[self._get_cache_key(return_period, time_step)] = data
+        height, width = data.shape
+        window = self._clip_window(width, height)
+        view = data[
+            int(window.row_off):int(window.row_off + window.height),
+            int(window.col_off):int(window.col_off + window.width)
+        ]
+
+        key = self._get_cache_key(return_period, time_step)
+        if key not in self._metadata_cache:
+            metadata = {
+                name: sidecar[name]
+                for name in ("bounds", "crs", "transform", "nodata", "statistics")
+            }
+            metadata["window_statistics"] = (
+                sidecar["statistics"] if view.shape == data.shape else depth_statistics(view)
+            )
+            metadata.update({
+                "shape": (height, width),
+                "window": {
+                    "row_off": int(window.row_off),
+                    "col_off": int(window.col_off),
+                    "height": int(window.height),
+                    "width": int(window.width)
+                },
+                "return_period": return_period,
+                "time_step": time_step
+            })
+            self._metadata_cache[key] = metadata
+
+        logger.debug(f"Mapped {return_period}-{time_step} from {npy_path}")
+        return CachedRaster(view, 1.0, int(window.row_off), int(window.col_off), (height, width))
+
+    def convert_to_store(self, dtype: str = "float32", force: bool = False) -> Dict[str, int]:
+        """
+        Convert all flood maps into the memory-mapped .npy store.
+
+        Only missing or stale maps are converted unless force is set.
+        Cached rasters are dropped so later queries use the store.
+
+        Args:
+            dtype: Stored dtype ("float32" or "float16")
+            force: Reconvert maps that are already current
+
+        Returns:
+            Dict with converted, skipped and missing counts
+
+        Example:
+            >>> get_geotiff_service().convert_to_store()
+            {'converted': 72, 'skipped': 0, 'missing': 0}
+        """
+        counts = convert_flood_maps(
+            self.data_dir, self.store_dir, self.return_periods, self.time_steps,
+            dtype=dtype, force=force
+        )
+        self._raster_cache.clear()
+        self._metadata_cache.clear()
+        self._mapped_maps.clear()
+        return counts
+
+    def load_flood_map(
+        self,
+        return_period: str = "rr01",
+        time_step: int = 1
+    ) -> Tuple[np.ndarray, Dict]:
+        """
+        Load flood map data from GeoTIFF file.
+
+        The array covers the clip window (see set_clip_bounds; the whole
+        raster by default) and is decoded to float32 from the cache.
+        Metadata, including the full-raster statistics (and the clip
+        window's under "window_statistics"), is computed once per map.
+
+        Args:
+            return_period: Return period (rr01, rr02, rr03, rr04)
+            time_step: Time step (1-18)
+
+        Returns:
+            Tuple of (flood_depth_array, metadata_dict)
+
+        Raises:
+            ValueError: If invalid return period or time step
+            FileNotFoundError: If GeoTIFF file not found
+        """
+        raster = self.get_raster(return_period, time_step)
+        metadata = self._metadata_cache[self._get_cache_key(return_period, time_step)]
+        return raster.decode(), dict(metadata)
+
+    def _read_pixel(
+        self,
+        return_period: str,
+        time_step: int,
+        row: int,
+        col: int
+    ) -> Optional[float]:
+        """Read one pixel outside the cached window straight from the file."""
+        self.window_fallback_reads += 1
+        mapped = self._mapped_maps.get(self._get_cache_key(return_period, time_step))
+        if mapped is not None:
+            value = float(mapped[row, col])
+            return None if np.isnan(value) else value
+        with rasterio.open(self._get_file_path(return_period, time_step)) as src:
+            value = src.read(1, window=Window(col, row, 1, 1), out_dtype="float32")[0, 0]
+        return None if np.isnan(value) else float(value)
+
+    def get_full_depths(self, return_period: str = "rr01", time_step: int = 1) -> np.ndarray:
+        """
+        Whole-raster float32 depths, regardless of the clip window.
+
+        Served from the cache when it holds the full raster, from the
+        memory-mapped store when converted, else read from the GeoTIFF
+        (not cached).
+
+        Args:
+            return_period: Return period (rr01, rr02, rr03, rr04)
+            time_step: Time step (1-18)
+
+        Returns:
+            float32 array of shape full_shape (NaN = nodata)
+        """
+        raster = self.get_raster(return_period, time_step)
+        if raster.data.shape == raster.full_shape:
+            return raster.decode()
+
+        mapped = self._mapped_maps.get(self._get_cache_key(return_period, time_step))
+        if mapped is not None:
+            return np.asarray(mapped, dtype=np.float32)
+
+        with rasterio.open(self._get_file_path(return_period, time_step)) as src:
+            return src.read(1, out_dtype="float32")
+
+    def get_map_signature(self, return_period: str, time_step: int) -> str:
+        """
+        Identifier that changes whenever a map's GeoTIFF changes.
+
+        Args:
+            return_period: Return period (rr01, rr02, rr03, rr04)
+            time_step: Time step (1-18)
+
+        Returns:
+            String built from the file's size and modification time
+        """
+        stat = os.stat(self._validate_map(return_period, time_step))
+        return f"{return_period}-{time_step}-{stat.st_size}-{stat.st_mtime_ns}"
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Raster cache metrics.
+
+        Returns:
+            Dict with cache entries/bytes/hits/misses/evictions, storage dtype,
+            clip bounds, out-of-window pixel reads and prefetch counters
+        """
+        stats = self._raster_cache.stats()
+        stats.update({
+            "storage": self.storage,
+            "store_dir": str(self.store_dir) if self.use_store else None,
+            "clip_bounds": list(self.clip_bounds) if self.clip_bounds else None,
+            "window_fallback_reads": self.window_fallback_reads,
+            "edge_depth_sync_loads": self.edge_depth_sync_loads,
+            "geojson": {
+                "entries": len(self._geojson_cache),
+                "hits": self.geojson_hits,
+                "misses": self.geojson_misses
+            },
+            "prefetch": self.prefetcher.stats()
+        })
+        return stats
+
     def _calculate_manual_bounds(self, tiff_width: int, tiff_height: int) -> Dict[str, float]:
         """
         Calculate manual geographic bounds for TIFF based on center point and aspect ratio.
@@ -290,9 +676,9 @@ class GeoTIFFService:
             Flood depth in meters, or None if outside bounds or NaN
         """
         try:
-            # Load TIFF data
-            data, metadata = self.load_flood_map(return_period, time_step)
-            height, width = data.shape
+            # Load cached raster
+            raster = self.get_raster(return_period, time_step)
+            height, width = raster.full_shape
 
             # Calculate manual bounds
             bounds = self._calculate_manual_bounds(width, height)
@@ -304,44 +690,492 @@ class GeoTIFFService:
                 return None
 
             # Get flood depth at pixel
-            depth = data[row, col]
-
-            # Return depth if valid
-            return float(depth) if not np.isnan(depth) else None
+            if raster.contains(row, col):
+                return raster.value_at(row, col)
+            return self._read_pixel(return_period, time_step, row, col)
 
         except Exception as e:
             logger.error(f"Error querying flood depth at ({lat}, {lon}): {e}")
             return None
 
+    def _sample_points(
+        self,
+        raster: CachedRaster,
+        lons: np.ndarray,
+        lats: np.ndarray,
+        return_period: str,
+        time_step: int
+    ) -> np.ndarray:
+        """
+        Vectorized equivalent of get_flood_depth_at_point for many points.
+
+        Args:
+            raster: Cached raster of the map
+            lons: Longitudes (degrees)
+            lats: Latitudes (degrees)
+            return_period: Return period (for out-of-window reads)
+            time_step: Time step (for out-of-window reads)
+
+        Returns:
+            float32 depths, NaN where out of bounds or no data
+        """
+        height, width = raster.full_shape
+        bounds = self._calculate_manual_bounds(width, height)
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+
+        inside = (
+            (lons >= bounds['min_lon']) & (lons <= bounds['max_lon']) &
+            (lats >= bounds['min_lat']) & (lats <= bounds['max_lat'])
+        )
+        norm_x = (lons - bounds['min_lon']) / (bounds['max_lon'] - bounds['min_lon'])
+        norm_y = (lats - bounds['min_lat']) / (bounds['max_lat'] - bounds['min_lat'])
+        cols = np.clip((norm_x * width).astype(np.int64), 0, width - 1)
+        rows = np.clip(((1.0 - norm_y) * height).astype(np.int64), 0, height - 1)
+
+        win_height, win_width = raster.data.shape
+        win_rows = rows - raster.row_off
+        win_cols = cols - raster.col_off
+        in_window = inside & (win_rows >= 0) & (win_rows < win_height) & \
+            (win_cols >= 0) & (win_cols < win_width)
+
+        depths = np.full(lons.shape, np.nan, dtype=np.float32)
+        if in_window.any():
+            depths[in_window] = decode_depths(
+                raster.data[win_rows[in_window], win_cols[in_window]], raster.scale
+            )
+        outside = np.flatnonzero(inside & ~in_window)
+        if len(outside) > self.WINDOW_FALLBACK_LIMIT:
+            # Many points beyond the clip window: one full read beats per-pixel reads
+            full = self.get_full_depths(return_period, time_step)
+            depths[outside] = full[rows[outside], cols[outside]]
+        else:
+            for i in outside:
+                value = self._read_pixel(return_period, time_step, int(rows[i]), int(cols[i]))
+                if value is not None:
+                    depths[i] = value
+
+        return depths
+
+    def get_flood_depths_at_points(
+        self,
+        lons: np.ndarray,
+        lats: np.ndarray,
+        return_period: str = "rr01",
+        time_steps: Union[int, Sequence[int]] = 1
+    ) -> np.ndarray:
+        """
+        Get flood depths for many coordinates, optionally over several time steps.
+
+        Batch counterpart of get_flood_depth_at_point: bounds are computed
+        once per map and all points are gathered in one vectorized lookup.
+
+        Args:
+            lons: Longitudes (degrees)
+            lats: Latitudes (degrees)
+            return_period: Return period (rr01, rr02, rr03, rr04)
+            time_steps: Time step or sequence of time steps (1-18)
+
+        Returns:
+            float32 array of shape (len(time_steps), len(lons)),
+            NaN where out of bounds or no data
+
+        Raises:
+            ValueError: If the inputs are invalid or exceed MAX_BATCH_POINTS
+            FileNotFoundError: If a GeoTIFF file is not found
+
+        Example:
+            >>> depths = service.get_flood_depths_at_points(
+            ...     [121.10, 121.11], [14.64, 14.65], "rr02", [1, 2, 3]
+            ... )
+            >>> depths.shape
+            (3, 2)
+        """
+        lons = np.asarray(lons, dtype=np.float64).ravel()
+        lats = np.asarray(lats, dtype=np.float64).ravel()
+        if lons.shape != lats.shape:
+            raise ValueError(f"lons and lats differ in length ({len(lons)} != {len(lats)})")
+        if len(lons) > self.MAX_BATCH_POINTS:
+            raise ValueError(f"Too many points ({len(lons)} > {self.MAX_BATCH_POINTS})")
+
+        steps = [time_steps] if isinstance(time_steps, (int, np.integer)) else list(time_steps)
+        if not steps:
+            raise ValueError("At least one time step is required")
+
+        depths = np.empty((len(steps), len(lons)), dtype=np.float32)
+        for i, ts in enumerate(steps):
+            raster = self.get_raster(return_period, int(ts))
+            depths[i] = self._sample_points(raster, lons, lats, return_period, int(ts))
+        return depths
+
+    def set_edge_samples(
+        self,
+        edge_keys: List[Tuple],
+        u_coords: np.ndarray,
+        v_coords: np.ndarray
+    ) -> None:
+        """
+        Register road edge endpoints for vectorized depth gathers.
+
+        Args:
+            edge_keys: Edge identifiers, e.g. (u, v, key), in sample order
+            u_coords: (E, 2) array of source node (lon, lat)
+            v_coords: (E, 2) array of target node (lon, lat)
+
+        Example:
+            >>> service.set_edge_samples(keys, u_lonlat, v_lonlat)
+            >>> depths = service.get_edge_depths("rr02", 5)  # aligned with keys
+        """
+        u_coords = np.asarray(u_coords, dtype=np.float64).reshape(-1, 2)
+        v_coords = np.asarray(v_coords, dtype=np.float64).reshape(-1, 2)
+        if not len(edge_keys) == len(u_coords) == len(v_coords):
+            raise ValueError("edge_keys, u_coords and v_coords must have equal length")
+
+        self.prefetcher.cancel()
+        with self._edge_depths_lock:
+            self._edge_samples = {
+                "keys": list(edge_keys),
+                "lon": np.concatenate([u_coords[:, 0], v_coords[:, 0]]),
+                "lat": np.concatenate([u_coords[:, 1], v_coords[:, 1]])
+            }
+            self._edge_depths.clear()
+            self._edge_coeffs.clear()
+
+        logger.info(f"Registered {len(edge_keys)} edge samples for flood depth gathers")
+
+    @property
+    def edge_sample_keys(self) -> Optional[List[Tuple]]:
+        """Edge identifiers of the registered samples, or None."""
+        samples = self._edge_samples
+        return samples["keys"] if samples else None
+
+    def _gather_edge_depths(self, return_period: str, time_step: int) -> Optional[np.ndarray]:
+        """
+        Average endpoint depth per registered edge for one map.
+
+        Matches HazardAgent.get_flood_depth_at_edge: the mean of the endpoint
+        depths that have data, NaN when neither does.
+        """
+        samples = self._edge_samples
+        if samples is None:
+            return None
+
+        raster = self.get_raster(return_period, time_step)
+        values = self._sample_points(raster, samples["lon"], samples["lat"], return_period, time_step)
+        count = len(samples["keys"])
+        u_depths, v_depths = values[:count], values[count:]
+        valid = (~np.isnan(u_depths)).astype(np.float32) + (~np.isnan(v_depths))
+        total = np.nan_to_num(u_depths) + np.nan_to_num(v_depths)
+        return np.where(valid > 0, total / np.maximum(valid, 1), np.nan).astype(np.float32)
+
+    def _remember_edge_depths(self, key: Tuple[str, int], depths: np.ndarray) -> None:
+        with self._edge_depths_lock:
+            self._edge_depths[key] = depths
+            self._edge_depths.move_to_end(key)
+            while len(self._edge_depths) > self.edge_depth_cache_size:
+                self._edge_depths.popitem(last=False)
+
+    def get_edge_depths(self, return_period: str, time_step: int) -> Optional[np.ndarray]:
+        """
+        Flood depth per registered edge sample.
+
+        Served from the gather cache, then from the prefetcher (waiting for
+        an in-flight load rather than duplicating it), else computed now.
+
+        Args:
+            return_period: Return period (rr01, rr02, rr03, rr04)
+            time_step: Time step (1-18)
+
+        Returns:
+            float32 array aligned with edge_sample_keys (NaN = no data),
+            or None if no samples are registered
+        """
+        if self._edge_samples is None:
+            return None
+
+        key = (return_period, time_step)
+        with self._edge_depths_lock:
+            depths = self._edge_depths.get(key)
+            if depths is not None:
+                self._edge_depths.move_to_end(key)
+                return depths
+
+        depths = self.prefetcher.take(key)
+        if depths is None:
+            self.edge_depth_sync_loads += 1
+            depths = self._gather_edge_depths(return_period, time_step)
+        if depths is not None:
+            self._remember_edge_depths(key, depths)
+        return depths
+
+    def get_edge_depths_at(
+        self,
+        return_period: str,
+        time: float,
+        method: str = "linear"
+    ) -> Optional[np.ndarray]:
+        """
+        Flood depth per registered edge sample at a fractional time step.
+
+        Interpolates between the neighbouring hourly maps without loading
+        extra rasters. Coefficients are built once per interval, so every
+        further time within the same hour costs one Horner evaluation per
+        edge (one multiply-add for linear).
+
+        Args:
+            return_period: Return period (rr01, rr02, rr03, rr04)
+            time: Time in time-step units, e.g. 4.25 = a quarter past step 4
+            method: "linear" or "monotone" (see flood_interpolation)
+
+        Returns:
+            float32 array aligned with edge_sample_keys (NaN = no data),
+            or None if no samples are registered
+
+        Raises:
+            ValueError: If the time is outside the time steps or the method is unknown
+
+        Example:
+            >>> service.get_edge_depths_at("rr04", 6.5, method="monotone")
+        """
+        if method not in INTERPOLATION_METHODS:
+            raise ValueError(
+                f"Invalid interpolation method: {method}. Valid options: {INTERPOLATION_METHODS}"
+            )
+        first, last = self.time_steps[0], self.time_steps[-1]
+        if not first <= time <= last:
+            raise ValueError(f"Invalid time: {time}. Valid range: {first}-{last}")
+
+        step = int(time)
+        fraction = time - step
+        if fraction == 0 or step == last:
+            return self.get_edge_depths(return_period, step)
+
+        coeffs = self._interval_coefficients(return_period, step, method)
+        if coeffs is None:
+            return None
+        return evaluate_interval(coeffs, fraction)
+
+    def _interval_coefficients(
+        self,
+        return_period: str,
+        step: int,
+        method: str
+    ) -> Optional[np.ndarray]:
+        """Cached interpolation coefficients for the interval [step, step + 1]."""
+        key = (return_period, step, method)
+        with self._edge_depths_lock:
+            coeffs = self._edge_coeffs.get(key)
+            if coeffs is not None:
+                self._edge_coeffs.move_to_end(key)
+                return coeffs
+
+        start = self.get_edge_depths(return_period, step)
+        end = self.get_edge_depths(return_period, step + 1)
+        if start is None or end is None:
+            return None
+
+        previous = following = None
+        if method == "monotone":
+            # Outer neighbours shape the slopes; one-sided at the ends of the series
+            if step - 1 in self.time_steps and self._get_file_path(return_period, step - 1).exists():
+                previous = self.get_edge_depths(return_period, step - 1)
+            if step + 2 in self.time_steps and self._get_file_path(return_period, step + 2).exists():
+                following = self.get_edge_depths(return_period, step + 2)
+
+        coeffs = interval_coefficients(start, end, previous, following, method)
+        with self._edge_depths_lock:
+            self._edge_coeffs[key] = coeffs
+            while len(self._edge_coeffs) > self.edge_coeff_cache_size:
+                self._edge_coeffs.popitem(last=False)
+        return coeffs
+
+    def get_edge_depth_series(self, return_period: str) -> Optional[np.ndarray]:
+        """
+        Flood depth per registered edge sample for every time step.
+
+        Stacks the per-step gathers (cached) from the first time step up to
+        the last consecutive map that exists.
+
+        Args:
+            return_period: Return period (rr01, rr02, rr03, rr04)
+
+        Returns:
+            float32 array of shape (time_steps, edges) aligned with
+            edge_sample_keys (NaN = no data), or None if no samples are
+            registered or no maps exist
+
+        Raises:
+            ValueError: If the return period is invalid
+        """
+        if return_period not in self.return_periods:
+            raise ValueError(
+                f"Invalid return period: {return_period}. "
+                f"Valid options: {self.return_periods}"
+            )
+        if self._edge_samples is None:
+            return None
+
+        rows = []
+        for ts in self.time_steps:
+            if not self._get_file_path(return_period, ts).exists():
+                break
+            rows.append(self.get_edge_depths(return_period, ts))
+        if not rows:
+            return None
+        return np.stack(rows)
+
+    def _prefetch_load(self, return_period: str, time_step: int) -> Optional[np.ndarray]:
+        """Background work for one upcoming map: raster read, downcast and gather."""
+        if self._edge_samples is None:
+            self.get_raster(return_period, time_step)
+            return None
+        return self._gather_edge_depths(return_period, time_step)
+
+    def prefetch(self, return_period: str, time_step: int, steps: int = 2) -> int:
+        """
+        Load time steps after time_step in the background.
+
+        time_step itself is also kept (or queued) until its depths have
+        been gathered. Switching return period cancels prefetches for the previous one.
+
+        Args:
+            return_period: Active return period
+            time_step: Current time step
+            steps: How many following time steps to prepare
+
+        Returns:
+            Number of newly queued time steps
+        """
+        if return_period not in self.return_periods:
+            raise ValueError(
+                f"Invalid return period: {return_period}. "
+                f"Valid options: {self.return_periods}"
+            )
+
+        # The current step stays wanted so a result prefetched for it last
+        # hour is not dropped before update_risk claims it
+        upcoming = [
+            ts for ts in range(time_step, time_step + steps + 1)
+            if ts in self.time_steps and (return_period, ts) not in self._edge_depths
+            and self._get_file_path(return_period, ts).exists()
+        ]
+        if self._edge_samples is None:
+            upcoming = [
+                ts for ts in upcoming
+                if self._get_cache_key(return_period, ts) not in self._raster_cache
+            ]
+        return self.prefetcher.schedule(return_period, upcoming)
+
     def get_flood_map_as_geojson(
         self,
         return_period: str = "rr01",
         time_step: int = 1,
-        threshold: float = 0.01
+        threshold: float = 0.01,
+        tolerance: Optional[float] = None,
+        zoom: Optional[float] = None
     ) -> Dict:
         """
         Convert flood map to GeoJSON format for frontend visualization.
 
+        The raster is split into depth bands and polygonized; each band is
+        one MultiPolygon feature, simplified (topology-preserving) to about
+        one screen pixel at the requested zoom. Results are cached per
+        (return_period, time_step, threshold, tolerance).
+
         Args:
             return_period: Return period (rr01, rr02, rr03, rr04)
             time_step: Time step (1-18)
             threshold: Minimum depth to include (meters)
+            tolerance: Simplification tolerance in degrees (overrides zoom)
+            zoom: Display zoom level used to derive the tolerance (default 14)
 
         Returns:
-            GeoJSON FeatureCollection with flood depth data
+            GeoJSON FeatureCollection with flood depth band polygons
         """
-        data, metadata = self.load_flood_map(return_period, time_step)
-
-        # For now, return metadata and bounds
-        # Full rasterization to GeoJSON would be too large
-        # Frontend will fetch the raw TIFF via endpoint instead
-
-        return {
+        if tolerance is None:
+            tolerance = tolerance_for_zoom(zoom if zoom is not None else DEFAULT_ZOOM)
+        key = (return_period, time_step, round(float(threshold), 4), round(float(tolerance), 9))
+
+        with self._geojson_lock:
+            cached = self._geojson_cache.get(key)
+            if cached is not None:
+                self._geojson_cache.move_to_end(key)
+                self.geojson_hits += 1
+                return cached
+
+        data = self.get_full_depths(return_period, time_step)
+        _, metadata = self.load_flood_map(return_period, time_step)
+        height, width = data.shape
+        bounds = self._calculate_manual_bounds(width, height)
+
+        result = {
             "type": "FeatureCollection",
-            "metadata": metadata,
-            "features": []  # Placeholder - use TIFF endpoint for actual data
+            "metadata": {
+                **metadata,
+                "threshold": threshold,
+                "tolerance": tolerance,
+                "geographic_bounds": bounds
+            },
+            "features": polygonize_depths(data, bounds, threshold, tolerance)
         }
 
+        with self._geojson_lock:
+            self.geojson_misses += 1
+            self._geojson_cache[key] = result
+            while len(self._geojson_cache) > self.geojson_cache_size:
+                self._geojson_cache.popitem(last=False)
+
+        return result
+
+    def start_geojson_precompute(
+        self,
+        threshold: float = 0.01,
+        zooms: Tuple[float, ...] = (DEFAULT_ZOOM,)
+    ) -> bool:
+        """
+        Polygonize every available map in a background thread.
+
+        Args:
+            threshold: Minimum depth to include (meters)
+            zooms: Zoom levels to precompute tolerances for
+
+        Returns:
+            False if a precompute is already running
+        """
+        if self._geojson_thread is not None and self._geojson_thread.is_alive():
+            return False
+
+        self._geojson_stop.clear()
+        jobs = [
+            (rp, ts, zoom)
+            for zoom in zooms
+            for rp in self.return_periods
+            for ts in self.time_steps
+            if self._get_file_path(rp, ts).exists()
+        ]
+        # Keep the precomputed set resident
+        self.geojson_cache_size = max(self.geojson_cache_size, len(jobs))
+
+        def run():
+            done = 0
+            for rp, ts, zoom in jobs:
+                if self._geojson_stop.is_set():
+                    break
+                try:
+                    self.get_flood_map_as_geojson(rp, ts, threshold, zoom=zoom)
+                    done += 1
+                except Exception as e:
+                    logger.warning(f"GeoJSON precompute failed for {rp}-{ts}: {e}")
+            logger.info(f"Precomputed flood extent GeoJSON for {done}/{len(jobs)} maps")
+
+        self._geojson_thread = Thread(target=run, name="geojson-precompute", daemon=True)
+        self._geojson_thread.start()
+        return True
+
+    def stop_geojson_precompute(self) -> None:
+        """Ask a running precompute to stop after its current map."""
+        self._geojson_stop.set()
+
     def get_available_maps(self) -> List[Dict[str, any]]:
         """
         Get list of all available flood maps.
@@ -365,6 +1199,45 @@ class GeoTIFFService:
         return available_maps
 
 
+# Binary batch query format: little-endian float64 (lon, lat) pairs in,
+# little-endian float32 depths out (row-major, one row per time step, NaN = no data)
+POINT_WIRE_DTYPE = np.dtype("<f8")
+DEPTH_WIRE_DTYPE = np.dtype("<f4")
+
+
+def unpack_points(body: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a binary batch query body into longitude and latitude arrays.
+
+    Args:
+        body: Interleaved lon, lat pairs as little-endian float64
+
+    Returns:
+        Tuple of (lons, lats)
+
+    Raises:
+        ValueError: If the body is not a whole number of pairs
+    """
+    pair_size = 2 * POINT_WIRE_DTYPE.itemsize
+    if len(body) % pair_size:
+        raise ValueError(f"Binary body must be a multiple of {pair_size} bytes (lon, lat float64 pairs)")
+    points = np.frombuffer(body, dtype=POINT_WIRE_DTYPE).reshape(-1, 2)
+    return points[:, 0], points[:, 1]
+
+
+def pack_depths(depths: np.ndarray) -> bytes:
+    """
+    Encode batch query depths for a binary response.
+
+    Args:
+        depths: Array of shape (time_steps, points)
+
+    Returns:
+        Little-endian float32 bytes, row-major
+    """
+    return np.ascontiguousarray(depths, dtype=DEPTH_WIRE_DTYPE).tobytes()
+
+
 # Global service instance
 _geotiff_service: Optional[GeoTIFFService] = None
 
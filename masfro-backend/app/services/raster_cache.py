@@ -0,0 +1,254 @@
+# filename: app/services/raster_cache.py
+
+"""
+Raster Cache for MAS-FRO Flood Maps
+
+Byte-budgeted LRU cache for decoded flood depth rasters. Depths are kept
+in a compact dtype instead of the float64 bands stored in the GeoTIFFs:
+
+- float16: ~3 significant digits, NaN kept as nodata (default)
+- uint16: depth scaled to millimetres, 65535 reserved for nodata
+
+Each entry may hold only a window of the full raster (e.g. the road
+graph's bounding box); pixel lookups take full-raster row/col and report
+whether they fell inside the cached window. Windows may also be views of
+memory-mapped .npy files (see flood_map_store); those cost no heap bytes
+against the budget.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+STORAGE_DTYPES = ("float16", "uint16")
+UINT16_SCALE = 0.001  # metres per unit
+UINT16_NODATA = np.uint16(65535)
+
+
+def encode_depths(data: np.ndarray, storage: str = "float16") -> Tuple[np.ndarray, float]:
+    """
+    Downcast a depth array for caching.
+
+    Args:
+        data: Depth array in metres (NaN = nodata)
+        storage: "float16" or "uint16"
+
+    Returns:
+        Tuple of (encoded_array, scale); scale is 1.0 for float16
+    """
+    if storage == "float16":
+        return data.astype(np.float16), 1.0
+    if storage == "uint16":
+        nodata = np.isnan(data)
+        scaled = np.rint(np.clip(np.nan_to_num(data, nan=0.0), 0.0, None) / UINT16_SCALE)
+        encoded = np.minimum(scaled, int(UINT16_NODATA) - 1).astype(np.uint16)
+        encoded[nodata] = UINT16_NODATA
+        return encoded, UINT16_SCALE
+    raise ValueError(f"Invalid storage dtype: {storage}. Valid options: {STORAGE_DTYPES}")
+
+
+def decode_depths(encoded: np.ndarray, scale: float) -> np.ndarray:
+    """
+    Convert cached depths back to float32 metres with NaN nodata.
+
+    Args:
+        encoded: Array returned by encode_depths (or a slice of it)
+        scale: Scale returned by encode_depths
+
+    Returns:
+        float32 array
+    """
+    if encoded.dtype == np.uint16:
+        decoded = encoded.astype(np.float32) * np.float32(scale)
+        decoded[encoded == UINT16_NODATA] = np.nan
+        return decoded
+    return encoded.astype(np.float32)
+
+
+class CachedRaster:
+    """
+    One cached flood map window.
+
+    Attributes:
+        data: Encoded depth window (float16, uint16, or a float32/float16 memmap view)
+        scale: Decode scale (see encode_depths)
+        row_off: First full-raster row covered by the window
+        col_off: First full-raster column covered by the window
+        full_shape: (height, width) of the full raster
+    """
+
+    __slots__ = ("data", "scale", "row_off", "col_off", "full_shape")
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        scale: float,
+        row_off: int,
+        col_off: int,
+        full_shape: Tuple[int, int]
+    ):
+        self.data = data
+        self.scale = scale
+        self.row_off = row_off
+        self.col_off = col_off
+        self.full_shape = full_shape
+
+    @property
+    def mapped(self) -> bool:
+        """Whether the window is a view of a memory-mapped file."""
+        return isinstance(self.data, np.memmap)
+
+    @property
+    def nbytes(self) -> int:
+        """Heap bytes held by the window (mapped windows live in the page cache)."""
+        return 0 if self.mapped else int(self.data.nbytes)
+
+    def contains(self, row: int, col: int) -> bool:
+        """Whether a full-raster pixel lies inside the cached window."""
+        height, width = self.data.shape
+        return (self.row_off <= row < self.row_off + height and
+                self.col_off <= col < self.col_off + width)
+
+    def value_at(self, row: int, col: int) -> Optional[float]:
+        """
+        Depth at a full-raster pixel inside the window.
+
+        Args:
+            row: Full-raster row
+            col: Full-raster column
+
+        Returns:
+            Depth in metres, or None for nodata
+        """
+        value = decode_depths(
+            self.data[row - self.row_off:row - self.row_off + 1,
+                      col - self.col_off:col - self.col_off + 1],
+            self.scale
+        )[0, 0]
+        return None if np.isnan(value) else float(value)
+
+    def decode(self) -> np.ndarray:
+        """Decode the whole window to float32."""
+        return decode_depths(self.data, self.scale)
+
+
+class RasterCache:
+    """
+    Thread-safe LRU cache bounded by total encoded bytes.
+
+    Attributes:
+        max_bytes: Byte budget for all entries
+        hits: Lookups answered from the cache
+        misses: Lookups that required a load
+        evictions: Entries dropped to stay within budget
+
+    Example:
+        >>> cache = RasterCache(max_bytes=8 * 1024 * 1024)
+        >>> cache.put(("rr01", 1), raster)
+        >>> cache.get(("rr01", 1)) is raster
+        True
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Byte budget for all entries
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, CachedRaster]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedRaster]:
+        """
+        Look up an entry and mark it most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            CachedRaster, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedRaster) -> None:
+        """
+        Insert an entry, evicting least recently used ones to fit the budget.
+
+        Entries larger than the whole budget are not cached.
+
+        Args:
+            key: Cache key
+            entry: Raster to cache
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            if entry.nbytes > self.max_bytes:
+                logger.debug(f"Raster {key} ({entry.nbytes} bytes) exceeds cache budget")
+                return
+            while self._entries and self._bytes + entry.nbytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+                logger.debug(f"Evicted raster {evicted_key}")
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache metrics.
+
+        Returns:
+            Dict with entries, bytes, max_bytes, hits, misses, evictions, hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "mapped_entries": sum(1 for e in self._entries.values() if e.mapped),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
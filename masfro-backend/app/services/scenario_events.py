@@ -0,0 +1,460 @@
+# filename: app/services/scenario_events.py
+
+"""
+Scenario Event Queue and Loaders for MAS-FRO Simulation
+
+Provides the time-ordered event queue consumed by SimulationManager's
+collection phase, plus streaming loaders for scenario files.
+
+Design:
+- Events live in a binary heap ordered by (time_offset, sequence), so
+  dequeuing is O(log n) instead of the O(n) list.pop(0).
+- Loaders stream the scenario file and only keep a small look-ahead of
+  events in the heap; rows are pulled as the queue head needs them.
+- Payload JSON is kept as raw text/bytes and parsed on first access, so
+  events are only decoded when their time arrives.
+
+Two file formats are supported:
+- CSV (time_offset, agent, payload) as shipped in data/simulation_scenarios
+- Compiled binary scenarios (.mfsc) written by compile_scenario(): a small
+  header followed by time-sorted length-prefixed records, readable in
+  constant memory regardless of scenario size.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import csv
+import heapq
+from abc import ABC, abstractmethod
+import json
+import logging
+import struct
+from itertools import count
+from pathlib import Path
+from threading import RLock
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Compiled scenario format
+BINARY_MAGIC = b"MFSC"
+BINARY_VERSION = 1
+BINARY_SUFFIX = ".mfsc"
+_HEADER = struct.Struct("<4sHIQ")  # magic, version, agent table bytes, event count
+_RECORD = struct.Struct("<dBI")    # time_offset, agent index, payload bytes
+
+
+class ScenarioEvent:
+    """
+    A single scenario event with a lazily decoded payload.
+
+    Attributes:
+        time_offset: Simulation time (seconds) at which the event fires
+        agent: Agent the event is addressed to ("flood_agent", "scout_agent")
+        seq: Load order, used to keep equal-time events stable
+
+    Example:
+        >>> event = ScenarioEvent(9, "scout_agent", '{"location": "Nangka"}')
+        >>> event.payload["location"]
+        'Nangka'
+    """
+
+    __slots__ = ("time_offset", "agent", "seq", "_raw", "_payload")
+
+    def __init__(
+        self,
+        time_offset: float,
+        agent: str,
+        payload: Union[str, bytes, Dict[str, Any]],
+        seq: int = 0
+    ):
+        self.time_offset = time_offset
+        self.agent = agent
+        self.seq = seq
+        if isinstance(payload, (str, bytes)):
+            self._raw = payload
+            self._payload = None
+        else:
+            self._raw = None
+            self._payload = payload
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        """Decoded payload (parsed on first access, then cached)."""
+        if self._payload is None:
+            self._payload = json.loads(self._raw)
+            self._raw = None
+        return self._payload
+
+    @property
+    def raw_payload(self) -> str:
+        """Payload as JSON text without caching a decoded copy."""
+        if self._payload is not None:
+            return json.dumps(self._payload)
+        return self._raw.decode("utf-8") if isinstance(self._raw, bytes) else self._raw
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access kept for code written against event dicts."""
+        if key in ("time_offset", "agent", "payload"):
+            return getattr(self, key)
+        return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the event as a plain dict (decodes the payload)."""
+        return {"time_offset": self.time_offset, "agent": self.agent, "payload": self.payload}
+
+    def __lt__(self, other: "ScenarioEvent") -> bool:
+        return (self.time_offset, self.seq) < (other.time_offset, other.seq)
+
+    def __repr__(self) -> str:
+        return f"ScenarioEvent(time_offset={self.time_offset}, agent={self.agent!r})"
+
+
+class _ScenarioSource(ABC):
+    """
+    Base class for streaming scenario readers.
+
+    Subclasses set remaining to the number of events not yet yielded and
+    keep it up to date while iterating (ScenarioEventQueue.__len__ uses it).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.remaining = 0
+        self.last_time: Optional[float] = None
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[ScenarioEvent]:
+        """Yield events in file order, decrementing remaining."""
+
+    def close(self) -> None:
+        pass
+
+
+class CSVScenarioSource(_ScenarioSource):
+    """
+    Stream events from a scenario CSV.
+
+    Rows are read one at a time; payload text is not parsed until the event
+    is consumed. Files are expected in time order (the shipped scenarios and
+    compiled files are); out-of-order rows are still queued correctly as
+    long as they are read before their time is reached.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        # Count records, not lines: quoted payloads may span several lines
+        with open(path, "r", newline="") as f:
+            self.remaining = max(sum(1 for row in csv.reader(f) if row) - 1, 0)
+        self._file = None
+
+    def __iter__(self) -> Iterator[ScenarioEvent]:
+        self._file = open(self.path, "r", newline="")
+        reader = csv.DictReader(self._file)
+        warned = False
+        try:
+            for row in reader:
+                try:
+                    time_offset = float(row["time_offset"])
+                    event = ScenarioEvent(
+                        int(time_offset) if time_offset.is_integer() else time_offset,
+                        row["agent"],
+                        row["payload"]
+                    )
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.error(f"Malformed row in {self.path} at line {reader.line_num}: {e}")
+                    self.remaining -= 1
+                    continue
+
+                if self.last_time is not None and event.time_offset < self.last_time and not warned:
+                    logger.warning(
+                        f"{self.path.name} is not sorted by time_offset; "
+                        f"compile it with compile_scenario() for exact ordering"
+                    )
+                    warned = True
+                self.last_time = max(event.time_offset, self.last_time or event.time_offset)
+                self.remaining -= 1
+                yield event
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BinaryScenarioSource(_ScenarioSource):
+    """Stream events from a compiled (.mfsc) scenario in constant memory."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        with open(path, "rb") as f:
+            self.agents, self.remaining, self._data_start = self._read_header(f)
+        self._file = None
+
+    @staticmethod
+    def _read_header(f):
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Truncated scenario header")
+        magic, version, table_size, event_count = _HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Not a compiled MAS-FRO scenario")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Unsupported scenario version {version}")
+        agents = json.loads(f.read(table_size).decode("utf-8"))
+        return agents, event_count, _HEADER.size + table_size
+
+    def __iter__(self) -> Iterator[ScenarioEvent]:
+        self._file = open(self.path, "rb")
+        self._file.seek(self._data_start)
+        try:
+            while self.remaining > 0:
+                record = self._file.read(_RECORD.size)
+                if len(record) < _RECORD.size:
+                    logger.error(f"{self.path} truncated with {self.remaining} events left")
+                    self.remaining = 0
+                    return
+                time_offset, agent_index, size = _RECORD.unpack(record)
+                payload = self._file.read(size)
+                self.remaining -= 1
+                self.last_time = time_offset
+                yield ScenarioEvent(
+                    int(time_offset) if time_offset.is_integer() else time_offset,
+                    self.agents[agent_index],
+                    payload
+                )
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ScenarioEventQueue:
+    """
+    Min-heap event queue fed incrementally from a streaming source.
+
+    The head of the queue is guaranteed correct once the source has been
+    read past the head's time_offset, so only a small look-ahead is held in
+    memory for time-ordered sources. Public methods are thread-safe so the
+    queue can be drained from a worker thread while the API inspects it.
+
+    Example:
+        >>> queue = ScenarioEventQueue.from_file(Path("light_scenario.csv"))
+        >>> while queue and queue.peek().time_offset <= clock:
+        ...     event = queue.pop()
+        ...     handle(event.agent, event.payload)
+    """
+
+    def __init__(self, source: Optional[_ScenarioSource] = None):
+        """
+        Initialize the queue.
+
+        Args:
+            source: Optional streaming source to pull events from
+        """
+        self._heap: List[ScenarioEvent] = []
+        self._seq = count()
+        self._source = source
+        self._iter = iter(source) if source is not None else None
+        self._lock = RLock()
+
+        # Scenario file and number of events popped so far; together they
+        # identify the queue position for checkpoints (see skip())
+        self.path: Optional[Path] = source.path if source is not None else None
+        self.consumed = 0
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ScenarioEventQueue":
+        """
+        Open a scenario file (CSV or compiled .mfsc) as a queue.
+
+        Args:
+            path: Scenario file path
+
+        Returns:
+            ScenarioEventQueue streaming from the file
+        """
+        path = Path(path)
+        if path.suffix == BINARY_SUFFIX:
+            return cls(BinaryScenarioSource(path))
+        return cls(CSVScenarioSource(path))
+
+    def _pull(self) -> bool:
+        """Move one event from the source into the heap."""
+        if self._iter is None:
+            return False
+        event = next(self._iter, None)
+        if event is None:
+            self._iter = None
+            self._source = None
+            return False
+        event.seq = next(self._seq)
+        heapq.heappush(self._heap, event)
+        return True
+
+    def _fill(self, size: int = 1) -> None:
+        """Pull until the first `size` heap entries are final."""
+        while self._iter is not None:
+            if len(self._heap) >= size:
+                boundary = heapq.nsmallest(size, self._heap)[-1] if size > 1 else self._heap[0]
+                last_time = self._source.last_time
+                if last_time is not None and last_time >= boundary.time_offset:
+                    return
+            if not self._pull():
+                return
+
+    def push(self, event: ScenarioEvent) -> None:
+        """
+        Insert an event.
+
+        Args:
+            event: Event to schedule
+        """
+        with self._lock:
+            event.seq = next(self._seq)
+            heapq.heappush(self._heap, event)
+
+    def peek(self) -> Optional[ScenarioEvent]:
+        """Return the next event without removing it (None if empty)."""
+        with self._lock:
+            self._fill()
+            return self._heap[0] if self._heap else None
+
+    def pop(self) -> ScenarioEvent:
+        """
+        Remove and return the next event.
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        with self._lock:
+            self._fill()
+            event = heapq.heappop(self._heap)
+            self.consumed += 1
+            return event
+
+    def skip(self, n: int) -> int:
+        """
+        Drop the next n events without decoding their payloads.
+
+        Used to restore a checkpointed queue position on a freshly opened
+        scenario file.
+
+        Args:
+            n: Number of events to drop
+
+        Returns:
+            Number of events actually dropped
+        """
+        dropped = 0
+        with self._lock:
+            while dropped < n and self.peek() is not None:
+                self.pop()
+                dropped += 1
+        return dropped
+
+    def upcoming(self, n: int = 10) -> List[ScenarioEvent]:
+        """
+        Return the next n events in order without removing them.
+
+        Args:
+            n: Number of events
+
+        Returns:
+            List of up to n events
+        """
+        with self._lock:
+            self._fill(n)
+            return heapq.nsmallest(n, self._heap)
+
+    def clear(self) -> None:
+        """Drop all queued events and close the source."""
+        with self._lock:
+            if self._source is not None:
+                self._source.close()
+            self._heap = []
+            self._source = None
+            self._iter = None
+
+    def __len__(self) -> int:
+        remaining = self._source.remaining if self._source is not None else 0
+        return len(self._heap) + remaining
+
+    def __bool__(self) -> bool:
+        return self.peek() is not None
+
+
+def compile_scenario(csv_path: Path, output_path: Optional[Path] = None) -> Path:
+    """
+    Compile a scenario CSV into the binary .mfsc format.
+
+    Events are sorted by time (stable for equal times). Payloads are
+    validated once and stored as compact JSON bytes.
+
+    Args:
+        csv_path: Source scenario CSV
+        output_path: Destination file (default: csv_path with .mfsc suffix)
+
+    Returns:
+        Path of the compiled scenario
+
+    Example:
+        >>> compile_scenario(Path("data/simulation_scenarios/heavy_scenario.csv"))
+        PosixPath('data/simulation_scenarios/heavy_scenario.mfsc')
+    """
+    csv_path = Path(csv_path)
+    output_path = Path(output_path) if output_path else csv_path.with_suffix(BINARY_SUFFIX)
+
+    agents: List[str] = []
+    agent_index: Dict[str, int] = {}
+    records = []
+    for event in CSVScenarioSource(csv_path):
+        try:
+            payload = json.dumps(json.loads(event.raw_payload), separators=(",", ":"))
+        except json.JSONDecodeError as e:
+            logger.error(f"Skipping event at t={event.time_offset}: invalid payload ({e})")
+            continue
+        if event.agent not in agent_index:
+            agent_index[event.agent] = len(agents)
+            agents.append(event.agent)
+        records.append((event.time_offset, len(records), agent_index[event.agent], payload.encode("utf-8")))
+
+    records.sort(key=lambda r: (r[0], r[1]))
+    write_compiled_scenario(output_path, agents, ((r[0], r[2], r[3]) for r in records), len(records))
+
+    logger.info(f"Compiled {len(records)} events from {csv_path} -> {output_path}")
+    return output_path
+
+
+def write_compiled_scenario(
+    output_path: Path,
+    agents: List[str],
+    records,
+    event_count: int
+) -> None:
+    """
+    Write time-sorted records as a compiled scenario.
+
+    Records are written as they are produced, so generators of synthetic
+    scenarios can stream millions of events without holding them.
+
+    Args:
+        output_path: Destination file
+        agents: Agent name table
+        records: Iterable of (time_offset, agent_index, payload_bytes),
+            already sorted by time_offset
+        event_count: Number of records that will be written
+    """
+    table = json.dumps(agents).encode("utf-8")
+    with open(output_path, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(table), event_count))
+        f.write(table)
+        for time_offset, agent, payload in records:
+            f.write(_RECORD.pack(float(time_offset), agent, len(payload)))
+            f.write(payload)
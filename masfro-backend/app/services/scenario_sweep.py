@@ -0,0 +1,460 @@
+# filename: app/services/scenario_sweep.py
+
+"""
+Parallel Scenario Sweep Runner for MAS-FRO
+
+Runs a grid of simulation configurations as isolated headless simulations
+(see SimulationManager.run_headless) across a process pool and streams one
+result row per configuration to a columnar results file.
+
+The road graph (and optionally a ScoutAgent with its ML models) is loaded
+once in the parent process. Workers are forked from it, so they share the
+loaded data copy-on-write instead of reloading it per configuration; each
+run starts by resetting edge risks in the worker's copy.
+
+Sweepable parameters:
+- mode: light / medium / heavy
+- risk_penalty: RoutingAgent virtual meters per risk unit
+- scout_decay_rate_fast, scout_decay_rate_slow, flood_decay_rate,
+  environmental_risk_radius_m: HazardAgent settings
+- scout_batch_size: scout reports processed per tick
+- seconds_per_tick, max_ticks: virtual clock settings
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import asyncio
+import csv
+import itertools
+import logging
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Optional Parquet output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# HazardAgent attributes that can be swept
+HAZARD_PARAMETERS = (
+    "scout_decay_rate_fast",
+    "scout_decay_rate_slow",
+    "flood_decay_rate",
+    "environmental_risk_radius_m",
+)
+
+# Defaults for every sweepable parameter
+DEFAULT_PARAMETERS: Dict[str, Any] = {
+    "mode": "light",
+    "risk_penalty": 2000.0,
+    "scout_decay_rate_fast": 0.10,
+    "scout_decay_rate_slow": 0.03,
+    "flood_decay_rate": 0.05,
+    "environmental_risk_radius_m": 800,
+    "scout_batch_size": None,
+    "seconds_per_tick": 60.0,
+    "max_ticks": None,
+}
+
+# Column types of the parameters (written as param_<name>)
+PARAMETER_TYPES: Dict[str, str] = {
+    "mode": "string",
+    "risk_penalty": "float64",
+    "scout_decay_rate_fast": "float64",
+    "scout_decay_rate_slow": "float64",
+    "flood_decay_rate": "float64",
+    "environmental_risk_radius_m": "float64",
+    "scout_batch_size": "int64",
+    "seconds_per_tick": "float64",
+    "max_ticks": "int64",
+}
+
+# Result columns written after the parameters, in order, with their types
+RESULT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("ticks", "int64"),
+    ("ticks_per_second", "float64"),
+    ("simulation_seconds", "float64"),
+    ("blocked_edges", "int64"),
+    ("routes_evaluated", "int64"),
+    ("routes_failed", "int64"),
+    ("mean_route_risk", "float64"),
+    ("max_route_risk", "float64"),
+    ("mean_route_distance_m", "float64"),
+    ("mean_route_ms", "float64"),
+    ("error", "string"),
+    ("total_seconds", "float64"),
+)
+
+# Shared state of the current process (set in the parent, inherited by forked workers)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def expand_grid(grid: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into the list of configurations to run.
+
+    Args:
+        grid: Dict mapping parameter name to candidate values
+
+    Returns:
+        List of complete parameter dicts (defaults filled in)
+
+    Raises:
+        ValueError: If the grid contains unknown parameters
+
+    Example:
+        >>> configs = expand_grid({"mode": ["light", "heavy"], "risk_penalty": [0, 2000]})
+        >>> len(configs)
+        4
+    """
+    unknown = set(grid) - set(DEFAULT_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    names = list(grid)
+    configs = []
+    for values in itertools.product(*(list(grid[name]) for name in names)):
+        config = dict(DEFAULT_PARAMETERS)
+        config.update(zip(names, values))
+        configs.append(config)
+    return configs
+
+
+def _init_worker(state: Dict[str, Any]) -> None:
+    """Install shared state in a worker process."""
+    _WORKER_STATE.update(state)
+    logging.getLogger("app").setLevel(state.get("worker_log_level", logging.WARNING))
+
+
+def _run_configuration(run_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one configuration as a headless simulation and evaluate routes.
+
+    Executed inside a worker (or inline when running without a pool).
+
+    Args:
+        run_id: Index of the configuration in the sweep
+        params: Complete parameter dict
+
+    Returns:
+        Flat result row
+    """
+    from app.agents.hazard_agent import HazardAgent
+    from app.agents.routing_agent import RoutingAgent
+    from app.agents.evacuation_manager_agent import EvacuationManagerAgent
+    from app.services.simulation_manager import SimulationManager
+    from app.services.evacuation_service import get_evacuation_service
+
+    environment = _WORKER_STATE["environment"]
+    od_pairs: List[Tuple[Tuple[float, float], Tuple[float, float]]] = _WORKER_STATE["od_pairs"]
+
+    row: Dict[str, Any] = {"run_id": run_id}
+    row.update({f"param_{name}": value for name, value in params.items()})
+
+    started = time.perf_counter()
+    try:
+        # Isolate runs that share a worker process
+        environment.reset_edge_risks()
+        get_evacuation_service().reset_all_occupancy()
+
+        hazard_agent = HazardAgent(
+            f"hazard_sweep_{run_id}",
+            environment,
+            enable_geotiff=_WORKER_STATE.get("enable_geotiff", True)
+        )
+        for name in HAZARD_PARAMETERS:
+            setattr(hazard_agent, name, params[name])
+
+        routing_agent = RoutingAgent(
+            f"routing_sweep_{run_id}",
+            environment,
+            risk_penalty=float(params["risk_penalty"]),
+            use_contraction=True
+        )
+        evacuation_manager = EvacuationManagerAgent(f"evac_sweep_{run_id}", environment)
+        evacuation_manager.set_hazard_agent(hazard_agent)
+        evacuation_manager.set_routing_agent(routing_agent)
+
+        manager = SimulationManager()
+        manager.set_agents(
+            scout_agent=_WORKER_STATE.get("scout_agent"),
+            hazard_agent=hazard_agent,
+            routing_agent=routing_agent,
+            evacuation_manager=evacuation_manager,
+            environment=environment
+        )
+        manager.scout_batch_size = params["scout_batch_size"]
+
+        status = asyncio.run(manager.run_headless(
+            params["mode"],
+            max_ticks=params["max_ticks"],
+            seconds_per_tick=float(params["seconds_per_tick"]),
+            seconds_per_time_step=_WORKER_STATE.get("seconds_per_time_step")
+        ))
+        simulation_seconds = time.perf_counter() - started
+
+        row.update({
+            "ticks": status["tick_count"],
+            "ticks_per_second": status["ticks_per_second"],
+            "simulation_seconds": round(simulation_seconds, 4),
+            "blocked_edges": sum(
+                1 for _, _, d in environment.graph.edges(data=True)
+                if d.get("risk_score", 0.0) >= 0.9
+            ),
+        })
+        row.update(_evaluate_routes(routing_agent, od_pairs))
+        row["error"] = ""
+
+    except Exception as e:
+        logger.error(f"Sweep run {run_id} failed: {e}")
+        row["error"] = str(e)
+
+    row["total_seconds"] = round(time.perf_counter() - started, 4)
+    return row
+
+
+def _evaluate_routes(routing_agent, od_pairs) -> Dict[str, Any]:
+    """Route every OD pair on the final graph state and aggregate metrics."""
+    risks, distances, timings = [], [], []
+    no_route = 0
+    for start, end in od_pairs:
+        route_started = time.perf_counter()
+        result = routing_agent.calculate_route(start, end)
+        timings.append((time.perf_counter() - route_started) * 1000.0)
+        if result.get("status") != "success":
+            no_route += 1
+            continue
+        risks.append(result["risk_level"])
+        distances.append(result["distance"])
+
+    def _mean(values):
+        return round(sum(values) / len(values), 4) if values else None
+
+    return {
+        "routes_evaluated": len(od_pairs),
+        "routes_failed": no_route,
+        "mean_route_risk": _mean(risks),
+        "max_route_risk": round(max(risks), 4) if risks else None,
+        "mean_route_distance_m": _mean(distances),
+        "mean_route_ms": _mean(timings),
+    }
+
+
+class _ResultWriter:
+    """
+    Stream result rows to Parquet (pyarrow) or CSV.
+
+    The columns (and the Parquet schema) are fixed up front from the
+    parameter names and RESULT_FIELDS, so failed runs, which only carry
+    their parameters and error, can arrive in any order.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        parameter_names: Iterable[str] = tuple(DEFAULT_PARAMETERS),
+        batch_size: int = 16
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.format = "parquet" if (pq is not None and path.suffix == ".parquet") else "csv"
+        if self.format == "csv" and path.suffix != ".csv":
+            self.path = path.with_suffix(".csv")
+
+        fields = [("run_id", "int64")]
+        fields += [
+            (f"param_{name}", PARAMETER_TYPES.get(name, "string"))
+            for name in parameter_names
+        ]
+        fields += list(RESULT_FIELDS)
+        self._columns: List[str] = [name for name, _ in fields]
+        self._schema = (
+            pa.schema([(name, pa.type_for_alias(kind)) for name, kind in fields])
+            if self.format == "parquet" else None
+        )
+        self._rows: List[Dict[str, Any]] = []
+        self._writer = None
+        self._file = None
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        rows = [{col: row.get(col) for col in self._columns} for row in self._rows]
+        self._rows = []
+
+        if self.format == "parquet":
+            table = pa.Table.from_pylist(rows, schema=self._schema)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(str(self.path), self._schema)
+            self._writer.write_table(table)
+        else:
+            if self._writer is None:
+                self._file = open(self.path, "w", newline="")
+                self._writer = csv.DictWriter(self._file, fieldnames=self._columns)
+                self._writer.writeheader()
+            self._writer.writerows(rows)
+            self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self.format == "parquet" and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class ScenarioSweepRunner:
+    """
+    Runs parameter sweeps of headless simulations across a process pool.
+
+    Attributes:
+        environment: Shared DynamicGraphEnvironment (loaded once)
+        od_pairs: Origin/destination coordinate pairs routed after each run
+
+    Example:
+        >>> runner = ScenarioSweepRunner(DynamicGraphEnvironment(lean=True))
+        >>> summary = runner.run(
+        ...     {"mode": ["light", "heavy"], "risk_penalty": [0.0, 2000.0, 100000.0]},
+        ...     output_path=Path("sweep_results.parquet"),
+        ...     processes=4
+        ... )
+    """
+
+    def __init__(
+        self,
+        environment=None,
+        scout_agent=None,
+        od_pairs: Optional[List[Tuple[Tuple[float, float], Tuple[float, float]]]] = None,
+        num_routes: int = 10,
+        seed: int = 42,
+        enable_geotiff: bool = True,
+        seconds_per_time_step: Optional[float] = None
+    ):
+        """
+        Initialize the runner and load shared data.
+
+        Args:
+            environment: Pre-loaded DynamicGraphEnvironment (loaded if None)
+            scout_agent: Optional ScoutAgent whose NLP/geocoder models are
+                shared by all runs
+            od_pairs: Route endpoints to evaluate; sampled from graph nodes if None
+            num_routes: Number of OD pairs to sample when od_pairs is None
+            seed: Seed for OD sampling
+            enable_geotiff: Use GeoTIFF flood depths in the HazardAgent
+            seconds_per_time_step: Advance GeoTIFF time steps with the virtual clock
+
+        Raises:
+            ValueError: If no graph is loaded
+        """
+        if environment is None:
+            from app.environment.graph_manager import DynamicGraphEnvironment
+            environment = DynamicGraphEnvironment()
+        if environment.graph is None:
+            raise ValueError("Graph environment not loaded")
+
+        self.environment = environment
+        self.scout_agent = scout_agent
+        self.enable_geotiff = enable_geotiff
+        self.seconds_per_time_step = seconds_per_time_step
+        self.od_pairs = od_pairs if od_pairs is not None else self._sample_od_pairs(num_routes, seed)
+
+    def _sample_od_pairs(self, num_routes: int, seed: int):
+        """Pick reproducible OD pairs from graph node coordinates."""
+        rng = random.Random(seed)
+        nodes = sorted(self.environment.graph.nodes, key=str)
+        pairs = []
+        for _ in range(num_routes):
+            a, b = rng.sample(nodes, 2)
+            a_data, b_data = self.environment.graph.nodes[a], self.environment.graph.nodes[b]
+            pairs.append(((a_data["y"], a_data["x"]), (b_data["y"], b_data["x"])))
+        return pairs
+
+    def _shared_state(self) -> Dict[str, Any]:
+        return {
+            "environment": self.environment,
+            "scout_agent": self.scout_agent,
+            "od_pairs": self.od_pairs,
+            "enable_geotiff": self.enable_geotiff,
+            "seconds_per_time_step": self.seconds_per_time_step,
+        }
+
+    def run(
+        self,
+        grid: Dict[str, Iterable[Any]],
+        output_path: Path,
+        processes: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every configuration in the grid and stream results to disk.
+
+        Args:
+            grid: Parameter grid (see expand_grid)
+            output_path: Results file (.parquet if pyarrow is installed,
+                otherwise written as .csv)
+            processes: Worker processes (default: CPU count); 0 runs inline
+
+        Returns:
+            Dict with run counts, failures, output path and wall time
+        """
+        configs = expand_grid(grid)
+        writer = _ResultWriter(Path(output_path), parameter_names=DEFAULT_PARAMETERS)
+        started = time.perf_counter()
+        failures = 0
+
+        logger.info(f"Starting sweep of {len(configs)} configurations -> {writer.path}")
+
+        try:
+            if processes == 0:
+                _init_worker(self._shared_state())
+                for run_id, params in enumerate(configs):
+                    row = _run_configuration(run_id, params)
+                    failures += bool(row["error"])
+                    writer.write(row)
+            else:
+                # fork shares the loaded graph copy-on-write; other start
+                # methods fall back to pickling it once per worker
+                method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+                context = multiprocessing.get_context(method)
+                with ProcessPoolExecutor(
+                    max_workers=processes,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self._shared_state(),)
+                ) as pool:
+                    futures = [
+                        pool.submit(_run_configuration, run_id, params)
+                        for run_id, params in enumerate(configs)
+                    ]
+                    for future in as_completed(futures):
+                        row = future.result()
+                        failures += bool(row["error"])
+                        writer.write(row)
+        finally:
+            writer.close()
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Sweep complete: {len(configs)} runs ({failures} failed) in {elapsed:.1f}s"
+        )
+        return {
+            "runs": len(configs),
+            "failed": failures,
+            "output_path": str(writer.path),
+            "format": writer.format,
+            "wall_seconds": round(elapsed, 2),
+        }
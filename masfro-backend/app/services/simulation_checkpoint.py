@@ -0,0 +1,196 @@
+# filename: app/services/simulation_checkpoint.py
+
+"""
+Simulation Checkpoints for MAS-FRO
+
+Serializes a mid-flood simulation state into one compact binary blob so it
+can be restored in well under a second, either to branch "what-if" runs
+from the same state or to recover after a worker restart without replaying
+the scenario from the start.
+
+A checkpoint holds:
+- graph edge risk scores (float32 array in edge order)
+- HazardAgent caches (flood data, scout reports, risk history/trend)
+- scenario event queue position (file + events consumed)
+- evacuation center occupancy
+- simulation clock, tick count, time step, mode and pending routes
+
+Blob layout: 4-byte magic, uint16 version, zlib-compressed pickle.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import logging
+import pickle
+import re
+import struct
+import zlib
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_MAGIC = b"MFCK"
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = ".ckpt"
+_HEADER = struct.Struct("<4sH")
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def encode_checkpoint(state: Dict[str, Any], level: int = 1) -> bytes:
+    """
+    Encode a checkpoint state dict as a compressed blob.
+
+    Args:
+        state: State captured by SimulationManager
+        level: zlib compression level (1 favours speed)
+
+    Returns:
+        Checkpoint bytes
+    """
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), level)
+    return _HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION) + payload
+
+
+def decode_checkpoint(blob: bytes) -> Dict[str, Any]:
+    """
+    Decode a blob produced by encode_checkpoint().
+
+    Only load checkpoints this service wrote itself: the payload is a
+    pickle.
+
+    Args:
+        blob: Checkpoint bytes
+
+    Returns:
+        Checkpoint state dict
+
+    Raises:
+        ValueError: If the blob is not a supported checkpoint
+    """
+    if len(blob) < _HEADER.size:
+        raise ValueError("Checkpoint is truncated")
+    magic, version = _HEADER.unpack_from(blob)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError("Not a MAS-FRO simulation checkpoint")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version}")
+    try:
+        return pickle.loads(zlib.decompress(blob[_HEADER.size:]))
+    except (zlib.error, pickle.UnpicklingError, EOFError) as e:
+        raise ValueError(f"Corrupt checkpoint: {e}")
+
+
+class CheckpointStore:
+    """
+    Checkpoint blobs kept in memory and mirrored to a directory.
+
+    Attributes:
+        directory: Directory checkpoint files are written to (None = memory only)
+        keep: Most checkpoints retained; the oldest are evicted first
+
+    Example:
+        >>> store = CheckpointStore(Path("outputs/checkpoints"), keep=5)
+        >>> store.save("tick_120", blob)
+        >>> blob = store.load("tick_120")
+    """
+
+    def __init__(self, directory: Optional[Path] = None, keep: int = 5):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Optional directory for checkpoint files
+            keep: Maximum number of checkpoints retained
+        """
+        self.directory = Path(directory) if directory else None
+        self.keep = keep
+        self._blobs: Dict[str, bytes] = {}
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._lock = Lock()
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}{CHECKPOINT_SUFFIX}"
+
+    def save(self, name: str, blob: bytes, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Store a checkpoint.
+
+        Args:
+            name: Checkpoint name (letters, digits, '.', '_', '-')
+            blob: Encoded checkpoint
+            meta: Optional summary stored alongside (tick, clock, ...)
+
+        Returns:
+            Checkpoint info dict
+
+        Raises:
+            ValueError: If the name is invalid
+        """
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid checkpoint name: {name!r}")
+
+        info = {
+            "name": name,
+            "size_bytes": len(blob),
+            "created_at": datetime.now().isoformat(),
+            **(meta or {})
+        }
+        with self._lock:
+            self._blobs.pop(name, None)
+            self._blobs[name] = blob
+            self._meta[name] = info
+            if self.directory:
+                self._path(name).write_bytes(blob)
+
+            while len(self._blobs) > self.keep:
+                oldest = next(iter(self._blobs))
+                del self._blobs[oldest]
+                del self._meta[oldest]
+                if self.directory:
+                    self._path(oldest).unlink(missing_ok=True)
+
+        return info
+
+    def load(self, name: str) -> bytes:
+        """
+        Get a checkpoint blob by name (memory first, then disk).
+
+        Args:
+            name: Checkpoint name
+
+        Returns:
+            Encoded checkpoint
+
+        Raises:
+            KeyError: If the checkpoint does not exist
+        """
+        with self._lock:
+            if name in self._blobs:
+                return self._blobs[name]
+        if self.directory and _NAME_PATTERN.match(name) and self._path(name).exists():
+            return self._path(name).read_bytes()
+        raise KeyError(f"Checkpoint not found: {name}")
+
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        List stored checkpoints, oldest first.
+
+        Returns:
+            List of checkpoint info dicts (in-memory and on-disk)
+        """
+        with self._lock:
+            infos = [dict(info) for info in self._meta.values()]
+        if self.directory:
+            known = {info["name"] for info in infos}
+            for path in sorted(self.directory.glob(f"*{CHECKPOINT_SUFFIX}"), key=lambda p: p.stat().st_mtime):
+                if path.stem not in known:
+                    infos.append({"name": path.stem, "size_bytes": path.stat().st_size})
+        return infos
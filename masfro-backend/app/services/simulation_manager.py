@@ -15,7 +15,7 @@ Author: MAS-FRO Development Team
 Date: November 2025
 """
 
-import json
+import time
 import asyncio
 from typing import Optional, Dict, Any, Literal, List, Tuple
 from datetime import datetime, timedelta
@@ -24,8 +24,27 @@ import logging
 from threading import Lock
 from pathlib import Path
 
+from app.services.flood_interpolation import INTERPOLATION_METHODS
+from app.services.scenario_events import ScenarioEvent, ScenarioEventQueue, BINARY_SUFFIX
+from app.services.simulation_checkpoint import (
+    CheckpointStore,
+    decode_checkpoint,
+    encode_checkpoint,
+)
+from app.services.tick_profiler import TickProfiler
+from app.services.tick_recorder import TickRecorder, summarize_route
+
 logger = logging.getLogger(__name__)
 
+# HazardAgent state captured by checkpoints
+HAZARD_CHECKPOINT_ATTRIBUTES = (
+    "flood_data_cache",
+    "scout_data_cache",
+    "risk_history",
+    "previous_average_risk",
+    "last_update_time",
+)
+
 
 class SimulationState(str, Enum):
     """Simulation state enumeration."""
@@ -48,6 +67,9 @@ MODE_TO_RETURN_PERIOD = {
     SimulationMode.HEAVY: "rr04"
 }
 
+# Fixed start time of the virtual clock so headless runs are reproducible
+VIRTUAL_CLOCK_EPOCH = datetime(2025, 11, 1, 0, 0, 0)
+
 
 class SimulationManager:
     """
@@ -81,11 +103,52 @@ class SimulationManager:
         
         # Scenario-based simulation attributes
         self._scenario_data: Optional[Dict[str, Any]] = None
-        self._event_queue: List[Dict[str, Any]] = []
+        self._event_queue = ScenarioEventQueue()
         self._simulation_clock: float = 0.0
         self._last_tick_time: Optional[datetime] = None
         self._tick_loop_task: Optional[asyncio.Task] = None
 
+        # Virtual clock / headless mode (see configure_clock and run_headless)
+        self.virtual_clock: bool = False
+        self.seconds_per_tick: float = 1.0
+        self.seconds_per_time_step: Optional[float] = None
+        self.flood_interpolation: Optional[str] = None  # Fractional time steps (see configure_clock)
+        self.headless: bool = False
+        self._headless_max_ticks: Optional[int] = None
+        self._run_started_perf: Optional[float] = None
+        self._run_ticks: int = 0
+
+        # Max scout reports taken off the queue per tick (None = all that are due)
+        self.scout_batch_size: Optional[int] = None
+
+        # Threads used to route a tick's pending requests (see _run_routing_phase)
+        self.routing_workers: int = 4
+
+        # Collect (and ML-process) the next tick's events while this tick's
+        # routing phase runs; see _start_collection_prefetch()
+        self.pipeline_collection: bool = True
+        self._collection_prefetch: Optional[asyncio.Future] = None
+
+        # Tick scheduler (see configure_scheduler and _simulation_loop)
+        self.tick_period_s: float = 1.0
+        self.max_coalesced_ticks: int = 10
+        self._last_tick_lateness_s: float = 0.0
+        self._scheduler_stats: Dict[str, Any] = self._new_scheduler_stats()
+
+        # Checkpoints (see create_checkpoint / restore_checkpoint)
+        self.checkpoint_store = CheckpointStore()
+        self.checkpoint_every_n_ticks: Optional[int] = None
+
+        # Rolling per-phase (and HazardAgent step) timings, see get_profile()
+        self.profiler = TickProfiler()
+
+        # Tick record/replay (see start_recording and replay_tick)
+        self.tick_log_directory: Path = Path(__file__).parent.parent.parent / "outputs" / "tick_logs"
+        self.tick_recorder: Optional[TickRecorder] = None
+        self._tick_io: Optional[Dict[str, List[Any]]] = None
+        self._replay_clock: Optional[float] = None
+        self._replay_now: Optional[datetime] = None
+
         # Tick-based simulation state
         self.current_time_step: int = 1  # GeoTIFF time step (1-18 hours)
         self.tick_count: int = 0
@@ -103,9 +166,12 @@ class SimulationManager:
         self.routing_agent = None
         self.evacuation_manager = None
         self.environment = None
+        self.ws_manager = None
 
-        # Thread safety
+        # Thread safety: _lock is held by worker phases; _tick_lock is held
+        # for a whole tick so checkpoints only ever see a state between ticks
         self._lock = Lock()
+        self._tick_lock = asyncio.Lock()
 
         logger.info("SimulationManager initialized (tick-based architecture)")
 
@@ -164,6 +230,9 @@ class SimulationManager:
         self.environment = environment
         self.ws_manager = ws_manager
 
+        if hazard_agent is not None and hasattr(hazard_agent, "set_profiler"):
+            hazard_agent.set_profiler(self.profiler)
+
         logger.info(
             f"SimulationManager configured with agents: "
             f"flood={flood_agent is not None}, "
@@ -173,12 +242,170 @@ class SimulationManager:
             f"evacuation={evacuation_manager is not None}"
         )
 
-    async def start(self, mode: str = "light") -> Dict[str, Any]:
+    def configure_clock(
+        self,
+        virtual: bool = False,
+        seconds_per_tick: float = 1.0,
+        seconds_per_time_step: Optional[float] = None,
+        flood_interpolation: Optional[str] = None
+    ) -> None:
+        """
+        Choose between the wall clock and a deterministic virtual clock.
+
+        With the virtual clock every tick advances the simulation clock by
+        exactly seconds_per_tick, and agents that accept a time source
+        (HazardAgent) see virtual time starting at VIRTUAL_CLOCK_EPOCH.
+
+        Args:
+            virtual: Use the virtual clock
+            seconds_per_tick: Simulated seconds per tick (virtual clock only)
+            seconds_per_time_step: If set, advance the GeoTIFF time step
+                (1-18) every this many simulated seconds
+            flood_interpolation: With seconds_per_time_step, give the
+                HazardAgent fractional time steps and interpolate edge
+                depths between hourly maps ("linear" or "monotone")
+
+        Raises:
+            ValueError: If seconds_per_tick is not positive or the
+                interpolation method is unknown
+        """
+        if seconds_per_tick <= 0:
+            raise ValueError(f"seconds_per_tick must be positive, got {seconds_per_tick}")
+        if flood_interpolation is not None and flood_interpolation not in INTERPOLATION_METHODS:
+            raise ValueError(
+                f"Invalid flood_interpolation: {flood_interpolation}. "
+                f"Valid options: {INTERPOLATION_METHODS}"
+            )
+        self.virtual_clock = virtual
+        self.seconds_per_tick = seconds_per_tick
+        self.seconds_per_time_step = seconds_per_time_step
+        self.flood_interpolation = flood_interpolation
+
+        if self.hazard_agent and hasattr(self.hazard_agent, "set_time_source"):
+            self.hazard_agent.set_time_source(self.now if virtual else None)
+        if self.hazard_agent and flood_interpolation and hasattr(self.hazard_agent, "interpolation"):
+            self.hazard_agent.interpolation = flood_interpolation
+
+    def configure_scheduler(
+        self,
+        tick_period_s: Optional[float] = None,
+        max_coalesced_ticks: Optional[int] = None
+    ) -> None:
+        """
+        Configure the real-time tick scheduler.
+
+        Args:
+            tick_period_s: Target wall-clock seconds between tick starts
+            max_coalesced_ticks: Most due ticks merged into one pass when the
+                loop falls behind; lag beyond this is dropped
+
+        Raises:
+            ValueError: If a value is not positive
+        """
+        if tick_period_s is not None:
+            if tick_period_s <= 0:
+                raise ValueError("tick_period_s must be positive")
+            self.tick_period_s = float(tick_period_s)
+        if max_coalesced_ticks is not None:
+            if max_coalesced_ticks < 1:
+                raise ValueError("max_coalesced_ticks must be at least 1")
+            self.max_coalesced_ticks = int(max_coalesced_ticks)
+
+        logger.info(
+            f"Tick scheduler configured: period={self.tick_period_s}s, "
+            f"max_coalesced_ticks={self.max_coalesced_ticks}"
+        )
+
+    @staticmethod
+    def _new_scheduler_stats() -> Dict[str, Any]:
+        return {
+            "last_lateness_ms": 0.0,
+            "max_lateness_ms": 0.0,
+            "last_duration_ms": 0.0,
+            "late_ticks": 0,
+            "coalesced_ticks": 0,
+            "dropped_ticks": 0,
+        }
+
+    def now(self) -> datetime:
+        """
+        Current simulation time.
+
+        Returns:
+            Virtual time (epoch + simulation clock) or wall-clock time
+            (the recorded time while replaying a tick)
+        """
+        if self._replay_now is not None:
+            return self._replay_now
+        if self.virtual_clock:
+            return VIRTUAL_CLOCK_EPOCH + timedelta(seconds=self._simulation_clock)
+        return datetime.now()
+
+    def _has_subscribers(self) -> bool:
+        """Check whether any WebSocket client would receive a broadcast."""
+        if not self.ws_manager:
+            return False
+        connections = getattr(self.ws_manager, "active_connections", None)
+        return connections is None or len(connections) > 0
+
+    async def run_headless(
+        self,
+        mode: str = "light",
+        max_ticks: Optional[int] = None,
+        seconds_per_tick: float = 1.0,
+        seconds_per_time_step: Optional[float] = None,
+        flood_interpolation: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a whole scenario as fast as possible on the virtual clock.
+
+        Ticks run back to back without sleeping. The run ends after
+        max_ticks, or once the event queue is drained (and the last time
+        step is reached when time steps advance).
+
+        Args:
+            mode: Simulation mode (light, medium, heavy)
+            max_ticks: Optional limit on the ticks run by this call (a
+                resumed run counts from where it resumes)
+            seconds_per_tick: Simulated seconds per tick
+            seconds_per_time_step: Optional GeoTIFF time step length
+            flood_interpolation: Optional sub-step depth interpolation
+                ("linear" or "monotone", see configure_clock)
+
+        Returns:
+            Dict with final status and throughput
+
+        Example:
+            >>> summary = await manager.run_headless("heavy", seconds_per_tick=60,
+            ...                                      seconds_per_time_step=3600)
+            >>> summary["ticks_per_second"]
+        """
+        self.configure_clock(
+            virtual=True,
+            seconds_per_tick=seconds_per_tick,
+            seconds_per_time_step=seconds_per_time_step,
+            flood_interpolation=flood_interpolation
+        )
+        self._headless_max_ticks = max_ticks
+        await self.start(mode, headless=True)
+        if self._tick_loop_task:
+            await self._tick_loop_task
+
+        status = self.get_status()
+        logger.info(
+            f"Headless run complete: {status['tick_count']} ticks, "
+            f"{status['ticks_per_second']} ticks/s"
+        )
+        return status
+
+    async def start(self, mode: str = "light", headless: bool = False) -> Dict[str, Any]:
         """
         Start the simulation (async).
 
         Args:
             mode: Simulation mode (light, medium, heavy)
+            headless: Run ticks back to back (no 1 s sleep) until the
+                scenario ends; see run_headless()
 
         Returns:
             Dictionary with start result and metadata
@@ -189,6 +416,8 @@ class SimulationManager:
         if self._state == SimulationState.RUNNING:
             raise ValueError("Simulation is already running")
 
+        previous_mode = self._mode
+
         # Validate mode
         try:
             self._mode = SimulationMode(mode.lower())
@@ -198,12 +427,23 @@ class SimulationManager:
                 f"Must be light, medium, or heavy"
             )
 
-        # Load scenario data
-        self._load_scenario(self._mode)
+        # Load scenario data (resuming a paused run keeps the queue position,
+        # including events already prefetched for the next tick)
+        if (
+            self._state == SimulationState.STOPPED
+            or self._mode != previous_mode
+            or self._event_queue.path is None
+        ):
+            self._collection_prefetch = None
+            self._load_scenario(self._mode)
 
         # Update state
         previous_state = self._state
         self._state = SimulationState.RUNNING
+        self.headless = headless
+        self._run_started_perf = time.perf_counter()
+        self._run_ticks = 0
+        self._scheduler_stats = self._new_scheduler_stats()
 
         if previous_state == SimulationState.STOPPED:
             self._started_at = datetime.now()
@@ -273,6 +513,7 @@ class SimulationManager:
             except asyncio.CancelledError:
                 pass
             self._tick_loop_task = None
+        await self._drain_workers(keep_prefetch=True)
 
         # Update runtime
         if self._last_tick_time:
@@ -318,6 +559,12 @@ class SimulationManager:
             except asyncio.CancelledError:
                 pass
             self._tick_loop_task = None
+        await self._drain_workers()
+
+        # A tick log session cannot span a reset
+        if self.tick_recorder is not None:
+            self.stop_recording()
+        self.profiler.reset()
 
         previous_state = self._state
         previous_mode = self._mode
@@ -331,7 +578,7 @@ class SimulationManager:
         self._paused_at = None
         self._total_runtime_seconds = 0.0
         self._scenario_data = None
-        self._event_queue = []
+        self._event_queue.clear()
         self._simulation_clock = 0.0
         self.tick_count = 0
         self.current_time_step = 1
@@ -351,10 +598,8 @@ class SimulationManager:
 
         # Reset graph edges to baseline (risk = 0.0)
         if self.environment and self.environment.graph:
-            edge_count = 0
-            for u, v, key in self.environment.graph.edges(keys=True):
-                self.environment.graph[u][v][key]["risk_score"] = 0.0
-                edge_count += 1
+            self.environment.reset_edge_risks()
+            edge_count = self.environment.graph.number_of_edges()
             logger.info(f"Reset {edge_count} edges to baseline risk")
 
         # Reset evacuation center occupancy
@@ -386,52 +631,140 @@ class SimulationManager:
         }
 
     def _load_scenario(self, mode: SimulationMode):
-        """Load the simulation scenario file for the given mode."""
-        scenario_file = Path(__file__).parent.parent / "data" / "simulation_scenarios" / f"{mode.value}_scenario.csv"
+        """
+        Open the scenario for the given mode as a streaming event queue.
+
+        A compiled scenario (<mode>_scenario.mfsc) is preferred over the CSV
+        when present. Events are pulled from the file as the simulation
+        clock reaches them and payloads are decoded on first use.
+        """
+        scenario_dir = Path(__file__).parent.parent / "data" / "simulation_scenarios"
+        scenario_file = scenario_dir / f"{mode.value}_scenario{BINARY_SUFFIX}"
+        if not scenario_file.exists():
+            scenario_file = scenario_dir / f"{mode.value}_scenario.csv"
         if not scenario_file.exists():
             logger.error(f"Scenario file not found: {scenario_file}")
             self._scenario_data = {"events": []}
-            self._event_queue = []
+            self._event_queue = ScenarioEventQueue()
             return
 
-        import csv
-        
-        events = []
-        with open(scenario_file, 'r', newline='') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    payload = json.loads(row['payload'])
-                    events.append({
-                        "time_offset": int(row['time_offset']),
-                        "agent": row['agent'],
-                        "payload": payload
-                    })
-                except json.JSONDecodeError as e:
-                    logger.error(f"Error decoding JSON payload in {scenario_file} at row {reader.line_num}: {e}")
-                except KeyError as e:
-                    logger.error(f"Missing column in {scenario_file} at row {reader.line_num}: {e}")
-
-        self._scenario_data = {"name": f"{mode.value.capitalize()} Flood Scenario (from CSV)", "events": events}
-        
-        # Sort events by time_offset and populate the event queue
-        self._event_queue = sorted(events, key=lambda e: e["time_offset"])
+        self._event_queue.clear()
+        try:
+            self._event_queue = ScenarioEventQueue.from_file(scenario_file)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to open scenario {scenario_file}: {e}")
+            self._scenario_data = {"events": []}
+            self._event_queue = ScenarioEventQueue()
+            return
+
+        source_type = "compiled" if scenario_file.suffix == BINARY_SUFFIX else "CSV"
+        self._scenario_data = {
+            "name": f"{mode.value.capitalize()} Flood Scenario (from {source_type})",
+            "file": scenario_file.name
+        }
         logger.info(f"Loaded scenario '{self._scenario_data.get('name')}' with {len(self._event_queue)} events.")
 
     async def _simulation_loop(self):
-        """The main simulation loop that runs as a background task."""
+        """
+        The main simulation loop that runs as a background task.
+
+        Ticks are scheduled on a fixed grid of tick_period_s; the time spent
+        running a tick is subtracted from the following sleep. When ticks
+        run past their slot, every tick that has come due is coalesced into
+        a single pass (one fusion/routing run covering several periods)
+        instead of queueing up lag. Headless runs skip scheduling entirely.
+        """
+        loop = asyncio.get_running_loop()
+        next_tick_at = loop.time()
+        periods = 1
+
         while self._state == SimulationState.RUNNING:
-            await self.run_tick()
-            if self.ws_manager:
+            lateness = 0.0 if self.headless else max(0.0, loop.time() - next_tick_at)
+            self._last_tick_lateness_s = lateness
+
+            tick_result = await self.run_tick(periods=periods)
+            self._record_schedule(tick_result, lateness, periods)
+
+            if self.checkpoint_every_n_ticks and self.tick_count % self.checkpoint_every_n_ticks == 0:
+                try:
+                    await self.create_checkpoint(f"tick_{self.tick_count}")
+                except Exception as e:
+                    logger.error(f"Periodic checkpoint failed: {e}")
+
+            if self._has_subscribers():
                 await self.ws_manager.broadcast({
                     "type": "simulation_state",
                     "event": "tick",
-                    "data": self.get_status(),
+                    "data": {**self.get_status(), "profile": self.get_profile()},
                     "timestamp": datetime.now().isoformat()
                 })
-            await asyncio.sleep(1) # Tick every second
 
-    async def run_tick(self, time_step: Optional[int] = None) -> Dict[str, Any]:
+            if self.headless:
+                if self._headless_finished():
+                    await self._drain_workers()
+                    self._state = SimulationState.PAUSED
+                    self._paused_at = datetime.now()
+                    self._tick_loop_task = None
+                    break
+                await asyncio.sleep(0)  # Yield to the event loop only
+                continue
+
+            next_tick_at += self.tick_period_s
+            behind = loop.time() - next_tick_at
+            if behind <= 0:
+                periods = 1
+                await asyncio.sleep(-behind)
+                continue
+
+            # Fell behind: merge every tick that is already due into the next
+            # pass and run it now
+            due = 1 + int(behind // self.tick_period_s)
+            periods = min(due, self.max_coalesced_ticks)
+            next_tick_at += (periods - 1) * self.tick_period_s
+            if due > periods:
+                # Too far behind to catch up; drop the remaining lag
+                self._scheduler_stats["dropped_ticks"] += due - periods
+                next_tick_at = loop.time()
+            await asyncio.sleep(0)
+
+    def _record_schedule(self, tick_result: Dict[str, Any], lateness: float, periods: int) -> None:
+        """Update scheduler counters after a tick."""
+        stats = self._scheduler_stats
+        lateness_ms = lateness * 1000.0
+        stats["last_lateness_ms"] = round(lateness_ms, 2)
+        stats["max_lateness_ms"] = round(max(stats["max_lateness_ms"], lateness_ms), 2)
+        stats["last_duration_ms"] = round(tick_result.get("duration_ms", 0.0), 2)
+        if lateness_ms > 1.0:
+            stats["late_ticks"] += 1
+        stats["coalesced_ticks"] += periods - 1
+
+    def _flood_time(self) -> float:
+        """
+        GeoTIFF time for the fusion phase.
+
+        The simulation clock in time-step units (e.g. 4.5 halfway through
+        hour 4) when flood_interpolation is configured, else the current
+        hourly time step.
+        """
+        if self.flood_interpolation and self.seconds_per_time_step:
+            return min(18.0, 1.0 + self._simulation_clock / self.seconds_per_time_step)
+        return self.current_time_step
+
+    def _headless_finished(self) -> bool:
+        """Check whether a headless run has reached its end."""
+        if self._headless_max_ticks is not None:
+            return self._run_ticks >= self._headless_max_ticks
+        if self._collection_prefetch is not None or self._event_queue:
+            return False
+        if self.seconds_per_time_step is not None:
+            return self.current_time_step >= 18
+        return True
+
+    async def run_tick(
+        self,
+        time_step: Optional[int] = None,
+        periods: int = 1
+    ) -> Dict[str, Any]:
         """
         Execute one simulation tick with ordered agent execution.
 
@@ -444,6 +777,9 @@ class SimulationManager:
 
         Args:
             time_step: Optional explicit time step (1-18). If None, auto-increment.
+            periods: Number of scheduled ticks this pass covers (> 1 when the
+                scheduler coalesces late ticks); advances the virtual clock
+                by that many ticks
 
         Returns:
             Dict with tick execution results
@@ -451,6 +787,11 @@ class SimulationManager:
         Raises:
             ValueError: If simulation is not running
         """
+        async with self._tick_lock:
+            return await self._execute_tick(time_step, periods)
+
+    async def _execute_tick(self, time_step: Optional[int], periods: int) -> Dict[str, Any]:
+        """Run the phases of one tick (caller holds the tick lock)."""
         if self._state != SimulationState.RUNNING:
             raise ValueError(
                 "Cannot run tick: simulation is not running. "
@@ -459,11 +800,22 @@ class SimulationManager:
 
         # Update simulation clock
         now = datetime.now()
-        if self._last_tick_time:
+        if self._replay_clock is not None:
+            self._simulation_clock = self._replay_clock
+        elif self.virtual_clock:
+            if self.tick_count > 0:
+                self._simulation_clock += self.seconds_per_tick * periods
+        elif self._last_tick_time:
             delta = (now - self._last_tick_time).total_seconds()
             self._simulation_clock += delta
         self._last_tick_time = now
 
+        # Derive the GeoTIFF time step from the clock when configured
+        if self.seconds_per_time_step:
+            self.current_time_step = min(
+                18, 1 + int(self._simulation_clock // self.seconds_per_time_step)
+            )
+
         # Update time step
         # if time_step is not None:
         #     if not 1 <= time_step <= 18:
@@ -476,6 +828,12 @@ class SimulationManager:
         #     self.current_time_step = (self.current_time_step % 18) + 1
 
         self.tick_count += 1
+        self._run_ticks += 1
+        tick_now = self.now()
+
+        # Inputs/outputs captured for the tick log (recording or replaying)
+        capture = self.tick_recorder is not None or self._replay_clock is not None
+        self._tick_io = {"events": [], "routes": [], "route_results": []} if capture else None
 
         logger.info(
             f"=== TICK {self.tick_count} START === "
@@ -488,35 +846,54 @@ class SimulationManager:
             "tick": self.tick_count,
             "time_step": self.current_time_step,
             "mode": self._mode.value,
-            "phases": {}
+            "coalesced": periods - 1,
+            "phases": {},
+            "phase_ms": {}
         }
+        phase_ms = tick_result["phase_ms"]
+        tick_started = time.perf_counter()
+
+        # CPU-heavy phases run in a worker thread so the event loop (HTTP and
+        # WebSocket clients) stays responsive; the lock is held in the worker.
+
+        # === PHASE 1: DATA COLLECTION ===
+        logger.info("--- Phase 1: Data Collection ---")
+        phase_started = time.perf_counter()
+        collection_result = await self._run_collection_async()
+        tick_result["phases"]["collection"] = collection_result
+        phase_ms["collection"] = (time.perf_counter() - phase_started) * 1000.0
+
+        # === PHASE 2: DATA FUSION & GRAPH UPDATE ===
+        logger.info("--- Phase 2: Data Fusion & Graph Update ---")
+        phase_started = time.perf_counter()
+        fusion_result = await self._run_fusion_phase()
+        tick_result["phases"]["fusion"] = fusion_result
+        phase_ms["fusion"] = (time.perf_counter() - phase_started) * 1000.0
+
+        # Collection for the next tick only touches the event queue and the
+        # ML models, so it overlaps routing/evacuation of this tick
+        self._start_collection_prefetch()
+
+        # === PHASES 3-5: ROUTING, EVACUATION, TIME ADVANCEMENT ===
+        routing_result, evacuation_result, advancement_result = await asyncio.to_thread(
+            self._run_post_fusion_phases, phase_ms
+        )
+        tick_result["phases"]["routing"] = routing_result
+        tick_result["phases"]["evacuation"] = evacuation_result
+        tick_result["phases"]["advancement"] = advancement_result
 
-        # Acquire lock for thread-safe execution
-        with self._lock:
-            # === PHASE 1: DATA COLLECTION ===
-            logger.info("--- Phase 1: Data Collection ---")
-            collection_result = self._run_collection_phase()
-            tick_result["phases"]["collection"] = collection_result
-
-            # === PHASE 2: DATA FUSION & GRAPH UPDATE ===
-            logger.info("--- Phase 2: Data Fusion & Graph Update ---")
-            fusion_result = await self._run_fusion_phase()
-            tick_result["phases"]["fusion"] = fusion_result
+        tick_result["duration_ms"] = (time.perf_counter() - tick_started) * 1000.0
 
-            # === PHASE 3: ROUTING ===
-            logger.info("--- Phase 3: Routing ---")
-            routing_result = self._run_routing_phase()
-            tick_result["phases"]["routing"] = routing_result
+        for phase, ms in phase_ms.items():
+            self.profiler.record(phase, ms)
+        self.profiler.record("tick", tick_result["duration_ms"])
 
-            # === PHASE 4: EVACUATION CENTER UPDATE ===
-            logger.info("--- Phase 4: Evacuation Center Update ---")
-            evacuation_result = self._run_evacuation_update_phase()
-            tick_result["phases"]["evacuation"] = evacuation_result
+        # Let the RoutingAgent switch to bounded fast mode when ticks run long
+        if self.routing_agent and hasattr(self.routing_agent, "report_load"):
+            self.routing_agent.report_load(tick_latency_ms=tick_result["duration_ms"])
 
-            # === PHASE 5: TIME ADVANCEMENT ===
-            logger.info("--- Phase 5: Time Advancement ---")
-            advancement_result = self._run_advancement_phase()
-            tick_result["phases"]["advancement"] = advancement_result
+        if self.tick_recorder is not None:
+            await asyncio.to_thread(self._record_tick, tick_result, tick_now, periods)
 
         logger.info(f"=== TICK {self.tick_count} COMPLETE ===\n")
 
@@ -532,39 +909,167 @@ class SimulationManager:
         Returns:
             Dict with collection phase results
         """
-        phase_result = {
-            "events_processed": 0,
-            "flood_data_collected": 0,
-            "scout_reports_collected": 0,
-            "errors": []
-        }
+        staged = self._collect_due_events(self._simulation_clock)
+        return self._publish_collection(staged)
+
+    async def _run_collection_async(self) -> Dict[str, Any]:
+        """
+        Run the collection phase off the event loop.
+
+        Picks up events already collected by a prefetch for this tick and
+        tops them up with anything else due at the actual clock.
+
+        Returns:
+            Dict with collection phase results
+        """
+        staged = None
+        prefetch = self._collection_prefetch
+        if prefetch is not None:
+            try:
+                # Shielded: if the tick is cancelled (pause), the prefetched
+                # events stay available to the resumed run
+                staged = await asyncio.shield(prefetch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Collection prefetch failed: {e}")
+            self._collection_prefetch = None
+
+        staged = await asyncio.to_thread(
+            self._collect_due_events, self._simulation_clock, staged
+        )
+        return self._publish_collection(staged)
+
+    def _next_clock_lower_bound(self) -> float:
+        """Earliest simulation clock value the next tick can have."""
+        if self.virtual_clock:
+            return self._simulation_clock + self.seconds_per_tick
+        if self.headless:
+            return self._simulation_clock
+        # The next tick is scheduled one period after this tick's slot
+        return self._simulation_clock + max(0.0, self.tick_period_s - self._last_tick_lateness_s)
+
+    def _start_collection_prefetch(self) -> None:
+        """
+        Start collecting the next tick's events in a worker thread.
+
+        Only runs when ticks are driven by the simulation loop (so the next
+        clock value is bounded) and some event is due by then. Events due
+        later than the bound are left for the next tick's top-up.
+        """
+        if (
+            not self.pipeline_collection
+            or self._tick_loop_task is None
+            or self._collection_prefetch is not None
+        ):
+            return
+        if (
+            self.headless
+            and self._headless_max_ticks is not None
+            and self._run_ticks >= self._headless_max_ticks
+        ):
+            return
+
+        next_clock = self._next_clock_lower_bound()
+        next_event = self._event_queue.peek()
+        if next_event is None or next_event.time_offset > next_clock:
+            return
+
+        self._collection_prefetch = asyncio.ensure_future(
+            asyncio.to_thread(self._collect_due_events, next_clock)
+        )
+
+    async def _drain_workers(self, keep_prefetch: bool = False) -> None:
+        """
+        Wait for in-flight worker phases.
+
+        Args:
+            keep_prefetch: Keep events already prefetched for the next tick
+                (pausing) instead of dropping them (reset/restore, where the
+                queue is replaced anyway)
+        """
+        prefetch = self._collection_prefetch
+        if prefetch is not None:
+            await asyncio.wait([prefetch])
+            if not keep_prefetch or prefetch.exception() is not None:
+                self._collection_prefetch = None
+
+        # Worker phases hold the lock while they run
+        await asyncio.to_thread(self._lock.acquire)
+        self._lock.release()
+
+    def _collect_due_events(
+        self,
+        clock: float,
+        staged: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Take due events off the queue and run scout reports through ML.
+
+        Does not touch the shared_data_bus, so it can run ahead of the
+        current tick; _publish_collection() makes the results visible.
+
+        Args:
+            clock: Simulation clock to collect events for
+            staged: Earlier partial collection for the same tick to extend
+
+        Returns:
+            Staged collection (phase_result, flood_data, scout_reports, details)
+        """
+        if staged is None:
+            staged = {
+                "phase_result": {
+                    "events_processed": 0,
+                    "flood_data_collected": 0,
+                    "scout_reports_collected": 0,
+                    "errors": []
+                },
+                "flood_data": None,
+                "scout_reports": [],
+                "details": [],
+                "events": []
+            }
+        phase_result = staged["phase_result"]
 
         # ENHANCED: Log current queue state
         next_event_info = "None"
-        if self._event_queue:
-            next_event = self._event_queue[0]
-            next_event_info = f"agent={next_event.get('agent')}, time={next_event.get('time_offset')}s"
+        next_event = self._event_queue.peek()
+        if next_event is not None:
+            next_event_info = f"agent={next_event.agent}, time={next_event.time_offset}s"
 
         logger.info(
             f"Collection phase START - "
-            f"Clock: {self._simulation_clock:.2f}s, "
+            f"Clock: {clock:.2f}s, "
             f"Queue size: {len(self._event_queue)}, "
             f"Next event: {next_event_info}"
         )
 
-        # Clear previous tick's data
-        self.shared_data_bus["flood_data"] = {}
-        self.shared_data_bus["scout_data"] = []
-        self.shared_data_bus["graph_updated"] = False
-
         # Process events from the queue
-        events_processed_details = []
-        while self._event_queue and self._event_queue[0]["time_offset"] <= self._simulation_clock:
-            event = self._event_queue.pop(0)
+        due_scout_reports: List[Tuple[Any, Dict[str, Any]]] = []
+        while True:
+            next_event = self._event_queue.peek()
+            if next_event is None or next_event.time_offset > clock:
+                break
+            if (
+                self.scout_batch_size is not None
+                and next_event.agent == "scout_agent"
+                and phase_result["scout_reports_collected"] >= self.scout_batch_size
+            ):
+                # Remaining due scout reports roll over to the next tick
+                break
+            event = self._event_queue.pop()
             phase_result["events_processed"] += 1
-            agent = event.get("agent")
-            payload = event.get("payload")
-            time_offset = event.get("time_offset")
+            agent = event.agent
+            time_offset = event.time_offset
+            # Raw input as consumed, kept for the tick log
+            staged["events"].append((time_offset, agent, event.raw_payload))
+            try:
+                payload = event.payload
+            except ValueError as e:
+                error_msg = f"Invalid payload for {agent} event at {time_offset}s: {e}"
+                phase_result["errors"].append(error_msg)
+                logger.error(error_msg)
+                continue
 
             # ENHANCED: Log each event processed with details
             logger.info(
@@ -573,61 +1078,70 @@ class SimulationManager:
             )
 
             if agent == "flood_agent":
-                self.shared_data_bus["flood_data"] = payload
+                staged["flood_data"] = payload
                 phase_result["flood_data_collected"] += 1
                 logger.info(f"✓ Flood data collected: {len(payload)} data points")
-                events_processed_details.append(f"flood_agent@{time_offset}s")
+                staged["details"].append(f"flood_agent@{time_offset}s")
 
             elif agent == "scout_agent":
                 # ENHANCED: Log scout data structure
                 logger.debug(f"Scout report payload (raw): {payload}")
-
-                # Process scout data through ML pipeline if scout agent available
-                if self.scout_agent and hasattr(self.scout_agent, 'nlp_processor') and self.scout_agent.nlp_processor:
-                    # Extract flood info using NLP processor
-                    text = payload.get("text", "")
-                    if text:
-                        logger.debug(f"Processing scout text through ML: '{text}'")
-                        flood_info = self.scout_agent.nlp_processor.extract_flood_info(text)
-
-                        # Geocode the result
-                        if self.scout_agent.geocoder:
-                            enhanced_info = self.scout_agent.geocoder.geocode_nlp_result(flood_info)
-                        else:
-                            enhanced_info = flood_info
-
-                        # Merge ML predictions with original payload
-                        payload.update({
-                            "coordinates": enhanced_info.get("coordinates"),
-                            "severity": enhanced_info.get("severity", 0),
-                            "confidence": enhanced_info.get("confidence", 0),
-                            "report_type": enhanced_info.get("report_type", "unknown"),
-                            "is_flood_related": enhanced_info.get("is_flood_related", False)
-                        })
-                        logger.debug(f"ML enhanced payload: coordinates={payload.get('coordinates')}, severity={payload.get('severity'):.2f}")
-
-                # FIX: Update timestamp to current time for simulation data
-                # This ensures reports pass the time-based filtering in the API
-                if "timestamp" in payload:
-                    payload["timestamp"] = datetime.now().isoformat()
-
-                self.shared_data_bus["scout_data"].append(payload)
+                due_scout_reports.append((time_offset, payload))
                 phase_result["scout_reports_collected"] += 1
 
-                # Log key scout data fields
-                location = payload.get("location", "Unknown")
-                severity = payload.get("severity", 0)
-                has_coords = "coordinates" in payload and payload["coordinates"] is not None
-                logger.info(
-                    f"✓ Scout report collected: location='{location}', severity={severity:.2f}, has_coords={has_coords}"
-                )
-                events_processed_details.append(f"scout_agent@{time_offset}s[{location}]")
-
             else:
                 error_msg = f"Unknown agent '{agent}' in scenario event."
                 phase_result["errors"].append(error_msg)
                 logger.warning(error_msg)
 
+        # Run all due scout reports through the ML pipeline in one batch
+        try:
+            self._enrich_scout_reports([payload for _, payload in due_scout_reports])
+        except Exception as e:
+            error_msg = f"Scout ML processing failed: {e}"
+            phase_result["errors"].append(error_msg)
+            logger.error(error_msg)
+
+        staged["scout_reports"].extend(due_scout_reports)
+        return staged
+
+    def _publish_collection(self, staged: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Place a staged collection onto the shared_data_bus for this tick.
+
+        Args:
+            staged: Result of _collect_due_events()
+
+        Returns:
+            Dict with collection phase results
+        """
+        phase_result = staged["phase_result"]
+        events_processed_details = staged["details"]
+        if self._tick_io is not None:
+            self._tick_io["events"] = staged["events"]
+
+        # Clear previous tick's data
+        self.shared_data_bus["flood_data"] = staged["flood_data"] or {}
+        self.shared_data_bus["scout_data"] = []
+        self.shared_data_bus["graph_updated"] = False
+
+        for time_offset, payload in staged["scout_reports"]:
+            # FIX: Update timestamp to current time for simulation data
+            # This ensures reports pass the time-based filtering in the API
+            if "timestamp" in payload:
+                payload["timestamp"] = self.now().isoformat()
+
+            self.shared_data_bus["scout_data"].append(payload)
+
+            # Log key scout data fields
+            location = payload.get("location", "Unknown")
+            severity = payload.get("severity", 0)
+            has_coords = "coordinates" in payload and payload["coordinates"] is not None
+            logger.info(
+                f"✓ Scout report collected: location='{location}', severity={severity:.2f}, has_coords={has_coords}"
+            )
+            events_processed_details.append(f"scout_agent@{time_offset}s[{location}]")
+
         # ENHANCED: Log phase summary
         logger.info(
             f"Collection phase COMPLETE - "
@@ -637,6 +1151,52 @@ class SimulationManager:
             f"Scout reports: {phase_result['scout_reports_collected']}")
         return phase_result
 
+    def _enrich_scout_reports(self, payloads: List[Dict[str, Any]]) -> None:
+        """
+        Add ML predictions to scout report payloads in place.
+
+        All report texts go through one batched NLP call and one batched
+        geocoding call, so a burst of reports costs about one model call.
+
+        Args:
+            payloads: Scout report payloads collected this tick
+        """
+        nlp_processor = getattr(self.scout_agent, "nlp_processor", None) if self.scout_agent else None
+        if not nlp_processor:
+            return
+
+        texted = [payload for payload in payloads if payload.get("text", "")]
+        if not texted:
+            return
+
+        texts = [payload["text"] for payload in texted]
+        logger.debug(f"Processing {len(texts)} scout texts through ML in one batch")
+
+        if hasattr(nlp_processor, "extract_flood_info_batch"):
+            flood_infos = nlp_processor.extract_flood_info_batch(texts)
+        else:
+            flood_infos = [nlp_processor.extract_flood_info(text) for text in texts]
+
+        # Geocode the results
+        geocoder = getattr(self.scout_agent, "geocoder", None)
+        if geocoder and hasattr(geocoder, "geocode_nlp_results"):
+            enhanced_infos = geocoder.geocode_nlp_results(flood_infos)
+        elif geocoder:
+            enhanced_infos = [geocoder.geocode_nlp_result(info) for info in flood_infos]
+        else:
+            enhanced_infos = flood_infos
+
+        # Merge ML predictions with original payloads
+        for payload, enhanced_info in zip(texted, enhanced_infos):
+            payload.update({
+                "coordinates": enhanced_info.get("coordinates"),
+                "severity": enhanced_info.get("severity", 0),
+                "confidence": enhanced_info.get("confidence", 0),
+                "report_type": enhanced_info.get("report_type", "unknown"),
+                "is_flood_related": enhanced_info.get("is_flood_related", False)
+            })
+            logger.debug(f"ML enhanced payload: coordinates={payload.get('coordinates')}, severity={payload.get('severity'):.2f}")
+
     async def _run_fusion_phase(self) -> Dict[str, Any]:
         """
         Phase 2: Data fusion and graph update by HazardAgent.
@@ -645,9 +1205,26 @@ class SimulationManager:
         calculates risk scores, and updates the graph. This ensures
         the graph is updated BEFORE routing calculations.
 
+        The update runs in a worker thread; the WebSocket broadcast is
+        sent from the event loop afterwards.
+
         Returns:
             Dict with fusion phase results
         """
+        phase_result, update_result = await asyncio.to_thread(self._run_fusion_update)
+
+        if update_result and update_result.get("edges_updated", 0) > 0:
+            await self._broadcast_graph_update(update_result)
+
+        return phase_result
+
+    def _run_fusion_update(self) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Run HazardAgent fusion under the tick lock (worker thread).
+
+        Returns:
+            Tuple of (phase result, HazardAgent update result or None)
+        """
         phase_result = {
             "edges_updated": 0,
             "errors": []
@@ -655,47 +1232,46 @@ class SimulationManager:
 
         if not self.hazard_agent:
             logger.warning("HazardAgent not configured, skipping fusion phase")
-            return phase_result
-
-        try:
-            # Update HazardAgent's GeoTIFF scenario to current time step
-            return_period = MODE_TO_RETURN_PERIOD[self._mode]
-            self.hazard_agent.set_flood_scenario(
-                return_period=return_period,
-                time_step=self.current_time_step
-            )
+            return phase_result, None
 
-            # Pass collected data to HazardAgent
-            flood_data = self.shared_data_bus.get("flood_data", {})
-            scout_data = self.shared_data_bus.get("scout_data", [])
+        update_result = None
+        with self._lock:
+            try:
+                # Update HazardAgent's GeoTIFF scenario to current time step
+                return_period = MODE_TO_RETURN_PERIOD[self._mode]
+                self.hazard_agent.set_flood_scenario(
+                    return_period=return_period,
+                    time_step=self._flood_time()
+                )
 
-            # Call HazardAgent's update_risk method
-            update_result = self.hazard_agent.update_risk(
-                flood_data=flood_data,
-                scout_data=scout_data,
-                time_step=self.current_time_step
-            )
+                # Pass collected data to HazardAgent
+                flood_data = self.shared_data_bus.get("flood_data", {})
+                scout_data = self.shared_data_bus.get("scout_data", [])
 
-            phase_result["edges_updated"] = update_result.get("edges_updated", 0)
-            self.shared_data_bus["graph_updated"] = True
+                # Call HazardAgent's update_risk method
+                update_result = self.hazard_agent.update_risk(
+                    flood_data=flood_data,
+                    scout_data=scout_data,
+                    time_step=self.current_time_step
+                )
 
-            if update_result.get("edges_updated", 0) > 0:
-                await self._broadcast_graph_update(update_result)
+                phase_result["edges_updated"] = update_result.get("edges_updated", 0)
+                self.shared_data_bus["graph_updated"] = True
 
-            logger.info(
-                f"HazardAgent updated {phase_result['edges_updated']} edges "
-                f"(time_step={self.current_time_step})"
-            )
+                logger.info(
+                    f"HazardAgent updated {phase_result['edges_updated']} edges "
+                    f"(time_step={self.current_time_step})"
+                )
 
-        except Exception as e:
-            logger.error(f"HazardAgent fusion failed: {e}")
-            phase_result["errors"].append(f"HazardAgent: {str(e)}")
+            except Exception as e:
+                logger.error(f"HazardAgent fusion failed: {e}")
+                phase_result["errors"].append(f"HazardAgent: {str(e)}")
 
-        return phase_result
+        return phase_result, update_result
 
     async def _broadcast_graph_update(self, update_result: Dict[str, Any]):
         """Broadcast graph risk update to WebSocket clients."""
-        if not self.ws_manager:
+        if not self._has_subscribers():
             return
 
         await self.ws_manager.broadcast({
@@ -710,6 +1286,41 @@ class SimulationManager:
         })
 
 
+    def _run_post_fusion_phases(
+        self,
+        phase_ms: Optional[Dict[str, float]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Run routing, evacuation update and time advancement (worker thread).
+
+        Args:
+            phase_ms: Optional dict that receives each phase's duration (ms)
+
+        Returns:
+            Tuple of (routing, evacuation, advancement) phase results
+        """
+        timings = phase_ms if phase_ms is not None else {}
+        with self._lock:
+            # === PHASE 3: ROUTING ===
+            logger.info("--- Phase 3: Routing ---")
+            phase_started = time.perf_counter()
+            routing_result = self._run_routing_phase()
+            timings["routing"] = (time.perf_counter() - phase_started) * 1000.0
+
+            # === PHASE 4: EVACUATION CENTER UPDATE ===
+            logger.info("--- Phase 4: Evacuation Center Update ---")
+            phase_started = time.perf_counter()
+            evacuation_result = self._run_evacuation_update_phase()
+            timings["evacuation"] = (time.perf_counter() - phase_started) * 1000.0
+
+            # === PHASE 5: TIME ADVANCEMENT ===
+            logger.info("--- Phase 5: Time Advancement ---")
+            phase_started = time.perf_counter()
+            advancement_result = self._run_advancement_phase()
+            timings["advancement"] = (time.perf_counter() - phase_started) * 1000.0
+
+        return routing_result, evacuation_result, advancement_result
+
     def _run_routing_phase(self) -> Dict[str, Any]:
         """
         Phase 3: Process route requests via EvacuationManagerAgent.
@@ -731,34 +1342,72 @@ class SimulationManager:
             )
             return phase_result
 
-        # Process pending routes from shared_data_bus
+        # Take pending routes from shared_data_bus; requests queued by the
+        # API while this phase runs go to the fresh list for the next tick
         pending_routes = self.shared_data_bus.get("pending_routes", [])
+        self.shared_data_bus["pending_routes"] = []
+        tick_io = self._tick_io
+        if tick_io is not None:
+            tick_io["routes"] = [
+                {key: request.get(key) for key in ("start", "end", "preferences")}
+                for request in pending_routes
+            ]
+
+        if self.routing_agent and hasattr(self.routing_agent, "report_load"):
+            self.routing_agent.report_load(queue_depth=len(pending_routes))
 
         if not pending_routes:
             logger.debug("No pending route requests in this tick")
             return phase_result
 
-        for route_request in pending_routes:
+        # Risk writers (including the flood data scheduler's thread) wait
+        # while the batch searches run, so the whole queue is routed as one
+        # batch: requests sharing a destination share one search, groups
+        # run on a pool
+        if hasattr(self.evacuation_manager, "handle_route_requests"):
+            if self.environment is not None:
+                phase_result["risk_epoch"] = getattr(self.environment, "risk_epoch", None)
             try:
-                start = route_request.get("start")
-                end = route_request.get("end")
-                preferences = route_request.get("preferences")
-
-                route_result = self.evacuation_manager.handle_route_request(
-                    start=start,
-                    end=end,
-                    preferences=preferences
+                route_results = self.evacuation_manager.handle_route_requests(
+                    pending_routes,
+                    max_workers=self.routing_workers
                 )
-
-                phase_result["routes_processed"] += 1
-                logger.info(f"Processed route request: {start} -> {end}")
-
             except Exception as e:
-                logger.error(f"Route request processing failed: {e}")
+                logger.error(f"Route batch processing failed: {e}")
                 phase_result["errors"].append(f"Route: {str(e)}")
+                route_results = [{"status": "exception", "error": str(e)} for _ in pending_routes]
+            else:
+                phase_result["routes_processed"] = len(route_results)
+                logger.info(f"Processed {len(route_results)} route requests in one batch")
+        else:
+            route_results = []
+            for route_request in pending_routes:
+                try:
+                    start = route_request.get("start")
+                    end = route_request.get("end")
+                    preferences = route_request.get("preferences")
 
-        # Clear processed routes
-        self.shared_data_bus["pending_routes"] = []
+                    route_results.append(self.evacuation_manager.handle_route_request(
+                        start=start,
+                        end=end,
+                        preferences=preferences
+                    ))
+
+                    phase_result["routes_processed"] += 1
+                    logger.info(f"Processed route request: {start} -> {end}")
+
+                except Exception as e:
+                    logger.error(f"Route request processing failed: {e}")
+                    phase_result["errors"].append(f"Route: {str(e)}")
+                    route_results.append({"status": "exception", "error": str(e)})
+
+        # Results in request order for this tick
+        self.shared_data_bus["route_results"] = route_results
+        if tick_io is not None:
+            tick_io["route_results"] = [summarize_route(result) for result in route_results]
+
+        if self.routing_agent and hasattr(self.routing_agent, "report_load"):
+            self.routing_agent.report_load(queue_depth=0)
 
         return phase_result
 
@@ -859,6 +1508,361 @@ class SimulationManager:
 
         return phase_result
 
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def configure_checkpoints(
+        self,
+        every_n_ticks: Optional[int] = None,
+        directory: Optional[Path] = None,
+        keep: int = 5
+    ) -> None:
+        """
+        Configure checkpoint storage and periodic checkpoints.
+
+        Args:
+            every_n_ticks: Take a checkpoint every N ticks (None disables)
+            directory: Mirror checkpoints to this directory (None = memory only)
+            keep: Number of checkpoints retained
+        """
+        self.checkpoint_every_n_ticks = every_n_ticks
+        self.checkpoint_store = CheckpointStore(directory, keep=keep)
+        logger.info(
+            f"Checkpoints configured: every_n_ticks={every_n_ticks}, "
+            f"directory={directory}, keep={keep}"
+        )
+
+    async def create_checkpoint(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Capture the current simulation state as a checkpoint.
+
+        Waits for a tick in progress to finish (ticks hold the tick lock
+        from collection to recording), so the state is always captured
+        between ticks. Events already prefetched for the next tick are not
+        counted as consumed; a restored run reads them again.
+
+        Args:
+            name: Checkpoint name (default: tick_<tick_count>)
+
+        Returns:
+            Checkpoint info dict (name, size, tick, clock)
+        """
+        name = name or f"tick_{self.tick_count}"
+        started = time.perf_counter()
+
+        async with self._tick_lock:
+            prefetched = await self._prefetched_event_count()
+            blob = await asyncio.to_thread(self._encode_state, prefetched)
+        info = self.checkpoint_store.save(name, blob, meta={
+            "tick_count": self.tick_count,
+            "simulation_clock": round(self._simulation_clock, 2),
+            "time_step": self.current_time_step,
+            "mode": self._mode.value
+        })
+        info["capture_ms"] = round((time.perf_counter() - started) * 1000.0, 2)
+
+        logger.info(f"Checkpoint '{name}' captured: {info['size_bytes']} bytes in {info['capture_ms']} ms")
+        return info
+
+    async def _prefetched_event_count(self) -> int:
+        """Wait for the collection prefetch and count the events it took."""
+        prefetch = self._collection_prefetch
+        if prefetch is None:
+            return 0
+        await asyncio.wait([prefetch])
+        if prefetch.exception():
+            return 0
+        return prefetch.result()["phase_result"]["events_processed"]
+
+    def _encode_state(self, prefetched_events: int = 0) -> bytes:
+        """Capture and encode the simulation state under the tick lock."""
+        from app.services.evacuation_service import get_evacuation_service
+
+        with self._lock:
+            state: Dict[str, Any] = {
+                "mode": self._mode.value,
+                "simulation_clock": self._simulation_clock,
+                "tick_count": self.tick_count,
+                "current_time_step": self.current_time_step,
+                "clock": {
+                    "virtual": self.virtual_clock,
+                    "seconds_per_tick": self.seconds_per_tick,
+                    "seconds_per_time_step": self.seconds_per_time_step,
+                    "flood_interpolation": self.flood_interpolation
+                },
+                "scenario": {
+                    "path": str(self._event_queue.path) if self._event_queue.path else None,
+                    "position": self._event_queue.consumed - prefetched_events
+                },
+                "pending_routes": list(self.shared_data_bus.get("pending_routes", [])),
+                "risk": None,
+                "hazard": None,
+                "evacuation_occupancy": dict(get_evacuation_service().occupancy)
+            }
+
+            if self.environment is not None and self.environment.graph is not None:
+                state["risk"] = self.environment.get_risk_array()
+
+            if self.hazard_agent is not None:
+                state["hazard"] = {
+                    attr: getattr(self.hazard_agent, attr)
+                    for attr in HAZARD_CHECKPOINT_ATTRIBUTES
+                    if hasattr(self.hazard_agent, attr)
+                }
+
+            return encode_checkpoint(state)
+
+    async def restore_checkpoint(
+        self,
+        name: Optional[str] = None,
+        blob: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """
+        Restore a checkpoint; the simulation is left paused at that state.
+
+        Args:
+            name: Name of a stored checkpoint
+            blob: Encoded checkpoint (used instead of name)
+
+        Returns:
+            Dict with restored tick, clock and restore duration
+
+        Raises:
+            KeyError: If the named checkpoint does not exist
+            ValueError: If neither name nor blob is given, or the blob is invalid
+        """
+        started = time.perf_counter()
+        if blob is None:
+            if name is None:
+                raise ValueError("Provide a checkpoint name or blob")
+            blob = self.checkpoint_store.load(name)
+        state = decode_checkpoint(blob)
+
+        if self._tick_loop_task:
+            self._tick_loop_task.cancel()
+            try:
+                await self._tick_loop_task
+            except asyncio.CancelledError:
+                pass
+            self._tick_loop_task = None
+
+        async with self._tick_lock:
+            await self._drain_workers()
+            await asyncio.to_thread(self._apply_state, state)
+        self._state = SimulationState.PAUSED
+        self._paused_at = datetime.now()
+
+        result = {
+            "status": "success",
+            "checkpoint": name,
+            "state": self._state.value,
+            "mode": self._mode.value,
+            "tick_count": self.tick_count,
+            "simulation_clock": round(self._simulation_clock, 2),
+            "time_step": self.current_time_step,
+            "restore_ms": round((time.perf_counter() - started) * 1000.0, 2)
+        }
+        logger.info(f"Checkpoint restored: {result}")
+        return result
+
+    def _apply_state(self, state: Dict[str, Any]) -> None:
+        """Apply a decoded checkpoint under the tick lock."""
+        from app.services.evacuation_service import get_evacuation_service
+
+        with self._lock:
+            self._mode = SimulationMode(state["mode"])
+            self._simulation_clock = state["simulation_clock"]
+            self.tick_count = state["tick_count"]
+            self.current_time_step = state["current_time_step"]
+            clock = state["clock"]
+            self.configure_clock(
+                virtual=clock["virtual"],
+                seconds_per_tick=clock["seconds_per_tick"],
+                seconds_per_time_step=clock["seconds_per_time_step"],
+                flood_interpolation=clock.get("flood_interpolation")
+            )
+            self._last_tick_time = None
+
+            # Scenario position: reopen the file and skip consumed events
+            self._event_queue.clear()
+            scenario = state["scenario"]
+            if scenario["path"] and Path(scenario["path"]).exists():
+                self._event_queue = ScenarioEventQueue.from_file(Path(scenario["path"]))
+                self._event_queue.skip(scenario["position"])
+                self._scenario_data = {
+                    "name": f"{self._mode.value.capitalize()} Flood Scenario (checkpoint)",
+                    "file": Path(scenario["path"]).name
+                }
+            else:
+                logger.warning(f"Checkpoint scenario file unavailable: {scenario['path']}")
+                self._event_queue = ScenarioEventQueue()
+
+            self.shared_data_bus = {
+                "flood_data": {},
+                "scout_data": [],
+                "graph_updated": False,
+                "pending_routes": list(state["pending_routes"])
+            }
+
+            if state["risk"] is not None and self.environment is not None:
+                try:
+                    self.environment.set_risk_array(state["risk"])
+                except ValueError as e:
+                    logger.error(f"Checkpoint risk scores not restored: {e}")
+
+            if state["hazard"] is not None and self.hazard_agent is not None:
+                for attr, value in state["hazard"].items():
+                    setattr(self.hazard_agent, attr, value)
+                self.hazard_agent.set_flood_scenario(
+                    return_period=MODE_TO_RETURN_PERIOD[self._mode],
+                    time_step=self.current_time_step
+                )
+
+            service = get_evacuation_service()
+            service.reset_all_occupancy()
+            for center, occupancy in state["evacuation_occupancy"].items():
+                if center in service.occupancy:
+                    service.occupancy[center] = occupancy
+
+    # ------------------------------------------------------------------
+    # Tick record/replay
+    # ------------------------------------------------------------------
+
+    async def start_recording(self, path: Path) -> Dict[str, Any]:
+        """
+        Start appending every tick's inputs and outputs to a tick log.
+
+        The session begins with a checkpoint of the current state so the
+        log can be replayed from here with TickReplayer.
+
+        Args:
+            path: Tick log file (appended to if it exists)
+
+        Returns:
+            Dict with the log path and the tick the session starts at
+
+        Raises:
+            ValueError: If an existing file is not a tick log
+        """
+        if self.tick_recorder is not None:
+            self.stop_recording()
+
+        recorder = TickRecorder(path)
+        async with self._tick_lock:
+            prefetched = await self._prefetched_event_count()
+            checkpoint = await asyncio.to_thread(self._encode_state, prefetched)
+            risks = None
+            if self.environment is not None and self.environment.graph is not None:
+                risks = await asyncio.to_thread(self.environment.get_risk_array)
+
+            recorder.begin_session(
+                meta={
+                    "mode": self._mode.value,
+                    "tick_count": self.tick_count,
+                    "simulation_clock": self._simulation_clock,
+                    "clock": {
+                        "virtual": self.virtual_clock,
+                        "seconds_per_tick": self.seconds_per_tick,
+                        "seconds_per_time_step": self.seconds_per_time_step
+                    },
+                    "scout_batch_size": self.scout_batch_size,
+                    "edge_count": int(risks.size) if risks is not None else 0
+                },
+                checkpoint=checkpoint,
+                risks=risks
+            )
+            self.tick_recorder = recorder
+
+        logger.info(f"Tick recording started: {recorder.path} (from tick {self.tick_count})")
+        return {"path": str(recorder.path), "tick_count": self.tick_count}
+
+    def stop_recording(self) -> Dict[str, Any]:
+        """
+        Stop recording and close the tick log.
+
+        Returns:
+            Dict with path, records and bytes written
+
+        Raises:
+            ValueError: If no recording is active
+        """
+        if self.tick_recorder is None:
+            raise ValueError("No tick recording is active")
+        recorder, self.tick_recorder = self.tick_recorder, None
+        info = recorder.close()
+        logger.info(f"Tick recording stopped: {info}")
+        return info
+
+    def _record_tick(self, tick_result: Dict[str, Any], tick_now: datetime, periods: int) -> None:
+        """Append the finished tick to the tick log (worker thread)."""
+        recorder = self.tick_recorder
+        if recorder is None:
+            return
+        tick_io = self._tick_io or {}
+        risks = None
+        if self.environment is not None and self.environment.graph is not None:
+            risks = self.environment.get_risk_array()
+
+        record = {
+            "tick": tick_result["tick"],
+            "clock": self._simulation_clock,
+            "now": tick_now,
+            "mode": tick_result["mode"],
+            "time_step": tick_result["time_step"],
+            "periods": periods,
+            "events": tick_io.get("events", []),
+            "routes": tick_io.get("routes", []),
+            "route_results": tick_io.get("route_results", []),
+            "edges_updated": tick_result["phases"]["fusion"].get("edges_updated", 0),
+            "phase_ms": dict(tick_result["phase_ms"]),
+            "duration_ms": tick_result["duration_ms"]
+        }
+        try:
+            recorder.record_tick(record, risks)
+        except (OSError, ValueError) as e:
+            logger.error(f"Tick {tick_result['tick']} not recorded: {e}")
+
+    async def replay_tick(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one tick from a tick log record instead of the scenario queue.
+
+        The recorded events and route requests are fed through the normal
+        phases with the recorded clock, time step and agent time. Used by
+        TickReplayer; the simulation loop must not be running.
+
+        Args:
+            record: Tick record from read_tick_log()
+
+        Returns:
+            Tick result, plus "route_results" summaries for comparison
+
+        Raises:
+            ValueError: If the simulation loop is running
+        """
+        if self._tick_loop_task is not None:
+            raise ValueError("Cannot replay ticks while the simulation loop is running")
+
+        self._event_queue = ScenarioEventQueue()
+        for time_offset, agent, raw_payload in record["events"]:
+            self._event_queue.push(ScenarioEvent(time_offset, agent, raw_payload))
+        self.shared_data_bus["pending_routes"] = [dict(request) for request in record["routes"]]
+        self._mode = SimulationMode(record["mode"])
+        self.tick_count = record["tick"] - 1
+        self.current_time_step = record["time_step"]
+        self._replay_clock = record["clock"]
+        self._replay_now = record["now"]
+        self._state = SimulationState.RUNNING
+        try:
+            tick_result = await self.run_tick(periods=record.get("periods", 1))
+        finally:
+            self._replay_clock = None
+            self._replay_now = None
+            self._state = SimulationState.PAUSED
+
+        tick_result["route_results"] = list(self._tick_io["route_results"]) if self._tick_io else []
+        return tick_result
+
     def add_route_request(
         self,
         start: Tuple[float, float],
@@ -908,7 +1912,15 @@ class SimulationManager:
             "return_period": MODE_TO_RETURN_PERIOD.get(self._mode),
             "pending_routes": len(self.shared_data_bus.get("pending_routes", [])),
             "scenario": self._scenario_data.get("name") if self._scenario_data else None,
-            "events_in_queue": len(self._event_queue)
+            "events_in_queue": len(self._event_queue),
+            "clock": "virtual" if self.virtual_clock else "wall",
+            "headless": self.headless,
+            "ticks_per_second": self._ticks_per_second(),
+            "scheduler": {
+                "tick_period_s": self.tick_period_s,
+                "max_coalesced_ticks": self.max_coalesced_ticks,
+                **self._scheduler_stats
+            }
         }
 
         # Calculate current runtime if running
@@ -918,6 +1930,24 @@ class SimulationManager:
 
         return status
 
+    def get_profile(self) -> Dict[str, Dict[str, float]]:
+        """
+        Rolling latency percentiles per tick phase and HazardAgent step.
+
+        Returns:
+            Dict of name -> {count, last, p50, p95, max} in ms. Names are
+            "tick", the phase names (collection, fusion, routing,
+            evacuation, advancement) and "hazard.<step>"
+        """
+        return self.profiler.snapshot()
+
+    def _ticks_per_second(self) -> float:
+        """Tick throughput since the simulation was last started."""
+        if not self._run_started_perf or not self._run_ticks:
+            return 0.0
+        elapsed = time.perf_counter() - self._run_started_perf
+        return round(self._run_ticks / elapsed, 2) if elapsed > 0 else 0.0
+
     def set_data(self, key: str, value: Any) -> None:
         """
         Store simulation data.
@@ -0,0 +1,174 @@
+# filename: app/services/tick_profiler.py
+
+"""
+Tick Profiler for MAS-FRO
+
+Low-overhead timing of simulation tick phases and agent steps. Durations
+come from the monotonic perf_counter_ns clock and go into fixed-size ring
+buffers, so recording a sample is a couple of array writes; percentiles are
+only computed when a snapshot is requested (profile endpoint, tick
+broadcast).
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import logging
+from threading import Lock
+from time import perf_counter_ns
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 512
+
+
+class RollingHistogram:
+    """
+    Ring buffer of the most recent duration samples (milliseconds).
+
+    Attributes:
+        window: Number of samples kept
+        count: Samples recorded since creation/reset
+    """
+
+    __slots__ = ("window", "count", "_samples", "_index", "_last")
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self.count = 0
+        self._samples = np.zeros(window, dtype=np.float64)
+        self._index = 0
+        self._last = 0.0
+
+    def add(self, value_ms: float) -> None:
+        """Record one sample, overwriting the oldest once the window is full."""
+        self._samples[self._index] = value_ms
+        self._index = (self._index + 1) % self.window
+        self.count += 1
+        self._last = value_ms
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarize the samples in the window.
+
+        Returns:
+            Dict with count, last, p50, p95 and max (ms)
+        """
+        samples = self._samples[:min(self.count, self.window)]
+        if samples.size == 0:
+            return {"count": 0, "last": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        p50, p95 = np.percentile(samples, (50, 95))
+        return {
+            "count": self.count,
+            "last": round(self._last, 3),
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "max": round(float(samples.max()), 3)
+        }
+
+
+class _Timer:
+    """Context manager timing one block into a TickProfiler."""
+
+    __slots__ = ("_profiler", "_name", "_started")
+
+    def __init__(self, profiler: "TickProfiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._started = 0
+
+    def __enter__(self) -> "_Timer":
+        self._started = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self._profiler.record(self._name, (perf_counter_ns() - self._started) / 1e6)
+        return False
+
+
+class TickProfiler:
+    """
+    Rolling per-name timing histograms for simulation ticks.
+
+    Names are free-form; SimulationManager uses the phase names ("tick",
+    "collection", "fusion", "routing", ...) and HazardAgent prefixes its
+    steps with "hazard.".
+
+    Attributes:
+        window: Samples kept per name
+        enabled: When False, samples are dropped
+
+    Example:
+        >>> profiler = TickProfiler()
+        >>> with profiler.measure("hazard.fuse_data"):
+        ...     fused = hazard_agent.fuse_data()
+        >>> profiler.snapshot()["hazard.fuse_data"]["p95"]
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, enabled: bool = True):
+        """
+        Initialize the profiler.
+
+        Args:
+            window: Samples kept per name
+            enabled: Record samples
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.enabled = enabled
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._lock = Lock()
+
+    def record(self, name: str, duration_ms: float) -> None:
+        """
+        Record one duration.
+
+        Args:
+            name: Phase or step name
+            duration_ms: Duration in milliseconds
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = RollingHistogram(self.window)
+            histogram.add(duration_ms)
+
+    def measure(self, name: str) -> _Timer:
+        """
+        Time a block with the monotonic clock.
+
+        Args:
+            name: Phase or step name
+
+        Returns:
+            Context manager recording the block's duration
+        """
+        return _Timer(self, name)
+
+    def snapshot(self, names: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Percentile summary per name.
+
+        Args:
+            names: Optional subset of names
+
+        Returns:
+            Dict of name -> {count, last, p50, p95, max} in ms
+        """
+        with self._lock:
+            items = [
+                (name, histogram) for name, histogram in sorted(self._histograms.items())
+                if names is None or name in names
+            ]
+            return {name: histogram.summary() for name, histogram in items}
+
+    def reset(self) -> None:
+        """Drop all samples."""
+        with self._lock:
+            self._histograms.clear()
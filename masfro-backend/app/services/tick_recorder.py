@@ -0,0 +1,473 @@
+# filename: app/services/tick_recorder.py
+
+"""
+Tick Record/Replay for MAS-FRO Performance Regression Runs
+
+TickRecorder appends every tick's inputs and outputs to a compact binary
+log while SimulationManager runs:
+
+- inputs: scenario events consumed (raw payloads, before ML enrichment),
+  route requests, simulation clock/time step and the time agents saw
+- outputs: edge risk change set, route result summaries, per-phase timings
+
+Each recording session starts with a checkpoint of the simulation state, so
+TickReplayer can restore that state on a new build, feed the recorded inputs
+back through the agents headlessly and report per-phase latency and output
+drift against the recording.
+
+Log layout: 4-byte magic + uint16 version, then records of uint32 length
+followed by a zlib-compressed pickle. Records are flushed one by one; a
+truncated tail (crash mid-write) is ignored when reading.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import logging
+import math
+import pickle
+import re
+import struct
+import zlib
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TICK_LOG_MAGIC = b"MFTL"
+TICK_LOG_VERSION = 1
+TICK_LOG_SUFFIX = ".mftl"
+_FILE_HEADER = struct.Struct("<4sH")
+_RECORD_HEADER = struct.Struct("<I")
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+# Route result fields compared between recording and replay
+ROUTE_SUMMARY_FIELDS = ("status", "distance", "estimated_time", "risk_level")
+
+
+def tick_log_path(directory: Path, name: str) -> Path:
+    """
+    Build the path of a named tick log inside a directory.
+
+    Args:
+        directory: Tick log directory
+        name: Log name (letters, digits, '.', '_', '-')
+
+    Returns:
+        Path of <directory>/<name>.mftl
+
+    Raises:
+        ValueError: If the name is invalid
+    """
+    if not _NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid tick log name: {name!r}")
+    return Path(directory) / f"{name}{TICK_LOG_SUFFIX}"
+
+
+def summarize_route(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a route result to the fields compared on replay.
+
+    Route IDs and timestamps differ on every run and are dropped.
+
+    Args:
+        result: EvacuationManagerAgent.handle_route_request() result
+
+    Returns:
+        Dict with status, distance, estimated_time, risk_level, path_nodes
+    """
+    summary = {field: result.get(field) for field in ROUTE_SUMMARY_FIELDS}
+    summary["path_nodes"] = len(result.get("path") or [])
+    return summary
+
+
+def risk_changes(previous: Optional[np.ndarray], current: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute the edge risk change set between two get_risk_array() snapshots.
+
+    Args:
+        previous: Earlier snapshot (None records the full array)
+        current: Current snapshot
+
+    Returns:
+        {"idx": int32 edge indices, "risk": float32 new values}, or
+        {"full": array} when there is no comparable earlier snapshot
+    """
+    if previous is None or previous.shape != current.shape:
+        return {"full": current}
+    idx = np.flatnonzero(previous != current).astype(np.int32)
+    return {"idx": idx, "risk": current[idx]}
+
+
+def apply_risk_changes(base: Optional[np.ndarray], changes: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Apply a change set from risk_changes() to a snapshot.
+
+    Args:
+        base: Snapshot the change set was computed against
+        changes: Change set
+
+    Returns:
+        New snapshot (base is not modified)
+    """
+    if "full" in changes:
+        return changes["full"].copy()
+    updated = base.copy()
+    updated[changes["idx"]] = changes["risk"]
+    return updated
+
+
+def _encode_record(record: Dict[str, Any]) -> bytes:
+    payload = zlib.compress(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL), 1)
+    return _RECORD_HEADER.pack(len(payload)) + payload
+
+
+def read_tick_log(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a tick log in write order.
+
+    Only read logs this service wrote itself: records are pickles.
+
+    Args:
+        path: Tick log file
+
+    Yields:
+        Record dicts ({"kind": "session", ...} or {"kind": "tick", ...})
+
+    Raises:
+        ValueError: If the file is not a tick log
+    """
+    with open(path, "rb") as f:
+        header = f.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size:
+            raise ValueError(f"Tick log is truncated: {path}")
+        magic, version = _FILE_HEADER.unpack(header)
+        if magic != TICK_LOG_MAGIC:
+            raise ValueError(f"Not a MAS-FRO tick log: {path}")
+        if version != TICK_LOG_VERSION:
+            raise ValueError(f"Unsupported tick log version {version}")
+
+        while True:
+            prefix = f.read(_RECORD_HEADER.size)
+            if not prefix:
+                return
+            length, payload = None, b""
+            if len(prefix) == _RECORD_HEADER.size:
+                (length,) = _RECORD_HEADER.unpack(prefix)
+                payload = f.read(length)
+            if length is None or len(payload) < length:
+                logger.warning(f"Ignoring truncated record at the end of {path}")
+                return
+            yield pickle.loads(zlib.decompress(payload))
+
+
+def load_sessions(path: Path) -> List[Dict[str, Any]]:
+    """
+    Group a tick log's records into recording sessions.
+
+    Args:
+        path: Tick log file
+
+    Returns:
+        List of {"session": session record, "ticks": [tick records]}
+    """
+    sessions: List[Dict[str, Any]] = []
+    for record in read_tick_log(path):
+        if record.get("kind") == "session":
+            sessions.append({"session": record, "ticks": []})
+        elif record.get("kind") == "tick" and sessions:
+            sessions[-1]["ticks"].append(record)
+    return sessions
+
+
+class TickRecorder:
+    """
+    Append-only writer for tick logs.
+
+    Attributes:
+        path: Log file (appended to if it already exists)
+        records_written: Records written by this recorder
+        bytes_written: Bytes written by this recorder
+
+    Example:
+        >>> recorder = TickRecorder(Path("outputs/tick_logs/flood_day.mftl"))
+        >>> recorder.begin_session(meta, checkpoint_blob, env.get_risk_array())
+        >>> recorder.record_tick(record, env.get_risk_array())
+        >>> recorder.close()
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) a tick log for appending.
+
+        Args:
+            path: Log file path
+
+        Raises:
+            ValueError: If an existing file is not a tick log
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.records_written = 0
+        self.bytes_written = 0
+        self._last_risks: Optional[np.ndarray] = None
+        self._lock = Lock()
+
+        if self.path.exists() and self.path.stat().st_size > 0:
+            with open(self.path, "rb") as f:
+                header = f.read(_FILE_HEADER.size)
+            if header != _FILE_HEADER.pack(TICK_LOG_MAGIC, TICK_LOG_VERSION):
+                raise ValueError(f"Cannot append to {self.path}: not a tick log")
+            self._file = open(self.path, "ab")
+        else:
+            self._file = open(self.path, "ab")
+            self._file.write(_FILE_HEADER.pack(TICK_LOG_MAGIC, TICK_LOG_VERSION))
+            self._file.flush()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the log has been closed."""
+        return self._file.closed
+
+    def _append(self, record: Dict[str, Any]) -> int:
+        data = _encode_record(record)
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()
+            self.records_written += 1
+            self.bytes_written += len(data)
+        return len(data)
+
+    def begin_session(
+        self,
+        meta: Dict[str, Any],
+        checkpoint: Optional[bytes],
+        risks: Optional[np.ndarray]
+    ) -> None:
+        """
+        Start a recording session.
+
+        Args:
+            meta: Run settings (mode, clock configuration, ...)
+            checkpoint: Simulation checkpoint the replay starts from
+            risks: Edge risk snapshot matching the checkpoint
+        """
+        self._last_risks = risks
+        self._append({
+            "kind": "session",
+            "recorded_at": datetime.now().isoformat(),
+            "meta": meta,
+            "checkpoint": checkpoint,
+            "risk": risks
+        })
+
+    def record_tick(self, record: Dict[str, Any], risks: Optional[np.ndarray]) -> int:
+        """
+        Append one tick, storing only the edges whose risk changed.
+
+        Args:
+            record: Tick inputs and outputs
+            risks: Edge risk snapshot after the tick
+
+        Returns:
+            Bytes written
+        """
+        entry = dict(record, kind="tick")
+        if risks is not None:
+            entry["risk_changes"] = risk_changes(self._last_risks, risks)
+            self._last_risks = risks
+        return self._append(entry)
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Close the log.
+
+        Returns:
+            Dict with path, records and bytes written
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        return {
+            "path": str(self.path),
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written
+        }
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    array = np.asarray(values, dtype=np.float64)
+    return {
+        "p50": round(float(np.percentile(array, 50)), 3),
+        "p95": round(float(np.percentile(array, 95)), 3),
+        "max": round(float(array.max()), 3)
+    }
+
+
+def _routes_match(recorded: Dict[str, Any], replayed: Dict[str, Any], tolerance: float) -> bool:
+    for key, value in recorded.items():
+        other = replayed.get(key)
+        if isinstance(value, float) and isinstance(other, (int, float)):
+            if not math.isclose(value, other, rel_tol=tolerance, abs_tol=tolerance):
+                return False
+        elif value != other:
+            return False
+    return True
+
+
+class TickReplayer:
+    """
+    Replay a tick log through a SimulationManager and compare the outputs.
+
+    The manager must be wired with the agents under test (at least
+    HazardAgent and the graph environment); its simulation loop must not
+    be running.
+
+    Attributes:
+        manager: SimulationManager the ticks are replayed through
+        risk_tolerance: Absolute edge risk difference counted as drift
+        latency_tolerance: Replay p95 / recorded p95 ratio above which a
+            phase is reported as a latency regression
+
+    Example:
+        >>> replayer = TickReplayer(manager)
+        >>> report = await replayer.replay(Path("outputs/tick_logs/flood_day.mftl"))
+        >>> report["risk_drift"]["ticks_with_drift"], report["regressions"]
+    """
+
+    def __init__(
+        self,
+        manager,
+        risk_tolerance: float = 1e-4,
+        latency_tolerance: float = 1.25
+    ):
+        """
+        Initialize the replayer.
+
+        Args:
+            manager: SimulationManager with agents configured
+            risk_tolerance: Edge risk drift tolerance
+            latency_tolerance: Allowed p95 latency ratio per phase
+        """
+        self.manager = manager
+        self.risk_tolerance = risk_tolerance
+        self.latency_tolerance = latency_tolerance
+
+    async def replay(
+        self,
+        path: Path,
+        session: int = 0,
+        max_ticks: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Replay one recording session and compare it with the recording.
+
+        Args:
+            path: Tick log file
+            session: Index of the session to replay
+            max_ticks: Optional limit on replayed ticks
+
+        Returns:
+            Report with per-phase latency (recorded vs replayed), edge risk
+            drift, route drift and the phases that regressed
+
+        Raises:
+            ValueError: If the session does not exist
+        """
+        sessions = load_sessions(path)
+        if not 0 <= session < len(sessions):
+            raise ValueError(f"Tick log {path} has no session {session} ({len(sessions)} recorded)")
+        header, ticks = sessions[session]["session"], sessions[session]["ticks"]
+        if max_ticks is not None:
+            ticks = ticks[:max_ticks]
+
+        manager = self.manager
+        if header.get("checkpoint"):
+            await manager.restore_checkpoint(blob=header["checkpoint"])
+        manager.scout_batch_size = None  # Recorded events are replayed as consumed
+        if manager.hazard_agent and hasattr(manager.hazard_agent, "set_time_source"):
+            manager.hazard_agent.set_time_source(manager.now)
+
+        recorded_risk = header.get("risk")
+        recorded_ms: Dict[str, List[float]] = {}
+        replayed_ms: Dict[str, List[float]] = {}
+        max_abs, abs_sum, compared_edges = 0.0, 0.0, 0
+        ticks_with_drift, first_drift_tick = 0, None
+        routes_compared, routes_mismatched = 0, 0
+
+        for record in ticks:
+            result = await manager.replay_tick(record)
+
+            for phase, ms in record.get("phase_ms", {}).items():
+                recorded_ms.setdefault(phase, []).append(ms)
+            recorded_ms.setdefault("tick", []).append(record.get("duration_ms", 0.0))
+            for phase, ms in result.get("phase_ms", {}).items():
+                replayed_ms.setdefault(phase, []).append(ms)
+            replayed_ms.setdefault("tick", []).append(result.get("duration_ms", 0.0))
+
+            if "risk_changes" in record and manager.environment is not None:
+                recorded_risk = apply_risk_changes(recorded_risk, record["risk_changes"])
+                replayed_risk = manager.environment.get_risk_array()
+                if replayed_risk.shape != recorded_risk.shape:
+                    raise ValueError(
+                        f"Graph mismatch: recorded {recorded_risk.size} edges, "
+                        f"replay graph has {replayed_risk.size}"
+                    )
+                diff = np.abs(replayed_risk.astype(np.float64) - recorded_risk)
+                if diff.size:
+                    max_abs = max(max_abs, float(diff.max()))
+                    abs_sum += float(diff.sum())
+                    compared_edges += diff.size
+                    if diff.max() > self.risk_tolerance:
+                        ticks_with_drift += 1
+                        if first_drift_tick is None:
+                            first_drift_tick = record["tick"]
+
+            for recorded, replayed in zip(record.get("route_results", []), result.get("route_results", [])):
+                routes_compared += 1
+                if not _routes_match(recorded, replayed, self.risk_tolerance):
+                    routes_mismatched += 1
+
+        latency = {}
+        regressions = []
+        for phase in sorted(set(recorded_ms) | set(replayed_ms)):
+            recorded_stats = _percentiles(recorded_ms.get(phase, []))
+            replayed_stats = _percentiles(replayed_ms.get(phase, []))
+            ratio = (
+                round(replayed_stats["p95"] / recorded_stats["p95"], 3)
+                if recorded_stats["p95"] > 0 else None
+            )
+            latency[phase] = {"recorded": recorded_stats, "replayed": replayed_stats, "p95_ratio": ratio}
+            if ratio is not None and ratio > self.latency_tolerance:
+                regressions.append(phase)
+
+        report = {
+            "path": str(path),
+            "session": session,
+            "ticks": len(ticks),
+            "latency_ms": latency,
+            "regressions": regressions,
+            "risk_drift": {
+                "max_abs": round(max_abs, 6),
+                "mean_abs": round(abs_sum / compared_edges, 6) if compared_edges else 0.0,
+                "ticks_with_drift": ticks_with_drift,
+                "first_drift_tick": first_drift_tick
+            },
+            "route_drift": {
+                "compared": routes_compared,
+                "mismatched": routes_mismatched
+            }
+        }
+        logger.info(
+            f"Replayed {len(ticks)} ticks from {path}: "
+            f"risk drift max={report['risk_drift']['max_abs']}, "
+            f"route mismatches={routes_mismatched}, regressions={regressions}"
+        )
+        return report
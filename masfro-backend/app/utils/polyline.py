@@ -0,0 +1,93 @@
+# filename: app/utils/polyline.py
+
+"""
+Encoded Polyline Utilities for MAS-FRO
+
+Implements the Google encoded polyline algorithm used for compact route
+payloads. Coordinates are (latitude, longitude) pairs, delta-encoded at a
+fixed precision and written as base64-like ASCII characters.
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Supported values for the route "encoding" option
+SUPPORTED_ENCODINGS = {"polyline": 5, "polyline6": 6}
+
+
+def _encode_value(value: int, out: List[str]) -> None:
+    """Append one zigzag/varint encoded delta to out."""
+    value = ~(value << 1) if value < 0 else (value << 1)
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+def encode_polyline(coords: Iterable[Sequence[float]], precision: int = 5) -> str:
+    """
+    Encode (lat, lon) coordinates as a Google encoded polyline.
+
+    Args:
+        coords: Sequence of (latitude, longitude) pairs or an (n, 2) array
+        precision: Decimal digits kept (5 for Google, 6 for OSRM/Valhalla)
+
+    Returns:
+        Encoded polyline string
+
+    Example:
+        >>> encode_polyline([(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)])
+        '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+    """
+    points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if len(points) == 0:
+        return ""
+
+    scaled = np.round(points * (10 ** precision)).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+
+    out: List[str] = []
+    for lat_delta, lon_delta in deltas.tolist():
+        _encode_value(lat_delta, out)
+        _encode_value(lon_delta, out)
+    return "".join(out)
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> List[Tuple[float, float]]:
+    """
+    Decode a Google encoded polyline into (lat, lon) coordinates.
+
+    Args:
+        encoded: Encoded polyline string
+        precision: Decimal digits used when encoding
+
+    Returns:
+        List of (latitude, longitude) tuples
+    """
+    coords = []
+    index = 0
+    lat = lon = 0
+    factor = 10 ** precision
+
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = 0
+            result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        coords.append((lat / factor, lon / factor))
+
+    return coords
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded tick log against the current build.
+
+Loads the graph and agents the way the API server does, replays one
+recording session headlessly and prints per-phase latency (recorded vs
+replayed) and output drift. Exits non-zero when risk drift or a latency
+regression is found, so it can gate a CI job.
+
+Usage:
+    python replay_tick_log.py outputs/tick_logs/flood_day.mftl
+    python replay_tick_log.py flood_day.mftl --session 1 --latency-tolerance 1.5 --json report.json
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import sys
+import json
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from app.environment.graph_manager import DynamicGraphEnvironment
+from app.agents.hazard_agent import HazardAgent
+from app.agents.routing_agent import RoutingAgent
+from app.agents.scout_agent import ScoutAgent
+from app.agents.evacuation_manager_agent import EvacuationManagerAgent
+from app.services.simulation_manager import SimulationManager
+from app.services.tick_recorder import TickReplayer
+
+
+def build_manager(enable_ml: bool) -> SimulationManager:
+    """Wire a SimulationManager with the production agent set."""
+    environment = DynamicGraphEnvironment()
+    hazard_agent = HazardAgent("hazard_replay", environment, enable_geotiff=True)
+    routing_agent = RoutingAgent("routing_replay", environment, use_contraction=True)
+    evacuation_manager = EvacuationManagerAgent("evac_replay", environment)
+    evacuation_manager.set_hazard_agent(hazard_agent)
+    evacuation_manager.set_routing_agent(routing_agent)
+
+    scout_agent = None
+    if enable_ml:
+        scout_agent = ScoutAgent(
+            "scout_replay",
+            environment,
+            simulation_mode=True,
+            use_ml_in_simulation=True
+        )
+
+    manager = SimulationManager()
+    manager.set_agents(
+        scout_agent=scout_agent,
+        hazard_agent=hazard_agent,
+        routing_agent=routing_agent,
+        evacuation_manager=evacuation_manager,
+        environment=environment
+    )
+    return manager
+
+
+def print_report(report: dict) -> None:
+    """Print a replay report as a table."""
+    print(f"\nReplayed {report['ticks']} ticks from {report['path']} (session {report['session']})")
+    print(f"\n{'phase':<12} {'rec p50':>9} {'rec p95':>9} {'new p50':>9} {'new p95':>9} {'p95 x':>7}")
+    for phase, stats in report["latency_ms"].items():
+        recorded, replayed = stats["recorded"], stats["replayed"]
+        ratio = f"{stats['p95_ratio']:.2f}" if stats["p95_ratio"] is not None else "-"
+        print(
+            f"{phase:<12} {recorded['p50']:>9.2f} {recorded['p95']:>9.2f} "
+            f"{replayed['p50']:>9.2f} {replayed['p95']:>9.2f} {ratio:>7}"
+        )
+
+    drift = report["risk_drift"]
+    print(
+        f"\nRisk drift: max={drift['max_abs']}, mean={drift['mean_abs']}, "
+        f"ticks={drift['ticks_with_drift']}, first at tick {drift['first_drift_tick']}"
+    )
+    routes = report["route_drift"]
+    print(f"Route drift: {routes['mismatched']}/{routes['compared']} routes differ")
+    print(f"Latency regressions: {', '.join(report['regressions']) or 'none'}")
+
+
+def main():
+    """Main execution with command line arguments."""
+    parser = argparse.ArgumentParser(description="Replay a MAS-FRO tick log")
+    parser.add_argument("log", help="Tick log (.mftl)")
+    parser.add_argument("--session", type=int, default=0, help="Recording session to replay")
+    parser.add_argument("--max-ticks", type=int, help="Replay at most N ticks")
+    parser.add_argument("--risk-tolerance", type=float, default=1e-4, help="Edge risk drift tolerance")
+    parser.add_argument("--latency-tolerance", type=float, default=1.25,
+                        help="Allowed replay/recorded p95 ratio per phase")
+    parser.add_argument("--no-ml", action="store_true", help="Replay without the scout ML models")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    manager = build_manager(enable_ml=not args.no_ml)
+    replayer = TickReplayer(
+        manager,
+        risk_tolerance=args.risk_tolerance,
+        latency_tolerance=args.latency_tolerance
+    )
+    report = asyncio.run(replayer.replay(Path(args.log), session=args.session, max_ticks=args.max_ticks))
+
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+    failed = (
+        report["risk_drift"]["ticks_with_drift"]
+        or report["route_drift"]["mismatched"]
+        or report["regressions"]
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
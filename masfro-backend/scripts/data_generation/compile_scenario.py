@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Compile simulation scenarios into the binary .mfsc format.
+
+Compiled scenarios are time-sorted and streamed by SimulationManager in
+constant memory. The script can also generate large synthetic scenarios
+(hundreds of thousands of scout reports) for load testing.
+
+Usage:
+    python compile_scenario.py app/data/simulation_scenarios/heavy_scenario.csv
+    python compile_scenario.py --synthetic 500000 --output stress_scenario.mfsc
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from app.services.scenario_events import compile_scenario, write_compiled_scenario
+
+SYNTHETIC_LOCATIONS = [
+    "Nangka", "Tumana", "Malanday", "Concepcion Uno", "Santa Elena",
+    "Sto Nino", "Jesus Dela Pena", "Provident Villages", "Marikina Heights"
+]
+SYNTHETIC_TEXTS = [
+    "Baha na dito sa {loc}, hanggang tuhod!",
+    "Flooding reported near {loc}, waist deep.",
+    "Roads wet but clear near {loc}.",
+    "Heavy rain at {loc}, water rising fast."
+]
+
+
+def generate_synthetic(output: Path, num_events: int, duration_s: int, seed: int) -> None:
+    """Stream a synthetic scout-heavy scenario straight to disk."""
+    rng = random.Random(seed)
+    step = duration_s / max(num_events, 1)
+    flood_every = max(num_events // 100, 1)
+
+    def records():
+        for i in range(num_events):
+            time_offset = int(i * step)
+            if i % flood_every == 0:
+                payload = {"river_levels": {"Sto Nino": {"water_level_m": 14 + rng.random() * 4}}}
+                yield time_offset, 0, json.dumps(payload).encode("utf-8")
+                continue
+            loc = rng.choice(SYNTHETIC_LOCATIONS)
+            payload = {
+                "location": loc,
+                "text": rng.choice(SYNTHETIC_TEXTS).format(loc=loc),
+                "timestamp": "2025-11-18T08:00:00Z"
+            }
+            yield time_offset, 1, json.dumps(payload).encode("utf-8")
+
+    write_compiled_scenario(output, ["flood_agent", "scout_agent"], records(), num_events)
+    print(f"Wrote {num_events:,} synthetic events to {output}")
+
+
+def main():
+    """Main execution with command line arguments."""
+    parser = argparse.ArgumentParser(description="Compile MAS-FRO simulation scenarios")
+    parser.add_argument("csv", nargs="*", help="Scenario CSV files to compile")
+    parser.add_argument("--output", "-o", help="Output path (single input or --synthetic)")
+    parser.add_argument("--synthetic", type=int, help="Generate N synthetic events instead")
+    parser.add_argument("--duration", type=int, default=3600, help="Synthetic scenario length (s)")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic scenario seed")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        generate_synthetic(Path(args.output or "synthetic_scenario.mfsc"),
+                           args.synthetic, args.duration, args.seed)
+        return
+
+    if not args.csv:
+        parser.error("Provide scenario CSV files or --synthetic N")
+
+    for csv_path in args.csv:
+        output = Path(args.output) if args.output and len(args.csv) == 1 else None
+        print(f"Compiled {csv_path} -> {compile_scenario(Path(csv_path), output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Convert the rrXX-N.tif flood maps into the memory-mapped .npy store.
+
+GeoTIFFService maps converted files with np.load(mmap_mode='r') and falls
+back to the GeoTIFFs for anything missing or stale, so this only needs to
+be rerun when the flood maps change.
+
+Usage:
+    python convert_flood_maps.py
+    python convert_flood_maps.py --dtype float16 --force
+
+Author: MAS-FRO Development Team
+Date: November 2025
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from app.services.geotiff_service import GeoTIFFService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Convert flood map GeoTIFFs to .npy")
+    parser.add_argument("--data-dir", default="app/data/timed_floodmaps",
+                        help="Directory containing rrXX/rrXX-N.tif")
+    parser.add_argument("--store-dir", default=None,
+                        help="Output directory (default: app/data/flood_map_store)")
+    parser.add_argument("--dtype", choices=("float32", "float16"), default="float32",
+                        help="Stored depth dtype")
+    parser.add_argument("--force", action="store_true",
+                        help="Reconvert maps that are already up to date")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    service = GeoTIFFService(data_dir=args.data_dir, store_dir=args.store_dir)
+    counts = service.convert_to_store(dtype=args.dtype, force=args.force)
+
+    print(
+        f"{service.store_dir}: {counts['converted']} converted, "
+        f"{counts['skipped']} up to date, {counts['missing']} missing"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# filename: tests/fixtures/flood_maps.py
+
+"""
+Small GeoTIFF flood maps shaped like the real ones, for GeoTIFFService tests.
+
+Maps are float64, EPSG:3857 with 10 m pixels anchored at the origin (the
+CRS does not match the study area, so GeoTIFFService falls back to its
+manual bounds, as it does for the shipped maps).
+"""
+
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+import rasterio
+from rasterio.transform import Affine
+
+
+def write_flood_map(path: Path, data: np.ndarray) -> Path:
+    """
+    Write one depth grid as a single-band GeoTIFF.
+
+    Args:
+        path: Output .tif path (parent must exist)
+        data: 2-D depth grid in meters (NaN = no data)
+
+    Returns:
+        The written path
+    """
+    height, width = data.shape
+    with rasterio.open(
+        path, "w", driver="GTiff", height=height, width=width,
+        count=1, dtype="float64", crs="EPSG:3857",
+        transform=Affine(10.0, 0.0, 0.0, 0.0, -10.0, 0.0)
+    ) as dst:
+        dst.write(data.astype(np.float64), 1)
+    return path
+
+
+def write_flood_maps(
+    data_dir: Path,
+    depths: Callable[[int], np.ndarray],
+    time_steps: Iterable[int] = (1,),
+    return_periods: Iterable[str] = ("rr01",)
+) -> Path:
+    """
+    Write a GeoTIFFService data directory: <data_dir>/<rp>/<rp>-<ts>.tif.
+
+    Args:
+        data_dir: Data directory (created if missing)
+        depths: Depth grid for a time step (same grid for every return period)
+        time_steps: Time steps to write
+        return_periods: Return period folders to write
+
+    Returns:
+        data_dir, for GeoTIFFService(data_dir=...)
+    """
+    time_steps = list(time_steps)
+    for rp in return_periods:
+        folder = data_dir / rp
+        folder.mkdir(parents=True, exist_ok=True)
+        for ts in time_steps:
+            write_flood_map(folder / f"{rp}-{ts}.tif", depths(ts))
+    return data_dir
@@ -0,0 +1,70 @@
+# filename: tests/fixtures/simulation.py
+
+"""
+Road grids and simulation managers for SimulationManager-level tests.
+"""
+
+from typing import Tuple
+
+import networkx as nx
+
+from app.agents.hazard_agent import HazardAgent
+from app.environment.graph_manager import DynamicGraphEnvironment
+from app.services.simulation_manager import SimulationManager
+
+
+def grid_graph(
+    size: int = 6,
+    origin: Tuple[float, float] = (14.62, 121.09),
+    spacing: Tuple[float, float] = (0.008, 0.004),
+    length: float = 900.0
+) -> nx.MultiDiGraph:
+    """
+    Two-way grid of size x size junctions.
+
+    The defaults span the Marikina scenario locations.
+
+    Args:
+        size: Junctions per side; node i * size + j sits in row i, column j
+        origin: (lat, lon) of node 0
+        spacing: (lat, lon) step between neighbouring rows / columns
+        length: Length of every road in meters
+
+    Returns:
+        MultiDiGraph in EPSG:4326 with one edge each way between neighbours
+    """
+    graph = nx.MultiDiGraph(crs="EPSG:4326")
+    for i in range(size):
+        for j in range(size):
+            graph.add_node(
+                i * size + j, x=origin[1] + spacing[1] * j, y=origin[0] + spacing[0] * i
+            )
+    for i in range(size):
+        for j in range(size):
+            node = i * size + j
+            for ni, nj in ((i + 1, j), (i, j + 1)):
+                if ni < size and nj < size:
+                    graph.add_edge(node, ni * size + nj, length=length)
+                    graph.add_edge(ni * size + nj, node, length=length)
+    return graph
+
+
+def hazard_manager(
+    agent_id: str = "hazard_test"
+) -> Tuple[SimulationManager, DynamicGraphEnvironment]:
+    """
+    SimulationManager with a GeoTIFF-free HazardAgent on the default grid.
+
+    Args:
+        agent_id: HazardAgent id
+
+    Returns:
+        Tuple of (manager, environment); the agent is manager.hazard_agent
+    """
+    env = DynamicGraphEnvironment(graph=grid_graph())
+    manager = SimulationManager()
+    manager.set_agents(
+        hazard_agent=HazardAgent(agent_id, env, enable_geotiff=False),
+        environment=env
+    )
+    return manager, env
@@ -0,0 +1,120 @@
+# filename: tests/unit/test_batch_depths.py
+
+"""
+Unit tests for batch point flood depth queries.
+
+Tests cover:
+- Agreement with single-point queries across time steps
+- Points outside the clip window
+- Binary wire format helpers and input validation
+"""
+
+import numpy as np
+import pytest
+
+from app.services.geotiff_service import GeoTIFFService, pack_depths, unpack_points
+from tests.fixtures.flood_maps import write_flood_maps
+
+HEIGHT, WIDTH = 120, 150
+
+
+def _depths(time_step):
+    rows, cols = np.mgrid[0:HEIGHT, 0:WIDTH]
+    data = (rows * WIDTH + cols) * 0.001 * time_step
+    data[:10, :10] = np.nan
+    return data.astype(np.float64)
+
+
+def _service(root, **kwargs):
+    write_flood_maps(root / "maps", _depths, (1, 2, 3))
+    return GeoTIFFService(
+        data_dir=str(root / "maps"), store_dir=str(root / "store"), storage="uint16", **kwargs
+    )
+
+
+def _points(service, count, seed=0):
+    bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+    rng = np.random.default_rng(seed)
+    margin = 0.1 * bounds["coverage_width"]
+    lons = rng.uniform(bounds["min_lon"] - margin, bounds["max_lon"] + margin, count)
+    lats = rng.uniform(bounds["min_lat"] - margin, bounds["max_lat"] + margin, count)
+    return lons, lats
+
+
+def _single(service, lons, lats, time_step):
+    values = [service.get_flood_depth_at_point(lon, lat, "rr01", time_step) for lon, lat in zip(lons, lats)]
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float32)
+
+
+class TestBatchDepths:
+    """Test GeoTIFFService.get_flood_depths_at_points."""
+
+    def test_matches_single_point_queries(self, tmp_path):
+        """Test that each row equals the per-point lookups for that time step."""
+        service = _service(tmp_path)
+        lons, lats = _points(service, 300)
+        depths = service.get_flood_depths_at_points(lons, lats, "rr01", [1, 3])
+
+        assert depths.shape == (2, 300)
+        assert depths.dtype == np.float32
+        np.testing.assert_array_equal(depths[0], _single(service, lons, lats, 1))
+        np.testing.assert_array_equal(depths[1], _single(service, lons, lats, 3))
+        assert np.isnan(depths).any()
+
+    def test_single_time_step(self, tmp_path):
+        """Test that a scalar time step gives one row."""
+        service = _service(tmp_path)
+        lons, lats = _points(service, 5)
+        assert service.get_flood_depths_at_points(lons, lats, "rr01", 2).shape == (1, 5)
+
+    def test_points_outside_clip_window(self, tmp_path):
+        """Test that points beyond the clip window still get depths."""
+        service = _service(tmp_path)
+        bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+        lons, lats = _points(service, 200, seed=1)
+        expected = service.get_flood_depths_at_points(lons, lats, "rr01", 1)
+
+        clipped = _service(tmp_path / "clipped", clip_bounds=(
+            bounds["min_lon"], bounds["min_lat"],
+            bounds["min_lon"] + 0.2 * bounds["coverage_width"],
+            bounds["min_lat"] + 0.2 * bounds["coverage_height"]
+        ))
+        depths = clipped.get_flood_depths_at_points(lons, lats, "rr01", 1)
+
+        # Out-of-window points come from the full float32 read, not millimetre storage
+        np.testing.assert_allclose(depths, expected, atol=1e-3)
+        assert clipped.get_cache_stats()["window_fallback_reads"] == 0
+
+    def test_validation(self, tmp_path):
+        """Test mismatched inputs, empty time steps and bad time steps."""
+        service = _service(tmp_path)
+        with pytest.raises(ValueError):
+            service.get_flood_depths_at_points([121.1, 121.2], [14.6], "rr01", 1)
+        with pytest.raises(ValueError):
+            service.get_flood_depths_at_points([121.1], [14.6], "rr01", [])
+        with pytest.raises(ValueError):
+            service.get_flood_depths_at_points([121.1], [14.6], "rr01", [1, 19])
+        with pytest.raises(ValueError):
+            service.get_flood_depths_at_points(
+                np.zeros(service.MAX_BATCH_POINTS + 1), np.zeros(service.MAX_BATCH_POINTS + 1)
+            )
+
+
+class TestWireFormat:
+    """Test binary body helpers."""
+
+    def test_round_trip(self):
+        """Test point decoding and depth encoding."""
+        body = np.array([[121.1, 14.6], [121.2, 14.7]], dtype="<f8").tobytes()
+        lons, lats = unpack_points(body)
+        np.testing.assert_array_equal(lons, [121.1, 121.2])
+        np.testing.assert_array_equal(lats, [14.6, 14.7])
+
+        depths = np.array([[0.5, np.nan], [1.0, 2.0]], dtype=np.float32)
+        decoded = np.frombuffer(pack_depths(depths), dtype="<f4").reshape(2, 2)
+        np.testing.assert_array_equal(decoded, depths)
+
+    def test_partial_pair_rejected(self):
+        """Test that a truncated body is rejected."""
+        with pytest.raises(ValueError):
+            unpack_points(b"\x00" * 24)
@@ -0,0 +1,217 @@
+# filename: tests/unit/test_batch_routing.py
+
+"""
+Unit tests for batched route processing.
+
+Tests cover:
+- Reverse (destination-rooted) search against per-pair A*
+- One impassable-edge policy for single- and multi-start groups
+- RoutingAgent.calculate_routes grouping and result order
+- Routing phase batching in SimulationManager
+"""
+
+import threading
+
+import networkx as nx
+import pytest
+
+from app.agents.evacuation_manager_agent import EvacuationManagerAgent
+from app.agents.routing_agent import RoutingAgent
+from app.algorithms import risk_aware_astar as astar_module
+from app.algorithms.risk_aware_astar import (
+    haversine_distance,
+    reverse_risk_search,
+    risk_aware_astar,
+)
+from app.environment.graph_manager import DynamicGraphEnvironment
+from app.services.simulation_manager import SimulationManager
+
+SIZE = 6
+
+
+def _coords(node):
+    i, j = divmod(node, SIZE)
+    return (14.62 + 0.008 * i, 121.09 + 0.004 * j)
+
+
+def _graph():
+    """Grid with uneven lengths and a risky middle column."""
+    graph = nx.MultiDiGraph(crs="EPSG:4326")
+    for node in range(SIZE * SIZE):
+        lat, lon = _coords(node)
+        graph.add_node(node, x=lon, y=lat)
+    for i in range(SIZE):
+        for j in range(SIZE):
+            node = i * SIZE + j
+            for ni, nj in ((i + 1, j), (i, j + 1)):
+                if ni < SIZE and nj < SIZE:
+                    other = ni * SIZE + nj
+                    for u, v in ((node, other), (other, node)):
+                        base = haversine_distance(_coords(u), _coords(v))
+                        risk = 0.6 if j == SIZE // 2 else 0.0
+                        graph.add_edge(u, v, length=base * (1.0 + ((u * 7 + v * 13) % 5) / 10.0),
+                                       risk_score=risk)
+    return graph
+
+
+def _path_cost(graph, path, risk_weight):
+    cost = 0.0
+    for u, v in zip(path, path[1:]):
+        data = min(graph[u][v].values(), key=lambda d: d["length"])
+        cost += data["length"] * (1.0 + data["risk_score"] * risk_weight)
+    return cost
+
+
+class TestReverseRiskSearch:
+    """Test the destination-rooted search."""
+
+    def test_matches_astar_costs(self):
+        """Test that every start gets a path as cheap as its own A*."""
+        graph = _graph()
+        starts = [1, 7, 12, 30, 33]
+        paths = reverse_risk_search(graph, 35, starts, risk_weight=2000.0, distance_weight=1.0)
+
+        for start in starts:
+            expected = risk_aware_astar(graph, start, 35, risk_weight=2000.0, distance_weight=1.0)
+            assert paths[start][0] == start and paths[start][-1] == 35
+            assert _path_cost(graph, paths[start], 2000.0) == pytest.approx(
+                _path_cost(graph, expected, 2000.0)
+            )
+
+    def test_unreachable_start(self):
+        """Test that starts cut off by impassable edges get None."""
+        graph = _graph()
+        for u, v, data in graph.edges(data=True):
+            if u == 0 or v == 0:
+                data["risk_score"] = 1.0
+        paths = reverse_risk_search(graph, 35, [0, 14], risk_weight=2000.0, distance_weight=1.0)
+        assert paths[0] is None
+        assert paths[14] is not None
+
+
+    def test_blocked_only_path_independent_of_grouping(self):
+        """Test that single- and multi-start searches both refuse blocked-only paths."""
+        graph = _graph()
+        for u, v, data in graph.edges(data=True):
+            if u == 0:
+                data["risk_score"] = 0.95
+
+        alone = risk_aware_astar(graph, 0, 35, risk_weight=2000.0, distance_weight=1.0)
+        grouped = reverse_risk_search(graph, 35, [0, 14], risk_weight=2000.0, distance_weight=1.0)
+        assert alone is None
+        assert grouped[0] is None
+
+
+class TestCalculateRoutes:
+    """Test RoutingAgent batch routing."""
+
+    def _agent(self):
+        env = DynamicGraphEnvironment(graph=_graph())
+        return RoutingAgent("routing_batch", env), env
+
+    def test_results_in_request_order_match_single_routes(self, monkeypatch):
+        """Test that grouped results equal one-by-one routing, in order."""
+        agent, env = self._agent()
+        shelter = _coords(35)
+        requests = [
+            {"start": _coords(node), "end": shelter} for node in (1, 7, 12, 30)
+        ] + [
+            {"start": _coords(3), "end": _coords(24), "preferences": {"fastest": True}}
+        ]
+
+        searches = []
+        original = astar_module.reverse_risk_search
+        monkeypatch.setattr(
+            astar_module, "reverse_risk_search",
+            lambda *args, **kwargs: searches.append(args[1]) or original(*args, **kwargs)
+        )
+        results = agent.calculate_routes(requests, max_workers=2)
+
+        assert searches == [35]
+        assert len(results) == len(requests)
+        for request, result in zip(requests, results):
+            single = agent.calculate_route(request["start"], request["end"], request.get("preferences"))
+            assert result["status"] == "success"
+            assert result["path"][0] == pytest.approx(request["start"])
+            assert result["distance"] == pytest.approx(single["distance"])
+            assert result["risk_level"] == pytest.approx(single["risk_level"])
+
+    def test_blocked_start_same_result_alone_or_grouped(self):
+        """Test that a start whose only exits are blocked fails in any batch."""
+        agent, env = self._agent()
+        for u, v, key in list(env.graph.edges(keys=True)):
+            if u == 0:
+                env.update_edge_risk(u, v, key, 0.95)
+        shelter = _coords(35)
+
+        alone = agent.calculate_routes([{"start": _coords(0), "end": shelter}])
+        grouped = agent.calculate_routes([
+            {"start": _coords(0), "end": shelter},
+            {"start": _coords(14), "end": shelter},
+        ])
+
+        assert alone[0]["status"] == grouped[0]["status"] != "success"
+        assert grouped[1]["status"] == "success"
+
+    def test_risk_updates_wait_for_batch(self, monkeypatch):
+        """Test that a risk update from another thread waits for the searches."""
+        agent, env = self._agent()
+        epoch = env.risk_epoch
+        writer = threading.Thread(target=env.update_edge_risk, args=(1, 2, 0, 0.9))
+        seen = []
+        original = astar_module.reverse_risk_search
+
+        def search(*args, **kwargs):
+            writer.start()
+            writer.join(timeout=0.2)
+            seen.append((writer.is_alive(), env.risk_epoch))
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(astar_module, "reverse_risk_search", search)
+        agent.calculate_routes([
+            {"start": _coords(node), "end": _coords(35)} for node in (7, 30)
+        ])
+        writer.join(timeout=5)
+
+        assert seen == [(True, epoch)]
+        assert env.risk_epoch == epoch + 1
+
+    def test_unmappable_request_reports_error(self):
+        """Test that a request far off the network fails alone."""
+        agent, _ = self._agent()
+        results = agent.calculate_routes([
+            {"start": (10.0, 120.0), "end": _coords(35)},
+            {"start": _coords(1), "end": _coords(35)},
+        ])
+        assert results[0]["status"] == "error"
+        assert results[1]["status"] == "success"
+
+
+class TestRoutingPhaseBatch:
+    """Test that the simulation routing phase uses the batch path."""
+
+    def test_route_results_published_in_order(self):
+        """Test that a tick's routes come back in request order."""
+        env = DynamicGraphEnvironment(graph=_graph())
+        routing_agent = RoutingAgent("routing_phase", env)
+        evacuation_manager = EvacuationManagerAgent("evac_phase", env)
+        evacuation_manager.set_routing_agent(routing_agent)
+
+        manager = SimulationManager()
+        manager.set_agents(
+            routing_agent=routing_agent,
+            evacuation_manager=evacuation_manager,
+            environment=env
+        )
+        starts = [1, 12, 30, 2, 33]
+        for node in starts:
+            manager.add_route_request(_coords(node), _coords(35))
+        manager.add_route_request((95.0, 0.0), _coords(35))
+
+        result = manager._run_routing_phase()
+        routes = manager.shared_data_bus["route_results"]
+
+        assert result["routes_processed"] == 6
+        assert [r["path"][0] for r in routes[:5]] == [pytest.approx(_coords(n)) for n in starts]
+        assert routes[5]["status"] == "error"
+        assert manager.shared_data_bus["pending_routes"] == []
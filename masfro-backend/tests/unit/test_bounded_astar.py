@@ -0,0 +1,124 @@
+# filename: tests/unit/test_bounded_astar.py
+
+"""
+Unit tests for bounded-suboptimal risk-aware A*.
+
+Tests cover:
+- Cost bound versus the exact search (for any distance weight)
+- Anytime refinement down to the optimum
+- Expansion budgets
+- Impassable edges
+"""
+
+import random
+
+import networkx as nx
+import pytest
+
+from app.algorithms.risk_aware_astar import (
+    risk_aware_astar,
+    bounded_risk_aware_astar,
+    create_weight_function,
+)
+
+
+def _grid(size=12, seed=3):
+    """Two-way grid with random risks and lengths >= straight-line distance."""
+    rng = random.Random(seed)
+    graph = nx.MultiDiGraph()
+    for i in range(size):
+        for j in range(size):
+            graph.add_node((i, j), x=121.10 + j * 0.001, y=14.60 + i * 0.001)
+    for i in range(size):
+        for j in range(size):
+            for di, dj in ((0, 1), (1, 0)):
+                if i + di < size and j + dj < size:
+                    length = rng.uniform(115, 200)
+                    risk = rng.choices([0.0, 0.2, 0.5, 0.95], weights=[5, 3, 2, 1])[0]
+                    if (i, j) == (0, 0) or (i + di, j + dj) == (size - 1, size - 1):
+                        risk = 0.0  # keep the corner endpoints reachable
+                    graph.add_edge((i, j), (i + di, j + dj), length=length, risk_score=risk)
+                    graph.add_edge((i + di, j + dj), (i, j), length=length, risk_score=risk)
+    return graph
+
+
+def _cost(graph, path, risk_weight, distance_weight=1.0):
+    weight, _ = create_weight_function(graph, risk_weight, distance_weight, 0.9)
+    return sum(weight(u, v, None) for u, v in zip(path[:-1], path[1:]))
+
+
+class TestBoundedAstar:
+    """Test weighted A* bounds and budgets."""
+
+    @pytest.mark.parametrize("epsilon", [1.0, 1.1, 1.5])
+    def test_cost_within_bound(self, epsilon):
+        """Test that weighted A* stays within epsilon of the optimum."""
+        graph = _grid()
+        start, end = (0, 0), (11, 11)
+        exact = risk_aware_astar(graph, start, end, risk_weight=2000.0, distance_weight=1.0)
+        result = bounded_risk_aware_astar(
+            graph, start, end, risk_weight=2000.0, distance_weight=1.0, epsilon=epsilon
+        )
+
+        optimum = _cost(graph, exact, 2000.0)
+        assert result["bound"] == epsilon
+        assert result["cost"] == pytest.approx(_cost(graph, result["path"], 2000.0))
+        assert result["cost"] <= epsilon * optimum + 1e-6
+
+    def test_anytime_refines_to_optimum(self):
+        """Test that anytime mode without a budget ends at the optimum."""
+        graph = _grid()
+        exact = risk_aware_astar(graph, (0, 0), (11, 11), risk_weight=2000.0, distance_weight=1.0)
+        result = bounded_risk_aware_astar(
+            graph, (0, 0), (11, 11), risk_weight=2000.0, distance_weight=1.0,
+            epsilon=1.1, anytime=True
+        )
+
+        assert result["bound"] == 1.0
+        assert result["cost"] == pytest.approx(_cost(graph, exact, 2000.0))
+
+    @pytest.mark.parametrize("anytime", [False, True])
+    def test_bound_holds_with_default_distance_weight(self, anytime):
+        """Test that the heuristic follows distance_weight, keeping the bound."""
+        graph = _grid()
+        weight, _ = create_weight_function(graph, 0.0, 0.5, 0.9)
+        optimum = nx.dijkstra_path_length(
+            graph, (0, 0), (11, 11),
+            weight=lambda u, v, _: None if weight(u, v, None) == float("inf") else weight(u, v, None)
+        )
+        result = bounded_risk_aware_astar(
+            graph, (0, 0), (11, 11), risk_weight=0.0, epsilon=1.1, anytime=anytime
+        )
+
+        assert result["cost"] <= result["bound"] * optimum + 1e-6
+        if anytime:
+            assert result["cost"] == pytest.approx(optimum)
+
+    def test_expansion_budget(self):
+        """Test that an exhausted budget reports an incomplete search."""
+        graph = _grid()
+        result = bounded_risk_aware_astar(graph, (0, 0), (11, 11), max_expansions=3)
+
+        assert result["path"] is None
+        assert result["complete"] is False
+
+    def test_impassable_returns_no_path(self):
+        """Test that fully blocked targets yield no path instead of an inf-cost one."""
+        graph = _grid(size=3)
+        for u, v, data in graph.edges(data=True):
+            if (2, 2) in (u, v):
+                data["risk_score"] = 0.95
+        result = bounded_risk_aware_astar(graph, (0, 0), (2, 2))
+
+        assert result["path"] is None
+        assert result["complete"] is True
+
+    def test_exact_search_agrees_on_blocked_target(self):
+        """Test that exact A* also refuses a path over impassable edges."""
+        graph = _grid(size=3)
+        for u, v, data in graph.edges(data=True):
+            if (2, 2) in (u, v):
+                data["risk_score"] = 0.95
+
+        assert risk_aware_astar(graph, (0, 0), (2, 2)) is None
+        assert bounded_risk_aware_astar(graph, (0, 0), (2, 2))["path"] is None
@@ -0,0 +1,191 @@
+# filename: tests/unit/test_flood_interpolation.py
+
+"""
+Unit tests for sub-hourly flood depth interpolation.
+
+Tests cover:
+- Linear and monotone (PCHIP) interval coefficients
+- GeoTIFFService.get_edge_depths_at over registered edge samples
+- HazardAgent and SimulationManager fractional time steps
+"""
+
+from unittest.mock import patch
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from app.agents.hazard_agent import HazardAgent
+from app.environment.graph_manager import DynamicGraphEnvironment
+from app.services.flood_interpolation import evaluate_interval, interval_coefficients
+from app.services.geotiff_service import GeoTIFFService
+from app.services.simulation_manager import SimulationManager
+from tests.fixtures.flood_maps import write_flood_maps
+
+HEIGHT, WIDTH = 40, 50
+# Depth scale per time step: rises, plateaus, recedes
+LEVELS = {1: 0.0, 2: 1.0, 3: 3.0, 4: 3.0, 5: 1.0}
+
+
+def _depths(time_step):
+    rows, cols = np.mgrid[0:HEIGHT, 0:WIDTH]
+    data = (rows * 0.02 + cols * 0.01 + 0.1) * LEVELS[time_step]
+    data[:11, :11] = np.nan
+    return data.astype(np.float64)
+
+
+def _service(root):
+    write_flood_maps(root, _depths, LEVELS)
+    return GeoTIFFService(data_dir=str(root), store_dir=str(root / "store"))
+
+
+def _graph(service, size=5):
+    bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+    graph = nx.MultiDiGraph(crs="EPSG:4326")
+    for i in range(size):
+        for j in range(size):
+            graph.add_node(
+                i * size + j,
+                x=bounds["min_lon"] + (j + 0.3) / size * (bounds["max_lon"] - bounds["min_lon"]),
+                y=bounds["max_lat"] - (i + 0.3) / size * (bounds["max_lat"] - bounds["min_lat"])
+            )
+    for i in range(size):
+        for j in range(size - 1):
+            graph.add_edge(i * size + j, i * size + j + 1, length=100.0)
+    return graph
+
+
+def _register(service):
+    graph = _graph(service)
+    keys = list(graph.edges(keys=True))
+    u = [(graph.nodes[k[0]]["x"], graph.nodes[k[0]]["y"]) for k in keys]
+    v = [(graph.nodes[k[1]]["x"], graph.nodes[k[1]]["y"]) for k in keys]
+    service.set_edge_samples(keys, u, v)
+    return keys
+
+
+class TestIntervalCoefficients:
+    """Test the interpolation polynomials."""
+
+    def test_linear(self):
+        """Test endpoints, midpoint and no-data handling."""
+        start = np.array([0.0, 1.0, np.nan, np.nan], dtype=np.float32)
+        end = np.array([2.0, 1.0, 0.5, np.nan], dtype=np.float32)
+        coeffs = interval_coefficients(start, end)
+
+        assert coeffs.shape == (2, 4)
+        np.testing.assert_allclose(evaluate_interval(coeffs, 0.0)[:2], [0.0, 1.0])
+        np.testing.assert_allclose(evaluate_interval(coeffs, 0.5)[:3], [1.0, 1.0, 0.25])
+        np.testing.assert_allclose(evaluate_interval(coeffs, 1.0)[:3], [2.0, 1.0, 0.5])
+        assert np.isnan(evaluate_interval(coeffs, 0.5)[3])
+
+    def test_monotone_matches_pchip(self):
+        """Test interior intervals against scipy's PCHIP."""
+        interpolate = pytest.importorskip("scipy.interpolate")
+        series = np.array([[0.0, 0.2], [1.0, 0.3], [3.0, 1.5], [3.2, 0.4], [1.0, 0.1]])
+        pchip = interpolate.PchipInterpolator(np.arange(5), series, axis=0)
+
+        for step in (1, 2):
+            coeffs = interval_coefficients(
+                series[step], series[step + 1], series[step - 1], series[step + 2], "monotone"
+            )
+            for fraction in (0.1, 0.5, 0.9):
+                np.testing.assert_allclose(
+                    evaluate_interval(coeffs, fraction), pchip(step + fraction), rtol=1e-5
+                )
+
+    def test_monotone_does_not_overshoot(self):
+        """Test that a plateau stays flat and values stay within the neighbours."""
+        start, end = np.array([3.0, 0.0]), np.array([3.0, 1.0])
+        coeffs = interval_coefficients(start, end, np.array([1.0, 0.0]), np.array([1.0, 5.0]), "monotone")
+        for fraction in np.linspace(0, 1, 11):
+            value = evaluate_interval(coeffs, fraction)
+            assert value[0] == pytest.approx(3.0)
+            assert -1e-6 <= value[1] <= 1.0 + 1e-6
+
+    def test_invalid_method(self):
+        """Test method validation."""
+        with pytest.raises(ValueError):
+            interval_coefficients(np.zeros(2), np.zeros(2), method="cubic")
+
+
+class TestServiceInterpolation:
+    """Test GeoTIFFService.get_edge_depths_at."""
+
+    def test_linear_between_steps(self, tmp_path):
+        """Test whole steps, midpoints and reuse of interval coefficients."""
+        service = _service(tmp_path)
+        _register(service)
+
+        two, three = service.get_edge_depths("rr01", 2), service.get_edge_depths("rr01", 3)
+        np.testing.assert_array_equal(service.get_edge_depths_at("rr01", 2.0), two)
+        np.testing.assert_allclose(
+            service.get_edge_depths_at("rr01", 2.5), (two + three) / 2, rtol=1e-6
+        )
+
+        loads = service.edge_depth_sync_loads
+        service.get_edge_depths_at("rr01", 2.75)
+        assert service.edge_depth_sync_loads == loads
+        assert len(service._edge_coeffs) == 1
+
+    def test_monotone_plateau(self, tmp_path):
+        """Test that monotone interpolation holds a plateau between equal maps."""
+        service = _service(tmp_path)
+        _register(service)
+        plateau = service.get_edge_depths_at("rr01", 3.4, method="monotone")
+        np.testing.assert_allclose(plateau, service.get_edge_depths("rr01", 3), rtol=1e-5)
+
+        receding = service.get_edge_depths_at("rr01", 4.5, method="monotone")
+        valid = ~np.isnan(receding)
+        assert (receding[valid] <= service.get_edge_depths("rr01", 4)[valid] + 1e-6).all()
+
+    def test_validation(self, tmp_path):
+        """Test time range, method and missing samples."""
+        service = _service(tmp_path)
+        assert service.get_edge_depths_at("rr01", 1.5) is None
+        _register(service)
+        with pytest.raises(ValueError):
+            service.get_edge_depths_at("rr01", 0.5)
+        with pytest.raises(ValueError):
+            service.get_edge_depths_at("rr01", 18.5)
+        with pytest.raises(ValueError):
+            service.get_edge_depths_at("rr01", 2.5, method="spline")
+
+
+class TestFractionalTimeSteps:
+    """Test HazardAgent and SimulationManager integration."""
+
+    def test_hazard_agent_interpolates(self, tmp_path):
+        """Test that a fractional scenario time yields interpolated edge depths."""
+        service = _service(tmp_path)
+        env = DynamicGraphEnvironment(graph=_graph(service))
+        with patch('app.agents.hazard_agent.get_geotiff_service', return_value=service):
+            agent = HazardAgent("hazard_interp", env, enable_geotiff=True)
+
+        agent.set_flood_scenario("rr01", 2)
+        at_two = agent.get_edge_flood_depths()
+        agent.set_flood_scenario("rr01", 2.5)
+        halfway = agent.get_edge_flood_depths()
+        agent.set_flood_scenario("rr01", 3)
+        at_three = agent.get_edge_flood_depths()
+
+        edge = next(iter(at_two))
+        assert halfway[edge] == pytest.approx((at_two[edge] + at_three[edge]) / 2, rel=1e-5)
+        service.prefetcher.shutdown()
+
+    def test_simulation_flood_time(self):
+        """Test the fractional fusion time derived from the clock."""
+        manager = SimulationManager()
+        manager._simulation_clock = 5400.0
+        manager.configure_clock(virtual=True, seconds_per_tick=60, seconds_per_time_step=3600)
+        assert manager._flood_time() == manager.current_time_step
+
+        manager.configure_clock(virtual=True, seconds_per_tick=60, seconds_per_time_step=3600,
+                                flood_interpolation="monotone")
+        assert manager._flood_time() == pytest.approx(2.5)
+
+        manager._simulation_clock = 10 ** 6
+        assert manager._flood_time() == 18.0
+
+        with pytest.raises(ValueError):
+            manager.configure_clock(flood_interpolation="cubic")
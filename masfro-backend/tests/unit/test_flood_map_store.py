@@ -0,0 +1,151 @@
+# filename: tests/unit/test_flood_map_store.py
+
+"""
+Unit tests for the memory-mapped flood map store.
+
+Tests cover:
+- GeoTIFF to .npy + JSON sidecar conversion
+- Incremental and stale-source handling
+- GeoTIFFService queries served from memory maps
+- Full-raster statistics agreeing between GeoTIFF and store reads
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from app.services.flood_map_store import convert_flood_maps, open_mapped, store_paths
+from app.services.geotiff_service import GeoTIFFService
+from tests.fixtures.flood_maps import write_flood_map, write_flood_maps
+
+HEIGHT, WIDTH = 40, 50
+
+
+def _depths(time_step):
+    rows, cols = np.mgrid[0:HEIGHT, 0:WIDTH]
+    data = (rows * 0.05 + cols * 0.01) * time_step
+    data[0, 0] = np.nan
+    return data.astype(np.float64)
+
+
+def _write_maps(root, time_steps=(1, 2)):
+    return write_flood_maps(root / "tiffs", _depths, time_steps)
+
+
+class TestConversion:
+    """Test converting GeoTIFFs into the store."""
+
+    def test_sidecar_and_array(self, tmp_path):
+        """Test that arrays are exact float32 and sidecars carry statistics."""
+        data_dir = _write_maps(tmp_path)
+        store = tmp_path / "store"
+
+        counts = convert_flood_maps(data_dir, store, ["rr01", "rr02"], [1, 2])
+        assert counts == {"converted": 2, "skipped": 0, "missing": 2}
+
+        npy_path, json_path = store_paths(store, "rr01", 2)
+        data, sidecar = open_mapped(npy_path, json_path, data_dir / "rr01" / "rr01-2.tif")
+        assert isinstance(data, np.memmap)
+        assert np.array_equal(data, _depths(2).astype(np.float32), equal_nan=True)
+        assert sidecar["shape"] == [HEIGHT, WIDTH]
+        assert sidecar["statistics"]["valid_pixels"] == HEIGHT * WIDTH - 1
+        assert json.loads(json_path.read_text())["time_step"] == 2
+
+    def test_incremental_and_stale(self, tmp_path):
+        """Test that only changed GeoTIFFs are reconverted."""
+        data_dir = _write_maps(tmp_path)
+        store = tmp_path / "store"
+        convert_flood_maps(data_dir, store, ["rr01"], [1, 2])
+
+        tif = data_dir / "rr01" / "rr01-1.tif"
+        write_flood_map(tif, _depths(5))
+        os.utime(tif, ns=(1, 1))
+
+        npy_path, json_path = store_paths(store, "rr01", 1)
+        assert open_mapped(npy_path, json_path, tif) is None
+
+        counts = convert_flood_maps(data_dir, store, ["rr01"], [1, 2])
+        assert counts["converted"] == 1 and counts["skipped"] == 1
+        data, _ = open_mapped(npy_path, json_path, tif)
+        assert np.allclose(data[1:], _depths(5)[1:])
+
+
+class TestMappedService:
+    """Test GeoTIFFService reading from the store."""
+
+    def test_queries_from_memmap(self, tmp_path):
+        """Test that converted maps are mapped without heap cost."""
+        data_dir = _write_maps(tmp_path)
+        service = GeoTIFFService(data_dir=str(data_dir), store_dir=str(tmp_path / "store"))
+        assert not service.get_raster("rr01", 1).mapped
+
+        service.convert_to_store()
+        raster = service.get_raster("rr01", 2)
+        bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+        lon = bounds["min_lon"] + (10.5 / WIDTH) * (bounds["max_lon"] - bounds["min_lon"])
+        lat = bounds["max_lat"] - (20.5 / HEIGHT) * (bounds["max_lat"] - bounds["min_lat"])
+
+        assert raster.mapped
+        assert raster.nbytes == 0
+        assert service.get_flood_depth_at_point(lon, lat, "rr01", 2) == pytest.approx(
+            _depths(2)[20, 10], rel=1e-6
+        )
+        _, metadata = service.load_flood_map("rr01", 2)
+        assert metadata["statistics"]["flooded_pixels"] > 0
+        assert service.get_cache_stats()["mapped_entries"] == 1
+
+    def test_clip_is_a_view(self, tmp_path):
+        """Test that clipped windows stay memory-mapped and fall back to the full map."""
+        data_dir = _write_maps(tmp_path)
+        service = GeoTIFFService(data_dir=str(data_dir), store_dir=str(tmp_path / "store"))
+        service.convert_to_store()
+        bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+        lon_span = bounds["max_lon"] - bounds["min_lon"]
+        lat_span = bounds["max_lat"] - bounds["min_lat"]
+        service.set_clip_bounds((
+            bounds["min_lon"] + 0.2 * lon_span, bounds["min_lat"] + 0.2 * lat_span,
+            bounds["min_lon"] + 0.4 * lon_span, bounds["min_lat"] + 0.4 * lat_span
+        ), margin=0.0)
+
+        raster = service.get_raster("rr01", 1)
+        assert raster.mapped
+        assert raster.data.shape[0] < HEIGHT
+
+        outside = service.get_flood_depth_at_point(
+            bounds["min_lon"] + 0.9 * lon_span, bounds["min_lat"] + 0.9 * lat_span, "rr01", 1
+        )
+        row, col = service._lonlat_to_pixel(
+            bounds["min_lon"] + 0.9 * lon_span, bounds["min_lat"] + 0.9 * lat_span,
+            bounds, WIDTH, HEIGHT
+        )
+        assert outside == pytest.approx(_depths(1)[row, col], rel=1e-6)
+
+    def test_clipped_statistics_match_store(self, tmp_path):
+        """Test that clipped GeoTIFF and store reads report the same statistics."""
+        data_dir = _write_maps(tmp_path)
+        services = [
+            GeoTIFFService(data_dir=str(data_dir)),
+            GeoTIFFService(data_dir=str(data_dir), store_dir=str(tmp_path / "store")),
+        ]
+        services[1].convert_to_store()
+        bounds = services[0]._calculate_manual_bounds(WIDTH, HEIGHT)
+        lon_span = bounds["max_lon"] - bounds["min_lon"]
+        lat_span = bounds["max_lat"] - bounds["min_lat"]
+        for service in services:
+            service.set_clip_bounds((
+                bounds["min_lon"] + 0.2 * lon_span, bounds["min_lat"] + 0.2 * lat_span,
+                bounds["min_lon"] + 0.4 * lon_span, bounds["min_lat"] + 0.4 * lat_span
+            ), margin=0.0)
+
+        (_, from_tiff), (_, from_store) = (s.load_flood_map("rr01", 2) for s in services)
+
+        full = from_tiff["statistics"]
+        assert full["total_pixels"] == HEIGHT * WIDTH
+        assert full["valid_pixels"] == HEIGHT * WIDTH - 1
+        assert full["max_depth"] == pytest.approx(np.nanmax(_depths(2)), rel=1e-6)
+        window = from_tiff["window"]
+        assert from_tiff["window_statistics"]["total_pixels"] == window["height"] * window["width"]
+        for key in ("statistics", "window_statistics"):
+            assert from_store[key] == pytest.approx(from_tiff[key], rel=1e-6)
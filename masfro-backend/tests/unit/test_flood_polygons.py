@@ -0,0 +1,127 @@
+# filename: tests/unit/test_flood_polygons.py
+
+"""
+Unit tests for flood extent polygonization.
+
+Tests cover:
+- Depth band classification and labels
+- Polygon validity, bounds and zoom-based simplification
+- GeoJSON caching and background precompute
+"""
+
+import numpy as np
+import pytest
+from shapely.geometry import box, shape
+
+from app.services.flood_polygons import (
+    band_edges,
+    polygonize_depths,
+    tolerance_for_zoom,
+)
+from app.services.geotiff_service import GeoTIFFService
+from tests.fixtures.flood_maps import write_flood_maps
+
+HEIGHT, WIDTH = 120, 150
+BOUNDS = {"min_lon": 121.0, "max_lon": 121.15, "min_lat": 14.6, "max_lat": 14.72}
+
+
+def _depths(time_step):
+    rows, cols = np.mgrid[0:HEIGHT, 0:WIDTH]
+    # Circular basin, deepest in the middle, with a noisy rim
+    radius = np.hypot(rows - HEIGHT / 2, cols - WIDTH / 2)
+    data = np.clip(2.5 - radius / 20.0, 0.0, None) * time_step / 2
+    data += np.random.default_rng(time_step).uniform(0, 0.05, data.shape)
+    data[:5, :5] = np.nan
+    return data.astype(np.float64)
+
+
+def _service(root):
+    write_flood_maps(root / "maps", _depths, (1, 2))
+    return GeoTIFFService(data_dir=str(root / "maps"), store_dir=str(root / "store"))
+
+
+def _vertices(features):
+    return sum(
+        len(polygon.exterior.coords)
+        for feature in features
+        for polygon in shape(feature["geometry"]).geoms
+    )
+
+
+class TestPolygonize:
+    """Test raster to depth-band polygons."""
+
+    def test_band_edges(self):
+        """Test that bands start at the threshold."""
+        assert band_edges(0.01) == [0.01, 0.5, 1.0, 2.0]
+        assert band_edges(0.75) == [0.75, 1.0, 2.0]
+
+    def test_bands_and_labels(self):
+        """Test one feature per band with matching depth ranges."""
+        features = polygonize_depths(_depths(2), BOUNDS, threshold=0.01)
+        labels = [f["properties"]["label"] for f in features]
+
+        assert labels == ["0.01-0.5m", "0.5-1m", "1-2m", ">=2m"]
+        assert features[-1]["properties"]["max_depth"] is None
+        assert all(f["geometry"]["type"] == "MultiPolygon" for f in features)
+
+    def test_valid_and_within_bounds(self):
+        """Test that geometries are valid and lie inside the raster bounds."""
+        extent = box(BOUNDS["min_lon"], BOUNDS["min_lat"], BOUNDS["max_lon"], BOUNDS["max_lat"])
+        for feature in polygonize_depths(_depths(2), BOUNDS, tolerance=tolerance_for_zoom(14)):
+            geometry = shape(feature["geometry"])
+            assert geometry.is_valid
+            assert extent.buffer(1e-6).contains(geometry)
+
+    def test_deep_band_near_center(self):
+        """Test that the deepest band covers the basin centre."""
+        deep = polygonize_depths(_depths(2), BOUNDS)[-1]
+        center_lon = (BOUNDS["min_lon"] + BOUNDS["max_lon"]) / 2
+        center_lat = (BOUNDS["min_lat"] + BOUNDS["max_lat"]) / 2
+        assert shape(deep["geometry"]).buffer(1e-4).contains(
+            shape({"type": "Point", "coordinates": (center_lon, center_lat)})
+        )
+
+    def test_lower_zoom_simplifies_more(self):
+        """Test that a coarser zoom yields fewer vertices."""
+        data = _depths(2)
+        raw = _vertices(polygonize_depths(data, BOUNDS))
+        fine = _vertices(polygonize_depths(data, BOUNDS, tolerance=tolerance_for_zoom(16)))
+        coarse = _vertices(polygonize_depths(data, BOUNDS, tolerance=tolerance_for_zoom(11)))
+        assert coarse < fine <= raw
+
+    def test_dry_map_has_no_features(self):
+        """Test an all-dry raster."""
+        assert polygonize_depths(np.zeros((10, 10)), BOUNDS) == []
+
+
+class TestGeoJSONCache:
+    """Test service-level GeoJSON caching."""
+
+    def test_cache_hit(self, tmp_path):
+        """Test that a repeated request is served from the cache."""
+        service = _service(tmp_path)
+        first = service.get_flood_map_as_geojson("rr01", 2, zoom=13)
+        assert service.get_flood_map_as_geojson("rr01", 2, zoom=13) is first
+
+        stats = service.get_cache_stats()["geojson"]
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert first["metadata"]["tolerance"] == pytest.approx(tolerance_for_zoom(13))
+
+        service.get_flood_map_as_geojson("rr01", 2, zoom=15)
+        assert service.get_cache_stats()["geojson"]["entries"] == 2
+
+    def test_invalid_return_period(self, tmp_path):
+        """Test request validation."""
+        with pytest.raises(ValueError):
+            _service(tmp_path).get_flood_map_as_geojson("rr09", 1)
+
+    def test_precompute(self, tmp_path):
+        """Test that the background precompute fills the cache."""
+        service = _service(tmp_path)
+        assert service.start_geojson_precompute(zooms=(12,))
+        service._geojson_thread.join(timeout=30)
+
+        assert service.get_cache_stats()["geojson"]["entries"] == 2
+        service.get_flood_map_as_geojson("rr01", 1, zoom=12)
+        assert service.get_cache_stats()["geojson"]["hits"] == 1
@@ -0,0 +1,185 @@
+# filename: tests/unit/test_flood_prefetch.py
+
+"""
+Unit tests for flood map prefetching and vectorized edge depth gathers.
+
+Tests cover:
+- FloodPrefetcher scheduling, waiting and cancellation
+- GeoTIFFService edge depth gathers against per-point queries
+- HazardAgent scheduling prefetches from set_flood_scenario
+"""
+
+import threading
+from unittest.mock import patch
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from app.agents.hazard_agent import HazardAgent
+from app.environment.graph_manager import DynamicGraphEnvironment
+from app.services.flood_prefetch import FloodPrefetcher
+from app.services.geotiff_service import GeoTIFFService
+from tests.fixtures.flood_maps import write_flood_maps
+
+HEIGHT, WIDTH = 40, 50
+
+
+def _depths(time_step):
+    rows, cols = np.mgrid[0:HEIGHT, 0:WIDTH]
+    data = (rows * 0.05 + cols * 0.01) * time_step
+    data[:11, :11] = np.nan
+    return data.astype(np.float64)
+
+
+def _service(root, return_periods=("rr01", "rr02"), time_steps=(1, 2, 3, 4)):
+    write_flood_maps(root, _depths, time_steps, return_periods)
+    return GeoTIFFService(data_dir=str(root), store_dir=str(root / "store"))
+
+
+def _graph(service, size=6):
+    """Grid spanning the manual raster bounds, including its nodata corner."""
+    bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+    graph = nx.MultiDiGraph(crs="EPSG:4326")
+    for i in range(size):
+        for j in range(size):
+            graph.add_node(
+                i * size + j,
+                x=bounds["min_lon"] + (j + 0.3) / size * (bounds["max_lon"] - bounds["min_lon"]),
+                y=bounds["max_lat"] - (i + 0.3) / size * (bounds["max_lat"] - bounds["min_lat"])
+            )
+    for i in range(size):
+        for j in range(size):
+            for ni, nj in ((i + 1, j), (i, j + 1)):
+                if ni < size and nj < size:
+                    graph.add_edge(i * size + j, ni * size + nj, length=100.0)
+                    graph.add_edge(ni * size + nj, i * size + j, length=100.0)
+    return graph
+
+
+class TestFloodPrefetcher:
+    """Test the background loader."""
+
+    def test_take_ready_and_waiting(self):
+        """Test that finished and in-flight results are both returned."""
+        release = threading.Event()
+
+        def load(rp, ts):
+            if ts == 2:
+                release.wait(5)
+            return f"{rp}-{ts}"
+
+        prefetcher = FloodPrefetcher(load)
+        assert prefetcher.schedule("rr01", [1, 2]) == 2
+        assert prefetcher.take(("rr01", 1)) == "rr01-1"
+
+        threading.Timer(0.05, release.set).start()
+        assert prefetcher.take(("rr01", 2)) == "rr01-2"
+        assert prefetcher.take(("rr01", 3)) is None
+
+        stats = prefetcher.stats()
+        assert stats["hits"] == 2
+        assert stats["waits"] >= 1
+        prefetcher.shutdown()
+
+    def test_return_period_change_cancels(self):
+        """Test that switching return period discards old work."""
+        release = threading.Event()
+        loaded = []
+
+        def load(rp, ts):
+            release.wait(5)
+            loaded.append((rp, ts))
+            return ts
+
+        prefetcher = FloodPrefetcher(load)
+        prefetcher.schedule("rr01", [1, 2, 3])
+        prefetcher.schedule("rr03", [1])
+        release.set()
+
+        assert prefetcher.take(("rr03", 1)) == 1
+        assert prefetcher.take(("rr01", 2)) is None
+        assert prefetcher.stats()["cancelled"] == 3
+        assert ("rr01", 3) not in loaded
+        prefetcher.shutdown()
+
+    def test_errors_counted(self):
+        """Test that a failing load is reported and yields None."""
+        def load(rp, ts):
+            raise OSError("disk gone")
+
+        prefetcher = FloodPrefetcher(load)
+        prefetcher.schedule("rr01", [1])
+        assert prefetcher.take(("rr01", 1)) is None
+        assert prefetcher.stats()["errors"] == 1
+        prefetcher.shutdown()
+
+
+class TestEdgeDepthGather:
+    """Test GeoTIFFService edge depth gathers and prefetch."""
+
+    def _register(self, service, graph):
+        keys = list(graph.edges(keys=True))
+        service.set_edge_samples(
+            keys,
+            [(graph.nodes[u]["x"], graph.nodes[u]["y"]) for u, _, _ in keys],
+            [(graph.nodes[v]["x"], graph.nodes[v]["y"]) for _, v, _ in keys]
+        )
+        return keys
+
+    def test_gather_matches_point_queries(self, tmp_path):
+        """Test that the vectorized gather equals two point queries per edge."""
+        service = _service(tmp_path)
+        graph = _graph(service)
+        keys = self._register(service, graph)
+
+        depths = service.get_edge_depths("rr01", 3)
+
+        for (u, v, _), depth in zip(keys, depths):
+            ends = [
+                service.get_flood_depth_at_point(graph.nodes[n]["x"], graph.nodes[n]["y"], "rr01", 3)
+                for n in (u, v)
+            ]
+            ends = [d for d in ends if d is not None]
+            if ends:
+                assert depth == pytest.approx(sum(ends) / len(ends), rel=1e-3)
+            else:
+                assert np.isnan(depth)
+        assert np.isnan(depths).any()
+
+    def test_prefetch_serves_next_step(self, tmp_path):
+        """Test that prefetched steps are claimed without a synchronous load."""
+        service = _service(tmp_path)
+        self._register(service, _graph(service))
+
+        assert service.prefetch("rr01", 1, steps=2) == 3
+        for ts in (1, 2, 3):
+            assert service.get_edge_depths("rr01", ts) is not None
+
+        stats = service.get_cache_stats()
+        assert stats["edge_depth_sync_loads"] == 0
+        assert stats["prefetch"]["hits"] == 3
+        assert service.prefetch("rr01", 3, steps=5) == 1  # only step 4 remains
+        service.prefetcher.shutdown()
+
+
+class TestHazardAgentPrefetch:
+    """Test HazardAgent integration."""
+
+    def test_set_flood_scenario_prefetches_and_gathers(self, tmp_path):
+        """Test that edge depths from the gather match the per-edge loop."""
+        service = _service(tmp_path)
+        env = DynamicGraphEnvironment(graph=_graph(service))
+
+        with patch('app.agents.hazard_agent.get_geotiff_service', return_value=service):
+            agent = HazardAgent("hazard_prefetch", env, enable_geotiff=True)
+
+        agent.set_flood_scenario("rr02", 2)
+        fast = agent.get_edge_flood_depths()
+        agent._edge_sample_count = 0
+        slow = agent.get_edge_flood_depths()
+
+        assert fast.keys() == slow.keys()
+        assert all(fast[k] == pytest.approx(slow[k], rel=1e-6) for k in slow)
+        assert service.get_cache_stats()["prefetch"]["return_period"] == "rr02"
+        service.prefetcher.shutdown()
@@ -0,0 +1,150 @@
+# filename: tests/unit/test_flood_tiles.py
+
+"""
+Unit tests for the flood depth tile renderer.
+
+Tests cover:
+- XYZ tile bounds and overview pyramids
+- Tile rendering against the manual georeferencing
+- Memory/disk tile caches and ETags
+"""
+
+import io
+import math
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.services.flood_tiles import (
+    FloodTileRenderer,
+    build_overviews,
+    depth_colormap,
+    tile_bounds,
+)
+from app.services.geotiff_service import GeoTIFFService
+from tests.fixtures.flood_maps import write_flood_maps
+
+HEIGHT, WIDTH = 120, 150
+
+
+def _depths(time_step):
+    rows, cols = np.mgrid[0:HEIGHT, 0:WIDTH]
+    data = np.where(cols < WIDTH // 2, 0.0, (rows * 0.01 + 0.05) * time_step)
+    data[:10, -10:] = np.nan
+    return data.astype(np.float64)
+
+
+def _service(root):
+    write_flood_maps(root / "maps", _depths, (1, 2))
+    return GeoTIFFService(data_dir=str(root / "maps"), store_dir=str(root / "store"))
+
+
+def _tile_at(lon, lat, z):
+    n = 2 ** z
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return x, y
+
+
+def _decode(png):
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGBA"))
+
+
+class TestTileGeometry:
+    """Test tile math and overviews."""
+
+    def test_tile_bounds(self):
+        """Test the world tile and a quadrant."""
+        world = tile_bounds(0, 0, 0)
+        assert world["west"] == -180.0 and world["east"] == 180.0
+        assert world["north"] == pytest.approx(85.0511, abs=1e-4)
+
+        quadrant = tile_bounds(1, 1, 1)
+        assert quadrant["west"] == 0.0
+        assert quadrant["north"] == pytest.approx(0.0, abs=1e-9)
+
+    def test_overviews_average_valid_pixels(self):
+        """Test that 2x2 means ignore NaN and odd edges are padded."""
+        data = np.array([[1.0, 3.0, 5.0], [np.nan, 2.0, 7.0]], dtype=np.float32)
+        data = np.tile(data, (40, 40))
+        levels = build_overviews(data, min_size=2)
+
+        assert levels[1][0, 0] == pytest.approx(2.0)
+        assert len(levels) > 2
+        assert levels[1].shape == (40, 60)
+
+    def test_colormap_shallow_to_deep(self):
+        """Test the gradient endpoints."""
+        lut = depth_colormap()
+        assert tuple(lut[0][:3]) == (64, 224, 208)
+        assert tuple(lut[255][:3]) == (0, 0, 139)
+
+
+class TestRenderer:
+    """Test tile rendering and caching."""
+
+    def test_tile_shows_flooded_half(self, tmp_path):
+        """Test that only the flooded (eastern) half of the map is coloured."""
+        service = _service(tmp_path)
+        renderer = FloodTileRenderer(service, cache_dir=str(tmp_path / "tiles"))
+        bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+        center_lon = (bounds["min_lon"] + bounds["max_lon"]) / 2
+        center_lat = (bounds["min_lat"] + bounds["max_lat"]) / 2
+
+        west_x, west_y = _tile_at(bounds["min_lon"] + 0.1 * bounds["coverage_width"], center_lat, 16)
+        east_x, east_y = _tile_at(bounds["max_lon"] - 0.2 * bounds["coverage_width"], center_lat, 16)
+
+        west = _decode(renderer.get_tile("rr01", 1, 16, west_x, west_y)[0])
+        east = _decode(renderer.get_tile("rr01", 1, 16, east_x, east_y)[0])
+
+        assert west.shape == (256, 256, 4)
+        assert west[..., 3].max() == 0
+        assert east[..., 3].min() > 0
+
+        overview = _decode(renderer.get_tile("rr01", 1, 12, *_tile_at(center_lon, center_lat, 12))[0])
+        assert 0 < (overview[..., 3] > 0).mean() < 1
+
+    def test_tile_outside_map_is_empty(self, tmp_path):
+        """Test that tiles away from the map are transparent."""
+        renderer = FloodTileRenderer(_service(tmp_path), cache_dir=None)
+        png, _ = renderer.get_tile("rr01", 1, 10, 0, 0)
+        assert _decode(png)[..., 3].max() == 0
+        assert renderer.stats()["empty"] == 1
+
+    def test_caches_and_etags(self, tmp_path):
+        """Test memory hits, disk reuse across renderers and per-map ETags."""
+        service = _service(tmp_path)
+        cache_dir = str(tmp_path / "tiles")
+        x, y = _tile_at(121.10305, 14.6456, 15)
+
+        first = FloodTileRenderer(service, cache_dir=cache_dir)
+        png, etag = first.get_tile("rr01", 2, 15, x, y)
+        assert first.get_tile("rr01", 2, 15, x, y) == (png, etag)
+        assert first.stats()["memory_hits"] == 1
+        assert first.tile_etag("rr01", 2, 15, x, y) == etag
+        assert first.tile_etag("rr01", 1, 15, x, y) != etag
+
+        second = FloodTileRenderer(service, cache_dir=cache_dir)
+        assert second.get_tile("rr01", 2, 15, x, y) == (png, etag)
+        assert second.stats()["disk_hits"] == 1
+        assert second.stats()["rendered"] == 0
+
+    def test_disk_budget(self, tmp_path):
+        """Test that the disk cache drops the oldest tiles over budget."""
+        renderer = FloodTileRenderer(_service(tmp_path), cache_dir=str(tmp_path / "tiles"),
+                                     disk_bytes=1)
+        x, y = _tile_at(121.10305, 14.6456, 15)
+        renderer.get_tile("rr01", 1, 15, x, y)
+        renderer.get_tile("rr01", 1, 15, x + 1, y)
+
+        assert renderer.stats()["disk"]["entries"] == 1
+        assert len(list((tmp_path / "tiles").rglob("*.png"))) == 1
+
+    def test_invalid_tile(self, tmp_path):
+        """Test coordinate validation."""
+        renderer = FloodTileRenderer(_service(tmp_path), cache_dir=None)
+        with pytest.raises(ValueError):
+            renderer.get_tile("rr01", 1, 3, 8, 0)
+        with pytest.raises(ValueError):
+            renderer.get_tile("rr09", 1, 3, 0, 0)
@@ -0,0 +1,100 @@
+# filename: tests/unit/test_geometry_store.py
+
+"""
+Unit tests for EdgeGeometryStore and the encoded polyline utilities.
+
+Tests cover:
+- Packing edge geometry with node-coordinate fallback
+- Stitching path geometry across edges
+- Polyline encode/decode round trips
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+from shapely.geometry import LineString
+
+from app.environment.geometry_store import EdgeGeometryStore
+from app.utils.polyline import encode_polyline, decode_polyline
+
+
+def _build_graph():
+    """Three-node graph where one edge carries a curved geometry."""
+    graph = nx.MultiDiGraph()
+    graph.add_node(1, x=121.100, y=14.650)
+    graph.add_node(2, x=121.110, y=14.650)
+    graph.add_node(3, x=121.110, y=14.660)
+    graph.add_edge(1, 2, 0, length=1100.0, weight=1100.0,
+                   geometry=LineString([(121.100, 14.650), (121.105, 14.652), (121.110, 14.650)]))
+    graph.add_edge(1, 2, 1, length=1500.0, weight=1500.0)
+    graph.add_edge(2, 3, 0, length=1100.0, weight=1100.0)
+    return graph
+
+
+class TestEdgeGeometryStore:
+    """Test geometry packing and path stitching."""
+
+    def test_offsets_cover_all_edges(self):
+        """Test that every edge owns a slice of the buffer."""
+        store = EdgeGeometryStore(_build_graph())
+
+        assert store.coords.dtype == np.float32
+        assert len(store.offsets) == 4
+        assert store.offsets[-1] == len(store.coords) == 3 + 2 + 2
+
+    def test_edge_geometry_uses_linestring(self):
+        """Test that geometry is read as (lat, lon) from the LineString."""
+        store = EdgeGeometryStore(_build_graph())
+
+        coords = store.edge_geometry(1, 2, 0)
+        assert coords.shape == (3, 2)
+        assert coords[1] == pytest.approx([14.652, 121.105], abs=1e-5)
+
+    def test_path_geometry_drops_shared_points(self):
+        """Test that stitched geometry follows the road without duplicates."""
+        store = EdgeGeometryStore(_build_graph())
+
+        coords = store.path_coordinates([1, 2, 3])
+        assert len(coords) == 4
+        assert coords[0] == pytest.approx((14.650, 121.100), abs=1e-5)
+        assert coords[-1] == pytest.approx((14.660, 121.110), abs=1e-5)
+
+    def test_parallel_edge_follows_search_rule(self):
+        """Test that geometry uses the lowest-risk parallel edge, as A* does."""
+        graph = _build_graph()
+        graph[1][2][0]["risk_score"] = 0.6
+        graph[1][2][1]["risk_score"] = 0.1
+        store = EdgeGeometryStore(graph)
+
+        assert len(store.path_coordinates([1, 2, 3])) == 3
+        assert len(store.path_coordinates(
+            [1, 2, 3], passable=lambda edge: edge != (1, 2, 1)
+        )) == 4
+
+    def test_path_geometry_missing_edge(self):
+        """Test that a path over a missing edge raises KeyError."""
+        store = EdgeGeometryStore(_build_graph())
+
+        with pytest.raises(KeyError):
+            store.path_geometry([3, 1])
+
+
+class TestPolyline:
+    """Test Google encoded polyline encoding."""
+
+    def test_reference_example(self):
+        """Test the example from the polyline algorithm documentation."""
+        coords = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+        assert encode_polyline(coords) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+    def test_round_trip(self):
+        """Test that decoding restores coordinates at the chosen precision."""
+        coords = [(14.650123, 121.100456), (14.651, 121.1021), (14.6499, 121.099)]
+        for precision in (5, 6):
+            decoded = decode_polyline(encode_polyline(coords, precision), precision)
+            assert np.allclose(decoded, coords, atol=10 ** -precision)
+
+    def test_empty(self):
+        """Test that an empty path encodes to an empty string."""
+        assert encode_polyline([]) == ""
+        assert decode_polyline("") == []
@@ -0,0 +1,186 @@
+# filename: tests/unit/test_graph_contraction.py
+
+"""
+Unit tests for degree-2 chain contraction.
+
+Tests cover:
+- Node/edge reduction on chain-heavy graphs
+- Identical route costs on contracted and original graphs
+- Incremental risk propagation to super-edges
+- Splitting chains at route endpoints
+- Splits waiting for in-flight searches
+"""
+
+import random
+import threading
+
+import networkx as nx
+import pytest
+
+from app.algorithms.graph_contraction import ContractedGraph
+from app.algorithms.risk_aware_astar import risk_aware_astar
+from app.environment.graph_manager import DynamicGraphEnvironment
+
+
+def _path_cost(graph, path, risk_weight, distance_weight):
+    """Cost of a path on the original graph under the A* edge rule."""
+    total = 0.0
+    for u, v in zip(path[:-1], path[1:]):
+        best = min(graph[u][v].values(), key=lambda d: (d["risk_score"], d["length"]))
+        if best["risk_score"] >= 0.9:
+            return float("inf")
+        total += best["length"] * distance_weight + best["length"] * best["risk_score"] * risk_weight
+    return total
+
+
+def _chain_grid(size=4, shape_nodes=3, seed=7):
+    """Grid of junctions whose streets are subdivided into shape-node chains."""
+    rng = random.Random(seed)
+    graph = nx.MultiDiGraph()
+    next_id = [1000]
+
+    def junction(i, j):
+        return i * size + j
+
+    for i in range(size):
+        for j in range(size):
+            graph.add_node(junction(i, j), x=121.10 + j * 0.01, y=14.60 + i * 0.01)
+
+    def add_street(a, b, two_way):
+        ax, ay = graph.nodes[a]["x"], graph.nodes[a]["y"]
+        bx, by = graph.nodes[b]["x"], graph.nodes[b]["y"]
+        nodes = [a]
+        for step in range(1, shape_nodes + 1):
+            t = step / (shape_nodes + 1)
+            graph.add_node(next_id[0], x=ax + (bx - ax) * t, y=ay + (by - ay) * t)
+            nodes.append(next_id[0])
+            next_id[0] += 1
+        nodes.append(b)
+        for u, v in zip(nodes[:-1], nodes[1:]):
+            length = rng.uniform(300, 500)  # >= straight-line distance (admissible heuristic)
+            graph.add_edge(u, v, length=length, risk_score=0.0, weight=length)
+            if two_way:
+                graph.add_edge(v, u, length=length, risk_score=0.0, weight=length)
+
+    for i in range(size):
+        for j in range(size):
+            if j + 1 < size:
+                add_street(junction(i, j), junction(i, j + 1), two_way=(i % 2 == 0))
+            if i + 1 < size:
+                add_street(junction(i, j), junction(i + 1, j), two_way=True)
+    # A parallel edge between two junctions keeps the plain-edge rule
+    graph.add_edge(0, 1, length=2500.0, risk_score=0.0, weight=2500.0)
+    return graph
+
+
+class TestContraction:
+    """Test contracted graph construction."""
+
+    def test_reduces_nodes_and_edges(self):
+        """Test that shape nodes are hidden inside super-edges."""
+        graph = _chain_grid()
+        contracted = ContractedGraph(graph)
+
+        # 16 junctions, minus the corner that is itself a two-way pass-through
+        assert contracted.graph.number_of_nodes() == 15
+        assert contracted.graph.number_of_edges() < graph.number_of_edges() / 3
+        stats = contracted.get_statistics()
+        assert stats["node_reduction"] > 0.8
+
+    def test_super_edge_aggregates(self):
+        """Test summed length, max risk and risk-weighted length."""
+        graph = _chain_grid()
+        contracted = ContractedGraph(graph)
+
+        a, b, key, data = next(
+            (a, b, k, d) for a, b, k, d in contracted.graph.edges(keys=True, data=True) if d["chain"]
+        )
+        assert data["length"] == pytest.approx(
+            sum(graph[u][v][k]["length"] for u, v, k in data["edges"])
+        )
+        assert data["risk_score"] == 0.0
+
+
+class TestEquivalence:
+    """Test that contracted search matches the original graph."""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_route_costs_match(self, seed):
+        """Test identical costs across random risks, endpoints and weights."""
+        rng = random.Random(seed)
+        graph = _chain_grid(seed=seed)
+        env = DynamicGraphEnvironment(graph=graph)
+        contracted = env.get_contracted_graph()
+
+        edges = list(graph.edges(keys=True))
+        for u, v, k in rng.sample(edges, len(edges) // 3):
+            env.update_edge_risk(u, v, k, rng.choice([0.1, 0.4, 0.7, 0.95]))
+
+        nodes = list(graph.nodes)
+        for _ in range(10):
+            start, end = rng.sample(nodes, 2)
+            for risk_weight in (0.0, 2000.0):
+                expected = risk_aware_astar(graph, start, end, risk_weight=risk_weight, distance_weight=1.0)
+                contracted.ensure_node(start)
+                contracted.ensure_node(end)
+                found = risk_aware_astar(contracted.graph, start, end, risk_weight=risk_weight, distance_weight=1.0)
+                expanded = contracted.expand_path(found, risk_weight=risk_weight, distance_weight=1.0)
+
+                if expected is None:
+                    assert expanded is None
+                    continue
+                assert expanded[0] == start and expanded[-1] == end
+                expected_cost = _path_cost(graph, expected, risk_weight, 1.0)
+                found_cost = _path_cost(graph, expanded, risk_weight, 1.0)
+                if expected_cost == float("inf"):
+                    # Only blocked paths remain; both searches report one
+                    assert found_cost == float("inf")
+                else:
+                    assert found_cost == pytest.approx(expected_cost)
+
+
+class TestIncrementalUpdates:
+    """Test risk propagation and endpoint splitting."""
+
+    def test_update_propagates_to_super_edge(self):
+        """Test that a risk update on a shape edge updates its super-edge."""
+        graph = _chain_grid()
+        env = DynamicGraphEnvironment(graph=graph)
+        contracted = env.get_contracted_graph()
+
+        u, v, k = next((u, v, k) for u, v, k in graph.edges(keys=True) if u >= 1000)
+        env.update_edge_risk(u, v, k, 0.95)
+        a, b, key = contracted._edge_to_super[(u, v, k)]
+        assert contracted.graph[a][b][key]["risk_score"] == 0.95
+
+        env.reset_edge_risks()
+        assert contracted.graph[a][b][key]["risk_score"] == 0.0
+
+    def test_ensure_node_splits_chain(self):
+        """Test that an interior node becomes addressable after a split."""
+        graph = _chain_grid()
+        contracted = ContractedGraph(graph)
+        edges_before = contracted.graph.number_of_edges()
+
+        contracted.ensure_node(1001)
+        assert 1001 in contracted.graph
+        assert 1001 not in contracted.contracted_nodes
+        assert contracted.graph.number_of_edges() == edges_before + 2
+
+    def test_split_waits_for_searches(self):
+        """Test that ensure_node does not restructure the graph mid-search."""
+        graph = _chain_grid()
+        contracted = ContractedGraph(graph)
+        edges_before = contracted.graph.number_of_edges()
+
+        splitter = threading.Thread(target=contracted.ensure_node, args=(1001,))
+        with contracted.searching():
+            splitter.start()
+            splitter.join(timeout=0.2)
+            assert splitter.is_alive()
+            assert 1001 not in contracted.graph
+            assert contracted.graph.number_of_edges() == edges_before
+
+        splitter.join(timeout=5)
+        assert not splitter.is_alive()
+        assert 1001 in contracted.graph
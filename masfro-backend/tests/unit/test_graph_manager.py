@@ -0,0 +1,93 @@
+# filename: tests/unit/test_graph_manager.py
+
+"""
+Unit tests for DynamicGraphEnvironment.
+
+Tests cover:
+- Construction from an in-memory graph
+- Lean mode attribute stripping
+- Highway interning and decoding
+- Side table lookups
+"""
+
+import networkx as nx
+
+from app.environment.graph_manager import DynamicGraphEnvironment, LEAN_EDGE_ATTRIBUTES
+
+
+def _build_graph():
+    """Small OSM-like graph with extra attributes on every edge."""
+    graph = nx.MultiDiGraph()
+    graph.add_node(1, x=121.10, y=14.65, street_count=2, highway="traffic_signals")
+    graph.add_node(2, x=121.11, y=14.65, street_count=3)
+    graph.add_node(3, x=121.12, y=14.66, street_count=1)
+    graph.add_edge(1, 2, 0, length=100.0, highway="primary", name="J.P. Rizal",
+                   osmid=[11, 12], lanes="4", maxspeed="60")
+    graph.add_edge(2, 3, 0, length=50.0, highway=["residential", "tertiary"],
+                   name="Side St", osmid=13)
+    graph.add_edge(2, 1, 0, length=100.0, highway="primary", name="J.P. Rizal", osmid=14)
+    return graph
+
+
+class TestDefaultMode:
+    """Test the default (non-lean) load mode."""
+
+    def test_keeps_all_attributes(self):
+        """Test that normal mode leaves OSM attributes on the graph."""
+        env = DynamicGraphEnvironment(lean=False, graph=_build_graph())
+
+        data = env.graph[1][2][0]
+        assert data["name"] == "J.P. Rizal"
+        assert data["risk_score"] == 0.0
+        assert data["weight"] == 100.0
+        assert env.get_edge_highway(data) == "primary"
+
+
+class TestLeanMode:
+    """Test lean mode stripping and interning."""
+
+    def test_strips_edge_and_node_attributes(self):
+        """Test that only lean attributes remain on edges and nodes."""
+        env = DynamicGraphEnvironment(lean=True, graph=_build_graph())
+
+        for _, _, _, data in env.graph.edges(keys=True, data=True):
+            assert set(data) <= set(LEAN_EDGE_ATTRIBUTES)
+            assert "risk_score" in data and "weight" in data
+        for _, data in env.graph.nodes(data=True):
+            assert set(data) == {"x", "y"}
+
+    def test_highway_interned_to_shared_codes(self):
+        """Test that equal highway values share one code."""
+        env = DynamicGraphEnvironment(lean=True, graph=_build_graph())
+
+        assert env.graph[1][2][0]["highway_code"] == env.graph[2][1][0]["highway_code"]
+        assert len(env.highway_table) == 2
+        assert env.get_edge_highway(env.graph[1][2][0]) == "primary"
+        assert env.get_edge_highway(env.graph[2][3][0]) == ["residential", "tertiary"]
+
+    def test_side_table_restores_attributes(self):
+        """Test that stripped attributes are available on demand."""
+        env = DynamicGraphEnvironment(lean=True, graph=_build_graph())
+
+        attrs = env.get_edge_attributes(1, 2, 0)
+        assert attrs["name"] == "J.P. Rizal"
+        assert attrs["osmid"] == [11, 12]
+        assert attrs["highway"] == "primary"
+        assert env.get_node_attributes(1)["street_count"] == 2
+        assert env.get_edge_attributes(3, 1, 0) == {}
+
+    def test_memory_report(self):
+        """Test that the memory report shows a reduction."""
+        env = DynamicGraphEnvironment(lean=True, graph=_build_graph())
+
+        report = env.get_memory_report()
+        assert report["lean"] is True
+        assert report["attribute_bytes_after"] < report["attribute_bytes_before"]
+        assert report["edges"] == 3
+
+    def test_risk_updates_work_in_lean_mode(self):
+        """Test that risk updates still recompute weight."""
+        env = DynamicGraphEnvironment(lean=True, graph=_build_graph())
+
+        env.update_edge_risk(1, 2, 0, 0.5)
+        assert env.graph[1][2][0]["weight"] == 150.0
@@ -0,0 +1,155 @@
+# filename: tests/unit/test_inundation_index.py
+
+"""
+Unit tests for the edge time-of-first-inundation index.
+
+Tests cover:
+- EdgeDepthSeries.first_inundation
+- HazardAgent per-vehicle inundation index and caching
+- Background forecast builds
+- RoutingAgent "usable until" results and warnings
+"""
+
+from unittest.mock import patch
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from app.agents.hazard_agent import HazardAgent
+from app.agents.routing_agent import RoutingAgent
+from app.algorithms.time_dependent_astar import NEVER_INUNDATED, EdgeDepthSeries
+from app.environment.graph_manager import DynamicGraphEnvironment
+from app.services.geotiff_service import GeoTIFFService
+from tests.fixtures.flood_maps import write_flood_maps
+
+HEIGHT, WIDTH = 40, 50
+# Depth of the eastern half per time step; the western half stays dry
+LEVELS = {1: 0.1, 2: 0.35, 3: 0.55, 4: 0.65}
+
+
+def _depths(time_step):
+    data = np.zeros((HEIGHT, WIDTH))
+    data[:, WIDTH // 2:] = LEVELS[time_step]
+    return data
+
+
+def _service(root):
+    write_flood_maps(root, _depths, LEVELS)
+    return GeoTIFFService(data_dir=str(root), store_dir=str(root / "store"))
+
+
+def _agents(root):
+    """HazardAgent and linked RoutingAgent on a dry road (1-2) and a flooding road (3-4)."""
+    service = _service(root)
+    bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+    lat = bounds["min_lat"] + 0.5 * bounds["coverage_height"]
+    coords = {}
+    graph = nx.MultiDiGraph(crs="EPSG:4326")
+    for node, fx in ((1, 0.1), (2, 0.2), (3, 0.7), (4, 0.8)):
+        lon = bounds["min_lon"] + fx * bounds["coverage_width"]
+        graph.add_node(node, x=lon, y=lat)
+        coords[node] = (lat, lon)
+    for u, v in ((1, 2), (3, 4)):
+        graph.add_edge(u, v, length=100.0, risk_score=0.0)
+        graph.add_edge(v, u, length=100.0, risk_score=0.0)
+
+    env = DynamicGraphEnvironment(graph=graph)
+    with patch('app.agents.hazard_agent.get_geotiff_service', return_value=service):
+        hazard = HazardAgent("hazard_inundation", env, enable_geotiff=True)
+    routing = RoutingAgent("routing_inundation", env)
+    routing.set_hazard_agent(hazard)
+    return hazard, routing, coords, service
+
+
+class TestFirstInundation:
+    """Test the vectorized first-step computation."""
+
+    def test_first_step_reaching_depth(self):
+        """Test closing steps, never-flooded edges and the step offset."""
+        depths = [[0.0, 0.1, 0.4], [0.2, 0.3, 0.1], [0.5, 0.1, 0.0]]
+        series = EdgeDepthSeries([("a",), ("b",), ("c",)], depths, first_step=3)
+
+        index = series.first_inundation(0.3)
+        assert index.dtype == np.uint8
+        np.testing.assert_array_equal(index, [5, 4, 3])
+        np.testing.assert_array_equal(series.first_inundation(0.6), [NEVER_INUNDATED] * 3)
+
+
+class TestHazardInundationIndex:
+    """Test HazardAgent.get_inundation_index."""
+
+    def test_per_vehicle_index(self, tmp_path):
+        """Test closing steps by vehicle class and caching."""
+        hazard, _, _, service = _agents(tmp_path)
+        column = hazard.get_edge_depth_series("rr01").index
+
+        car = hazard.get_inundation_index("rr01", "car")
+        assert car[column[(3, 4, 0)]] == 2
+        assert car[column[(1, 2, 0)]] == NEVER_INUNDATED
+        assert hazard.get_inundation_index("rr01", "suv")[column[(3, 4, 0)]] == 3
+        assert hazard.get_inundation_index("rr01", "truck")[column[(3, 4, 0)]] == 4
+        assert hazard.get_inundation_index("rr01", "car") is car
+        service.prefetcher.shutdown()
+
+    def test_configurable_depths(self, tmp_path):
+        """Test that changed limits are picked up and unknown vehicles rejected."""
+        hazard, _, _, service = _agents(tmp_path)
+        column = hazard.get_edge_depth_series().index
+
+        hazard.passability_depths["car"] = 0.7
+        assert hazard.get_inundation_index()[column[(3, 4, 0)]] == NEVER_INUNDATED
+        with pytest.raises(ValueError):
+            hazard.get_inundation_index(vehicle_type="boat")
+        service.prefetcher.shutdown()
+
+
+class TestRouteClosures:
+    """Test route results and warnings from the index."""
+
+    def test_dry_route_stays_usable(self, tmp_path):
+        """Test that a route on dry roads has no closure."""
+        hazard, routing, coords, service = _agents(tmp_path)
+        assert hazard.prepare_forecast("rr01")
+        result = routing.calculate_route(coords[1], coords[2])
+
+        assert "usable_until" in result and result["usable_until"] is None
+        assert not any("time step" in w for w in result["warnings"])
+        service.prefetcher.shutdown()
+
+    def test_closure_waits_for_background_build(self, tmp_path):
+        """Test that routes do not read rasters and pick up the built forecast."""
+        hazard, routing, coords, service = _agents(tmp_path)
+
+        first = routing.calculate_route(coords[3], coords[4])
+        assert "usable_until" not in first
+        hazard._forecast_builds["rr01"].join(timeout=10)
+
+        assert routing.calculate_route(coords[3], coords[4])["usable_until"] == 2
+        service.prefetcher.shutdown()
+
+    def test_set_flood_scenario_starts_build(self, tmp_path):
+        """Test that choosing a scenario builds its forecast in the background."""
+        hazard, _, _, service = _agents(tmp_path)
+
+        hazard.set_flood_scenario("rr01", 1)
+        hazard._forecast_builds["rr01"].join(timeout=10)
+        assert hazard.get_inundation_index("rr01", "truck", build=False) is not None
+        service.prefetcher.shutdown()
+
+    def test_flooding_route_reports_closure(self, tmp_path):
+        """Test usable_until and warnings by vehicle and current time."""
+        hazard, routing, coords, service = _agents(tmp_path)
+        assert hazard.prepare_forecast("rr01")
+
+        car = routing.calculate_route(coords[3], coords[4])
+        assert car["usable_until"] == 2
+        assert any("usable until time step 2" in w for w in car["warnings"])
+
+        truck = routing.calculate_route(coords[3], coords[4], {"vehicle_type": "truck"})
+        assert truck["usable_until"] == 4
+
+        hazard.time_step = 3
+        late = routing.calculate_route(coords[3], coords[4])
+        assert any("since time step 2" in w for w in late["warnings"])
+        service.prefetcher.shutdown()
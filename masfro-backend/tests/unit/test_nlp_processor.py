@@ -0,0 +1,67 @@
+# filename: tests/unit/test_nlp_processor.py
+
+"""
+Unit tests for batched NLP processing and geocoding.
+
+Tests cover:
+- Batch results matching per-text extraction
+- spaCy nlp.pipe() use for location extraction
+- Batched geocoding with per-name resolution
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from app.ml_models.location_geocoder import LocationGeocoder
+from app.ml_models.nlp_processor import NLPProcessor
+
+TEXTS = [
+    "Baha sa Nangka! Tuhod level, hindi madaan!",
+    "Clear na sa Tumana, madaan na.",
+    "Heavy rain at Malanday, water rising fast",
+    "Grabe baha sa Marikina Heights, hanggang dibdib!",
+]
+
+
+class TestBatchExtraction:
+    """Test extract_flood_info_batch."""
+
+    def test_matches_per_text_results(self):
+        """Test that batching does not change any extracted field."""
+        processor = NLPProcessor()
+        assert processor.extract_flood_info_batch(TEXTS) == [
+            processor.extract_flood_info(text) for text in TEXTS
+        ]
+
+    def test_empty_batch(self):
+        """Test that an empty batch returns no results."""
+        assert NLPProcessor().extract_flood_info_batch([]) == []
+
+    def test_location_model_uses_pipe(self):
+        """Test that spaCy documents are produced with one pipe() call."""
+        processor = NLPProcessor()
+        entity = SimpleNamespace(text="Nangka", label_="LOC")
+        model = Mock()
+        model.pipe.side_effect = lambda texts, batch_size: [
+            SimpleNamespace(ents=[entity]) for _ in texts
+        ]
+        processor.location_model = model
+
+        results = processor.extract_flood_info_batch(TEXTS)
+
+        model.pipe.assert_called_once()
+        model.assert_not_called()
+        assert {r["location"] for r in results} == {"Nangka"}
+
+
+class TestBatchGeocoding:
+    """Test geocode_nlp_results."""
+
+    def test_matches_single_geocoding(self):
+        """Test that batched geocoding matches geocode_nlp_result."""
+        geocoder = LocationGeocoder()
+        infos = [{"location": "Nangka"}, {"location": "nangka"}, {"location": None}]
+
+        assert geocoder.geocode_nlp_results(infos) == [
+            geocoder.geocode_nlp_result(info) for info in infos
+        ]
@@ -0,0 +1,80 @@
+# filename: tests/unit/test_passable_components.py
+
+"""
+Unit tests for the passable-component index.
+
+Tests cover:
+- Component labelling over passable edges
+- Lazy relabelling on risk epoch changes
+- Stranded area summaries
+"""
+
+import networkx as nx
+
+from app.algorithms.passable_components import label_passable_components
+from app.environment.graph_manager import DynamicGraphEnvironment
+
+
+def _two_districts():
+    """Two two-way districts joined by a single bridge edge pair (2 <-> 3)."""
+    graph = nx.MultiDiGraph()
+    for node, (x, y) in {1: (121.10, 14.65), 2: (121.11, 14.65),
+                         3: (121.12, 14.65), 4: (121.13, 14.65)}.items():
+        graph.add_node(node, x=x, y=y)
+    for u, v in [(1, 2), (2, 3), (3, 4)]:
+        graph.add_edge(u, v, length=100.0)
+        graph.add_edge(v, u, length=100.0)
+    return graph
+
+
+class TestLabelling:
+    """Test union-find labelling."""
+
+    def test_connected_graph_single_component(self):
+        """Test that a fully passable graph is one component."""
+        env = DynamicGraphEnvironment(graph=_two_districts())
+        labels = label_passable_components(env.graph)
+        assert set(labels.values()) == {0}
+
+    def test_blocked_bridge_splits_graph(self):
+        """Test that blocking every bridge edge separates the districts."""
+        env = DynamicGraphEnvironment(graph=_two_districts())
+        env.update_edge_risk(2, 3, 0, 0.95)
+        env.update_edge_risk(3, 2, 0, 0.95)
+
+        labels = label_passable_components(env.graph)
+        assert labels[1] == labels[2]
+        assert labels[3] == labels[4]
+        assert labels[1] != labels[3]
+
+
+class TestComponentIndex:
+    """Test the lazily maintained index."""
+
+    def test_relabels_after_risk_change(self):
+        """Test that queries see risk updates through the epoch counter."""
+        env = DynamicGraphEnvironment(graph=_two_districts())
+        index = env.get_component_index()
+        assert index.same_component(1, 4)
+
+        env.batch_update_edge_risks({(2, 3, 0): 0.95, (3, 2, 0): 0.95})
+        assert not index.same_component(1, 4)
+
+        env.reset_edge_risks()
+        assert index.same_component(1, 4)
+
+    def test_unknown_nodes_are_not_rejected(self):
+        """Test that unknown nodes fall through to the full search."""
+        env = DynamicGraphEnvironment(graph=_two_districts())
+        assert env.get_component_index().same_component(1, 999)
+
+    def test_stranded_areas(self):
+        """Test that the smaller side of a cut is reported as stranded."""
+        env = DynamicGraphEnvironment(graph=_two_districts())
+        env.update_edge_risk(3, 4, 0, 0.95)
+        env.update_edge_risk(4, 3, 0, 0.95)
+
+        areas = env.get_component_index().get_stranded_areas()
+        assert len(areas) == 1
+        assert areas[0]["node_count"] == 1
+        assert areas[0]["centroid"] == [14.65, 121.13]
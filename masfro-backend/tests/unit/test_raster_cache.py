@@ -0,0 +1,171 @@
+# filename: tests/unit/test_raster_cache.py
+
+"""
+Unit tests for the GeoTIFF raster cache.
+
+Tests cover:
+- float16 / scaled uint16 depth encoding
+- Byte-budgeted LRU eviction and hit/miss metrics
+- GeoTIFFService windowed reads, fallbacks and metadata reuse
+"""
+
+import numpy as np
+import pytest
+
+from app.services.geotiff_service import GeoTIFFService
+from app.services.raster_cache import (
+    CachedRaster,
+    RasterCache,
+    decode_depths,
+    encode_depths,
+)
+from tests.fixtures.flood_maps import write_flood_maps
+
+HEIGHT, WIDTH = 40, 50
+
+
+def _depths(time_step):
+    rows, cols = np.mgrid[0:HEIGHT, 0:WIDTH]
+    data = (rows * 0.05 + cols * 0.01) * time_step
+    data[0, 0] = np.nan
+    return data.astype(np.float64)
+
+
+def _write_maps(root, time_steps=(1, 2, 3)):
+    return write_flood_maps(root, _depths, time_steps)
+
+
+def _raster(nbytes):
+    return CachedRaster(np.zeros(nbytes, dtype=np.uint8).reshape(1, -1), 1.0, 0, 0, (1, nbytes))
+
+
+class TestEncoding:
+    """Test compact depth storage."""
+
+    def test_float16_round_trip(self):
+        """Test that float16 keeps depths to ~1e-3 relative and NaN nodata."""
+        data = _depths(2)
+        encoded, scale = encode_depths(data, "float16")
+        decoded = decode_depths(encoded, scale)
+
+        assert encoded.dtype == np.float16
+        assert np.isnan(decoded[0, 0])
+        assert np.allclose(decoded[1:], data[1:], rtol=1e-3)
+
+    def test_uint16_round_trip(self):
+        """Test that uint16 stores millimetres with a nodata sentinel."""
+        data = _depths(2)
+        encoded, scale = encode_depths(data, "uint16")
+        decoded = decode_depths(encoded, scale)
+
+        assert encoded.dtype == np.uint16
+        assert np.isnan(decoded[0, 0])
+        assert np.nanmax(np.abs(decoded - data)) <= 0.0005 + 1e-6
+
+    def test_invalid_storage(self):
+        """Test that unknown storage dtypes are rejected."""
+        with pytest.raises(ValueError):
+            encode_depths(_depths(1), "float8")
+
+
+class TestRasterCache:
+    """Test LRU eviction under a byte budget."""
+
+    def test_lru_eviction_and_metrics(self):
+        """Test that the least recently used entry goes first."""
+        cache = RasterCache(max_bytes=300)
+        cache.put("a", _raster(100))
+        cache.put("b", _raster(100))
+        cache.put("c", _raster(100))
+        assert cache.get("a") is not None  # a is now most recent
+
+        cache.put("d", _raster(100))
+
+        assert "b" not in cache
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert stats["entries"] == 3
+        assert stats["bytes"] == 300
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_oversized_entry_not_cached(self):
+        """Test that an entry above the whole budget is skipped."""
+        cache = RasterCache(max_bytes=50)
+        cache.put("big", _raster(100))
+        assert len(cache) == 0
+
+
+class TestGeoTIFFServiceCache:
+    """Test GeoTIFFService on top of the raster cache."""
+
+    def test_point_query_matches_source(self, tmp_path):
+        """Test that cached float16 lookups match the GeoTIFF pixel."""
+        service = GeoTIFFService(data_dir=str(_write_maps(tmp_path)))
+        raster = service.get_raster("rr01", 2)
+        bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+        lon = bounds["min_lon"] + (10.5 / WIDTH) * (bounds["max_lon"] - bounds["min_lon"])
+        lat = bounds["max_lat"] - (20.5 / HEIGHT) * (bounds["max_lat"] - bounds["min_lat"])
+
+        depth = service.get_flood_depth_at_point(lon, lat, "rr01", 2)
+
+        assert raster.data.dtype == np.float16
+        assert depth == pytest.approx(_depths(2)[20, 10], rel=1e-3)
+
+    def test_clip_window_and_fallback(self, tmp_path):
+        """Test that clipped reads keep a window and still answer outside it."""
+        service = GeoTIFFService(data_dir=str(_write_maps(tmp_path)), storage="uint16")
+        bounds = service._calculate_manual_bounds(WIDTH, HEIGHT)
+        lon_span = bounds["max_lon"] - bounds["min_lon"]
+        lat_span = bounds["max_lat"] - bounds["min_lat"]
+        service.set_clip_bounds((
+            bounds["min_lon"] + 0.2 * lon_span, bounds["min_lat"] + 0.2 * lat_span,
+            bounds["min_lon"] + 0.4 * lon_span, bounds["min_lat"] + 0.4 * lat_span
+        ), margin=0.0)
+
+        data, metadata = service.load_flood_map("rr01", 3)
+        assert data.shape[0] < HEIGHT and data.shape[1] < WIDTH
+        assert metadata["shape"] == (HEIGHT, WIDTH)
+        window = metadata["window"]
+        assert np.allclose(
+            data,
+            _depths(3)[window["row_off"]:window["row_off"] + window["height"],
+                       window["col_off"]:window["col_off"] + window["width"]],
+            atol=0.001
+        )
+
+        outside = service.get_flood_depth_at_point(
+            bounds["min_lon"] + 0.9 * lon_span, bounds["min_lat"] + 0.9 * lat_span, "rr01", 3
+        )
+        assert outside is not None
+        assert service.get_cache_stats()["window_fallback_reads"] == 1
+
+    def test_budget_evicts_and_metadata_is_reused(self, tmp_path, monkeypatch):
+        """Test eviction under a two-map budget without recomputing statistics."""
+        per_map = HEIGHT * WIDTH * 2
+        service = GeoTIFFService(data_dir=str(_write_maps(tmp_path)), cache_bytes=2 * per_map)
+        builds = []
+        build_metadata = service._build_metadata
+        monkeypatch.setattr(
+            service, "_build_metadata",
+            lambda *args: builds.append(args[-1]) or build_metadata(*args)
+        )
+
+        for ts in (1, 2, 3, 1):
+            service.load_flood_map("rr01", ts)
+
+        stats = service.get_cache_stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] == 2 * per_map
+        assert stats["evictions"] == 2
+        assert stats["misses"] == 4
+        assert builds == [1, 2, 3]
+
+    def test_invalid_map(self, tmp_path):
+        """Test validation errors are unchanged."""
+        service = GeoTIFFService(data_dir=str(_write_maps(tmp_path)))
+        with pytest.raises(ValueError):
+            service.load_flood_map("rr09", 1)
+        with pytest.raises(FileNotFoundError):
+            service.load_flood_map("rr02", 1)
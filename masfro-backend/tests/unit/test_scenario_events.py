@@ -0,0 +1,140 @@
+# filename: tests/unit/test_scenario_events.py
+
+"""
+Unit tests for the scenario event queue and loaders.
+
+Tests cover:
+- Heap ordering and stable equal-time events
+- Streaming CSV loading with lazy payload parsing
+- Compiled binary scenarios
+"""
+
+import json
+
+import pytest
+
+from app.services.scenario_events import (
+    ScenarioEvent,
+    ScenarioEventQueue,
+    compile_scenario,
+    write_compiled_scenario,
+)
+
+
+def _write_csv(path, rows):
+    lines = ["time_offset,agent,payload"]
+    for time_offset, agent, payload in rows:
+        text = payload if isinstance(payload, str) else json.dumps(payload)
+        lines.append(f'{time_offset},{agent},"{text.replace(chr(34), chr(34) * 2)}"')
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestScenarioEventQueue:
+    """Test heap queue semantics."""
+
+    def test_pops_in_time_then_insertion_order(self):
+        """Test that events come out by time, ties in insertion order."""
+        queue = ScenarioEventQueue()
+        for time_offset, name in [(5, "c"), (1, "a"), (5, "d"), (1, "b")]:
+            queue.push(ScenarioEvent(time_offset, "scout_agent", {"name": name}))
+
+        names = [queue.pop().payload["name"] for _ in range(len(queue))]
+        assert names == ["a", "b", "c", "d"]
+        assert not queue
+
+    def test_payload_parsed_lazily(self):
+        """Test that payload JSON is only decoded on access."""
+        event = ScenarioEvent(0, "scout_agent", "{not json")
+        assert event.agent == "scout_agent"
+        with pytest.raises(ValueError):
+            _ = event.payload
+
+
+class TestCSVStreaming:
+    """Test the streaming CSV loader."""
+
+    def test_streams_with_small_lookahead(self, tmp_path):
+        """Test that only the queue head's look-ahead is held in memory."""
+        path = _write_csv(tmp_path / "s.csv", [
+            (t, "scout_agent", {"location": f"L{t}"}) for t in range(100)
+        ])
+        queue = ScenarioEventQueue.from_file(path)
+
+        assert len(queue) == 100
+        assert queue.peek().time_offset == 0
+        assert len(queue._heap) <= 2
+        assert [e.time_offset for e in queue.upcoming(3)] == [0, 1, 2]
+
+        popped = [queue.pop().payload["location"] for _ in range(100)]
+        assert popped[:2] == ["L0", "L1"]
+        assert len(queue) == 0
+
+    def test_malformed_rows_skipped(self, tmp_path):
+        """Test that rows with bad time offsets are dropped."""
+        path = _write_csv(tmp_path / "s.csv", [
+            (0, "flood_agent", {}), ("soon", "scout_agent", {}), (3, "scout_agent", {})
+        ])
+        queue = ScenarioEventQueue.from_file(path)
+        assert [queue.pop().time_offset for _ in range(2)] == [0, 3]
+        assert not queue
+
+
+    def test_multiline_payloads_counted_once(self, tmp_path):
+        """Test that pretty-printed (multi-line) payloads count as one event."""
+        path = _write_csv(tmp_path / "s.csv", [
+            (0, "scout_agent", json.dumps({"location": "Nangka", "depth": 0.4}, indent=2)),
+            (5, "scout_agent", json.dumps({"location": "Tumana"}, indent=2)),
+        ])
+        queue = ScenarioEventQueue.from_file(path)
+
+        assert len(queue) == 2
+        assert queue.pop().payload["depth"] == 0.4
+        assert len(queue) == 1
+
+
+class TestCompiledScenario:
+    """Test the binary scenario format."""
+
+    def test_compile_sorts_and_round_trips(self, tmp_path):
+        """Test that compiled scenarios preserve events in time order."""
+        csv_path = _write_csv(tmp_path / "s.csv", [
+            (10, "scout_agent", {"location": "B"}),
+            (0, "flood_agent", {"river_levels": {}}),
+            (10, "scout_agent", {"location": "C"}),
+            (2, "scout_agent", "{broken"),
+        ])
+        compiled = compile_scenario(csv_path)
+
+        queue = ScenarioEventQueue.from_file(compiled)
+        assert len(queue) == 3
+        events = [queue.pop() for _ in range(3)]
+        assert [e.time_offset for e in events] == [0, 10, 10]
+        assert [e.agent for e in events] == ["flood_agent", "scout_agent", "scout_agent"]
+        assert events[2].payload == {"location": "C"}
+
+    def test_large_scenario_streams(self, tmp_path):
+        """Test that a large compiled scenario is consumed without buffering."""
+        path = tmp_path / "big.mfsc"
+        n = 50_000
+        write_compiled_scenario(
+            path, ["scout_agent"],
+            ((i // 10, 0, b'{"i": %d}' % i) for i in range(n)), n
+        )
+
+        queue = ScenarioEventQueue.from_file(path)
+        assert len(queue) == n
+        total = 0
+        while queue and queue.peek().time_offset <= 2500:
+            queue.pop()
+            total += 1
+            assert len(queue._heap) <= 11
+        assert total == 25_010
+        assert len(queue) == n - total
+
+    def test_rejects_foreign_files(self, tmp_path):
+        """Test that non-scenario binaries are rejected."""
+        path = tmp_path / "x.mfsc"
+        path.write_bytes(b"NOPE" + b"\0" * 32)
+        with pytest.raises(ValueError):
+            ScenarioEventQueue.from_file(path)
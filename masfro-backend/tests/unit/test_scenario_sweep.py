@@ -0,0 +1,134 @@
+# filename: tests/unit/test_scenario_sweep.py
+
+"""
+Unit tests for the parallel scenario sweep runner.
+
+Tests cover:
+- Parameter grid expansion
+- Inline and process-pool sweeps
+- Streaming CSV and Parquet results
+"""
+
+import csv
+import multiprocessing
+
+import pytest
+
+from app.environment.graph_manager import DynamicGraphEnvironment
+from app.services.scenario_sweep import (
+    RESULT_FIELDS,
+    ScenarioSweepRunner,
+    _ResultWriter,
+    expand_grid,
+)
+from tests.fixtures.simulation import grid_graph
+
+
+def _runner():
+    # Junctions ~110 m apart
+    graph = grid_graph(4, origin=(14.65, 121.10), spacing=(0.001, 0.001), length=120.0)
+    env = DynamicGraphEnvironment(graph=graph)
+    return ScenarioSweepRunner(env, num_routes=3, seed=7, enable_geotiff=False)
+
+
+class TestExpandGrid:
+    """Test grid expansion."""
+
+    def test_cartesian_product_with_defaults(self):
+        """Test that every combination is produced and defaults are filled."""
+        configs = expand_grid({"mode": ["light", "heavy"], "risk_penalty": [0.0, 2000.0, 1e5]})
+
+        assert len(configs) == 6
+        assert {c["mode"] for c in configs} == {"light", "heavy"}
+        assert all(c["flood_decay_rate"] == 0.05 for c in configs)
+
+    def test_unknown_parameter_rejected(self):
+        """Test that typos in parameter names fail early."""
+        with pytest.raises(ValueError):
+            expand_grid({"risk_penality": [0.0]})
+
+
+class TestSweepRun:
+    """Test sweep execution."""
+
+    def test_od_pairs_are_deterministic(self):
+        """Test that OD sampling is reproducible for a seed."""
+        assert _runner().od_pairs == _runner().od_pairs
+
+    def test_inline_sweep_writes_rows(self, tmp_path):
+        """Test an inline sweep streams one CSV row per configuration."""
+        summary = _runner().run(
+            {"risk_penalty": [0.0, 2000.0], "max_ticks": [2]},
+            output_path=tmp_path / "results.csv",
+            processes=0
+        )
+
+        assert summary["runs"] == 2
+        assert summary["failed"] == 0
+        with open(summary["output_path"], newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 2
+        assert {row["param_risk_penalty"] for row in rows} == {"0.0", "2000.0"}
+        assert all(row["ticks"] == "2" for row in rows)
+        assert all(row["routes_evaluated"] == "3" for row in rows)
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="fork start method unavailable"
+    )
+    def test_process_pool_sweep(self, tmp_path):
+        """Test that a forked pool runs every configuration."""
+        summary = _runner().run(
+            {"mode": ["light"], "scout_batch_size": [None, 1], "max_ticks": [2]},
+            output_path=tmp_path / "results.csv",
+            processes=2
+        )
+
+        assert summary["runs"] == 2
+        assert summary["failed"] == 0
+        with open(summary["output_path"], newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert sorted(row["run_id"] for row in rows) == ["0", "1"]
+
+    def test_failed_first_run_keeps_result_columns(self, tmp_path):
+        """Test that an error row written first does not drop later columns."""
+        summary = _runner().run(
+            {"mode": ["flooded", "light"], "max_ticks": [2]},
+            output_path=tmp_path / "results.csv",
+            processes=0
+        )
+
+        assert summary["failed"] == 1
+        with open(summary["output_path"], newline="") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        assert set(name for name, _ in RESULT_FIELDS) <= set(reader.fieldnames)
+        assert rows[0]["error"] and rows[0]["ticks"] == ""
+        assert rows[1]["error"] == ""
+        assert rows[1]["ticks"] == "2"
+        assert rows[1]["routes_evaluated"] == "3"
+
+
+class TestResultWriter:
+    """Test the streaming result writer."""
+
+    def test_parquet_schema_survives_null_first_batch(self, tmp_path):
+        """Test that all-null columns in the first batch keep their types."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        writer = _ResultWriter(
+            tmp_path / "results.parquet",
+            parameter_names=["mode", "max_ticks"],
+            batch_size=1
+        )
+        writer.write({"run_id": 0, "param_mode": "flooded", "param_max_ticks": None,
+                      "error": "Invalid simulation mode", "total_seconds": 0.01})
+        writer.write({"run_id": 1, "param_mode": "light", "param_max_ticks": 2,
+                      "ticks": 2, "mean_route_risk": 0.25, "error": "",
+                      "total_seconds": 0.5})
+        writer.close()
+
+        table = pq.read_table(writer.path)
+        assert table.num_rows == 2
+        assert table.column("ticks").to_pylist() == [None, 2]
+        assert table.column("mean_route_risk").to_pylist() == [None, 0.25]
+        assert table.column("param_max_ticks").to_pylist() == [None, 2]
@@ -0,0 +1,152 @@
+# filename: tests/unit/test_simulation_checkpoint.py
+
+"""
+Unit tests for simulation checkpoints.
+
+Tests cover:
+- Blob encoding and validation
+- Checkpoint store retention
+- Capture/restore round trip through SimulationManager
+- Checkpoints requested mid-tick waiting for the tick to finish
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.services.simulation_checkpoint import (
+    CheckpointStore,
+    decode_checkpoint,
+    encode_checkpoint,
+)
+from app.services.simulation_manager import SimulationState
+from tests.fixtures.simulation import hazard_manager
+
+
+class TestEncoding:
+    """Test checkpoint blob encoding."""
+
+    def test_round_trip(self):
+        """Test that state survives encoding, including numpy arrays."""
+        state = {"tick_count": 7, "risk": np.array([0.1, 0.9], dtype=np.float32)}
+        decoded = decode_checkpoint(encode_checkpoint(state))
+        assert decoded["tick_count"] == 7
+        assert np.array_equal(decoded["risk"], state["risk"])
+
+    def test_rejects_foreign_blob(self):
+        """Test that non-checkpoint bytes are refused."""
+        with pytest.raises(ValueError):
+            decode_checkpoint(b"not a checkpoint")
+
+
+class TestCheckpointStore:
+    """Test checkpoint retention."""
+
+    def test_keeps_newest(self, tmp_path):
+        """Test that the oldest checkpoints are evicted from memory and disk."""
+        store = CheckpointStore(tmp_path, keep=2)
+        for name in ("a", "b", "c"):
+            store.save(name, encode_checkpoint({"name": name}))
+
+        assert [info["name"] for info in store.list()] == ["b", "c"]
+        assert not (tmp_path / "a.ckpt").exists()
+        with pytest.raises(KeyError):
+            store.load("a")
+
+    def test_invalid_name(self):
+        """Test that path-like names are rejected."""
+        with pytest.raises(ValueError):
+            CheckpointStore().save("../x", b"")
+
+
+class TestManagerCheckpoint:
+    """Test capture and restore through SimulationManager."""
+
+    def test_restore_resumes_from_checkpoint_position(self):
+        """Test that a restored run resumes the scenario where it was saved."""
+        manager, env = hazard_manager("hazard_ckpt")
+
+        async def scenario():
+            await manager.run_headless("medium", max_ticks=3, seconds_per_tick=60.0)
+            at_checkpoint = (env.get_risk_array(), manager._event_queue.consumed)
+            info = await manager.create_checkpoint("mid")
+
+            await manager.run_headless("medium", max_ticks=6, seconds_per_tick=60.0)
+            first = (manager._simulation_clock, len(manager._event_queue))
+
+            restored = await manager.restore_checkpoint(name="mid")
+            assert restored["tick_count"] == 3
+            assert restored["state"] == "paused"
+            after_restore = (env.get_risk_array(), manager._event_queue.consumed)
+
+            await manager.run_headless("medium", max_ticks=6, seconds_per_tick=60.0)
+            second = (manager._simulation_clock, len(manager._event_queue))
+            return info, at_checkpoint, after_restore, first, second
+
+        info, at_checkpoint, after_restore, first, second = asyncio.run(scenario())
+
+        assert info["tick_count"] == 3
+        assert np.array_equal(at_checkpoint[0], after_restore[0])
+        assert at_checkpoint[0].max() > 0
+        assert at_checkpoint[1] == after_restore[1]
+        # Risk decay ages reports against wall-clock time, so only the
+        # scenario position (clock and queue) is expected to replay exactly.
+        assert first == second
+
+    def test_restore_brings_back_risk_and_caches(self):
+        """Test that risk scores and HazardAgent caches are restored."""
+        manager, env = hazard_manager("hazard_ckpt")
+
+        async def scenario():
+            await manager.run_headless("medium", max_ticks=4, seconds_per_tick=60.0)
+            risks = env.get_risk_array()
+            scout_reports = len(manager.hazard_agent.scout_data_cache)
+            await manager.create_checkpoint("snap")
+
+            await manager.reset()
+            assert env.get_risk_array().max() == 0.0
+
+            await manager.restore_checkpoint(name="snap")
+            return risks, scout_reports
+
+        risks, scout_reports = asyncio.run(scenario())
+
+        assert np.array_equal(env.get_risk_array(), risks)
+        assert len(manager.hazard_agent.scout_data_cache) == scout_reports
+        assert manager.tick_count == 4
+
+    def test_checkpoint_waits_for_tick_in_progress(self):
+        """Test that a mid-tick checkpoint captures the state after the tick."""
+        manager, env = hazard_manager("hazard_ckpt")
+        release = threading.Event()
+        post_fusion = manager._run_post_fusion_phases
+
+        def blocked_post_fusion(phase_ms):
+            release.wait(timeout=5)
+            return post_fusion(phase_ms)
+
+        async def scenario():
+            await manager.run_headless("medium", max_ticks=2, seconds_per_tick=60.0)
+            manager._run_post_fusion_phases = blocked_post_fusion
+            manager._state = SimulationState.RUNNING
+
+            tick = asyncio.ensure_future(manager.run_tick())
+            while manager.tick_count < 3:
+                await asyncio.sleep(0.01)
+            checkpoint = asyncio.ensure_future(manager.create_checkpoint("mid_tick"))
+            await asyncio.sleep(0.1)
+            waited = not checkpoint.done()
+
+            release.set()
+            await tick
+            info = await checkpoint
+            return waited, info, manager._event_queue.consumed
+
+        waited, info, consumed = asyncio.run(scenario())
+
+        assert waited
+        assert info["tick_count"] == 3
+        state = decode_checkpoint(manager.checkpoint_store.load("mid_tick"))
+        assert state["scenario"]["position"] == consumed
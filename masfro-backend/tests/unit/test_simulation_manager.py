@@ -0,0 +1,323 @@
+# filename: tests/unit/test_simulation_manager.py
+
+"""
+Unit tests for SimulationManager.
+
+Tests cover:
+- Virtual clock advancement
+- Headless back-to-back runs
+- Broadcast suppression without subscribers
+- Batched scout ML processing
+- Off-loop phases and pipelined collection
+- Tick scheduling and coalescing
+"""
+
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.agents.hazard_agent import HazardAgent
+from app.services.simulation_manager import (
+    SimulationManager,
+    SimulationState,
+    VIRTUAL_CLOCK_EPOCH,
+)
+from tests.fixtures.simulation import hazard_manager
+
+
+class TestVirtualClock:
+    """Test the deterministic virtual clock."""
+
+    def test_now_follows_simulation_clock(self):
+        """Test that virtual time is epoch + simulation clock."""
+        manager = SimulationManager()
+        manager.configure_clock(virtual=True, seconds_per_tick=30.0)
+        manager._simulation_clock = 90.0
+
+        assert (manager.now() - VIRTUAL_CLOCK_EPOCH).total_seconds() == 90.0
+
+    def test_hazard_agent_receives_time_source(self):
+        """Test that the virtual clock is injected into the HazardAgent."""
+        manager = SimulationManager()
+        hazard = Mock()
+        manager.set_agents(hazard_agent=hazard)
+
+        manager.configure_clock(virtual=True)
+        hazard.set_time_source.assert_called_with(manager.now)
+
+        manager.configure_clock(virtual=False)
+        hazard.set_time_source.assert_called_with(None)
+
+    def test_hazard_risk_trend_uses_virtual_time(self):
+        """Test that risk trend timestamps follow the virtual clock."""
+        manager, _ = hazard_manager("hazard_clock")
+        hazard = manager.hazard_agent
+
+        asyncio.run(manager.run_headless("medium", max_ticks=3, seconds_per_tick=60.0))
+
+        assert hazard.last_update_time == VIRTUAL_CLOCK_EPOCH + timedelta(seconds=120)
+        assert all(
+            timestamp - VIRTUAL_CLOCK_EPOCH <= timedelta(seconds=120)
+            for timestamp, _ in hazard.risk_history
+        )
+
+
+class TestHeadlessRun:
+    """Test headless accelerated runs."""
+
+    def test_runs_until_queue_drained(self):
+        """Test that a headless run consumes the whole scenario deterministically."""
+        manager = SimulationManager()
+        summary = asyncio.run(manager.run_headless("light", seconds_per_tick=30.0))
+
+        assert summary["events_in_queue"] == 0
+        assert summary["clock"] == "virtual"
+        assert summary["state"] == "paused"
+        # Last event is at 262 s: ticks at 0, 30, ..., 270
+        assert summary["tick_count"] == 10
+        assert summary["simulation_clock"] == 270.0
+        assert summary["ticks_per_second"] > 1.0
+
+    def test_max_ticks(self):
+        """Test that max_ticks bounds the run."""
+        manager = SimulationManager()
+        summary = asyncio.run(manager.run_headless("light", max_ticks=3, seconds_per_tick=1.0))
+
+        assert summary["tick_count"] == 3
+
+    def test_max_ticks_counts_from_resume(self):
+        """Test that a resumed headless run runs max_ticks more ticks."""
+        manager = SimulationManager()
+
+        async def scenario():
+            await manager.run_headless("light", max_ticks=2, seconds_per_tick=1.0)
+            return await manager.run_headless("light", max_ticks=3, seconds_per_tick=1.0)
+
+        summary = asyncio.run(scenario())
+
+        assert summary["tick_count"] == 5
+
+    def test_time_step_advances_with_clock(self):
+        """Test that GeoTIFF time steps follow the virtual clock when configured."""
+        manager = SimulationManager()
+        summary = asyncio.run(manager.run_headless(
+            "light", seconds_per_tick=600.0, seconds_per_time_step=3600.0
+        ))
+
+        assert summary["current_time_step"] == 18
+
+    def test_no_broadcast_without_subscribers(self):
+        """Test that tick broadcasts are skipped when nobody is connected."""
+        manager = SimulationManager()
+        ws_manager = Mock()
+        ws_manager.active_connections = set()
+        ws_manager.broadcast = AsyncMock()
+        manager.set_agents(ws_manager=ws_manager)
+
+        asyncio.run(manager.run_headless("light", max_ticks=2))
+        ws_manager.broadcast.assert_not_called()
+
+
+class TestBatchedScoutProcessing:
+    """Test batched ML processing in the collection phase."""
+
+    def test_due_reports_use_one_batched_call(self):
+        """Test that all due scout reports go through one NLP and geocoder call."""
+        manager = SimulationManager()
+        scout = Mock()
+        scout.nlp_processor.extract_flood_info_batch.side_effect = lambda texts: [
+            {"location": "Nangka", "severity": 0.65, "is_flood_related": True} for _ in texts
+        ]
+        scout.geocoder.geocode_nlp_results.side_effect = lambda infos: [
+            dict(info, coordinates={"lat": 14.67, "lon": 121.11}) for info in infos
+        ]
+        manager.set_agents(scout_agent=scout)
+
+        manager._load_scenario(manager._mode)
+        manager._simulation_clock = 60.0
+        result = manager._run_collection_phase()
+
+        reports = manager.shared_data_bus["scout_data"]
+        assert result["scout_reports_collected"] == len(reports) > 1
+        scout.nlp_processor.extract_flood_info_batch.assert_called_once()
+        scout.nlp_processor.extract_flood_info.assert_not_called()
+        scout.geocoder.geocode_nlp_results.assert_called_once()
+        assert all(r["severity"] == 0.65 and r["coordinates"] for r in reports)
+
+
+def _recording_hazard_agent(delay_s: float = 0.0):
+    """HazardAgent stand-in recording the scout reports fused per tick."""
+    hazard = Mock()
+    hazard.fused_reports = []
+
+    def update_risk(flood_data, scout_data, time_step):
+        time.sleep(delay_s)
+        hazard.fused_reports.append([r.get("location") for r in scout_data])
+        return {"edges_updated": 0}
+
+    hazard.update_risk.side_effect = update_risk
+    return hazard
+
+
+class TestOffLoopTicks:
+    """Test worker-thread tick execution and pipelined collection."""
+
+    def test_event_loop_stays_responsive(self):
+        """Test that a slow fusion phase does not block other coroutines."""
+        manager = SimulationManager()
+        manager.set_agents(hazard_agent=_recording_hazard_agent(delay_s=0.3))
+
+        async def scenario():
+            await manager.start("light")
+            manager._tick_loop_task.cancel()
+            manager._tick_loop_task = None
+
+            beats = 0
+
+            async def heartbeat():
+                nonlocal beats
+                while True:
+                    await asyncio.sleep(0.01)
+                    beats += 1
+
+            task = asyncio.create_task(heartbeat())
+            await manager.run_tick()
+            task.cancel()
+            return beats
+
+        assert asyncio.run(scenario()) >= 10
+
+    def test_pipelined_collection_matches_sequential(self):
+        """Test that prefetching the next tick's events changes no tick's inputs."""
+        runs = []
+        for pipeline in (True, False):
+            manager = SimulationManager()
+            manager.pipeline_collection = pipeline
+            hazard = _recording_hazard_agent()
+            manager.set_agents(hazard_agent=hazard)
+            asyncio.run(manager.run_headless("light", seconds_per_tick=20.0))
+            runs.append(hazard.fused_reports)
+
+        assert runs[0] == runs[1]
+        assert sum(len(reports) for reports in runs[0]) > 0
+
+    def test_pause_keeps_prefetched_events(self):
+        """Test that pausing and resuming keeps events prefetched for the next tick."""
+        manager = SimulationManager()
+        manager.configure_clock(virtual=True, seconds_per_tick=20.0)
+        hazard = _recording_hazard_agent()
+        manager.set_agents(hazard_agent=hazard)
+
+        async def scenario():
+            await manager.start("light")
+            manager._tick_loop_task.cancel()
+            manager._tick_loop_task = None
+
+            prefetch = asyncio.ensure_future(asyncio.to_thread(manager._collect_due_events, 20.0))
+            manager._collection_prefetch = prefetch
+            staged = await asyncio.shield(prefetch)
+
+            await manager.stop()
+            assert manager._collection_prefetch is prefetch
+
+            await manager.start("light")
+            manager._tick_loop_task.cancel()
+            manager._tick_loop_task = None
+            await manager.run_tick()
+            return staged
+
+        staged = asyncio.run(scenario())
+        assert staged["scout_reports"]
+        assert len(hazard.fused_reports[0]) == len(staged["scout_reports"])
+
+    def test_cancelled_tick_keeps_prefetch(self):
+        """Test that cancelling a tick waiting on the prefetch does not cancel it."""
+        manager = SimulationManager()
+
+        def slow_collect():
+            time.sleep(0.2)
+            return manager._collect_due_events(20.0)
+
+        async def scenario():
+            prefetch = asyncio.ensure_future(asyncio.to_thread(slow_collect))
+            manager._collection_prefetch = prefetch
+            tick = asyncio.create_task(manager._run_collection_async())
+            await asyncio.sleep(0.05)
+            tick.cancel()
+            try:
+                await tick
+            except asyncio.CancelledError:
+                pass
+            assert manager._collection_prefetch is prefetch
+            return await prefetch
+
+        assert asyncio.run(scenario())["phase_result"]["errors"] == []
+
+
+class TestTickScheduler:
+    """Test the adaptive tick scheduler."""
+
+    def _run_for(self, manager, seconds):
+        async def scenario():
+            await manager.start("light")
+            await asyncio.sleep(seconds)
+            await manager.stop()
+        asyncio.run(scenario())
+
+    def test_period_subtracts_tick_time(self, monkeypatch):
+        """Test that ticks start on the configured period."""
+        manager = SimulationManager()
+        manager.configure_scheduler(tick_period_s=0.05)
+        clock = [100.0]
+        sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def fake_tick(periods=1):
+            clock[0] += 0.02  # each tick takes 20 ms
+            manager.tick_count += 1
+            if manager.tick_count == 10:
+                manager._state = SimulationState.PAUSED
+            return {"duration_ms": 20.0}
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            clock[0] += delay
+            await real_sleep(0)
+
+        async def scenario():
+            asyncio.get_running_loop().time = lambda: clock[0]
+            monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+            manager._state = SimulationState.RUNNING
+            await manager._simulation_loop()
+
+        monkeypatch.setattr(manager, "run_tick", fake_tick)
+        asyncio.run(scenario())
+
+        # A loop sleeping a full period after each tick would sleep 50 ms
+        assert sleeps == pytest.approx([0.03] * 10)
+        assert manager.get_status()["scheduler"]["coalesced_ticks"] == 0
+
+    def test_late_ticks_are_coalesced(self):
+        """Test that a slow tick merges the missed slots into one pass."""
+        manager = SimulationManager()
+        manager.configure_scheduler(tick_period_s=0.05)
+        manager.configure_clock(virtual=True, seconds_per_tick=10.0)
+        manager.set_agents(hazard_agent=_recording_hazard_agent(delay_s=0.12))
+
+        self._run_for(manager, 0.6)
+
+        scheduler = manager.get_status()["scheduler"]
+        assert scheduler["coalesced_ticks"] > 0
+        assert scheduler["late_ticks"] > 0
+        # The virtual clock covers every scheduled slot, not only executed ticks
+        covered = manager.tick_count + scheduler["coalesced_ticks"]
+        assert manager._simulation_clock >= (covered - 1) * 10.0
+        assert manager._simulation_clock > (manager.tick_count - 1) * 10.0
+
+    def test_invalid_period_rejected(self):
+        """Test that non-positive periods are refused."""
+        with pytest.raises(ValueError):
+            SimulationManager().configure_scheduler(tick_period_s=0)
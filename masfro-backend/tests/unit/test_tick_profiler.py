@@ -0,0 +1,131 @@
+# filename: tests/unit/test_tick_profiler.py
+
+"""
+Unit tests for the tick profiler.
+
+Tests cover:
+- Rolling histogram percentiles and window eviction
+- Context-manager timing
+- Phase and HazardAgent step timings from SimulationManager ticks
+"""
+
+import asyncio
+import time
+
+import networkx as nx
+
+from app.agents.hazard_agent import HazardAgent
+from app.environment.graph_manager import DynamicGraphEnvironment
+from app.services.simulation_manager import SimulationManager
+from app.services.tick_profiler import RollingHistogram, TickProfiler
+
+
+class _RecordingBroadcaster:
+    """Minimal WebSocket manager stand-in that keeps broadcast messages."""
+
+    def __init__(self):
+        self.active_connections = [object()]
+        self.messages = []
+
+    async def broadcast(self, message):
+        self.messages.append(message)
+
+
+def _manager():
+    graph = nx.MultiDiGraph(crs="EPSG:4326")
+    for i in range(4):
+        graph.add_node(i, x=121.09 + 0.004 * i, y=14.63)
+    for i in range(3):
+        graph.add_edge(i, i + 1, length=400.0)
+        graph.add_edge(i + 1, i, length=400.0)
+    env = DynamicGraphEnvironment(graph=graph)
+
+    manager = SimulationManager()
+    manager.set_agents(
+        hazard_agent=HazardAgent("hazard_profile", env, enable_geotiff=False),
+        environment=env,
+        ws_manager=_RecordingBroadcaster()
+    )
+    return manager
+
+
+class TestRollingHistogram:
+    """Test the ring buffer histogram."""
+
+    def test_percentiles(self):
+        """Test p50/p95/max over the samples."""
+        histogram = RollingHistogram(window=100)
+        for value in range(1, 101):
+            histogram.add(float(value))
+
+        summary = histogram.summary()
+        assert summary["count"] == 100
+        assert summary["p50"] == 50.5
+        assert 95.0 <= summary["p95"] <= 96.0
+        assert summary["max"] == 100.0
+        assert summary["last"] == 100.0
+
+    def test_window_evicts_oldest(self):
+        """Test that only the most recent samples count."""
+        histogram = RollingHistogram(window=4)
+        for value in (1000.0, 1.0, 2.0, 3.0, 4.0):
+            histogram.add(value)
+
+        summary = histogram.summary()
+        assert summary["max"] == 4.0
+        assert summary["count"] == 5
+
+    def test_empty(self):
+        """Test the summary of an unused histogram."""
+        assert RollingHistogram().summary()["p95"] == 0.0
+
+
+class TestTickProfiler:
+    """Test profiler recording."""
+
+    def test_measure_records_duration(self):
+        """Test that measure() records elapsed milliseconds."""
+        profiler = TickProfiler()
+        with profiler.measure("step"):
+            time.sleep(0.01)
+
+        stats = profiler.snapshot()["step"]
+        assert stats["count"] == 1
+        assert stats["last"] >= 9.0
+
+    def test_disabled_and_reset(self):
+        """Test that disabled profilers drop samples and reset clears them."""
+        profiler = TickProfiler(enabled=False)
+        profiler.record("tick", 5.0)
+        assert profiler.snapshot() == {}
+
+        profiler.enabled = True
+        profiler.record("tick", 5.0)
+        profiler.reset()
+        assert profiler.snapshot() == {}
+
+
+class TestSimulationProfile:
+    """Test phase and HazardAgent step timings from ticks."""
+
+    def test_phases_and_hazard_steps_profiled(self):
+        """Test that each tick feeds the phase and HazardAgent histograms."""
+        manager = _manager()
+        asyncio.run(manager.run_headless("light", max_ticks=3, seconds_per_tick=60.0))
+
+        profile = manager.get_profile()
+        for name in ("tick", "collection", "fusion", "routing", "evacuation", "advancement"):
+            assert profile[name]["count"] == 3
+        for step in ("clean_expired_data", "fuse_data", "calculate_risk_scores",
+                     "get_edge_flood_depths", "update_environment"):
+            assert profile[f"hazard.{step}"]["count"] == 3
+        assert profile["tick"]["max"] >= profile["fusion"]["max"]
+
+    def test_tick_broadcast_carries_profile(self):
+        """Test that tick broadcasts include the profile."""
+        manager = _manager()
+        asyncio.run(manager.run_headless("light", max_ticks=2, seconds_per_tick=60.0))
+
+        ticks = [m for m in manager.ws_manager.messages if m.get("event") == "tick"]
+        assert ticks
+        assert ticks[-1]["data"]["profile"]["tick"]["count"] == 2
@@ -0,0 +1,149 @@
+# filename: tests/unit/test_tick_recorder.py
+
+"""
+Unit tests for the tick recorder and replayer.
+
+Tests cover:
+- Tick log framing, sessions and truncated tails
+- Edge risk change sets
+- Recording a headless run and replaying it through fresh agents
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.tick_recorder import (
+    TickRecorder,
+    TickReplayer,
+    apply_risk_changes,
+    load_sessions,
+    read_tick_log,
+    risk_changes,
+    tick_log_path,
+)
+from tests.fixtures.simulation import hazard_manager
+
+
+def _manager(risk_scale: float = 1.0):
+    manager, env = hazard_manager("hazard_replay")
+    hazard_agent = manager.hazard_agent
+    if risk_scale != 1.0:
+        # Stand-in for a build that changed how scout reports raise risk
+        update_node_risk = hazard_agent.update_node_risk
+        hazard_agent.update_node_risk = (
+            lambda node, risk, *args, **kwargs: update_node_risk(node, risk * risk_scale, *args, **kwargs)
+        )
+    return manager, env
+
+
+class TestTickLog:
+    """Test the tick log format."""
+
+    def test_sessions_and_ticks_round_trip(self, tmp_path):
+        """Test that records come back grouped by session, in order."""
+        path = tmp_path / "run.mftl"
+        risks = np.zeros(4, dtype=np.float32)
+        for session in range(2):
+            recorder = TickRecorder(path)
+            recorder.begin_session({"session": session}, None, risks)
+            for tick in (1, 2):
+                recorder.record_tick({"tick": tick, "events": []}, risks)
+            recorder.close()
+
+        sessions = load_sessions(path)
+        assert [s["session"]["meta"]["session"] for s in sessions] == [0, 1]
+        assert [t["tick"] for t in sessions[1]["ticks"]] == [1, 2]
+
+    def test_truncated_tail_ignored(self, tmp_path):
+        """Test that a partially written last record is skipped."""
+        path = tmp_path / "run.mftl"
+        recorder = TickRecorder(path)
+        recorder.begin_session({}, None, None)
+        recorder.record_tick({"tick": 1}, None)
+        recorder.close()
+        with open(path, "ab") as f:
+            f.write(b"\xff\x00\x00\x00partial")
+
+        assert [r["kind"] for r in read_tick_log(path)] == ["session", "tick"]
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Test that the recorder will not append to other files."""
+        path = tmp_path / "notes.mftl"
+        path.write_bytes(b"hello world")
+        with pytest.raises(ValueError):
+            TickRecorder(path)
+
+    def test_invalid_name(self, tmp_path):
+        """Test that path-like log names are rejected."""
+        with pytest.raises(ValueError):
+            tick_log_path(tmp_path, "../escape")
+
+    def test_risk_change_set(self):
+        """Test that change sets hold only changed edges and re-apply exactly."""
+        before = np.array([0.0, 0.2, 0.5, 0.9], dtype=np.float32)
+        after = np.array([0.0, 0.3, 0.5, 1.0], dtype=np.float32)
+
+        changes = risk_changes(before, after)
+        assert changes["idx"].tolist() == [1, 3]
+        assert np.array_equal(apply_risk_changes(before, changes), after)
+        assert "full" in risk_changes(None, after)
+
+
+class TestRecordReplay:
+    """Test recording a run and replaying it."""
+
+    def _record(self, path):
+        manager, env = _manager()
+
+        async def scenario():
+            await manager.start_recording(path)
+            await manager.run_headless("medium", max_ticks=4, seconds_per_tick=60.0)
+            return manager.stop_recording()
+
+        info = asyncio.run(scenario())
+        return info, env.get_risk_array()
+
+    def test_records_every_tick(self, tmp_path):
+        """Test that each tick's events, timings and risk changes are logged."""
+        path = tmp_path / "run.mftl"
+        info, final_risks = self._record(path)
+
+        sessions = load_sessions(path)
+        assert info["records_written"] == 5
+        ticks = sessions[0]["ticks"]
+        assert [t["tick"] for t in ticks] == [1, 2, 3, 4]
+        assert sum(len(t["events"]) for t in ticks) > 0
+        assert {"collection", "fusion", "routing"} <= set(ticks[0]["phase_ms"])
+
+        risks = sessions[0]["session"]["risk"]
+        for tick in ticks:
+            risks = apply_risk_changes(risks, tick["risk_changes"])
+        assert np.array_equal(risks, final_risks)
+        assert final_risks.max() > 0
+
+    def test_replay_matches_recording(self, tmp_path):
+        """Test that replaying with the same agents shows no drift."""
+        path = tmp_path / "run.mftl"
+        self._record(path)
+
+        replay_manager, _ = _manager()
+        report = asyncio.run(TickReplayer(replay_manager, latency_tolerance=1e9).replay(path))
+
+        assert report["ticks"] == 4
+        assert report["risk_drift"]["ticks_with_drift"] == 0
+        assert report["regressions"] == []
+        assert set(report["latency_ms"]) >= {"collection", "fusion", "tick"}
+        assert replay_manager.is_paused
+
+    def test_replay_reports_drift(self, tmp_path):
+        """Test that changed agent behaviour shows up as risk drift."""
+        path = tmp_path / "run.mftl"
+        self._record(path)
+
+        replay_manager, _ = _manager(risk_scale=0.5)
+        report = asyncio.run(TickReplayer(replay_manager).replay(path))
+
+        assert report["risk_drift"]["ticks_with_drift"] > 0
+        assert report["risk_drift"]["max_abs"] > 0
@@ -0,0 +1,248 @@
+# filename: tests/unit/test_time_dependent_routing.py
+
+"""
+Unit tests for time-dependent flood-aware routing.
+
+Tests cover:
+- EdgeDepthSeries interpolation and traversal maxima
+- Time-dependent A* avoiding roads flooded on arrival
+- RoutingAgent departure times and the HazardAgent depth series
+"""
+
+from unittest.mock import patch
+
+import networkx as nx
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import Affine
+
+from app.agents.hazard_agent import HazardAgent
+from app.agents.routing_agent import RoutingAgent
+from app.algorithms.risk_aware_astar import haversine_distance
+from app.algorithms.time_dependent_astar import EdgeDepthSeries, time_dependent_astar
+from app.environment.graph_manager import DynamicGraphEnvironment
+from app.services.geotiff_service import GeoTIFFService
+
+# Short route 1 -> 2 -> 3 (~16 km, the last km on a road that floods at
+# hour 3) and a dry detour 1 -> 4 -> 3
+COORDS = {
+    1: (14.600, 121.000),
+    2: (14.735, 121.000),
+    3: (14.744, 121.000),
+    4: (14.672, 121.060),
+}
+FLOODING_EDGE = (2, 3, 0)
+
+
+def _graph():
+    graph = nx.MultiDiGraph(crs="EPSG:4326")
+    for node, (lat, lon) in COORDS.items():
+        graph.add_node(node, x=lon, y=lat)
+    for u, v in ((1, 2), (2, 3), (1, 4), (4, 3)):
+        length = haversine_distance(COORDS[u], COORDS[v])
+        graph.add_edge(u, v, length=length, risk_score=0.0)
+        graph.add_edge(v, u, length=length, risk_score=0.0)
+    return graph
+
+
+def _series(graph):
+    keys = list(graph.edges(keys=True))
+    depths = np.zeros((18, len(keys)), dtype=np.float32)
+    depths[2:, keys.index(FLOODING_EDGE)] = 1.0  # dry at steps 1-2, 1m from step 3
+    return EdgeDepthSeries(keys, depths)
+
+
+class _Forecast:
+    """Stand-in HazardAgent exposing a fixed depth series."""
+
+    agent_id = "hazard_forecast"
+    time_step = 1
+
+    def __init__(self, series):
+        self.series = series
+        self.requested = []
+
+    def get_edge_depth_series(self, return_period=None, build=True):
+        self.requested.append(return_period)
+        return self.series
+
+    def get_inundation_index(self, return_period=None, vehicle_type="car", build=True):
+        return self.series.first_inundation(0.3)
+
+    def depth_to_risk(self, depth):
+        return min(depth, 1.0) * 0.5
+
+
+class TestEdgeDepthSeries:
+    """Test per-edge depth lookups."""
+
+    def test_interpolation_and_clamping(self):
+        """Test linear depths between steps and clamping outside the series."""
+        series = EdgeDepthSeries([("a",), ("b",)], [[0.0, 1.0], [1.0, 1.0], [3.0, 0.0]])
+
+        assert series.last_step == 3
+        assert series.depth_at(0, 1.5) == pytest.approx(0.5)
+        assert series.depth_at(0, 2.25) == pytest.approx(1.5)
+        assert series.depth_at(1, 2.5) == pytest.approx(0.5)
+        assert series.depth_at(0, 0.0) == 0.0
+        assert series.depth_at(0, 7.0) == 3.0
+
+    def test_max_depth_includes_peak_between_ends(self):
+        """Test that a peak at a time step inside the traversal counts."""
+        series = EdgeDepthSeries([("a",)], [[0.0], [2.0], [0.0]])
+        assert series.max_depth(0, 1.5, 2.5) == pytest.approx(2.0)
+        assert series.max_depth(0, 1.1, 1.2) == pytest.approx(0.4)
+
+    def test_nodata_and_shape(self):
+        """Test that NaN counts as dry and shapes are checked."""
+        series = EdgeDepthSeries([("a",)], [[np.nan], [1.0]])
+        assert series.depth_at(0, 1.0) == 0.0
+        with pytest.raises(ValueError):
+            EdgeDepthSeries([("a",), ("b",)], [[0.0]])
+
+
+class TestTimeDependentAstar:
+    """Test the forecast-aware search."""
+
+    def test_early_departure_takes_short_road(self):
+        """Test that the road is used while it is still dry on arrival."""
+        graph = _graph()
+        result = time_dependent_astar(graph, 1, 3, _series(graph), 1.0,
+                                      risk_weight=2000.0, distance_weight=1.0)
+
+        assert result["path"] == [1, 2, 3]
+        expected = 1.0 + (graph[1][2][0]["length"] + graph[2][3][0]["length"]) / 30000.0
+        assert result["arrival_time"] == pytest.approx(expected)
+
+    def test_late_departure_avoids_road_flooded_on_arrival(self):
+        """Test that a road dry at departure but flooded on arrival is avoided."""
+        graph = _graph()
+        series = _series(graph)
+        assert series.depth_at(series.index[FLOODING_EDGE], 2.2) < 0.3
+
+        result = time_dependent_astar(graph, 1, 3, series, 2.2,
+                                      risk_weight=2000.0, distance_weight=1.0)
+        assert result["path"] == [1, 4, 3]
+
+    def test_no_passable_path(self):
+        """Test that a fully flooded destination yields no path."""
+        graph = _graph()
+        keys = list(graph.edges(keys=True))
+        series = EdgeDepthSeries(keys, np.ones((18, len(keys)), dtype=np.float32))
+
+        result = time_dependent_astar(graph, 1, 3, series, 1.0)
+        assert result["path"] is None
+        assert result["arrival_time"] is None
+
+    def test_earlier_costlier_label_is_kept(self):
+        """Test that a cheaper road arriving too late does not hide the feasible route."""
+        graph = nx.MultiDiGraph(crs="EPSG:4326")
+        for node, lon in (("S", 121.0), ("B", 121.005), ("A", 121.0095), ("E", 121.012)):
+            graph.add_node(node, x=lon, y=14.6)
+        graph.add_edge("S", "B", length=555.0, risk_score=0.5)
+        graph.add_edge("B", "A", length=555.0, risk_score=0.5)
+        graph.add_edge("A", "E", length=300.0, risk_score=0.0)
+
+        def route():
+            keys = list(graph.edges(keys=True))
+            depths = np.zeros((18, len(keys)), dtype=np.float32)
+            depths[1:, keys.index(("A", "E", 0))] = 5.0  # passable until t = 1.06
+            return time_dependent_astar(graph, "S", "E", EdgeDepthSeries(keys, depths), 1.0,
+                                        risk_weight=10.0, distance_weight=1.0)
+
+        assert route()["path"] == ["S", "B", "A", "E"]
+
+        # Dry and cheaper, but reaches A at t = 1.1 when A->E is flooded
+        graph.add_edge("S", "A", length=3000.0, risk_score=0.0)
+        result = route()
+        assert result["path"] == ["S", "B", "A", "E"]
+        assert result["arrival_time"] == pytest.approx(1.0 + 1410.0 / 30000.0)
+
+    def test_depth_risk_raises_cost(self):
+        """Test that shallow forecast water adds risk cost without blocking."""
+        graph = _graph()
+        keys = list(graph.edges(keys=True))
+        depths = np.zeros((18, len(keys)), dtype=np.float32)
+        depths[:, keys.index(FLOODING_EDGE)] = 0.2
+        series = EdgeDepthSeries(keys, depths)
+
+        dry = time_dependent_astar(graph, 1, 3, series, 1.0, risk_weight=2000.0, distance_weight=1.0)
+        wet = time_dependent_astar(graph, 1, 3, series, 1.0, risk_weight=2000.0, distance_weight=1.0,
+                                   depth_risk=lambda d: 0.5)
+        assert dry["path"] == [1, 2, 3]
+        assert wet["cost"] > dry["cost"]
+
+
+class TestRoutingAgentDeparture:
+    """Test RoutingAgent integration."""
+
+    def test_calculate_route_with_departure_time(self):
+        """Test that departure time changes the route and is reported."""
+        graph = _graph()
+        agent = RoutingAgent("routing_td", DynamicGraphEnvironment(graph=graph))
+        forecast = _Forecast(_series(graph))
+        agent.set_hazard_agent(forecast)
+
+        early = agent.calculate_route(COORDS[1], COORDS[3], departure_time=1.0)
+        late = agent.calculate_route(COORDS[1], COORDS[3], {"return_period": "rr04"}, departure_time=2.2)
+        static = agent.calculate_route(COORDS[1], COORDS[3])
+
+        assert early["distance"] < late["distance"]
+        assert late["departure_time"] == 2.2 and late["arrival_time"] > 2.2
+        assert static["distance"] == pytest.approx(early["distance"])
+        assert "arrival_time" not in static
+        assert forecast.requested[0] is None and "rr04" in forecast.requested
+
+    def test_departure_outside_forecast(self):
+        """Test departure time validation."""
+        graph = _graph()
+        agent = RoutingAgent("routing_td", DynamicGraphEnvironment(graph=graph))
+        agent.set_hazard_agent(_Forecast(_series(graph)))
+        with pytest.raises(ValueError):
+            agent.calculate_route(COORDS[1], COORDS[3], departure_time=19.0)
+
+    def test_without_forecast_falls_back(self):
+        """Test that routing without a HazardAgent uses current conditions."""
+        graph = _graph()
+        agent = RoutingAgent("routing_td", DynamicGraphEnvironment(graph=graph))
+        result = agent.calculate_route(COORDS[1], COORDS[3], departure_time=2.2)
+        assert result["status"] == "success"
+        assert any("forecast unavailable" in w for w in result["warnings"])
+
+
+class TestHazardAgentDepthSeries:
+    """Test the HazardAgent depth series built from GeoTIFF gathers."""
+
+    def test_series_from_maps(self, tmp_path):
+        """Test series shape, alignment with gathers and caching."""
+        height, width = 40, 50
+        folder = tmp_path / "rr01"
+        folder.mkdir(parents=True)
+        for ts in (1, 2, 3):
+            with rasterio.open(
+                folder / f"rr01-{ts}.tif", "w", driver="GTiff", height=height, width=width,
+                count=1, dtype="float64", crs="EPSG:3857",
+                transform=Affine(10.0, 0.0, 0.0, 0.0, -10.0, 0.0)
+            ) as dst:
+                dst.write(np.full((height, width), 0.1 * ts), 1)
+        service = GeoTIFFService(data_dir=str(tmp_path), store_dir=str(tmp_path / "store"))
+
+        bounds = service._calculate_manual_bounds(width, height)
+        graph = nx.MultiDiGraph(crs="EPSG:4326")
+        for node, fx in ((1, 0.2), (2, 0.5), (3, 0.8)):
+            graph.add_node(node, x=bounds["min_lon"] + fx * bounds["coverage_width"],
+                           y=bounds["min_lat"] + 0.5 * bounds["coverage_height"])
+        graph.add_edge(1, 2, length=100.0)
+        graph.add_edge(2, 3, length=100.0)
+
+        with patch('app.agents.hazard_agent.get_geotiff_service', return_value=service):
+            agent = HazardAgent("hazard_series", DynamicGraphEnvironment(graph=graph), enable_geotiff=True)
+
+        series = agent.get_edge_depth_series("rr01")
+        assert series.depths.shape == (3, 2)
+        assert series.depth_at(series.index[(1, 2, 0)], 2.5) == pytest.approx(0.25, abs=1e-3)
+        assert agent.get_edge_depth_series("rr01") is series
+        assert agent.depth_to_risk(0.0) == 0.0
+        assert 0.0 < agent.depth_to_risk(0.45) < agent.depth_to_risk(1.0) <= 0.5
+        service.prefetcher.shutdown()
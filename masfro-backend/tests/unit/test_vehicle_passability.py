@@ -0,0 +1,193 @@
+# filename: tests/unit/test_vehicle_passability.py
+
+"""
+Unit tests for vehicle-specific passability bitsets.
+
+Tests cover:
+- Bit packing and lazy rebuilds per risk epoch
+- Vehicle-specific routes in RoutingAgent (plain and contracted graphs)
+- Batch routing and HazardAgent depth updates (dict and aligned array)
+"""
+
+from unittest.mock import Mock, patch
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from app.agents.hazard_agent import HazardAgent
+from app.agents.routing_agent import RoutingAgent
+from app.algorithms.risk_aware_astar import haversine_distance
+from app.algorithms.vehicle_passability import passability_bits
+from app.environment.graph_manager import DynamicGraphEnvironment
+
+# Short road 1-2-3-4 with 0.4m of water on 2-3 (too deep for a car, fine
+# for a truck) and a longer dry road 1-5-6-4
+COORDS = {
+    1: (14.650, 121.100),
+    2: (14.652, 121.100),
+    3: (14.654, 121.100),
+    4: (14.656, 121.100),
+    5: (14.651, 121.104),
+    6: (14.655, 121.104),
+}
+FLOODED = {(2, 3, 0): 0.4, (3, 2, 0): 0.4}
+
+
+def _env():
+    graph = nx.MultiDiGraph(crs="EPSG:4326")
+    for node, (lat, lon) in COORDS.items():
+        graph.add_node(node, x=lon, y=lat)
+    for u, v in ((1, 2), (2, 3), (3, 4), (1, 5), (5, 6), (6, 4)):
+        length = haversine_distance(COORDS[u], COORDS[v])
+        graph.add_edge(u, v, length=length, risk_score=0.0)
+        graph.add_edge(v, u, length=length, risk_score=0.0)
+    return DynamicGraphEnvironment(graph=graph)
+
+
+class TestPassabilityIndex:
+    """Test the bitsets."""
+
+    def test_bit_packing(self):
+        """Test that bit i is set for passable edge i."""
+        bits = passability_bits(np.array([0.0, 0.4, 0.2, 0.6, 0.0, 0.0, 0.0, 0.0, 0.5]), 0.3)
+        assert bits.dtype == np.uint8 and len(bits) == 2
+        unpacked = np.unpackbits(bits, count=9, bitorder="little")
+        np.testing.assert_array_equal(unpacked, [1, 0, 1, 0, 1, 1, 1, 1, 0])
+
+    def test_edge_test_per_vehicle(self):
+        """Test car/truck bits and the no-depth case."""
+        env = _env()
+        index = env.get_passability_index()
+        assert index.edge_test("car") is None
+
+        env.set_flood_depths(FLOODED)
+        car, truck = index.edge_test("car"), index.edge_test("truck")
+        assert not car((2, 3, 0)) and car((1, 2, 0))
+        assert truck((2, 3, 0))
+        assert car(("unknown", "edge", 0))
+        with pytest.raises(ValueError):
+            index.edge_test("boat")
+
+    def test_rebuilt_on_new_epoch(self):
+        """Test that new depths and limits rebuild the bitsets."""
+        env = _env()
+        index = env.get_passability_index()
+        env.set_flood_depths(FLOODED)
+        before = index.get_bits("car")
+        assert index.get_bits("car") is before
+
+        env.set_flood_depths({})
+        assert index.edge_test("car")((2, 3, 0))
+
+        env.set_flood_depths(FLOODED, {"car": 0.5, "truck": 0.6})
+        assert index.edge_test("car")((2, 3, 0))
+        with pytest.raises(ValueError):
+            index.get_bits("suv")
+
+        env.reset_edge_risks()
+        assert index.get_bits("car") is None
+
+
+    def test_aligned_depth_array(self):
+        """Test that an edge-ordered array matches the dict path."""
+        env = _env()
+        index = env.get_passability_index()
+        edges = list(env.graph.edges(keys=True))
+        depths = np.full(len(edges), np.nan, dtype=np.float32)
+        for edge, depth in FLOODED.items():
+            depths[edges.index(edge)] = depth
+
+        env.set_flood_depths(depths)
+        from_array = env.get_flood_depth_array()
+        assert not index.edge_test("car")((2, 3, 0))
+        env.set_flood_depths(FLOODED)
+        np.testing.assert_array_equal(from_array, env.get_flood_depth_array())
+
+        with pytest.raises(ValueError):
+            env.set_flood_depths(depths[:-1])
+
+
+class TestVehicleRoutes:
+    """Test vehicle_type routing preferences."""
+
+    @pytest.mark.parametrize("use_contraction", [False, True])
+    def test_car_and_truck_routes_differ(self, use_contraction):
+        """Test that a car detours around water a truck can drive through."""
+        env = _env()
+        env.set_flood_depths(FLOODED)
+        agent = RoutingAgent("routing_vehicle", env, use_contraction=use_contraction)
+
+        default = agent.calculate_route(COORDS[1], COORDS[4])
+        car = agent.calculate_route(COORDS[1], COORDS[4], {"vehicle_type": "car"})
+        truck = agent.calculate_route(COORDS[1], COORDS[4], {"vehicle_type": "truck"})
+
+        assert car["distance"] > truck["distance"]
+        assert truck["distance"] == pytest.approx(default["distance"])
+        assert (COORDS[5][0], COORDS[5][1]) in [tuple(p) for p in car["path"]]
+
+    def test_invalid_vehicle(self):
+        """Test vehicle type validation."""
+        agent = RoutingAgent("routing_vehicle", _env())
+        with pytest.raises(ValueError):
+            agent.calculate_route(COORDS[1], COORDS[4], {"vehicle_type": "boat"})
+
+    def test_forecast_depth_limit(self):
+        """Test the blocking depth used for time-dependent routes."""
+        agent = RoutingAgent("routing_vehicle", _env())
+        assert agent._vehicle_depth_limit(None) == agent.passable_depth
+        assert agent._vehicle_depth_limit({"vehicle_type": "truck"}) == 0.6
+
+    def test_batch_groups_by_vehicle(self):
+        """Test batch routing with several vehicle classes to one destination."""
+        env = _env()
+        env.set_flood_depths(FLOODED)
+        agent = RoutingAgent("routing_vehicle", env)
+
+        results = agent.calculate_routes([
+            {"start": COORDS[1], "end": COORDS[4], "preferences": {"vehicle_type": "car"}},
+            {"start": COORDS[1], "end": COORDS[4], "preferences": {"vehicle_type": "truck"}},
+            {"start": COORDS[2], "end": COORDS[4], "preferences": {"vehicle_type": "truck"}},
+            {"start": COORDS[1], "end": COORDS[4], "preferences": {"vehicle_type": "boat"}},
+        ])
+
+        single = agent.calculate_route(COORDS[1], COORDS[4], {"vehicle_type": "car"})
+        assert results[0]["distance"] == pytest.approx(single["distance"])
+        assert results[1]["distance"] < results[0]["distance"]
+        assert results[2]["status"] == "success"
+        assert results[3]["status"] == "error"
+
+
+class TestHazardAgentDepths:
+    """Test that risk updates publish depths and limits to the environment."""
+
+    def test_calculate_risk_scores_sets_depths(self):
+        """Test depths and the agent's configured limits reach the index."""
+        env = _env()
+        agent = HazardAgent("hazard_vehicle", env, enable_geotiff=False)
+        agent.passability_depths["car"] = 0.45
+        agent.calculate_risk_scores({})
+
+        np.testing.assert_array_equal(env.get_flood_depth_array(), np.zeros(env.graph.number_of_edges()))
+        assert env.get_passability_index().depth_limits["car"] == 0.45
+
+    def test_gathered_depths_passed_as_array(self):
+        """Test that the GeoTIFF edge gather reaches the environment unconverted."""
+        env = _env()
+        agent = HazardAgent("hazard_vehicle", env, enable_geotiff=False)
+        edges = list(env.graph.edges(keys=True))
+        gathered = np.zeros(len(edges), dtype=np.float32)
+        gathered[edges.index((2, 3, 0))] = 0.4
+        gathered[edges.index((1, 2, 0))] = np.nan
+        agent.geotiff_enabled = True
+        agent.geotiff_service = Mock(edge_sample_keys=edges)
+        agent.geotiff_service.get_edge_depths.return_value = gathered
+        agent._edge_sample_count = len(edges)
+
+        with patch.object(env, "set_flood_depths", wraps=env.set_flood_depths) as set_depths:
+            agent.calculate_risk_scores({})
+
+        assert isinstance(set_depths.call_args[0][0], np.ndarray)
+        depths = env.get_flood_depth_array()
+        assert depths[edges.index((2, 3, 0))] == pytest.approx(0.4)
+        assert depths[edges.index((1, 2, 0))] == 0.0